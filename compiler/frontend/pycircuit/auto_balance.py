@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+class AutoBalanceError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class DepthPath:
+    """One critical path from `pycc --logic-depth-report` (start -> endpoint)."""
+
+    function: str
+    endpoint: str
+    depth: int
+    # Named values on the path, ascending depth: (pyc.name, depth).
+    nodes: tuple[tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class LogicDepthReport:
+    limit: int
+    paths: tuple[DepthPath, ...]
+
+
+def load_logic_depth_report(path: Path) -> LogicDepthReport:
+    p = Path(path)
+    try:
+        obj = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise AutoBalanceError(f"failed to read logic-depth report: {p}") from e
+    return parse_logic_depth_report(obj)
+
+
+def parse_logic_depth_report(obj: Any) -> LogicDepthReport:
+    if not isinstance(obj, Mapping):
+        raise AutoBalanceError("logic-depth report must be a JSON object")
+    if int(obj.get("version", 1)) != 1:
+        raise AutoBalanceError(
+            f"unsupported logic-depth report version: {obj.get('version')}"
+        )
+    try:
+        limit = int(obj["logic_depth_limit"])
+        paths: list[DepthPath] = []
+        for f in obj.get("functions", []):
+            for p in f.get("paths", []):
+                nodes = tuple(
+                    (str(n["name"]), int(n["depth"])) for n in p.get("nodes", [])
+                )
+                paths.append(
+                    DepthPath(
+                        function=str(f.get("name", "")),
+                        endpoint=str(p.get("endpoint", p.get("endpoint_op", ""))),
+                        depth=int(p["depth"]),
+                        nodes=nodes,
+                    )
+                )
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise AutoBalanceError(f"malformed logic-depth report: {e}") from e
+    return LogicDepthReport(limit=limit, paths=tuple(paths))
+
+
+def plan_path_cuts(
+    path: DepthPath, *, limit: int, cuttable: Iterable[str]
+) -> list[str]:
+    """Cut points splitting `path` into stages of at most `limit` levels.
+
+    Greedy from the path start: each cut is the deepest cuttable node that
+    keeps the current stage within `limit`. A register after a node restarts
+    the depth count there, so a stage spans `(prev cut depth, cut depth]`.
+    When no cuttable node lies in range, the first one past it is cut: that
+    stage stays over the limit, the rest of the path does not.
+    """
+    ok = set(cuttable)
+    cands = [(n, d) for n, d in path.nodes if n in ok]
+    cuts: list[str] = []
+    base = 0
+    last: tuple[str, int] | None = None
+    for name, d in [*cands, ("", path.depth)]:
+        if d - base > limit and last is not None:
+            cuts.append(last[0])
+            base = last[1]
+            last = None
+        if d - base > limit and name:
+            cuts.append(name)
+            base = d
+            continue
+        if name and d > base:
+            last = (name, d)
+    return cuts
+
+
+class BalancePlan:
+    """Retiming cuts for cycle-aware values, keyed by their JIT debug names.
+
+    Names come from `_Compiler._name_with_loc` (`x__<stem>__L<line>`), so a
+    cut applies to every value assigned at that source line (each loop
+    iteration included). The JIT and `CycleAwareSignal.named` ask
+    `cut_point(name)` for each cycle-aware value they name: the name is
+    recorded as cuttable and, when planned, the value is moved one cycle
+    later through `CycleAwareDomain.delay_to`. Consumers at other cycles are
+    re-aligned by the usual operand balancing.
+
+    State updates (`set`/`assign`/`<<=`) cannot be re-aligned: delaying a value
+    in a register's feedback loop changes what it computes (a counter cut at
+    its increment counts 0, 0, 1, 1, ...). The domain reports the named values
+    feeding each update through `feeds_state`; they are never cuttable, and a
+    cut already applied to one is dropped and listed in `refused`.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        cuts: Iterable[str] = (),
+        cuttable: Iterable[str] = (),
+        state_fed: Iterable[str] = (),
+    ) -> None:
+        # Names reaching a state update (this run and persisted ones).
+        self.state_fed: set[str] = set(state_fed)
+        self.cuts: set[str] = set(cuts) - self.state_fed
+        # Names seen on cycle-aware values (this run and persisted ones).
+        self.cuttable: set[str] = set(cuttable) - self.state_fed
+        self.applied: set[str] = set()
+        # Cuts applied this run before they turned out to feed a state update.
+        self.refused: set[str] = set()
+
+    def cut_point(self, name: str) -> bool:
+        if name in self.state_fed:
+            return False
+        self.cuttable.add(name)
+        if name in self.cuts:
+            self.applied.add(name)
+            return True
+        return False
+
+    def feeds_state(self, names: Iterable[str]) -> list[str]:
+        """Mark the cut points in `names` as reaching a state update.
+
+        Returns the cuts among them that were already applied (now refused).
+        """
+        refused: list[str] = []
+        for name in names:
+            if name not in self.cuttable:
+                continue
+            self.state_fed.add(name)
+            self.cuttable.discard(name)
+            self.cuts.discard(name)
+            if name in self.applied:
+                self.applied.discard(name)
+                self.refused.add(name)
+                refused.append(name)
+        return refused
+
+    def extend_from_report(self, report: LogicDepthReport) -> list[str]:
+        """Add cuts for the report's violating paths; returns the new ones."""
+        new: list[str] = []
+        for p in report.paths:
+            for c in plan_path_cuts(p, limit=report.limit, cuttable=self.cuttable):
+                if c not in self.cuts:
+                    self.cuts.add(c)
+                    new.append(c)
+        return new
+
+    def key(self) -> list[str]:
+        return sorted(self.cuts)
+
+    @classmethod
+    def load(cls, path: Path) -> BalancePlan:
+        p = Path(path)
+        if not p.is_file():
+            return cls()
+        try:
+            obj = json.loads(p.read_text(encoding="utf-8"))
+            if int(obj.get("version", 0)) != cls.FORMAT_VERSION:
+                return cls()
+            return cls(
+                cuts=map(str, obj.get("cuts", [])),
+                cuttable=map(str, obj.get("cuttable", [])),
+                state_fed=map(str, obj.get("state_fed", [])),
+            )
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        obj = {
+            "version": self.FORMAT_VERSION,
+            "cuts": sorted(self.cuts),
+            "cuttable": sorted(self.cuttable),
+            "state_fed": sorted(self.state_fed),
+        }
+        tmp = p.with_name(p.name + f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(obj, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, p)
+
+
+_ACTIVE_PLAN: BalancePlan | None = None
+
+
+def set_balance_plan(plan: BalancePlan | None) -> None:
+    global _ACTIVE_PLAN
+    _ACTIVE_PLAN = plan
+
+
+def balance_plan() -> BalancePlan | None:
+    """The process-wide auto-balance plan (None: auto-balance off)."""
+    return _ACTIVE_PLAN
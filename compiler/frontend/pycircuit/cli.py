@@ -17,12 +17,20 @@ from pathlib import Path
 from typing import Any
 
 from .api_contract import collect_local_python_graph, nearest_project_root, scan_file
+from .auto_balance import (
+    AutoBalanceError,
+    BalancePlan,
+    load_logic_depth_report,
+    set_balance_plan,
+)
 from .design import FRONTEND_CONTRACT, Design, DesignError, value_params_of
 from .diagnostics import render_diagnostic
 from .dsl import Module
 from .jit import JitError
 from .jit import compile as jit_compile
+from .jit_cache import const_result_cache
 from .packaged_toolchain import bundled_toolchain_root, tool_executable
+from .path_shortening import InstancePathTable, xxhash64_many
 from .probe import (
     ProbeError,
     TbProbes,
@@ -676,6 +684,12 @@ def _render_tb_cpp(
         for s in sigs:
             lines.append(f"      {json.dumps(s)},\n")
         lines.append("    };\n")
+        # Build-time probe ids (ProbeRegistry::hash64ForPath) let the registry
+        # resolve each signal without hashing the path at startup.
+        lines.append("    static constexpr std::uint64_t kEnabledSignalIds[] = {\n")
+        for sig_id in xxhash64_many((s.encode("utf-8") for s in sigs), seed=0):
+            lines.append(f"      0x{sig_id:016x}ull,\n")
+        lines.append("    };\n")
         lines.append("    // Per-signal observation points (Decision 0113 / 0140).\n")
         lines.append(
             f"    static constexpr std::array<std::string_view, {len(tick_sigs)}> kTickObsSignals = {{\n"
@@ -722,9 +736,12 @@ def _render_tb_cpp(
         )
         lines.append("    trace_probes.reserve(std::size(kEnabledSignals));\n")
         lines.append("    trace_sample_at.reserve(std::size(kEnabledSignals));\n")
-        lines.append("    for (auto p : kEnabledSignals) {\n")
         lines.append(
-            "      if (const auto *e = reg.findByPath(p)) { trace_probes.push_back(e); trace_sample_at.push_back(sampleAtForSignal(p)); }\n"
+            "    for (std::size_t i = 0; i < std::size(kEnabledSignals); ++i) {\n"
+        )
+        lines.append("      const std::string_view p = kEnabledSignals[i];\n")
+        lines.append(
+            "      if (const auto *e = reg.findByPath(p, kEnabledSignalIds[i])) { trace_probes.push_back(e); trace_sample_at.push_back(sampleAtForSignal(p)); }\n"
         )
         lines.append("    }\n")
         lines.append("    bin_trace.emplace();\n")
@@ -1583,8 +1600,9 @@ def _resolve_probe_outputs(
     manifest: Mapping[str, Any],
     probe_catalog_path: Path,
     out_dir: Path,
+    path_table: InstancePathTable | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any], Path]:
-    catalog = load_probe_catalog(probe_catalog_path)
+    catalog = load_probe_catalog(probe_catalog_path, path_table=path_table)
     params_by_symbol = _module_params_from_manifest(manifest)
     bases = _module_bases_from_manifest(manifest)
     explicit_plans = []
@@ -1705,6 +1723,26 @@ def _cmd_build(args: argparse.Namespace) -> int:
         "top_name": top_name,
         "frontend_contract": FRONTEND_CONTRACT,
     }
+
+    # Auto-balance: cuts accumulate in `auto_balance.json` from the
+    # logic-depth report of the previous build (written by pycc below).
+    balance_plan_path = out_dir / "auto_balance.json"
+    depth_report_path = out_dir / "logic_depth_report.json"
+    plan: BalancePlan | None = None
+    if getattr(args, "auto_balance", False):
+        plan = BalancePlan.load(balance_plan_path)
+        if depth_report_path.is_file():
+            try:
+                new_cuts = plan.extend_from_report(
+                    load_logic_depth_report(depth_report_path)
+                )
+            except AutoBalanceError as e:
+                raise SystemExit(f"auto-balance: {e}") from e
+            sys.stdout.write(
+                f"auto-balance: {len(new_cuts)} new cut(s) from {depth_report_path.name}\n"
+            )
+        set_balance_plan(plan)
+        jit_inputs["auto_balance_cuts"] = plan.key()
     jit_key = _canonical_hash(jit_inputs)
 
     manifest_path = out_dir / "project_manifest.json"
@@ -1736,12 +1774,46 @@ def _cmd_build(args: argparse.Namespace) -> int:
             cache_hit = False
 
     if not cache_hit:
+        # `@const` results persist across builds with other JIT params; they
+        # depend on the sources, not the params.
+        const_cache_path = out_dir / ".const_cache.json"
+        const_cache_stamp = _canonical_hash(
+            {
+                k: v
+                for k, v in jit_inputs.items()
+                if k not in {"jit_params_json", "top_name"}
+            }
+        )
+        const_result_cache().load(const_cache_path, stamp=const_cache_stamp)
         try:
             design_obj = _compile_entrypoint(
                 build, top_name=top_name, jit_params=jit_params
             )
+            if plan is not None and plan.refused:
+                # Those cuts were applied before their values reached a state
+                # update; the plan has dropped them, so compile again.
+                sys.stdout.write(
+                    "auto-balance: refused cut(s) feeding state updates: "
+                    f"{', '.join(sorted(plan.refused))}\n"
+                )
+                plan.refused.clear()
+                plan.applied.clear()
+                design_obj = _compile_entrypoint(
+                    build, top_name=top_name, jit_params=jit_params
+                )
+                jit_inputs["auto_balance_cuts"] = plan.key()
+                jit_key = _canonical_hash(jit_inputs)
         except (DesignError, JitError) as e:
             raise SystemExit(f"design compile failed: {e}") from e
+        try:
+            const_result_cache().save(const_cache_path, stamp=const_cache_stamp)
+        except OSError:
+            pass
+        if plan is not None:
+            plan.save(balance_plan_path)
+            sys.stdout.write(
+                f"auto-balance: cuts={len(plan.cuts)} applied={len(plan.applied)} cuttable={len(plan.cuttable)}\n"
+            )
         if not isinstance(design_obj, Design):
             raise SystemExit("internal error: expected Design from compile(...)")
         design = design_obj
@@ -1781,6 +1853,7 @@ def _cmd_build(args: argparse.Namespace) -> int:
         "hierarchy_policy": "strict",
         "target": target,
         "frontend_contract": FRONTEND_CONTRACT,
+        "auto_balance": plan is not None,
     }
     build_flags_hash = _canonical_hash(build_flags)
     same_flags = str(cache.get("build_flags_hash", "")) == build_flags_hash
@@ -1795,6 +1868,11 @@ def _cmd_build(args: argparse.Namespace) -> int:
     probe_unchanged = same_flags and old_hashes.get(design_key) == design_hash
     pycc_jobs: list[tuple[str, list[str]]] = []
     if not (probe_unchanged and probe_catalog_ready):
+        report_flags: list[str] = []
+        if plan is not None:
+            # Consumed into the plan above; pycc writes a fresh one.
+            depth_report_path.unlink(missing_ok=True)
+            report_flags = [f"--logic-depth-report={depth_report_path}"]
         pycc_jobs.append(
             (
                 "probe-catalog",
@@ -1806,22 +1884,34 @@ def _cmd_build(args: argparse.Namespace) -> int:
                     "--probe-manifest",
                     str(probe_catalog_path),
                     f"--logic-depth={logic_depth}",
+                    *report_flags,
                 ],
             )
         )
     if pycc_jobs:
-        with ProcessPoolExecutor(max_workers=jobs) as pool:
-            futs = {pool.submit(_run_backend_job, j): j[0] for j in pycc_jobs}
-            for fut in as_completed(futs):
-                _ = fut.result()
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futs = {pool.submit(_run_backend_job, j): j[0] for j in pycc_jobs}
+                for fut in as_completed(futs):
+                    _ = fut.result()
+        except RuntimeError as e:
+            if plan is not None and depth_report_path.is_file():
+                raise SystemExit(
+                    f"{e}\nauto-balance: logic-depth report written to {depth_report_path}; "
+                    "re-run `pycircuit build --auto-balance` to place pipeline registers"
+                ) from e
+            raise
         pycc_jobs = []
 
+    # Instance paths interned by the probe catalog are reused by the trace plan.
+    path_table = InstancePathTable()
     try:
         probe_manifest_obj, probe_section, probe_plan_path = _resolve_probe_outputs(
             mod=mod,
             manifest=manifest,
             probe_catalog_path=probe_catalog_path,
             out_dir=out_dir,
+            path_table=path_table,
         )
     except ProbeError as e:
         raise SystemExit(f"probe resolution failed: {e}") from e
@@ -1842,6 +1932,7 @@ def _cmd_build(args: argparse.Namespace) -> int:
                     module_paths=module_paths,
                     config=cfg,
                     probe_manifest=probe_manifest_obj,
+                    path_table=path_table,
                 )
             except TraceConfigError as e:
                 raise SystemExit(f"trace config error: {e}") from e
@@ -2258,6 +2349,12 @@ def main(argv: list[str] | None = None) -> int:
         default=32,
         help="Max combinational logic depth for pycc",
     )
+    build.add_argument(
+        "--auto-balance",
+        action="store_true",
+        help="Retime cycle-aware values at the cut points planned from the previous build's "
+        "logic-depth report (pycc --logic-depth-report); plan kept in <out-dir>/auto_balance.json.",
+    )
     build.add_argument(
         "--trace-config",
         default=None,
@@ -613,6 +613,7 @@ class DesignContext:
             "collection_count",
             "collection_instance_count",
             "module_family_collection_count",
+            "delay_flops_saved",
         ):
             struct_metrics[key] = int(runtime_metrics.get(key, 0))
         struct_metrics_json = json.dumps(struct_metrics, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
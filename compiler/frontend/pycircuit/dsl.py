@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 import json
 import re
-from typing import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 
 _IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
+def _ty_width(ty: str) -> int:
+    return int(ty[1:])
+
+
+def _to_signed(value: int, ty: str) -> int:
+    w = _ty_width(ty)
+    return value - (1 << w) if (value >> (w - 1)) & 1 else value
+
+
 @dataclass(frozen=True)
 class Signal:
     ref: str
@@ -27,6 +37,14 @@ class Module:
         self._indent_level = 1
         self._finalizers: list[Callable[[], None]] = []
         self._finalized = False
+        # Hash-cons tables for pure ops (`_pure`), one per indent level:
+        # op text -> (result, owning line list, line index, line).
+        self._cse_scopes: list[dict[str, tuple[Signal, list[str], int, str]]] = []
+        # `const()` results by ref, for build-time folding:
+        # ref -> (value, owning line list, line index, line).
+        self._const_values: dict[str, tuple[int, list[str], int, str]] = {}
+        # Buffers suspended by `capture_lines()`; their values stay visible.
+        self._outer_lines: list[list[str]] = []
         # Extra `func.func` attributes emitted by `emit_func_mlir()`.
         # Values are stored as MLIR attribute literals (e.g. `"foo"`).
         self._func_attrs: dict[str, str] = {}
@@ -71,9 +89,7 @@ class Module:
         """Return i1 where **1** means reset is asserted (same convention as ``Tb.reset`` / SV TB)."""
         if rst.ty != "!pyc.reset":
             raise TypeError("reset_active expects a !pyc.reset signal (use m.reset(...))")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.reset_active {rst.ref} : i1")
-        return Signal(ref=tmp, ty="i1")
+        return self._pure(f"pyc.reset_active {rst.ref} : i1", "i1")
 
     def i(self, width: int) -> str:
         if width <= 0:
@@ -93,124 +109,133 @@ class Module:
             raise ValueError("width must be > 0")
         # Represent negative literals in two's complement at the requested width.
         value = int(value) & ((1 << int(width)) - 1)
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.constant {value} : {ty}")
-        return Signal(ref=tmp, ty=ty)
+        emitted = self._next_tmp
+        sig = self._pure(f"pyc.constant {value} : {ty}", ty)
+        if self._next_tmp != emitted:
+            lines = self._lines
+            self._const_values[sig.ref] = (value, lines, len(lines) - 1, lines[-1])
+        return sig
 
     def add(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "add")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.add {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] + k[1], a.ty)
+        return self._pure(f"pyc.add {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def sub(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "sub")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.sub {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] - k[1], a.ty)
+        return self._pure(f"pyc.sub {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def mul(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "mul")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.mul {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] * k[1], a.ty)
+        return self._pure(f"pyc.mul {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def udiv(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "udiv")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.udiv {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        return self._pure(f"pyc.udiv {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def urem(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "urem")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.urem {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        return self._pure(f"pyc.urem {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def sdiv(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "sdiv")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.sdiv {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        return self._pure(f"pyc.sdiv {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def srem(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "srem")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.srem {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        return self._pure(f"pyc.srem {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def mux(self, sel: Signal, a: Signal, b: Signal) -> Signal:
         if sel.ty != "i1":
             raise TypeError("mux sel must be i1")
         self._require_same_ty(a, b, "mux")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.mux {sel.ref}, {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(sel)
+        if k is not None:
+            return a if k[0] else b
+        return self._pure(f"pyc.mux {sel.ref}, {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def and_(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "and")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.and {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] & k[1], a.ty)
+        return self._pure(f"pyc.and {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def or_(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "or")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.or {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] | k[1], a.ty)
+        return self._pure(f"pyc.or {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def xor(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "xor")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.xor {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(k[0] ^ k[1], a.ty)
+        return self._pure(f"pyc.xor {a.ref}, {b.ref} : {a.ty}", a.ty)
 
     def not_(self, a: Signal) -> Signal:
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.not {a.ref} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(~k[0], a.ty)
+        return self._pure(f"pyc.not {a.ref} : {a.ty}", a.ty)
 
     def eq(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "eq")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.eq {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty="i1")
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(int(k[0] == k[1]), "i1")
+        return self._pure(f"pyc.eq {a.ref}, {b.ref} : {a.ty}", "i1")
 
     def ult(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "ult")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.ult {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty="i1")
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(int(k[0] < k[1]), "i1")
+        return self._pure(f"pyc.ult {a.ref}, {b.ref} : {a.ty}", "i1")
 
     def slt(self, a: Signal, b: Signal) -> Signal:
         self._require_same_ty(a, b, "slt")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.slt {a.ref}, {b.ref} : {a.ty}")
-        return Signal(ref=tmp, ty="i1")
+        k = self._known(a, b)
+        if k is not None:
+            return self._folded(int(_to_signed(k[0], a.ty) < _to_signed(k[1], b.ty)), "i1")
+        return self._pure(f"pyc.slt {a.ref}, {b.ref} : {a.ty}", "i1")
 
     def trunc(self, a: Signal, *, width: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("trunc requires an integer input")
         out_ty = self.i(width)
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.trunc {a.ref} : {a.ty} -> {out_ty}")
-        return Signal(ref=tmp, ty=out_ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(k[0], out_ty)
+        return self._pure(f"pyc.trunc {a.ref} : {a.ty} -> {out_ty}", out_ty)
 
     def zext(self, a: Signal, *, width: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("zext requires an integer input")
         out_ty = self.i(width)
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.zext {a.ref} : {a.ty} -> {out_ty}")
-        return Signal(ref=tmp, ty=out_ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(k[0], out_ty)
+        return self._pure(f"pyc.zext {a.ref} : {a.ty} -> {out_ty}", out_ty)
 
     def sext(self, a: Signal, *, width: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("sext requires an integer input")
         out_ty = self.i(width)
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.sext {a.ref} : {a.ty} -> {out_ty}")
-        return Signal(ref=tmp, ty=out_ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(_to_signed(k[0], a.ty), out_ty)
+        return self._pure(f"pyc.sext {a.ref} : {a.ty} -> {out_ty}", out_ty)
 
     def extract(self, a: Signal, *, lsb: int, width: int) -> Signal:
         if not a.ty.startswith("i"):
@@ -218,57 +243,64 @@ class Module:
         if lsb < 0:
             raise ValueError("extract lsb must be >= 0")
         out_ty = self.i(width)
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.extract {a.ref} {{lsb = {int(lsb)}}} : {a.ty} -> {out_ty}")
-        return Signal(ref=tmp, ty=out_ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(k[0] >> int(lsb), out_ty)
+        return self._pure(f"pyc.extract {a.ref} {{lsb = {int(lsb)}}} : {a.ty} -> {out_ty}", out_ty)
 
     def shli(self, a: Signal, *, amount: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("shli requires an integer input")
         if amount < 0:
             raise ValueError("shli amount must be >= 0")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.shli {a.ref} {{amount = {int(amount)}}} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(k[0] << min(int(amount), _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.shli {a.ref} {{amount = {int(amount)}}} : {a.ty}", a.ty)
 
     def lshri(self, a: Signal, *, amount: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("lshri requires an integer input")
         if amount < 0:
             raise ValueError("lshri amount must be >= 0")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.lshri {a.ref} {{amount = {int(amount)}}} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(k[0] >> min(int(amount), _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.lshri {a.ref} {{amount = {int(amount)}}} : {a.ty}", a.ty)
 
     def ashri(self, a: Signal, *, amount: int) -> Signal:
         if not a.ty.startswith("i"):
             raise TypeError("ashri requires an integer input")
         if amount < 0:
             raise ValueError("ashri amount must be >= 0")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.ashri {a.ref} {{amount = {int(amount)}}} : {a.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a)
+        if k is not None:
+            return self._folded(_to_signed(k[0], a.ty) >> min(int(amount), _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.ashri {a.ref} {{amount = {int(amount)}}} : {a.ty}", a.ty)
 
     def shl(self, a: Signal, amount: Signal) -> Signal:
         if not a.ty.startswith("i") or not amount.ty.startswith("i"):
             raise TypeError("shl requires integer inputs")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.shl {a.ref}, {amount.ref} : {a.ty}, {amount.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, amount)
+        if k is not None:
+            return self._folded(k[0] << min(k[1], _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.shl {a.ref}, {amount.ref} : {a.ty}, {amount.ty}", a.ty)
 
     def lshr(self, a: Signal, amount: Signal) -> Signal:
         if not a.ty.startswith("i") or not amount.ty.startswith("i"):
             raise TypeError("lshr requires integer inputs")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.lshr {a.ref}, {amount.ref} : {a.ty}, {amount.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, amount)
+        if k is not None:
+            return self._folded(k[0] >> min(k[1], _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.lshr {a.ref}, {amount.ref} : {a.ty}, {amount.ty}", a.ty)
 
     def ashr(self, a: Signal, amount: Signal) -> Signal:
         if not a.ty.startswith("i") or not amount.ty.startswith("i"):
             raise TypeError("ashr requires integer inputs")
-        tmp = self._tmp()
-        self._emit(f"{tmp} = pyc.ashr {a.ref}, {amount.ref} : {a.ty}, {amount.ty}")
-        return Signal(ref=tmp, ty=a.ty)
+        k = self._known(a, amount)
+        if k is not None:
+            return self._folded(_to_signed(k[0], a.ty) >> min(k[1], _ty_width(a.ty)), a.ty)
+        return self._pure(f"pyc.ashr {a.ref}, {amount.ref} : {a.ty}, {amount.ty}", a.ty)
 
     def concat(self, *inputs: Signal) -> Signal:
         """Concatenate integer signals into a packed bus (MSB-first)."""
@@ -285,11 +317,15 @@ class Module:
 
         out_w = sum(w(s.ty) for s in inputs)
         out_ty = self.i(out_w)
-        tmp = self._tmp()
+        k = self._known(*inputs)
+        if k is not None:
+            value = 0
+            for s, v in zip(inputs, k, strict=True):
+                value = (value << w(s.ty)) | v
+            return self._folded(value, out_ty)
         op_list = ", ".join(s.ref for s in inputs)
         ty_list = ", ".join(s.ty for s in inputs)
-        self._emit(f"{tmp} = pyc.concat ({op_list}) : ({ty_list}) -> {out_ty}")
-        return Signal(ref=tmp, ty=out_ty)
+        return self._pure(f"pyc.concat ({op_list}) : ({ty_list}) -> {out_ty}", out_ty)
 
     def instance_op(
         self,
@@ -588,6 +624,20 @@ class Module:
         """Emit a raw line at the current indentation level (inside func body)."""
         self._emit(line)
 
+    @contextmanager
+    def capture_lines(self) -> Iterator[list[str]]:
+        """Redirect emission into a fresh line buffer, e.g. a region body that
+        is spliced into the enclosing buffer later."""
+        outer = self._lines
+        buf: list[str] = []
+        self._outer_lines.append(outer)
+        self._lines = buf
+        try:
+            yield buf
+        finally:
+            self._lines = outer
+            self._outer_lines.pop()
+
     def push_indent(self) -> None:
         self._indent_level += 1
 
@@ -595,11 +645,11 @@ class Module:
         if self._indent_level <= 1:
             raise RuntimeError("indent underflow")
         self._indent_level -= 1
+        # Values defined in the closed region are not visible to its siblings.
+        del self._cse_scopes[self._indent_level :]
 
     def index_const(self, value: int) -> Signal:
-        tmp = self._tmp()
-        self._emit(f"{tmp} = arith.constant {int(value)} : index")
-        return Signal(ref=tmp, ty="index")
+        return self._pure(f"arith.constant {int(value)} : index", "index")
 
     # --- emission ---
     def emit_func_mlir(self) -> str:
@@ -659,6 +709,69 @@ class Module:
     def _emit(self, line: str) -> None:
         self._lines.append(("  " * self._indent_level) + line)
 
+    def _known(self, *sigs: Signal) -> list[int] | None:
+        """Constant values of `sigs` (unsigned), or None unless all are known."""
+        vals = self._const_values
+        out: list[int] = []
+        for s in sigs:
+            hit = vals.get(s.ref)
+            if hit is None:
+                return None
+            v, owner, idx, line = hit
+            # Refs are reused after a rolled-back emission; check the def is live.
+            if idx >= len(owner) or owner[idx] is not line:
+                return None
+            out.append(v)
+        return out
+
+    def _folded(self, value: int, ty: str) -> Signal:
+        # Base `const` (`Circuit.const` returns a Wire); wraps like `pyc_bits`.
+        return Module.const(self, value, width=_ty_width(ty))
+
+    def _pure(self, op: str, ty: str) -> Signal:
+        """Emit `%tmp = <op>` for a side-effect-free op, or reuse an identical one."""
+        sig = self._cse_lookup(op)
+        if sig is not None:
+            return sig
+        tmp = self._tmp()
+        self._emit(f"{tmp} = {op}")
+        sig = Signal(ref=tmp, ty=ty)
+        self._cse_record(op, sig)
+        return sig
+
+    def _cse_scope_stack(self) -> list[dict[str, tuple[Signal, list[str], int, str]]]:
+        scopes = self._cse_scopes
+        depth = self._indent_level
+        if len(scopes) > depth:
+            del scopes[depth:]
+        while len(scopes) < depth:
+            scopes.append({})
+        return scopes
+
+    def _cse_lookup(self, key: str) -> Signal | None:
+        """Return the value recorded under `key` if it is still visible here.
+
+        A hit must still be at its recorded index in the current buffer or one
+        suspended by `capture_lines()`, at this or an enclosing indent level, so
+        values never leak out of a region, a discarded capture or a rolled-back
+        emission.
+        """
+        lines = self._lines
+        for scope in reversed(self._cse_scope_stack()):
+            hit = scope.get(key)
+            if hit is not None:
+                sig, owner, idx, line = hit
+                if owner is not lines and not any(owner is o for o in self._outer_lines):
+                    continue
+                if idx < len(owner) and owner[idx] is line:
+                    return sig
+        return None
+
+    def _cse_record(self, key: str, sig: Signal) -> None:
+        """Record `sig`, defined by the last emitted line, under `key`."""
+        lines = self._lines
+        self._cse_scope_stack()[-1][key] = (sig, lines, len(lines) - 1, lines[-1])
+
     @staticmethod
     def _require_same_ty(a: Signal, b: Signal, op: str) -> None:
         if a.ty != b.ty:
@@ -590,6 +590,8 @@ class Circuit(Module):
         self._struct_instance_count = 0
         self._struct_state_alloc_count = 0
         self._struct_collections: list[dict[str, Any]] = []
+        # Flops not re-instantiated thanks to shared v5 balancing delay lines.
+        self._struct_delay_flops_saved = 0
 
     @staticmethod
     def _struct_identity(payload: Any) -> str:
@@ -602,6 +604,9 @@ class Circuit(Module):
     def _record_struct_state_alloc(self) -> None:
         self._struct_state_alloc_count += 1
 
+    def _record_struct_delay_reuse(self, flops: int) -> None:
+        self._struct_delay_flops_saved += int(flops)
+
     def _record_struct_collection(self, meta: Mapping[str, Any]) -> None:
         self._struct_collections.append(dict(meta))
 
@@ -618,6 +623,7 @@ class Circuit(Module):
             "collection_count": int(len(self._struct_collections)),
             "collection_instance_count": int(collection_instance_count),
             "module_family_collection_count": int(module_family_collection_count),
+            "delay_flops_saved": int(self._struct_delay_flops_saved),
             "collections": list(self._struct_collections),
         }
 
@@ -1924,7 +1930,7 @@ class Circuit(Module):
         return RvQueue(self, name, clk=clk, rst=rst, width=width, depth=depth)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Vec:
     """A small fixed-length container of wires/regs for building pipelines."""
 
@@ -2017,6 +2023,158 @@ class Vec:
             lsb += w.width
         return Vec(tuple(reversed(parts_rev)))
 
+    # --- bulk ops: one wide op, or one balanced tree, per call ---
+    def _lanes(self, other: Union["Vec", Wire, Reg, int, LiteralValue]) -> tuple[Wire, ...]:
+        ws = self.wires()
+        if isinstance(other, Vec):
+            os_ = other.wires()
+            if len(os_) != len(ws):
+                raise ValueError(f"Vec length mismatch: {len(ws)} vs {len(os_)}")
+        else:
+            os_ = tuple(other for _ in ws)  # type: ignore[misc]
+        out: list[Wire] = []
+        for w, o in zip(ws, os_, strict=True):
+            ow = w._as_wire(o, width=w.width)
+            if ow.width != w.width:
+                raise ValueError(f"Vec lane width mismatch: i{w.width} vs i{ow.width}")
+            out.append(ow)
+        return tuple(out)
+
+    def _bitwise(self, other: Union["Vec", Wire, Reg, int, LiteralValue], op: str) -> "Vec":
+        a = self.pack()
+        b = Vec(self._lanes(other)).pack()
+        return self.unpack(getattr(a, op)(b))
+
+    def __and__(self, other: Union["Vec", Wire, Reg, int, LiteralValue]) -> "Vec":
+        """Lane-wise AND as one wide `and` over the packed lanes."""
+        return self._bitwise(other, "__and__")
+
+    def __or__(self, other: Union["Vec", Wire, Reg, int, LiteralValue]) -> "Vec":
+        """Lane-wise OR as one wide `or` over the packed lanes."""
+        return self._bitwise(other, "__or__")
+
+    def __xor__(self, other: Union["Vec", Wire, Reg, int, LiteralValue]) -> "Vec":
+        """Lane-wise XOR as one wide `xor` over the packed lanes."""
+        return self._bitwise(other, "__xor__")
+
+    def where(self, sel: Union[Wire, Reg, "Vec"], other: Union["Vec", Wire, Reg, int, LiteralValue]) -> "Vec":
+        """`self if sel else other` per lane.
+
+        A scalar `sel` (i1) emits one wide mux over the packed lanes; a Vec of
+        i1 selectors muxes each lane with its own selector.
+        """
+        lanes = self._lanes(other)
+        if isinstance(sel, Vec):
+            sels = sel.wires()
+            if len(sels) != len(lanes):
+                raise ValueError(f"Vec length mismatch: {len(sels)} selectors for {len(lanes)} lanes")
+            return Vec(tuple(s._select_internal(w, o) for s, w, o in zip(sels, self.wires(), lanes, strict=True)))
+        s = sel if isinstance(sel, Wire) else sel.q
+        return self.unpack(s._select_internal(self.pack(), Vec(lanes).pack()))
+
+    def __eq__(self, other: object) -> "Vec":  # type: ignore[override]
+        """Lane-wise equality against a Vec or a broadcast scalar; a Vec of i1."""
+        if not isinstance(other, (Vec, Wire, Reg, int, LiteralValue)):
+            return NotImplemented
+        return Vec(tuple(w == o for w, o in zip(self.wires(), self._lanes(other), strict=True)))
+
+    def __ne__(self, other: object) -> "Vec":  # type: ignore[override]
+        if not isinstance(other, (Vec, Wire, Reg, int, LiteralValue)):
+            return NotImplemented
+        return Vec(tuple(w != o for w, o in zip(self.wires(), self._lanes(other), strict=True)))
+
+    def _is_bits(self) -> bool:
+        return all(w.width == 1 for w in self.wires())
+
+    @staticmethod
+    def _tree(items: list[Any], combine: Any) -> Any:
+        # Pairwise reduction: depth ceil(log2(n)).
+        while len(items) > 1:
+            nxt = [combine(items[i], items[i + 1]) for i in range(0, len(items) - 1, 2)]
+            if len(items) % 2:
+                nxt.append(items[-1])
+            items = nxt
+        return items[0]
+
+    def or_reduce(self) -> Wire:
+        """OR of all lanes (lane width); a Vec of i1 reduces as `pack() != 0`."""
+        if self._is_bits():
+            return self.pack() != 0
+        return self._tree(list(self.wires()), lambda a, b: a | b)
+
+    def and_reduce(self) -> Wire:
+        """AND of all lanes (lane width); a Vec of i1 reduces as `pack() == ~0`."""
+        if self._is_bits():
+            return self.pack() == (1 << len(self)) - 1
+        return self._tree(list(self.wires()), lambda a, b: a & b)
+
+    def popcount(self) -> Wire:
+        """Number of set lanes of a Vec of i1, as an adder tree (width `len(self).bit_length()`)."""
+        if not self._is_bits():
+            raise TypeError("popcount requires a Vec of i1 lanes")
+
+        def add(a: Wire, b: Wire) -> Wire:
+            w = max(a.width, b.width) + 1
+            return a._zext(width=w) + b._zext(width=w)
+
+        out_w = len(self).bit_length()
+        total = self._tree(list(self.wires()), add)
+        if total.width < out_w:
+            return total._zext(width=out_w)
+        return total._trunc(width=out_w) if total.width > out_w else total
+
+    def _padded_pow2(self, fill: int) -> tuple[list[Wire], int]:
+        ws = list(self.wires())
+        bits = max(1, (len(ws) - 1).bit_length())
+        m = ws[0].m
+        while len(ws) < (1 << bits):
+            ws.append(Wire(m, Module.const(m, fill, width=ws[0].width)))
+        return ws, bits
+
+    def priority_encode(self) -> tuple[Wire, Wire]:
+        """Lowest set lane of a Vec of i1 as `(valid, index)`, via a balanced tree.
+
+        `index` has `max(1, clog2(len(self)))` bits and is only meaningful when
+        `valid` is set.
+        """
+        if not self._is_bits():
+            raise TypeError("priority_encode requires a Vec of i1 lanes")
+        if len(self) == 1:
+            return self.wires()[0], Wire(self.m, Module.const(self.m, 0, width=1))
+        lanes, bits = self._padded_pow2(0)
+        level: list[tuple[Wire, Wire | None]] = [(v, None) for v in lanes]
+        while len(level) > 1:
+            nxt: list[tuple[Wire, Wire | None]] = []
+            for (lv, li), (rv, ri) in zip(level[0::2], level[1::2], strict=True):
+                hi = ~lv
+                if li is None or ri is None:
+                    idx = hi
+                else:
+                    idx = cat(hi, lv._select_internal(li, ri))
+                nxt.append((lv | rv, idx))
+            level = nxt
+        valid, index = level[0]
+        assert index is not None and index.width == bits
+        return valid, index
+
+    def read(self, index: Union[Wire, Reg]) -> Wire:
+        """Indexed read as a balanced mux tree on the index bits; out-of-range reads give 0."""
+        ws = self.wires()
+        if any(w.width != ws[0].width for w in ws):
+            raise ValueError("Vec.read requires lanes of equal width")
+        idx = index if isinstance(index, Wire) else index.q
+        lanes, bits = self._padded_pow2(0)
+        if idx.width < bits:
+            idx = idx._zext(width=bits)
+        level = lanes
+        for k in range(bits):
+            bit = idx[k]
+            level = [bit._select_internal(hi, lo) for lo, hi in zip(level[0::2], level[1::2], strict=True)]
+        out = level[0]
+        if idx.width > bits:
+            out = idx.ult(len(self))._select_internal(out, 0)
+        return out
+
     def regs_domain(
         self,
         domain: ClockDomain,
@@ -2069,6 +2227,13 @@ class Bundle:
         elems = tuple(self.fields.values())
         return Vec(elems).pack()
 
+    def where(self, sel: Union[Wire, Reg], other: "Bundle") -> "Bundle":
+        """`self if sel else other` as one wide mux over the packed fields."""
+        if list(self.fields) != list(other.fields):
+            raise ValueError("Bundle.where requires bundles with the same fields")
+        parts = Vec(tuple(self.fields.values())).where(sel, Vec(tuple(other.fields.values())))
+        return Bundle(dict(zip(self.fields, parts.elems, strict=True)))
+
     def unpack(self, packed: Wire) -> "Bundle":
         """Extract fields from a packed bus (inverse of pack())."""
         if not self.fields:
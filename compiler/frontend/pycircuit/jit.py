@@ -3,10 +3,13 @@ from __future__ import annotations
 import ast
 import copy
 import inspect
-from dataclasses import dataclass
+import re
+import weakref
+from dataclasses import dataclass, fields, is_dataclass
 from typing import Any, Hashable, Mapping, get_args, get_origin
 
 from .api_contract import removed_call_diagnostic
+from .auto_balance import balance_plan
 from .connectors import Connector, ConnectorBundle, is_connector, is_connector_bundle
 from .diagnostics import (
     Diagnostic,
@@ -24,6 +27,8 @@ from .hw import (
 )
 from .jit_cache import (
     assigned_names_for,
+    const_fn_fingerprint,
+    const_result_cache,
     get_function_meta,
     get_signature,
     get_structural_metrics,
@@ -185,7 +190,11 @@ def _wire_ifexpr(cond: Wire, true_v: Any, false_v: Any) -> Wire:
     return cond._select_internal(true_v, false_v)
 
 
-_TemplateKey = tuple[int, Hashable, Hashable]
+_TemplateKey = tuple[Hashable, Hashable, Hashable]
+
+# Identity-snapshot tags of per-module hardware objects; keys holding them
+# cannot be shared across modules.
+_TEMPLATE_HW_TAGS = frozenset({"circuit", "wire", "reg", "signal", "connector"})
 
 
 def _resolve_call_target(
@@ -286,6 +295,66 @@ def _template_identity_snapshot(v: Any) -> Hashable:
     )
 
 
+def _template_key_is_portable(key: Hashable) -> bool:
+    if isinstance(key, tuple):
+        if key and isinstance(key[0], str) and key[0] in _TEMPLATE_HW_TAGS:
+            return False
+        return all(_template_key_is_portable(x) for x in key)
+    return True
+
+
+_BUILDER_READS: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
+
+def _const_reads_builder(fn: Any, builder_arg: str) -> bool:
+    """Whether a `@const` body reads its builder argument other than `_ = m`.
+
+    Unavailable sources count as reading it.
+    """
+    try:
+        return _BUILDER_READS[fn]
+    except (KeyError, TypeError):
+        pass
+    try:
+        fdef = get_function_meta(fn).fdef
+    except Exception:  # noqa: BLE001
+        return True
+    discarded = {
+        id(node.value)
+        for node in ast.walk(fdef)
+        if isinstance(node, ast.Assign)
+        and len(node.targets) == 1
+        and isinstance(node.targets[0], ast.Name)
+        and node.targets[0].id == "_"
+    }
+    reads = any(
+        isinstance(node, ast.Name)
+        and node.id == builder_arg
+        and isinstance(node.ctx, ast.Load)
+        and id(node) not in discarded
+        for node in ast.walk(fdef)
+    )
+    try:
+        _BUILDER_READS[fn] = reads
+    except TypeError:
+        pass
+    return reads
+
+
+def _template_result_is_frozen(v: Any) -> bool:
+    # Immutable results are shared between cache hits without copying.
+    if v is None or isinstance(v, (bool, int, str, LiteralValue)):
+        return True
+    if isinstance(v, tuple):
+        return all(_template_result_is_frozen(x) for x in v)
+    if is_dataclass(v) and not isinstance(v, type):
+        params = getattr(type(v), "__dataclass_params__", None)
+        if params is None or not params.frozen:
+            return False
+        return all(_template_result_is_frozen(getattr(v, f.name)) for f in fields(v))
+    return False
+
+
 def _validate_template_return(v: Any, *, where: str = "return") -> None:
     rep = _template_meta_value(v)
     if rep is not None:
@@ -363,6 +432,150 @@ def _emit_scf_for_header(
     )
 
 
+# `range()` loops with at least this many trips are candidates for `scf.for`
+# emission (see `_Compiler._compile_uniform_for`).
+_SCF_FOR_MIN_TRIPS = 4
+
+# Ops `LowerSCFToPYCStaticPass` can clone out of an `scf.for` body: pure pyc
+# combinational ops, constants and nested `scf.if`.
+_SCF_FOR_BODY_OPS = frozenset(
+    {
+        "arith.constant",
+        "scf.if",
+        "pyc.constant",
+        "pyc.alias",
+        "pyc.add",
+        "pyc.sub",
+        "pyc.mul",
+        "pyc.udiv",
+        "pyc.sdiv",
+        "pyc.urem",
+        "pyc.srem",
+        "pyc.and",
+        "pyc.or",
+        "pyc.xor",
+        "pyc.not",
+        "pyc.eq",
+        "pyc.ult",
+        "pyc.slt",
+        "pyc.mux",
+        "pyc.zext",
+        "pyc.sext",
+        "pyc.trunc",
+        "pyc.extract",
+        "pyc.concat",
+        "pyc.shl",
+        "pyc.shli",
+        "pyc.lshr",
+        "pyc.lshri",
+        "pyc.ashr",
+        "pyc.ashri",
+    }
+)
+
+_SSA_TOKEN_RE = re.compile(r"%[A-Za-z0-9_$.\-#]+")
+
+
+def _scf_for_body_ok(stmts: list[ast.stmt]) -> bool:
+    """Body shape accepted for `scf.for` emission: name assignments and `if`."""
+
+    def names_only(t: ast.AST) -> bool:
+        if isinstance(t, ast.Name):
+            return True
+        if isinstance(t, (ast.Tuple, ast.List)):
+            return all(names_only(e) for e in t.elts)
+        return False
+
+    for s in stmts:
+        if isinstance(s, ast.Pass):
+            continue
+        if isinstance(s, ast.Assign):
+            if not all(names_only(t) for t in s.targets):
+                return False
+        elif isinstance(s, (ast.AugAssign, ast.AnnAssign)):
+            if not isinstance(s.target, ast.Name):
+                return False
+        elif isinstance(s, ast.If):
+            if not (_scf_for_body_ok(s.body) and _scf_for_body_ok(s.orelse)):
+                return False
+        else:
+            return False
+    return True
+
+
+def _canonical_ssa_lines(
+    lines: list[str], inputs: Mapping[str, str]
+) -> tuple[list[str], dict[str, str]]:
+    """Rename SSA values in `lines` by first definition (alpha-equivalence key).
+
+    `inputs` maps outer refs to placeholders; other outer refs stay literal.
+    Returns the renamed lines and the ref -> placeholder map of local defs.
+    """
+    local: dict[str, str] = {}
+
+    def rename(tok: re.Match[str]) -> str:
+        ref = tok.group(0)
+        return inputs.get(ref) or local.get(ref) or ref
+
+    out: list[str] = []
+    for line in lines:
+        text = line.strip()
+        lhs, sep, _ = text.partition(" = ")
+        if sep and lhs.startswith("%"):
+            for ref in _SSA_TOKEN_RE.findall(lhs):
+                local.setdefault(ref, f"$d{len(local)}")
+        out.append(_SSA_TOKEN_RE.sub(rename, text))
+    return out, local
+
+
+def _scf_for_line_ops_ok(lines: list[str]) -> bool:
+    for line in lines:
+        text = line.strip()
+        lhs, sep, rhs = text.partition(" = ")
+        if sep and lhs.startswith("%"):
+            op = rhs.split(" ", 1)[0]
+        else:
+            op = text.split(" ", 1)[0]
+            if op in {"}", "scf.yield"}:
+                continue
+        if op not in _SCF_FOR_BODY_OPS:
+            return False
+    return True
+
+
+def _loop_wire(v: Any) -> Wire | None:
+    """Integer wire behind a value that can be carried through `scf.for`."""
+    if type(v) is not Wire:
+        try:
+            from .v5 import CycleAwareSignal
+        except Exception:
+            return None
+        if type(v) is not CycleAwareSignal:
+            return None
+        v = v.wire
+        if type(v) is not Wire:
+            return None
+    if v.assignable or not v.ty.startswith("i"):
+        return None
+    return v
+
+
+def _loop_value_key(v: Any) -> tuple[Any, ...] | None:
+    w = _loop_wire(v)
+    if w is None:
+        return None
+    if type(v) is Wire:
+        return (Wire, w.ty, w.signed)
+    return (type(v), w.ty, w.signed, v.cycle, id(v.domain))
+
+
+def _loop_rebind(v: Any, w: Wire) -> Any:
+    """`v` with its wire replaced by `w` (see `_loop_wire`)."""
+    if type(v) is Wire:
+        return w
+    return type(v)(v.domain, w, v.cycle)
+
+
 class _Compiler:
     def __init__(
         self,
@@ -716,6 +929,17 @@ class _Compiler:
             ) from e
 
     def _alias_if_wire(self, v: Any, *, base_name: str, node: ast.AST) -> Any:
+        from .v5 import CycleAwareSignal
+
+        if isinstance(v, CycleAwareSignal) and balance_plan() is not None:
+            # Under auto-balance, named like wires so logic-depth reports can
+            # point at it; the plan may retime it (`CycleAwareDomain._auto_balance`).
+            n = self._scoped_name(self._name_with_loc(base_name, node))
+            w = v.wire
+            named = CycleAwareSignal(
+                v.domain, Wire(w.m, w.m.alias(w.sig, name=n), signed=w.signed), v.cycle
+            )
+            return v.domain._auto_balance(named, n)  # noqa: SLF001
         if isinstance(v, Wire):
             # `pyc.assign` destinations must be defined by `pyc.wire`. The JIT
             # compiler normally wraps assigned values in `pyc.alias` for stable
@@ -1129,6 +1353,10 @@ class _Compiler:
                     return lhs & rhs
                 if _is_cycleaware_value(rhs):
                     return rhs & lhs
+                if isinstance(lhs, Vec):
+                    return lhs & rhs
+                if isinstance(rhs, Vec):
+                    return rhs & lhs
                 if isinstance(lhs, (Wire, Reg)):
                     return lhs & rhs
                 if isinstance(rhs, (Wire, Reg)):
@@ -1139,6 +1367,10 @@ class _Compiler:
                     return lhs | rhs
                 if _is_cycleaware_value(rhs):
                     return rhs | lhs
+                if isinstance(lhs, Vec):
+                    return lhs | rhs
+                if isinstance(rhs, Vec):
+                    return rhs | lhs
                 if isinstance(lhs, (Wire, Reg)):
                     return lhs | rhs
                 if isinstance(rhs, (Wire, Reg)):
@@ -1149,6 +1381,10 @@ class _Compiler:
                     return lhs ^ rhs
                 if _is_cycleaware_value(rhs):
                     return rhs ^ lhs
+                if isinstance(lhs, Vec):
+                    return lhs ^ rhs
+                if isinstance(rhs, Vec):
+                    return rhs ^ lhs
                 if isinstance(lhs, (Wire, Reg)):
                     return lhs ^ rhs
                 if isinstance(rhs, (Wire, Reg)):
@@ -1582,72 +1818,79 @@ class _Compiler:
         return None
 
     def _snapshot_template_purity_state(self) -> dict[str, Any]:
+        # Watermark, not a copy: module builder state only grows through the
+        # builder APIs (`_emit`/`_tmp`/`_arg`/`output`/`add_finalizer`), so
+        # lengths and the temp counter detect any emission in O(1). Debug
+        # exports are insertion-ordered and only added to, so they use a
+        # length watermark too. The small func-attr and scope tables are
+        # copied.
+        m = self.m
         snap: dict[str, Any] = {
-            "lines": list(self.m._lines),  # noqa: SLF001
-            "next_tmp": int(self.m._next_tmp),  # noqa: SLF001
-            "args": list(self.m._args),  # noqa: SLF001
-            "results": list(self.m._results),  # noqa: SLF001
-            "finalizers": list(getattr(self.m, "_finalizers", [])),  # noqa: SLF001
-            "indent_level": int(getattr(self.m, "_indent_level", 0)),  # noqa: SLF001
-            "func_attrs": dict(getattr(self.m, "_func_attrs", {})),  # noqa: SLF001
+            "lines_obj": m._lines,  # noqa: SLF001
+            "lines": len(m._lines),  # noqa: SLF001
+            "next_tmp": int(m._next_tmp),  # noqa: SLF001
+            "args": len(m._args),  # noqa: SLF001
+            "results": len(m._results),  # noqa: SLF001
+            "finalizers": len(getattr(m, "_finalizers", [])),  # noqa: SLF001
+            "indent_level": int(getattr(m, "_indent_level", 0)),  # noqa: SLF001
+            "func_attrs": dict(getattr(m, "_func_attrs", {})),  # noqa: SLF001
         }
-        if hasattr(self.m, "_scope_stack"):
-            snap["scope_stack"] = list(getattr(self.m, "_scope_stack"))  # noqa: SLF001
-        if hasattr(self.m, "_debug_exports"):
-            snap["debug_exports"] = dict(
-                getattr(self.m, "_debug_exports")
-            )  # noqa: SLF001
+        if hasattr(m, "_scope_stack"):
+            snap["scope_stack"] = list(getattr(m, "_scope_stack"))  # noqa: SLF001
+        if hasattr(m, "_debug_exports"):
+            snap["debug_exports_obj"] = m._debug_exports  # noqa: SLF001
+            snap["debug_exports"] = len(m._debug_exports)  # noqa: SLF001
         return snap
 
     def _restore_template_purity_state(self, snap: Mapping[str, Any]) -> None:
-        self.m._lines = list(snap["lines"])  # noqa: SLF001
-        self.m._next_tmp = int(snap["next_tmp"])  # noqa: SLF001
-        self.m._args = list(snap["args"])  # noqa: SLF001
-        self.m._results = list(snap["results"])  # noqa: SLF001
-        if hasattr(self.m, "_finalizers"):
-            self.m._finalizers = list(snap.get("finalizers", []))  # noqa: SLF001
-        if hasattr(self.m, "_indent_level"):
-            self.m._indent_level = int(snap.get("indent_level", 0))  # noqa: SLF001
-        if hasattr(self.m, "_func_attrs"):
-            self.m._func_attrs = dict(snap.get("func_attrs", {}))  # noqa: SLF001
-        if hasattr(self.m, "_scope_stack"):
-            self.m._scope_stack = list(snap.get("scope_stack", []))  # noqa: SLF001
-        if hasattr(self.m, "_debug_exports"):
-            self.m._debug_exports = dict(snap.get("debug_exports", {}))  # noqa: SLF001
+        # Error path only: drop whatever the @const call appended.
+        m = self.m
+        m._lines = snap["lines_obj"]  # noqa: SLF001
+        del m._lines[int(snap["lines"]) :]  # noqa: SLF001
+        m._next_tmp = int(snap["next_tmp"])  # noqa: SLF001
+        del m._args[int(snap["args"]) :]  # noqa: SLF001
+        del m._results[int(snap["results"]) :]  # noqa: SLF001
+        if hasattr(m, "_finalizers"):
+            del m._finalizers[int(snap.get("finalizers", 0)) :]  # noqa: SLF001
+        if hasattr(m, "_indent_level"):
+            m._indent_level = int(snap.get("indent_level", 0))  # noqa: SLF001
+        if hasattr(m, "_func_attrs"):
+            m._func_attrs = dict(snap.get("func_attrs", {}))  # noqa: SLF001
+        if hasattr(m, "_scope_stack"):
+            m._scope_stack = list(snap.get("scope_stack", []))  # noqa: SLF001
+        if "debug_exports_obj" in snap:
+            exports = snap["debug_exports_obj"]
+            for k in list(exports)[int(snap["debug_exports"]) :]:
+                del exports[k]
+            m._debug_exports = exports  # noqa: SLF001
 
     def _template_purity_mutations(self, snap: Mapping[str, Any]) -> list[str]:
+        m = self.m
         changed: list[str] = []
-        if list(self.m._lines) != list(snap["lines"]):  # noqa: SLF001
+        lines = m._lines  # noqa: SLF001
+        if lines is not snap["lines_obj"] or len(lines) != snap["lines"]:
             changed.append("_lines")
-        if int(self.m._next_tmp) != int(snap["next_tmp"]):  # noqa: SLF001
+        if int(m._next_tmp) != int(snap["next_tmp"]):  # noqa: SLF001
             changed.append("_next_tmp")
-        if list(self.m._args) != list(snap["args"]):  # noqa: SLF001
+        if len(m._args) != snap["args"]:  # noqa: SLF001
             changed.append("_args")
-        if list(self.m._results) != list(snap["results"]):  # noqa: SLF001
+        if len(m._results) != snap["results"]:  # noqa: SLF001
             changed.append("_results")
-        if list(getattr(self.m, "_finalizers", [])) != list(
-            snap.get("finalizers", [])
-        ):  # noqa: SLF001
+        finalizers = getattr(m, "_finalizers", [])
+        if len(finalizers) != snap.get("finalizers", 0):
             changed.append("_finalizers")
-        if int(getattr(self.m, "_indent_level", 0)) != int(
-            snap.get("indent_level", 0)
-        ):  # noqa: SLF001
+        indent_level = int(getattr(m, "_indent_level", 0))
+        if indent_level != int(snap.get("indent_level", 0)):
             changed.append("_indent_level")
-        if dict(getattr(self.m, "_func_attrs", {})) != dict(
-            snap.get("func_attrs", {})
-        ):  # noqa: SLF001
+        if dict(getattr(m, "_func_attrs", {})) != snap.get("func_attrs", {}):
             changed.append("_func_attrs")
-        if hasattr(self.m, "_scope_stack") and list(
-            getattr(self.m, "_scope_stack")
-        ) != list(
-            snap.get("scope_stack", [])
-        ):  # noqa: SLF001
+        scope_stack = getattr(m, "_scope_stack", None)
+        if scope_stack is not None and list(scope_stack) != snap.get("scope_stack", []):
             changed.append("_scope_stack")
-        if hasattr(self.m, "_debug_exports") and dict(
-            getattr(self.m, "_debug_exports")
-        ) != dict(
-            snap.get("debug_exports", {})
-        ):  # noqa: SLF001
+        if "debug_exports_obj" in snap and (
+            m._debug_exports is not snap["debug_exports_obj"]  # noqa: SLF001
+            or len(m._debug_exports) != snap["debug_exports"]  # noqa: SLF001
+        ):
             changed.append("_debug_exports")
         return changed
 
@@ -1674,12 +1917,36 @@ class _Compiler:
                 f"@const {fn_name!r} must be called with the current Circuit as first argument"
             )
 
-        args_key = tuple(_template_identity_snapshot(a) for a in args)
-        kwargs_key = tuple(
-            (str(k), _template_identity_snapshot(v)) for k, v in sorted(kwargs.items())
+        # A body that never reads the builder depends only on the other
+        # arguments: its results are shared across modules and specializations
+        # through the process-wide cache. Otherwise the builder's identity
+        # keys the result to this module (and keeps it out of that cache).
+        fingerprint = const_fn_fingerprint(fn)
+        builder_free = fingerprint is not None and not _const_reads_builder(
+            fn, builder_arg
+        )
+
+        def key_part(v: Any) -> Hashable:
+            if v is self.m and builder_free:
+                return ("builder",)
+            return _template_identity_snapshot(v)
+
+        args_key = tuple(key_part(a) for a in args)
+        kwargs_key = tuple((str(k), key_part(v)) for k, v in sorted(kwargs.items()))
+        shared = fingerprint is not None and _template_key_is_portable(
+            (args_key, kwargs_key)
+        )
+        cache_key: _TemplateKey = (
+            fingerprint if shared else id(fn),
+            ("args", args_key),
+            ("kwargs", kwargs_key),
         )
-        cache_key: _TemplateKey = (id(fn), ("args", args_key), ("kwargs", kwargs_key))
-        if cache_key in self._template_cache:
+        if shared:
+            hit = const_result_cache().get(cache_key)
+            if hit is not None:
+                value, frozen = hit
+                return value if frozen else copy.deepcopy(value)
+        elif cache_key in self._template_cache:
             return copy.deepcopy(self._template_cache[cache_key])
 
         snap = self._snapshot_template_purity_state()
@@ -1703,7 +1970,13 @@ class _Compiler:
             ) from call_err
 
         _validate_template_return(result)
-        self._template_cache[cache_key] = copy.deepcopy(result)
+        if shared:
+            frozen = _template_result_is_frozen(result)
+            const_result_cache().put(
+                cache_key, result if frozen else copy.deepcopy(result), frozen=frozen
+            )
+        else:
+            self._template_cache[cache_key] = copy.deepcopy(result)
         return result
 
     # ---- statement compilation ----
@@ -1879,13 +2152,8 @@ class _Compiler:
 
         def capture(fn: Any) -> list[str]:
             # Avoid slicing/copying the shared line buffer in hot dynamic-if paths.
-            saved_lines = self.m._lines  # noqa: SLF001
-            local_lines: list[str] = []
-            self.m._lines = local_lines  # noqa: SLF001
-            try:
+            with self.m.capture_lines() as local_lines:
                 fn()
-            finally:
-                self.m._lines = saved_lines  # noqa: SLF001
             return local_lines
 
         def value_ty(v: Any) -> str | None:
@@ -2140,11 +2408,12 @@ class _Compiler:
                 return
             raise JitError("for-loop target must be a name or tuple/list of names")
 
-        if (
+        is_range = (
             isinstance(node.iter, ast.Call)
             and isinstance(node.iter.func, ast.Name)
             and node.iter.func.id == "range"
-        ):
+        )
+        if is_range:
             args = node.iter.args
             if not (1 <= len(args) <= 3):
                 raise JitError("range() must have 1..3 arguments")
@@ -2177,9 +2446,24 @@ class _Compiler:
         saved = {n: self.env[n] for n in names if n in self.env}
         had = set(saved.keys())
 
-        for v in iter_vals:
-            bind_target(node.target, v)
-            self.compile_block(node.body)
+        uniform = (
+            is_range
+            and len(iter_vals) >= _SCF_FOR_MIN_TRIPS
+            and isinstance(node.target, ast.Name)
+            and not node.orelse
+            and _scf_for_body_ok(node.body)
+            and not any(
+                isinstance(n, ast.Name) and n.id == node.target.id
+                for s in node.body
+                for n in ast.walk(s)
+            )
+        )
+        if uniform:
+            self._compile_uniform_for(node, iter_vals)
+        else:
+            for v in iter_vals:
+                bind_target(node.target, v)
+                self.compile_block(node.body)
 
         for n in names:
             if n in had:
@@ -2187,6 +2471,143 @@ class _Compiler:
             else:
                 self.env.pop(n, None)
 
+    def _loop_side_state(self) -> tuple[int, ...]:
+        # Builder state outside `_lines` that a loop body must leave untouched
+        # to be emitted once as an `scf.for` region.
+        m = self.m
+        return (
+            len(m._args),  # noqa: SLF001
+            len(m._results),  # noqa: SLF001
+            len(getattr(m, "_finalizers", [])),  # noqa: SLF001
+            len(getattr(m, "_func_attrs", {})),  # noqa: SLF001
+            len(getattr(m, "_debug_exports", {})),  # noqa: SLF001
+            len(getattr(m, "_hardened_probe_table", {})),  # noqa: SLF001
+            len(getattr(m, "_hardened_layout_groups", [])),  # noqa: SLF001
+            int(getattr(m, "_struct_instance_count", 0)),  # noqa: SLF001
+            int(getattr(m, "_struct_state_alloc_count", 0)),  # noqa: SLF001
+            len(getattr(m, "_struct_collections", [])),  # noqa: SLF001
+            int(getattr(m, "_struct_delay_flops_saved", 0)),  # noqa: SLF001
+        )
+
+    def _compile_uniform_for(self, node: ast.For, iter_vals: list[Any]) -> None:
+        """Compile a `range()` loop as a peeled `scf.for` when iterations match.
+
+        The first two iterations are compiled into captured buffers. If the
+        second is alpha-equivalent to the first (same ops, with the loop-carried
+        wires as the only inputs that change) it becomes the body of an
+        `scf.for` over all but the last iteration, which is compiled normally so
+        names assigned in the loop keep their usual post-loop values. Otherwise
+        the captured iterations are emitted as-is and unrolling continues, which
+        is exactly the fully unrolled output.
+        """
+        m = self.m
+        target = node.target.id  # type: ignore[attr-defined]
+        assigned = sorted(_assigned_names(node.body))
+        pre = {n: self.env.get(n) for n in assigned}
+        carried = [n for n in assigned if _loop_wire(pre[n]) is not None]
+
+        def trial(v: Any) -> tuple[list[str], bool, dict[str, Any]]:
+            self.env[target] = v
+            side = self._loop_side_state()
+            with m.capture_lines() as local_lines:
+                self.compile_block(node.body)
+            after = {n: self.env.get(n) for n in assigned}
+            return local_lines, side == self._loop_side_state(), after
+
+        lines_a, pure_a, after_a = trial(iter_vals[0])
+        lines_b, pure_b, after_b = trial(iter_vals[1])
+
+        def uniform() -> bool:
+            if not (pure_a and pure_b and _scf_for_line_ops_ok(lines_a)):
+                return False
+            for n in carried:
+                key = _loop_value_key(pre[n])
+                if _loop_value_key(after_a[n]) != key:
+                    return False
+                if _loop_value_key(after_b[n]) != key:
+                    return False
+            in_a = {_loop_wire(pre[n]).ref: f"$in{i}" for i, n in enumerate(carried)}
+            in_b = {
+                _loop_wire(after_a[n]).ref: f"$in{i}" for i, n in enumerate(carried)
+            }
+            if len(in_a) != len(carried) or len(in_b) != len(carried):
+                return False
+            canon_a, defs_a = _canonical_ssa_lines(lines_a, in_a)
+            canon_b, defs_b = _canonical_ssa_lines(lines_b, in_b)
+            if canon_a != canon_b:
+                return False
+            if any(_loop_wire(after_a[n]).ref not in defs_a for n in carried):
+                return False
+            for n in assigned:
+                a, b = after_a[n], after_b[n]
+                wa, wb = _loop_wire(a), _loop_wire(b)
+                if wa is not None and wb is not None:
+                    if _loop_value_key(a) != _loop_value_key(b):
+                        return False
+                    if defs_a.get(wa.ref, wa.ref) != defs_b.get(wb.ref, wb.ref):
+                        return False
+                elif not (
+                    type(a) is type(b)
+                    and (a is None or isinstance(a, (bool, int, str)))
+                    and a == b
+                ):
+                    return False
+            return True
+
+        if not uniform():
+            m._lines.extend(lines_a)  # noqa: SLF001
+            m._lines.extend(lines_b)  # noqa: SLF001
+            for v in iter_vals[2:]:
+                self.env[target] = v
+                self.compile_block(node.body)
+            return
+
+        # Iterations 0..N-2 run in the loop (iteration 1's ops with the carried
+        # refs from iteration 0 replaced by block arguments); iteration 0's
+        # captured ops are dropped.
+        init = [_loop_wire(pre[n]) for n in carried]
+        outs = [_loop_wire(after_a[n]).ref for n in carried]
+        used = {tok for line in lines_b for tok in _SSA_TOKEN_RE.findall(line)}
+        if not any(ref in used for ref in outs):
+            # No iteration reads a carried value, so the (pure) loop only
+            # feeds results nothing uses: emit just the last iteration.
+            self.env[target] = iter_vals[-1]
+            self.compile_block(node.body)
+            return
+        lb = m.index_const(0)
+        ub = m.index_const(len(iter_vals) - 1)
+        step = m.index_const(1)
+        block_args = {ref: m._tmp() for ref in outs}  # noqa: SLF001
+        results = [m._tmp() for _ in carried]  # noqa: SLF001
+        _emit_scf_for_header(
+            m,
+            results,
+            m._tmp(),  # noqa: SLF001
+            lb.ref,
+            ub.ref,
+            step.ref,
+            [(block_args[ref], w) for ref, w in zip(outs, init)],
+            [w.ty for w in init],
+        )
+
+        def rebind(tok: re.Match[str]) -> str:
+            return block_args.get(tok.group(0), tok.group(0))
+
+        for line in lines_b:
+            m._lines.append("  " + _SSA_TOKEN_RE.sub(rebind, line))  # noqa: SLF001
+        m.push_indent()
+        try:
+            _emit_scf_yield(m, [_loop_wire(after_b[n]) for n in carried])
+        finally:
+            m.pop_indent()
+        m.emit_line("}")
+        for n, w, ref in zip(carried, init, results):
+            res = Wire(m, Signal(ref=ref, ty=w.ty), signed=w.signed)
+            self.env[n] = _loop_rebind(pre[n], res)
+
+        self.env[target] = iter_vals[-1]
+        self.compile_block(node.body)
+
 
 def compile_module(
     fn: Any,
@@ -2208,6 +2629,8 @@ def compile_module(
     - `if` conditions: python bool or `i1` Wire
     - `for` loops: `for ... in range(const)` only, step must be > 0
     - Loop induction variable is currently not usable in expressions.
+    - `range()` loops whose iterations lower to identical ops are emitted as a
+      peeled `scf.for`; everything else is unrolled in the frontend.
     """
 
     try:
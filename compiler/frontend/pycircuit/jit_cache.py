@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import ast
+import atexit
+from collections import OrderedDict
 import hashlib
 import inspect
+import json
+import os
+import pickle
+import sys
 import textwrap
 import weakref
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Hashable, Iterator
 from pathlib import Path
 
 
@@ -99,6 +105,7 @@ _META_CACHE: weakref.WeakKeyDictionary[Any, FunctionMeta] = weakref.WeakKeyDicti
 _SIG_CACHE: weakref.WeakKeyDictionary[Any, inspect.Signature] = weakref.WeakKeyDictionary()
 _ASSIGNED_NAMES_CACHE: dict[tuple[int, ...], frozenset[str]] = {}
 _STRUCT_METRICS_CACHE: weakref.WeakKeyDictionary[Any, StructuralMetrics] = weakref.WeakKeyDictionary()
+_FINGERPRINT_CACHE: weakref.WeakKeyDictionary[Any, str | None] = weakref.WeakKeyDictionary()
 
 
 def _nonempty_source_loc(source: str) -> int:
@@ -272,30 +279,28 @@ def get_function_meta(fn: Any, *, fn_name: str | None = None) -> FunctionMeta:
     if cached is not None and (fn_name is None or cached.fdef.name == fn_name):
         return cached
 
+    name = fn_name if fn_name is not None else getattr(fn, "__name__", None)
+    if not isinstance(name, str) or not name:
+        raise RuntimeError(f"failed to infer function name for {fn!r}")
     synthetic = getattr(fn, "__pycircuit_jit_source__", None)
     if isinstance(synthetic, str) and synthetic.strip():
         source = textwrap.dedent(synthetic).strip() + "\n"
         start_line = int(getattr(fn, "__pycircuit_jit_start_line__", 1) or 1)
         tree = ast.parse(source)
     else:
+        meta = _FUNCTION_META_STORE.load(fn, name)
+        if meta is not None:
+            _META_CACHE[fn] = meta
+            return meta
         lines, start_line = inspect.getsourcelines(fn)
         source = textwrap.dedent("".join(lines))
         tree = ast.parse(source)
-    name = fn_name if fn_name is not None else getattr(fn, "__name__", None)
-    if not isinstance(name, str) or not name:
-        raise RuntimeError(f"failed to infer function name for {fn!r}")
     fdef = _find_function_def(tree, name)
 
     if isinstance(synthetic, str) and synthetic.strip():
         source_file = getattr(fn, "__pycircuit_jit_source_file__", None) or "<pycircuit_v5>"
     else:
         source_file = inspect.getsourcefile(fn) or inspect.getfile(fn)
-    source_stem = None
-    try:
-        if source_file:
-            source_stem = Path(source_file).stem
-    except Exception:
-        source_stem = None
 
     meta = FunctionMeta(
         fn=fn,
@@ -305,12 +310,201 @@ def get_function_meta(fn: Any, *, fn_name: str | None = None) -> FunctionMeta:
         tree=tree,
         fdef=fdef,
         source_file=source_file,
-        source_stem=source_stem,
+        source_stem=_source_stem(source_file),
     )
     _META_CACHE[fn] = meta
+    if not (isinstance(synthetic, str) and synthetic.strip()):
+        _FUNCTION_META_STORE.track(fn, name, meta)
     return meta
 
 
+def _source_stem(source_file: str | None) -> str | None:
+    try:
+        if source_file:
+            return Path(source_file).stem
+    except Exception:
+        return None
+    return None
+
+
+class FunctionMetaStore:
+    """On-disk cache of parsed function sources behind `get_function_meta`.
+
+    One pickle per function, named by a hash of its file (path, mtime, size),
+    qualname and the interpreter/frontend version. An entry holds the parsed
+    tree and `fdef`, plus the `StructuralMetrics` and `assigned_names_for`
+    sets computed for it, so later processes skip `inspect.getsource`,
+    `ast.parse` and the metric walks. Disabled until `set_dir()` (or the
+    `PYC_META_CACHE_DIR` environment variable) names a directory; `save()`,
+    also run at exit, writes the entries that are new or gained data.
+
+    Entries are unpickled on load, so the directory must only be writable by
+    trusted users; never point it at a shared or downloaded build tree.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path: Path | None = None
+        self._salt = ""
+        # key -> (fn, meta, persisted state)
+        self._tracked: dict[str, tuple[Any, FunctionMeta, tuple[bool, int] | None]] = {}
+        self._atexit = False
+        self.set_dir(path)
+
+    def set_dir(self, path: Path | str | None) -> None:
+        self.path = None if path is None else Path(path)
+        if self.path is not None and not self._atexit:
+            atexit.register(self._save_at_exit)
+            self._atexit = True
+        try:
+            st = os.stat(__file__)
+            self._salt = f"{sys.implementation.cache_tag}|{st.st_mtime_ns}|{st.st_size}"
+        except OSError:
+            self._salt = str(sys.implementation.cache_tag)
+
+    def clear(self) -> None:
+        self._tracked.clear()
+
+    def _key(self, fn: Any, name: str) -> str | None:
+        if self.path is None:
+            return None
+        code = getattr(inspect.unwrap(fn), "__code__", None)
+        if code is None:
+            return None
+        try:
+            st = os.stat(code.co_filename)
+        except (OSError, TypeError):
+            return None
+        ident = "|".join(
+            (
+                str(self.FORMAT_VERSION),
+                self._salt,
+                os.path.abspath(code.co_filename),
+                str(st.st_mtime_ns),
+                str(st.st_size),
+                str(getattr(fn, "__qualname__", "")),
+                name,
+            )
+        )
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:32]
+
+    def load(self, fn: Any, name: str) -> FunctionMeta | None:
+        key = self._key(fn, name)
+        if key is None:
+            return None
+        try:
+            with open(self.path / f"{key}.pkl", "rb") as f:  # type: ignore[operator]
+                entry = pickle.load(f)
+            meta = FunctionMeta(
+                fn=fn,
+                signature=get_signature(fn),
+                source=entry["source"],
+                start_line=int(entry["start_line"]),
+                tree=entry["tree"],
+                fdef=entry["fdef"],
+                source_file=entry["source_file"],
+                source_stem=_source_stem(entry["source_file"]),
+            )
+            metrics = entry["metrics"]
+            assigned = entry["assigned"]
+        except Exception:  # noqa: BLE001
+            return None
+        if metrics is not None:
+            _STRUCT_METRICS_CACHE[fn] = metrics
+        for paths, names in assigned:
+            _ASSIGNED_NAMES_CACHE[tuple(id(_node_at(meta.fdef, p)) for p in paths)] = names
+        self._tracked[key] = (fn, meta, (metrics is not None, len(assigned)))
+        return meta
+
+    def track(self, fn: Any, name: str, meta: FunctionMeta) -> None:
+        key = self._key(fn, name)
+        if key is not None:
+            self._tracked[key] = (fn, meta, None)
+
+    def _save_at_exit(self) -> None:
+        try:
+            self.save()
+        except OSError:
+            pass
+
+    def save(self) -> int:
+        if self.path is None or not self._tracked:
+            return 0
+        # Statement-list memo entries, by node path from `fdef`.
+        owner: dict[int, tuple[str, tuple[tuple[str, int], ...]]] = {}
+        for key, (_fn, meta, _state) in self._tracked.items():
+            for node_id, path in _node_paths(meta.fdef):
+                owner[node_id] = (key, path)
+        assigned: dict[str, list[tuple[tuple[Any, ...], frozenset[str]]]] = {}
+        for ids, names in _ASSIGNED_NAMES_CACHE.items():
+            locs = [owner.get(x) for x in ids]
+            if not locs or any(loc is None or loc[0] != locs[0][0] for loc in locs):
+                continue
+            assigned.setdefault(locs[0][0], []).append((tuple(loc[1] for loc in locs), names))
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        n = 0
+        for key, (fn, meta, state) in list(self._tracked.items()):
+            metrics = _STRUCT_METRICS_CACHE.get(fn)
+            sets = assigned.get(key, [])
+            new_state = (metrics is not None, len(sets))
+            if state is not None and new_state[0] <= state[0] and new_state[1] <= state[1]:
+                continue
+            entry = {
+                "source": meta.source,
+                "start_line": meta.start_line,
+                "tree": meta.tree,
+                "fdef": meta.fdef,
+                "source_file": meta.source_file,
+                "metrics": metrics,
+                "assigned": sets,
+            }
+            p = self.path / f"{key}.pkl"
+            tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp.replace(p)
+            except (OSError, pickle.PicklingError):
+                continue
+            self._tracked[key] = (fn, meta, new_state)
+            n += 1
+        return n
+
+
+def _node_paths(root: ast.AST) -> Iterator[tuple[int, tuple[tuple[str, int], ...]]]:
+    # (field, list index or -1) steps from `root` to every node below it.
+    stack: list[tuple[ast.AST, tuple[tuple[str, int], ...]]] = [(root, ())]
+    while stack:
+        node, path = stack.pop()
+        yield id(node), path
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                stack.append((value, path + ((field, -1),)))
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, ast.AST):
+                        stack.append((item, path + ((field, i),)))
+
+
+def _node_at(root: ast.AST, path: tuple[tuple[str, int], ...]) -> ast.AST:
+    node: Any = root
+    for field, i in path:
+        node = getattr(node, field)
+        if i >= 0:
+            node = node[i]
+    return node
+
+
+_FUNCTION_META_STORE = FunctionMetaStore(os.environ.get("PYC_META_CACHE_DIR") or None)
+
+
+def function_meta_store() -> FunctionMetaStore:
+    """The process-wide persistent `FunctionMeta` store (disabled by default)."""
+    return _FUNCTION_META_STORE
+
+
 def assigned_names_for(stmts: list[ast.stmt]) -> frozenset[str]:
     key = tuple(id(s) for s in stmts)
     cached = _ASSIGNED_NAMES_CACHE.get(key)
@@ -343,8 +537,183 @@ def assigned_names_for(stmts: list[ast.stmt]) -> frozenset[str]:
     return frozen
 
 
+def const_fn_fingerprint(fn: Any) -> str | None:
+    """Process-independent identity of a function, or None.
+
+    Keys the `@const` result cache and the v5 sub-module artifact cache.
+
+    Module, qualname and source text; None for closures (captured cells are
+    not part of the source) and functions whose source is unavailable.
+    """
+    try:
+        return _FINGERPRINT_CACHE[fn]
+    except (KeyError, TypeError):
+        pass
+    fp: str | None = None
+    if not getattr(fn, "__closure__", None):
+        try:
+            meta = get_function_meta(fn)
+        except Exception:  # noqa: BLE001
+            meta = None
+        if meta is not None:
+            h = hashlib.sha256()
+            for part in (getattr(fn, "__module__", ""), getattr(fn, "__qualname__", ""), meta.source):
+                h.update(str(part).encode("utf-8"))
+                h.update(b"\0")
+            fp = h.hexdigest()
+    try:
+        _FINGERPRINT_CACHE[fn] = fp
+    except TypeError:
+        pass
+    return fp
+
+
+class ConstResultCache:
+    """Process-wide LRU of `@const` results keyed by function fingerprint + args.
+
+    `frozen` entries (only immutable values) are returned as-is on a hit;
+    others are deep-copied by the caller. Entries made of JSON-encodable
+    values can be persisted with `save()` / `load()`; a `stamp` (hash of the
+    inputs the results depend on) guards against stale files.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = int(max_entries)
+        self._entries: OrderedDict[Hashable, tuple[Any, bool]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[Any, bool] | None:
+        hit = self._entries.get(key)
+        if hit is not None:
+            self._entries.move_to_end(key)
+        return hit
+
+    def put(self, key: Hashable, value: Any, *, frozen: bool) -> None:
+        self._entries[key] = (value, bool(frozen))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def save(self, path: Path, *, stamp: str) -> int:
+        entries: list[list[Any]] = []
+        for key, (value, _frozen) in self._entries.items():
+            k = _encode_persisted(key)
+            v = _encode_persisted(value)
+            if k is not None and v is not None:
+                entries.append([k, v])
+        payload = {"version": self.FORMAT_VERSION, "stamp": str(stamp), "entries": entries}
+        p = Path(path)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+        tmp.replace(p)
+        return len(entries)
+
+    def load(self, path: Path, *, stamp: str) -> int:
+        try:
+            payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(payload, dict):
+            return 0
+        if payload.get("version") != self.FORMAT_VERSION or payload.get("stamp") != str(stamp):
+            return 0
+        n = 0
+        for item in payload.get("entries", []):
+            try:
+                k, v = item
+                key = _decode_persisted(k)
+                value = _decode_persisted(v)
+            except (TypeError, ValueError, KeyError):
+                continue
+            self.put(key, value, frozen=_is_frozen_plain(value))
+            n += 1
+        return n
+
+
+_NO_ENCODING = object()
+
+
+def _encode_persisted(v: Any) -> Any:
+    out = _encode_persisted_rec(v)
+    return None if out is _NO_ENCODING else out
+
+
+def _encode_persisted_rec(v: Any) -> Any:
+    # Type-tagged JSON for plain values; anything else is not persisted.
+    if v is None or isinstance(v, (bool, str)):
+        return v
+    if type(v) is int:
+        return {"i": str(v)}
+    if isinstance(v, (tuple, list)):
+        items = [_encode_persisted_rec(x) for x in v]
+        if any(x is _NO_ENCODING for x in items):
+            return _NO_ENCODING
+        return {"t" if isinstance(v, tuple) else "l": items}
+    if isinstance(v, dict):
+        kv = [[_encode_persisted_rec(k), _encode_persisted_rec(x)] for k, x in v.items()]
+        if any(a is _NO_ENCODING or b is _NO_ENCODING for a, b in kv):
+            return _NO_ENCODING
+        return {"d": kv}
+    return _NO_ENCODING
+
+
+def _decode_persisted(v: Any) -> Any:
+    if v is None or isinstance(v, (bool, str)):
+        return v
+    if not isinstance(v, dict) or len(v) != 1:
+        raise ValueError("malformed persisted @const value")
+    (tag, body), = v.items()
+    if tag == "i":
+        return int(body)
+    if tag == "t":
+        return tuple(_decode_persisted(x) for x in body)
+    if tag == "l":
+        return [_decode_persisted(x) for x in body]
+    if tag == "d":
+        return {_decode_persisted(k): _decode_persisted(x) for k, x in body}
+    raise ValueError(f"unknown persisted @const tag {tag!r}")
+
+
+def _is_frozen_plain(v: Any) -> bool:
+    if v is None or isinstance(v, (bool, int, str)):
+        return True
+    if isinstance(v, tuple):
+        return all(_is_frozen_plain(x) for x in v)
+    return False
+
+
+_CONST_RESULTS = ConstResultCache()
+_MODULE_ARTIFACTS = ConstResultCache(max_entries=1024)
+
+
+def const_result_cache() -> ConstResultCache:
+    """The process-wide `@const` result cache used by the JIT."""
+    return _CONST_RESULTS
+
+
+def module_artifact_cache() -> ConstResultCache:
+    """The process-wide cache of emitted v5 hierarchical sub-modules.
+
+    Values are plain tuples (`func.func` text, ports, output structure) keyed
+    by source fingerprint and canonical kwargs, so they persist with the same
+    `save()` / `load()` as `@const` results.
+    """
+    return _MODULE_ARTIFACTS
+
+
 def clear_metadata_caches() -> None:
     _META_CACHE.clear()
     _SIG_CACHE.clear()
     _ASSIGNED_NAMES_CACHE.clear()
     _STRUCT_METRICS_CACHE.clear()
+    _FINGERPRINT_CACHE.clear()
+    _CONST_RESULTS.clear()
+    _MODULE_ARTIFACTS.clear()
+    _FUNCTION_META_STORE.clear()
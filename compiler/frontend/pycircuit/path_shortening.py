@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import struct
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator
 
 
 # Must match `runtime/cpp/pyc_probe_registry.hpp` (Decision 0017).
@@ -12,100 +15,117 @@ class InstancePathShorteningPolicy:
     keep_tail: int = 2
 
 
+_DEFAULT_POLICY = InstancePathShorteningPolicy()
+
 _MASK64 = 0xFFFFFFFFFFFFFFFF
 
+_PRIME1 = 11400714785074694791
+_PRIME2 = 14029467366897019727
+_PRIME3 = 1609587929392839161
+_PRIME4 = 9650029242287828579
+_PRIME5 = 2870177450012600261
+
+_U64X4 = struct.Struct("<4Q")
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+
+try:  # Optional accelerator (`pip install xxhash`); same algorithm, C speed.
+    from xxhash import xxh64_intdigest as _native_xxh64
+except ImportError:  # pragma: no cover - depends on the environment
+    _native_xxh64 = None
+
 
 def _rotl64(x: int, r: int) -> int:
     x &= _MASK64
     return ((x << r) & _MASK64) | (x >> (64 - r))
 
 
-def xxhash64(data: bytes, seed: int = 0) -> int:
-    # xxHash64 reference algorithm; must match the C++ runtime implementation
-    # used for probe_id and instance-path shortening.
-    prime1 = 11400714785074694791
-    prime2 = 14029467366897019727
-    prime3 = 1609587929392839161
-    prime4 = 9650029242287828579
-    prime5 = 2870177450012600261
-
-    def read64(i: int) -> int:
-        return int.from_bytes(data[i : i + 8], "little")
-
-    def read32(i: int) -> int:
-        return int.from_bytes(data[i : i + 4], "little")
-
-    def round_(acc: int, inp: int) -> int:
-        acc = (acc + (inp * prime2)) & _MASK64
-        acc = _rotl64(acc, 31)
-        acc = (acc * prime1) & _MASK64
-        return acc
-
-    def merge_round(acc: int, val: int) -> int:
-        val = round_(0, val)
-        acc ^= val
-        acc = (acc * prime1 + prime4) & _MASK64
-        return acc
+def _round(acc: int, inp: int) -> int:
+    acc = (acc + inp * _PRIME2) & _MASK64
+    acc = ((acc << 31) & _MASK64) | (acc >> 33)
+    return (acc * _PRIME1) & _MASK64
 
+
+def _xxhash64_py(data: bytes, seed: int = 0) -> int:
+    # xxHash64 reference algorithm (pure-Python fallback).
     n = len(data)
     p = 0
+    seed &= _MASK64
 
     if n >= 32:
-        v1 = (seed + prime1 + prime2) & _MASK64
-        v2 = (seed + prime2) & _MASK64
-        v3 = seed & _MASK64
-        v4 = (seed - prime1) & _MASK64
+        v1 = (seed + _PRIME1 + _PRIME2) & _MASK64
+        v2 = (seed + _PRIME2) & _MASK64
+        v3 = seed
+        v4 = (seed - _PRIME1) & _MASK64
 
         limit = n - 32
+        m, p1, p2 = _MASK64, _PRIME1, _PRIME2
         while p <= limit:
-            v1 = round_(v1, read64(p))
-            p += 8
-            v2 = round_(v2, read64(p))
-            p += 8
-            v3 = round_(v3, read64(p))
-            p += 8
-            v4 = round_(v4, read64(p))
-            p += 8
+            # `_round` inlined per lane: this loop dominates long inputs.
+            a, b, c, d = _U64X4.unpack_from(data, p)
+            v1 = (v1 + a * p2) & m
+            v1 = ((((v1 << 31) & m) | (v1 >> 33)) * p1) & m
+            v2 = (v2 + b * p2) & m
+            v2 = ((((v2 << 31) & m) | (v2 >> 33)) * p1) & m
+            v3 = (v3 + c * p2) & m
+            v3 = ((((v3 << 31) & m) | (v3 >> 33)) * p1) & m
+            v4 = (v4 + d * p2) & m
+            v4 = ((((v4 << 31) & m) | (v4 >> 33)) * p1) & m
+            p += 32
 
         h64 = (_rotl64(v1, 1) + _rotl64(v2, 7) + _rotl64(v3, 12) + _rotl64(v4, 18)) & _MASK64
-        h64 = merge_round(h64, v1)
-        h64 = merge_round(h64, v2)
-        h64 = merge_round(h64, v3)
-        h64 = merge_round(h64, v4)
+        for v in (v1, v2, v3, v4):
+            h64 = ((h64 ^ _round(0, v)) * _PRIME1 + _PRIME4) & _MASK64
     else:
-        h64 = (seed + prime5) & _MASK64
+        h64 = (seed + _PRIME5) & _MASK64
 
     h64 = (h64 + n) & _MASK64
 
     while p + 8 <= n:
-        k1 = read64(p)
-        k1 = (k1 * prime2) & _MASK64
-        k1 = _rotl64(k1, 31)
-        k1 = (k1 * prime1) & _MASK64
-        h64 ^= k1
-        h64 = (_rotl64(h64, 27) * prime1 + prime4) & _MASK64
+        h64 ^= _round(0, _U64.unpack_from(data, p)[0])
+        h64 = (_rotl64(h64, 27) * _PRIME1 + _PRIME4) & _MASK64
         p += 8
 
     if p + 4 <= n:
-        h64 ^= (read32(p) * prime1) & _MASK64
-        h64 = (_rotl64(h64, 23) * prime2 + prime3) & _MASK64
+        h64 ^= (_U32.unpack_from(data, p)[0] * _PRIME1) & _MASK64
+        h64 = (_rotl64(h64, 23) * _PRIME2 + _PRIME3) & _MASK64
         p += 4
 
     while p < n:
-        h64 ^= (data[p] * prime5) & _MASK64
-        h64 = (_rotl64(h64, 11) * prime1) & _MASK64
+        h64 ^= (data[p] * _PRIME5) & _MASK64
+        h64 = (_rotl64(h64, 11) * _PRIME1) & _MASK64
         p += 1
 
     # Avalanche.
     h64 ^= h64 >> 33
-    h64 = (h64 * prime2) & _MASK64
+    h64 = (h64 * _PRIME2) & _MASK64
     h64 ^= h64 >> 29
-    h64 = (h64 * prime3) & _MASK64
+    h64 = (h64 * _PRIME3) & _MASK64
     h64 ^= h64 >> 32
-    return h64 & _MASK64
+    return h64
 
 
-def shorten_instance_path(full_path: str, policy: InstancePathShorteningPolicy = InstancePathShorteningPolicy()) -> str:
+def xxhash64(data: bytes, seed: int = 0) -> int:
+    # xxHash64; must match the C++ runtime implementation
+    # (`pyc::cpp::xxhash64`) used for probe_id and instance-path shortening.
+    if _native_xxh64 is not None:
+        return _native_xxh64(data, seed & _MASK64)
+    return _xxhash64_py(data, seed)
+
+
+def xxhash64_many(items: Iterable[bytes], seed: int = 0) -> list[int]:
+    """`xxhash64` over a batch of byte strings, in input order."""
+    seed &= _MASK64
+    if _native_xxh64 is not None:
+        h = _native_xxh64
+        return [h(b, seed) for b in items]
+    return [_xxhash64_py(b, seed) for b in items]
+
+
+@lru_cache(maxsize=1 << 16)
+def shorten_instance_path(full_path: str, policy: InstancePathShorteningPolicy = _DEFAULT_POLICY) -> str:
+    # Memoized: trace plans and probe manifests shorten the same instance
+    # prefixes many times over.
     # Defensive: if a caller passes a canonical_path, only shorten the instance
     # prefix.
     full_path = str(full_path)
@@ -174,3 +194,84 @@ def shorten_instance_path(full_path: str, policy: InstancePathShorteningPolicy =
         return f"{segs[0]}.{hash_seg}"
     return hash_seg
 
+
+class InstancePathTable:
+    """Interned instance paths with their shortened form and parent.
+
+    Each full path gets a stable integer id; its parent is the path without
+    the last segment (-1 for a root). Ancestor expansion then walks parent ids
+    instead of re-splitting and re-shortening every prefix.
+    """
+
+    def __init__(self, policy: InstancePathShorteningPolicy = _DEFAULT_POLICY) -> None:
+        self.policy = policy
+        self._ids: dict[str, int] = {}
+        self._paths: list[str] = []
+        self._parents: list[int] = []
+        self._short: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _add(self, path: str, parent: int) -> int:
+        pid = len(self._paths)
+        self._ids[path] = pid
+        self._paths.append(path)
+        self._parents.append(parent)
+        self._short.append(None)
+        return pid
+
+    def intern(self, path: str) -> int:
+        """Id of `path` (interning it and all of its prefixes); -1 for an empty path."""
+        path = str(path)
+        pid = self._ids.get(path)
+        if pid is not None:
+            return pid
+        segs = [s for s in path.split(".") if s]
+        if not segs:
+            # "" and "." name no instance, like an empty prefix expansion.
+            return -1
+        if ".".join(segs) != path:
+            # Empty segments ("a..b", ".a") collapse like in prefix expansion.
+            pid = self.intern(".".join(segs))
+            self._ids[path] = pid
+            return pid
+        # Find the longest interned prefix, then add the missing tail.
+        i = len(segs) - 1
+        parent = -1
+        while i > 0:
+            parent = self._ids.get(".".join(segs[:i]), -1)
+            if parent >= 0:
+                break
+            i -= 1
+        for j in range(i + 1, len(segs) + 1):
+            parent = self._add(".".join(segs[:j]), parent)
+        return parent
+
+    def child(self, parent: int, seg: str) -> int:
+        """Id of `<path(parent)>.<seg>` (`seg` must be a single segment)."""
+        path = f"{self._paths[parent]}.{seg}"
+        pid = self._ids.get(path)
+        if pid is None:
+            pid = self._add(path, parent)
+        return pid
+
+    def path(self, pid: int) -> str:
+        return self._paths[pid]
+
+    def parent(self, pid: int) -> int:
+        return self._parents[pid]
+
+    def short(self, pid: int) -> str:
+        """`shorten_instance_path(path(pid))` under this table's policy."""
+        out = self._short[pid]
+        if out is None:
+            out = shorten_instance_path(self._paths[pid], self.policy)
+            self._short[pid] = out
+        return out
+
+    def ancestors(self, pid: int) -> Iterator[int]:
+        """`pid` and its ancestors, innermost first."""
+        while pid >= 0:
+            yield pid
+            pid = self._parents[pid]
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 import fnmatch
 import inspect
 import json
 from pathlib import Path
 from typing import Any, Iterable, Mapping
 
-from .path_shortening import InstancePathShorteningPolicy, xxhash64
+from .path_shortening import InstancePathShorteningPolicy, InstancePathTable, xxhash64, xxhash64_many
 
 
 class ProbeError(RuntimeError):
@@ -120,9 +121,37 @@ class ProbeCatalog:
     root_instance: str
     instances: tuple[ProbeCatalogInstance, ...]
     entries: tuple[ProbeCatalogEntry, ...]
+    # Instance-path index: entry positions sorted by (instance_path, position),
+    # with the parallel key list for bisect. Built once; read-only afterwards,
+    # so probe functions can be resolved concurrently against one catalog.
+    _by_instance: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _instance_keys: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # Interned instance paths; pass it on to `compute_trace_plan_from_artifacts`
+    # so the trace plan reuses them.
+    path_table: InstancePathTable = field(default_factory=InstancePathTable, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        order = sorted(range(len(self.entries)), key=lambda i: self.entries[i].instance_path)
+        object.__setattr__(self, "_by_instance", tuple(order))
+        object.__setattr__(self, "_instance_keys", tuple(self.entries[i].instance_path for i in order))
+        for inst in self.instances:
+            self.path_table.intern(inst.instance_path)
+
+    def entries_under(self, instance_path: str) -> tuple[ProbeCatalogEntry, ...]:
+        """Entries of `instance_path` and its descendants, in catalog order."""
+        keys = self._instance_keys
+        path = str(instance_path)
+        # `path` and `path.*` are two sorted runs; siblings like `path_x` can
+        # sort between them.
+        lo = bisect_left(keys, path)
+        hi = bisect_right(keys, path, lo)
+        sub_lo = bisect_left(keys, f"{path}.", hi)
+        sub_hi = bisect_left(keys, f"{path}/", sub_lo)
+        pos = sorted(self._by_instance[lo:hi] + self._by_instance[sub_lo:sub_hi])
+        return tuple(self.entries[i] for i in pos)
 
     @staticmethod
-    def from_dict(obj: Mapping[str, Any]) -> "ProbeCatalog":
+    def from_dict(obj: Mapping[str, Any], *, path_table: InstancePathTable | None = None) -> "ProbeCatalog":
         version = int(obj.get("version", 1))
         top = str(obj.get("top", "")).strip()
         root_instance = str(obj.get("root_instance", "dut")).strip() or "dut"
@@ -171,6 +200,7 @@ class ProbeCatalog:
             root_instance=root_instance,
             instances=tuple(instances),
             entries=tuple(entries),
+            path_table=InstancePathTable() if path_table is None else path_table,
         )
 
     def as_dict(self) -> dict[str, Any]:
@@ -186,7 +216,7 @@ class ProbeCatalog:
         }
 
 
-def load_probe_catalog(path: Path) -> ProbeCatalog:
+def load_probe_catalog(path: Path, *, path_table: InstancePathTable | None = None) -> ProbeCatalog:
     p = Path(path).resolve()
     if not p.is_file():
         raise ProbeError(f"probe catalog not found: {p}")
@@ -196,7 +226,7 @@ def load_probe_catalog(path: Path) -> ProbeCatalog:
         raise ProbeError(f"failed to parse probe catalog JSON: {p}") from e
     if not isinstance(obj, Mapping):
         raise ProbeError(f"invalid probe catalog JSON: {p}")
-    return ProbeCatalog.from_dict(obj)
+    return ProbeCatalog.from_dict(obj, path_table=path_table)
 
 
 @dataclass(frozen=True)
@@ -221,6 +251,7 @@ class ProbeView:
             ref = ProbeRef(relative_path=rel, source=entry)
             index[rel] = ref
         self._index = index
+        self._keys = tuple(sorted(index))
 
     def read(self, path: str) -> ProbeRef:
         key = str(path).strip()
@@ -235,11 +266,11 @@ class ProbeView:
         pat = str(pattern).strip()
         if not pat:
             raise ProbeError("probe glob pattern must be non-empty")
-        out = [ref for key, ref in sorted(self._index.items()) if fnmatch.fnmatchcase(key, pat)]
+        out = [self._index[key] for key in self._keys if fnmatch.fnmatchcase(key, pat)]
         return tuple(out)
 
     def paths(self) -> tuple[str, ...]:
-        return tuple(sorted(self._index.keys()))
+        return self._keys
 
 
 @dataclass(frozen=True)
@@ -436,12 +467,7 @@ def resolve_probe_function(
     for inst in catalog.instances:
         if inst.module not in target_symbols_tuple:
             continue
-        visible_entries = [
-            entry
-            for entry in catalog.entries
-            if entry.instance_path == inst.instance_path or entry.instance_path.startswith(f"{inst.instance_path}.")
-        ]
-        view = ProbeView(root_instance=inst.instance_path, entries=visible_entries)
+        view = ProbeView(root_instance=inst.instance_path, entries=catalog.entries_under(inst.instance_path))
         builder = ProbeBuilder(probe_name=probe_name, target_module=inst.module, target_instance=inst.instance_path)
         call_kwargs: dict[str, Any] = {}
         bound_params = dict(params_by_symbol.get(inst.module, {}))
@@ -524,14 +550,17 @@ def build_resolved_probe_manifest(
     entries.sort(key=lambda entry: str(entry.get("canonical_path", "")))
 
     used_probe_ids: set[int] = set()
-    for entry in entries:
-        canonical_path = str(entry.get("canonical_path", "")).strip()
+    canonical_paths = [str(entry.get("canonical_path", "")).strip() for entry in entries]
+    base_ids = xxhash64_many((path.encode("utf-8") for path in canonical_paths), seed=0)
+    for entry, canonical_path, base_id in zip(entries, canonical_paths, base_ids, strict=True):
         if not canonical_path:
             continue
         suffix = 0
         while True:
-            raw = canonical_path if suffix == 0 else f"{canonical_path}#{suffix}"
-            probe_id = int(xxhash64(raw.encode("utf-8"), seed=0))
+            if suffix == 0:
+                probe_id = base_id
+            else:
+                probe_id = int(xxhash64(f"{canonical_path}#{suffix}".encode(), seed=0))
             if probe_id not in used_probe_ids:
                 used_probe_ids.add(probe_id)
                 entry["probe_id"] = f"0x{probe_id:016x}"
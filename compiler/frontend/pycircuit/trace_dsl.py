@@ -6,10 +6,10 @@ import fnmatch
 import json
 import re
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping, Sequence
 
 from .design import Design
-from .path_shortening import shorten_instance_path
+from .path_shortening import InstancePathTable
 from .tb import _sanitize_id
 
 
@@ -103,6 +103,91 @@ def _match_hier_glob(pat: str, path: str) -> bool:
     return rec(0, 0)
 
 
+_DOUBLE_STAR = object()
+
+
+def _compile_glob_segment(seg: str) -> Any:
+    if seg == "**":
+        return _DOUBLE_STAR
+    if not any(c in seg for c in "*?["):
+        return seg.__eq__
+    return re.compile(fnmatch.translate(seg)).match
+
+
+class _HierGlobMatcher:
+    """Incremental `_match_hier_glob` over the instance globs of all rules.
+
+    Every glob becomes a segment-level NFA; a matcher state is the set of live
+    (glob, position) pairs, interned to an int. Transitions are memoized per
+    (state, segment), so walking the instance tree costs one dict lookup per
+    instance once sibling/cousin segment names repeat.
+    """
+
+    def __init__(self, rule_globs: Sequence[Sequence[str]]) -> None:
+        self._globs: list[tuple[list[Any], int]] = []
+        for ri, globs in enumerate(rule_globs):
+            for g in globs:
+                segs = [x for x in str(g).split(".") if x != ""]
+                self._globs.append(([_compile_glob_segment(x) for x in segs], ri))
+        self._ids: dict[frozenset[tuple[int, int]], int] = {}
+        self._states: list[frozenset[tuple[int, int]]] = []
+        self._rules: list[tuple[int, ...]] = []
+        self._trans: dict[tuple[int, str], int] = {}
+        self.root = self._intern({(gi, 0) for gi in range(len(self._globs))})
+
+    def _intern(self, live: set[tuple[int, int]]) -> int:
+        # Epsilon closure: "**" may match zero segments.
+        todo = list(live)
+        closed: set[tuple[int, int]] = set()
+        while todo:
+            gi, i = todo.pop()
+            if (gi, i) in closed:
+                continue
+            closed.add((gi, i))
+            segs = self._globs[gi][0]
+            if i < len(segs) and segs[i] is _DOUBLE_STAR:
+                todo.append((gi, i + 1))
+        key = frozenset(closed)
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = len(self._states)
+            self._ids[key] = sid
+            self._states.append(key)
+            self._rules.append(
+                tuple(sorted({self._globs[gi][1] for gi, i in key if i == len(self._globs[gi][0])}))
+            )
+        return sid
+
+    def step(self, state: int, seg: str) -> int:
+        key = (state, seg)
+        nxt = self._trans.get(key)
+        if nxt is None:
+            moved: set[tuple[int, int]] = set()
+            for gi, i in self._states[state]:
+                segs = self._globs[gi][0]
+                if i >= len(segs):
+                    continue
+                m = segs[i]
+                if m is _DOUBLE_STAR:
+                    moved.add((gi, i))
+                elif m(seg):
+                    moved.add((gi, i + 1))
+            nxt = self._intern(moved)
+            self._trans[key] = nxt
+        return nxt
+
+    def rules(self, state: int) -> tuple[int, ...]:
+        """Indices of rules with at least one glob accepting in `state`."""
+        return self._rules[state]
+
+    def match_path(self, path: str) -> tuple[int, ...]:
+        state = self.root
+        for seg in str(path).split("."):
+            if seg:
+                state = self.step(state, seg)
+        return self._rules[state]
+
+
 @dataclass(frozen=True)
 class TraceWindow:
     begin_cycle: int | None = None
@@ -385,103 +470,91 @@ def _probe_table_from_pyc_text(sym: str, pyc_text: str) -> dict[str, dict[str, A
     return {}
 
 
-def compute_trace_plan_from_artifacts(
+def _plan_from_instance_tree(
     *,
-    manifest: Mapping[str, Any],
-    module_paths: Mapping[str, Path],
+    top: str,
+    children_of: Callable[[str], list[tuple[str, str]] | None],
+    module_ports: Mapping[str, list[str]],
+    module_out_port_name: Mapping[str, Mapping[str, str]],
+    module_probes: Mapping[str, Mapping[str, dict[str, Any]]],
     config: TraceConfig,
-    probe_manifest: Mapping[str, Any] | None = None,
+    probe_manifest: Mapping[str, Any] | None,
+    path_table: InstancePathTable | None,
 ) -> TracePlan:
-    """Compute a TracePlan using already-emitted `.pyc` artifacts + project manifest.
+    """Evaluate `config` over the instance tree rooted at `top` in one pass.
 
-    This is the cache-hit path for incremental builds: avoid re-running JIT
-    compile when the frontend artifacts are unchanged.
+    `children_of(sym)` returns the sorted `(segment, callee)` children of a
+    module (None if its body is unavailable); it is called once per symbol.
+    Instance globs advance a shared segment automaton down the tree, and port
+    / probe selections are computed once per (module, rule). Instance paths
+    are interned in `path_table` (shared with the probe catalog when given).
     """
-
-    top = str(manifest.get("top", "")).strip()
-    modules = manifest.get("modules", None)
-    if not top or not isinstance(modules, list):
-        raise TraceConfigError("invalid project manifest: missing `top` or `modules` list")
-
-    module_ports: dict[str, list[str]] = {}
-    module_out_port_name: dict[str, dict[str, str]] = {}
-    module_probes: dict[str, dict[str, dict[str, Any]]] = {}
-
-    for m in modules:
-        if not isinstance(m, Mapping):
-            continue
-        sym = str(m.get("name", "")).strip()
-        if not sym:
-            continue
-        in_raw = [str(x).strip() for x in (m.get("arg_names") or [])]
-        out_raw = [str(x).strip() for x in (m.get("result_names") or [])]
-        all_names = _unique_canonical_names([*in_raw, *out_raw], ctx=f"module {sym} port")
-        module_ports[sym] = list(all_names)
-        module_out_port_name[sym] = {r: r for r in out_raw}
-
-        pyc_path = module_paths.get(sym)
-        probe_table: dict[str, dict[str, Any]] = {}
-        if isinstance(pyc_path, Path) and pyc_path.is_file():
-            try:
-                text = pyc_path.read_text(encoding="utf-8")
-            except OSError:
-                text = ""
-            probe_table = _probe_table_from_pyc_text(sym, text)
-        module_probes[sym] = probe_table
-
-    instances: list[tuple[str, str, str]] = []
-
-    def visit(sym: str, full_path: str, stack: tuple[str, ...]) -> None:
-        ipath = shorten_instance_path(full_path)
-        instances.append((ipath, sym, full_path))
-        if sym in stack:
-            return
-        pyc_path = module_paths.get(sym)
-        if not isinstance(pyc_path, Path) or not pyc_path.is_file():
-            return
-        try:
-            func_mlir = pyc_path.read_text(encoding="utf-8")
-        except OSError:
-            return
-        children = _instance_ops_in_func_mlir(func_mlir)
-        for raw_name, callee in sorted(children, key=lambda x: (_sanitize_id(x[0]), x[1])):
-            seg = _sanitize_id(raw_name)
-            child_full = f"{full_path}.{seg}"
-            visit(str(callee), child_full, stack=(*stack, sym))
-
-    visit(str(top), "dut", stack=())
+    table = InstancePathTable() if path_table is None else path_table
+    rules = config.rules
+    matcher = _HierGlobMatcher([r.instance_globs for r in rules])
+    child_cache: dict[str, list[tuple[str, str]] | None] = {}
+    selected: dict[tuple[str, int], tuple[list[str], list[tuple[str, str | None]]]] = {}
 
     enabled: set[str] = set()
-    enabled_full_paths: set[str] = set()
-    enabled_probe_instances: set[str] = set()
+    enabled_ids: set[int] = set()
     signal_obs: dict[str, str] = {}
-    for ipath, sym, full_path in instances:
-        ports = module_ports.get(sym, [])
-        probes = module_probes.get(sym, {})
 
-        for rule in config.rules:
-            if not any(_match_hier_glob(p, ipath) for p in rule.instance_globs):
-                continue
-            for port in ports:
-                if rule.port_globs and not any(fnmatch.fnmatchcase(port, pg) for pg in rule.port_globs):
-                    continue
-                if rule.port_globs:
+    def select(sym: str, ri: int) -> tuple[list[str], list[tuple[str, str | None]]]:
+        key = (sym, ri)
+        hit = selected.get(key)
+        if hit is not None:
+            return hit
+        rule = rules[ri]
+        ports: list[str] = []
+        if rule.port_globs:
+            ports = [p for p in module_ports.get(sym, []) if any(fnmatch.fnmatchcase(p, pg) for pg in rule.port_globs)]
+        probes: list[tuple[str, str | None]] = []
+        if rule.probes is not None:
+            out_names = module_out_port_name.get(sym, {})
+            for port, meta in module_probes.get(sym, {}).items():
+                if rule.probes.matches(meta):
+                    at = meta.get("at", None)
+                    obs = at.strip().lower() if isinstance(at, str) and at.strip() else None
+                    probes.append((out_names.get(port, str(port)), obs))
+        selected[key] = (ports, probes)
+        return ports, probes
+
+    active: set[str] = set()
+
+    def visit(sym: str, pid: int, state: int) -> None:
+        ipath = table.short(pid)
+        matched = matcher.rules(state) if ipath == table.path(pid) else matcher.match_path(ipath)
+        for ri in matched:
+            ports, probes = select(sym, ri)
+            if ports:
+                for port in ports:
                     enabled.add(f"{ipath}:{port}")
-                    enabled_full_paths.add(full_path)
-            if rule.probes is not None:
-                for port, meta in probes.items():
-                    if rule.probes.matches(meta):
-                        unique_out = module_out_port_name.get(sym, {}).get(port, str(port))
-                        sig = f"{ipath}:{unique_out}"
-                        enabled.add(sig)
-                        enabled_full_paths.add(full_path)
-                        at = meta.get("at", None)
-                        if isinstance(at, str) and at.strip():
-                            signal_obs[sig] = at.strip().lower()
+                enabled_ids.add(pid)
+            for unique_out, obs in probes:
+                sig = f"{ipath}:{unique_out}"
+                enabled.add(sig)
+                enabled_ids.add(pid)
+                if obs is not None:
+                    signal_obs[sig] = obs
+
+        if sym in active:
+            return
+        if sym not in child_cache:
+            child_cache[sym] = children_of(sym)
+        children = child_cache[sym]
+        if not children:
+            return
+        active.add(sym)
+        for seg, callee in children:
+            visit(callee, table.child(pid, seg), matcher.step(state, seg))
+        active.discard(sym)
+
+    visit(str(top), table.intern("dut"), matcher.step(matcher.root, "dut"))
 
     if probe_manifest is not None:
         raw_probes = probe_manifest.get("probes", [])
         if isinstance(raw_probes, list):
+            path_rules: dict[str, tuple[int, ...]] = {}
             for raw in raw_probes:
                 if not isinstance(raw, Mapping):
                     continue
@@ -489,31 +562,35 @@ def compute_trace_plan_from_artifacts(
                 instance_path = str(raw.get("instance_path", "")).strip()
                 if not canonical_path or not instance_path:
                     continue
+                matched = path_rules.get(instance_path)
+                if matched is None:
+                    matched = matcher.match_path(instance_path)
+                    path_rules[instance_path] = matched
                 meta: dict[str, Any] = {"at": raw.get("obs", None), "tags": raw.get("tags", {})}
-                for rule in config.rules:
+                for ri in matched:
+                    rule = rules[ri]
                     if rule.probes is None:
                         continue
-                    if not any(_match_hier_glob(p, instance_path) for p in rule.instance_globs):
-                        continue
                     if rule.probes.matches(meta):
                         enabled.add(canonical_path)
-                        enabled_probe_instances.add(instance_path)
+                        enabled_ids.add(table.intern(instance_path))
                         at = raw.get("obs", None)
                         if isinstance(at, str) and at.strip():
                             signal_obs[canonical_path] = at.strip().lower()
 
     enabled_signals = tuple(sorted(enabled))
-    signal_obs = {s: v for s, v in signal_obs.items() if s in enabled_signals}
+    signal_obs = {s: v for s, v in signal_obs.items() if s in enabled}
 
+    # Every ancestor of an enabled instance is enabled too. Walk parent ids;
+    # an ancestor already seen implies all of its own ancestors.
+    seen_ids: set[int] = set()
     enabled_instances_set: set[str] = set()
-    for full_path in enabled_full_paths:
-        parts = [p for p in str(full_path).split(".") if p]
-        for i in range(1, len(parts) + 1):
-            enabled_instances_set.add(shorten_instance_path(".".join(parts[:i])))
-    for instance_path in enabled_probe_instances:
-        parts = [p for p in str(instance_path).split(".") if p]
-        for i in range(1, len(parts) + 1):
-            enabled_instances_set.add(shorten_instance_path(".".join(parts[:i])))
+    for pid in enabled_ids:
+        for aid in table.ancestors(pid):
+            if aid in seen_ids:
+                break
+            seen_ids.add(aid)
+            enabled_instances_set.add(table.short(aid))
     enabled_instances = tuple(sorted(enabled_instances_set))
 
     return TracePlan(
@@ -526,6 +603,91 @@ def compute_trace_plan_from_artifacts(
     )
 
 
+def _sorted_children(func_mlir: str) -> list[tuple[str, str]]:
+    # Deterministic order independent of frontend call order.
+    children = _instance_ops_in_func_mlir(func_mlir)
+    return [
+        (_sanitize_id(raw_name), str(callee))
+        for raw_name, callee in sorted(children, key=lambda x: (_sanitize_id(x[0]), x[1]))
+    ]
+
+
+def compute_trace_plan_from_artifacts(
+    *,
+    manifest: Mapping[str, Any],
+    module_paths: Mapping[str, Path],
+    config: TraceConfig,
+    probe_manifest: Mapping[str, Any] | None = None,
+    path_table: InstancePathTable | None = None,
+) -> TracePlan:
+    """Compute a TracePlan using already-emitted `.pyc` artifacts + project manifest.
+
+    This is the cache-hit path for incremental builds: avoid re-running JIT
+    compile when the frontend artifacts are unchanged. Each `.pyc` file is
+    read once, however many instances its module has. Pass the probe
+    catalog's `path_table` to reuse its interned instance paths.
+    """
+
+    top = str(manifest.get("top", "")).strip()
+    modules = manifest.get("modules", None)
+    if not top or not isinstance(modules, list):
+        raise TraceConfigError("invalid project manifest: missing `top` or `modules` list")
+
+    module_ports: dict[str, list[str]] = {}
+    module_out_port_name: dict[str, dict[str, str]] = {}
+    module_probes: dict[str, dict[str, dict[str, Any]]] = {}
+    texts: dict[Path, str | None] = {}
+
+    def pyc_text(sym: str) -> str | None:
+        pyc_path = module_paths.get(sym)
+        if not isinstance(pyc_path, Path):
+            return None
+        if pyc_path not in texts:
+            text: str | None = None
+            if pyc_path.is_file():
+                try:
+                    text = pyc_path.read_text(encoding="utf-8")
+                except OSError:
+                    text = None
+            texts[pyc_path] = text
+        return texts[pyc_path]
+
+    for m in modules:
+        if not isinstance(m, Mapping):
+            continue
+        sym = str(m.get("name", "")).strip()
+        if not sym:
+            continue
+        in_raw = [str(x).strip() for x in (m.get("arg_names") or [])]
+        out_raw = [str(x).strip() for x in (m.get("result_names") or [])]
+        all_names = _unique_canonical_names([*in_raw, *out_raw], ctx=f"module {sym} port")
+        module_ports[sym] = list(all_names)
+        module_out_port_name[sym] = {r: r for r in out_raw}
+
+        pyc_path = module_paths.get(sym)
+        probe_table: dict[str, dict[str, Any]] = {}
+        if isinstance(pyc_path, Path) and pyc_path.is_file():
+            probe_table = _probe_table_from_pyc_text(sym, pyc_text(sym) or "")
+        module_probes[sym] = probe_table
+
+    def children_of(sym: str) -> list[tuple[str, str]] | None:
+        text = pyc_text(sym)
+        if text is None:
+            return None
+        return _sorted_children(text)
+
+    return _plan_from_instance_tree(
+        top=top,
+        children_of=children_of,
+        module_ports=module_ports,
+        module_out_port_name=module_out_port_name,
+        module_probes=module_probes,
+        config=config,
+        probe_manifest=probe_manifest,
+        path_table=path_table,
+    )
+
+
 def compute_trace_plan(*, design: Design, config: TraceConfig) -> TracePlan:
     module_ports: dict[str, list[str]] = {}
     module_out_port_name: dict[str, dict[str, str]] = {}
@@ -548,70 +710,20 @@ def compute_trace_plan(*, design: Design, config: TraceConfig) -> TracePlan:
                         probe_table[str(k)] = dict(v)
         module_probes[cm.sym_name] = probe_table
 
-    # Build a flat instance list from the top module by parsing `pyc.instance`.
-    instances: list[tuple[str, str, str]] = []
-
-    def visit(sym: str, full_path: str, stack: tuple[str, ...]) -> None:
-        ipath = shorten_instance_path(full_path)
-        instances.append((ipath, sym, full_path))
+    # The instance tree comes from the `pyc.instance` ops of each module body.
+    def children_of(sym: str) -> list[tuple[str, str]] | None:
         cm = design.lookup(sym)
         if cm is None:
-            return
-        if sym in stack:
-            return
-        children = _instance_ops_in_func_mlir(cm.mod.emit_func_mlir())
-        # Deterministic order independent of frontend call order.
-        for raw_name, callee in sorted(children, key=lambda x: (_sanitize_id(x[0]), x[1])):
-            seg = _sanitize_id(raw_name)
-            child_full = f"{full_path}.{seg}"
-            visit(str(callee), child_full, stack=(*stack, sym))
-
-    visit(str(design.top), "dut", stack=())
-
-    enabled: set[str] = set()
-    enabled_full_paths: set[str] = set()
-    signal_obs: dict[str, str] = {}
-    for ipath, sym, full_path in instances:
-        ports = module_ports.get(sym, [])
-        probes = module_probes.get(sym, {})
-
-        for rule in config.rules:
-            if not any(_match_hier_glob(p, ipath) for p in rule.instance_globs):
-                continue
-            # Port globs.
-            for port in ports:
-                if rule.port_globs and not any(fnmatch.fnmatchcase(port, pg) for pg in rule.port_globs):
-                    continue
-                if rule.port_globs:
-                    enabled.add(f"{ipath}:{port}")
-                    enabled_full_paths.add(full_path)
-            # Probe tag selectors.
-            if rule.probes is not None:
-                for port, meta in probes.items():
-                    if rule.probes.matches(meta):
-                        unique_out = module_out_port_name.get(sym, {}).get(port, str(port))
-                        sig = f"{ipath}:{unique_out}"
-                        enabled.add(sig)
-                        enabled_full_paths.add(full_path)
-                        at = meta.get("at", None)
-                        if isinstance(at, str) and at.strip():
-                            signal_obs[sig] = at.strip().lower()
-
-    enabled_signals = tuple(sorted(enabled))
-    signal_obs = {s: v for s, v in signal_obs.items() if s in enabled_signals}
-
-    enabled_instances_set: set[str] = set()
-    for full_path in enabled_full_paths:
-        parts = [p for p in str(full_path).split(".") if p]
-        for i in range(1, len(parts) + 1):
-            enabled_instances_set.add(shorten_instance_path(".".join(parts[:i])))
-    enabled_instances = tuple(sorted(enabled_instances_set))
-
-    return TracePlan(
-        version=1,
-        enabled_signals=enabled_signals,
-        enabled_instances=enabled_instances,
-        signal_obs=signal_obs,
-        window=config.window,
+            return None
+        return _sorted_children(cm.mod.emit_func_mlir())
+
+    return _plan_from_instance_tree(
+        top=str(design.top),
+        children_of=children_of,
+        module_ports=module_ports,
+        module_out_port_name=module_out_port_name,
+        module_probes=module_probes,
         config=config,
+        probe_manifest=None,
+        path_table=None,
     )
@@ -12,12 +12,15 @@ from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 import inspect
+import re
 import textwrap
 import threading
 from typing import Any, TypeVar, Union
 
+from .auto_balance import balance_plan
 from .dsl import Signal
 from .hw import Circuit, ClockDomain, Reg, Wire
+from .jit_cache import const_fn_fingerprint, module_artifact_cache
 from .literals import LiteralValue, infer_literal_width
 from .tb import Tb as _Tb
 
@@ -25,6 +28,9 @@ F = TypeVar("F", bound=Callable[..., Any])
 
 _tls = threading.local()
 
+_SSA_REF = re.compile(r"%[\w$.-]+")
+_PYC_NAME = re.compile(r'\{pyc\.name = "([^"]*)"\}')
+
 
 def _current_domain() -> "CycleAwareDomain | None":
     return getattr(_tls, "domain", None)
@@ -82,6 +88,16 @@ class CycleAwareDomain:
         self._hierarchical: bool = False
         self._design: Any | None = None
         self._sub_cache: dict[tuple[Any, ...], Any] = {}
+        # Module records of the hierarchical calls made through this domain.
+        self._sub_modules: list[tuple[Any, ...]] = []
+        # Auto-balance: Q refs of state registers, and a ref -> operand refs
+        # index over the module lines for `_fanin_names`.
+        self._state_refs: set[str] = set()
+        self._fanin: dict[str, list[str]] = {}
+        self._fanin_alias: dict[str, str] = {}
+        self._fanin_buf: list[str] | None = None
+        self._fanin_len = 0
+        self._fanin_last: str | None = None
 
     @property
     def clock_domain(self) -> ClockDomain:
@@ -153,6 +169,7 @@ class CycleAwareDomain:
         reg = self._m.out(
             full, domain=self._cd, width=int(width), init=int(reset_value)
         )
+        self._state_refs.add(reg.q.sig.ref)
         return StateSignal(self, reg, self._occurrence)
 
     def signal(
@@ -224,25 +241,19 @@ class CycleAwareDomain:
         prefix = kwargs.get("prefix", sub_name)
 
         cache_key = _hierarchical_cache_key(fn, kwargs)
-        if cache_key not in self._sub_cache:
-            canonical_kwargs = dict(kwargs)
-            canonical_kwargs["prefix"] = sub_name
-
-            sub_m = CycleAwareCircuit(sub_name)
-            sub_dom = sub_m.create_domain(self._name)
-            sub_dom._hierarchical = True
-            sub_dom._design = self._design
-            sub_dom._sub_cache = self._sub_cache
-
-            outs_dict = fn(sub_m, sub_dom, inputs=None, **canonical_kwargs)
-
-            out_entries = _record_output_structure(outs_dict, circuit=sub_m)
-
-            cm = _make_compiled_module(fn, sub_m, sub_name)
-            self._design.add(cm)
-            self._sub_cache[cache_key] = (sub_m, out_entries)
-
-        sub_m, out_entries = self._sub_cache[cache_key]
+        entry = self._sub_cache.get(cache_key)
+        if entry is None:
+            artifact_key = _sub_artifact_key(fn, kwargs, self._name)
+            entry = self._reload_sub(artifact_key)
+            if entry is None:
+                entry = self._compile_sub(fn, sub_name, kwargs)
+                if artifact_key is not None:
+                    module_artifact_cache().put(artifact_key, entry, frozen=True)
+            self._sub_cache[cache_key] = entry
+
+        modules, out_entries = entry
+        self._sub_modules.extend(modules)
+        arg_names, arg_types, _result_names, result_types = modules[-1][5:9]
 
         canonical_prefix = sub_name
         input_map: dict[str, Any] = {}
@@ -251,28 +262,28 @@ class CycleAwareDomain:
                 input_map[f"{canonical_prefix}_{k}"] = v
 
         input_sigs: list[Signal] = []
-        for port_name, port_sig in sub_m._args:
-            if port_sig.ty == "!pyc.clock":
+        for port_name, port_ty in zip(arg_names, arg_types, strict=True):
+            if port_ty == "!pyc.clock":
                 input_sigs.append(self._cd.clk)
-            elif port_sig.ty == "!pyc.reset":
+            elif port_ty == "!pyc.reset":
                 input_sigs.append(self._cd.rst)
             elif port_name in input_map:
                 w = _to_wire(input_map[port_name])
                 if (
-                    w.sig.ty != port_sig.ty
+                    w.sig.ty != port_ty
                     and w.sig.ty.startswith("i")
-                    and port_sig.ty.startswith("i")
+                    and port_ty.startswith("i")
                 ):
                     actual_w = int(w.sig.ty[1:])
-                    expect_w = int(port_sig.ty[1:])
+                    expect_w = int(port_ty[1:])
                     if actual_w < expect_w:
                         w = w._zext(width=expect_w)
                     else:
                         w = w._trunc(width=expect_w)
                 input_sigs.append(w.sig)
             else:
-                if port_sig.ty.startswith("i"):
-                    width = int(port_sig.ty[1:])
+                if port_ty.startswith("i"):
+                    width = int(port_ty[1:])
                 else:
                     width = 1
                 if port_name.startswith(canonical_prefix + "_"):
@@ -283,33 +294,187 @@ class CycleAwareDomain:
                 parent_wire = self._m.input(parent_port_name, width=width)
                 input_sigs.append(parent_wire.sig)
 
-        result_types = [sig.ty for _, sig in sub_m._results]
         out_sigs = self._m.instance_op(
             sub_name,
             *input_sigs,
-            result_types=result_types,
+            result_types=list(result_types),
             name=prefix,
         )
 
         out_wires = [Wire(self._m, s) for s in out_sigs]
         return _reconstruct_output_dict(out_entries, out_wires, self)
 
+    def _compile_sub(
+        self, fn: Callable[..., Any], sub_name: str, kwargs: dict[str, Any]
+    ) -> tuple[Any, ...]:
+        """Run *fn* into a fresh sub-circuit and add it to the design.
+
+        Returns ``(modules, out_entries)``: the module records this call needs
+        (nested sub-modules first, then its own) and the output structure.
+        """
+        canonical_kwargs = dict(kwargs)
+        canonical_kwargs["prefix"] = sub_name
+
+        sub_m = CycleAwareCircuit(sub_name)
+        sub_dom = sub_m.create_domain(self._name)
+        sub_dom._hierarchical = True
+        sub_dom._design = self._design
+        sub_dom._sub_cache = self._sub_cache
+
+        outs_dict = fn(sub_m, sub_dom, inputs=None, **canonical_kwargs)
+
+        out_entries = _record_output_structure(outs_dict, circuit=sub_m)
+
+        cm = _make_compiled_module(fn, sub_m, sub_name)
+        self._design.add(cm)
+
+        modules: dict[str, tuple[Any, ...]] = {}
+        for rec in sub_dom._sub_modules:
+            modules.setdefault(rec[2], rec)
+        modules.pop(sub_name, None)
+        modules[sub_name] = _module_record(fn, cm)
+        return (
+            tuple(modules.values()),
+            tuple(
+                (key, kind, count, tuple(cycles), tuple(indices))
+                for key, kind, count, cycles, indices in out_entries
+            ),
+        )
+
+    def _reload_sub(
+        self, artifact_key: tuple[Any, ...] | None
+    ) -> tuple[Any, ...] | None:
+        """Add a cached sub-module (and its nested ones) without running its function."""
+        if artifact_key is None:
+            return None
+        hit = module_artifact_cache().get(artifact_key)
+        if hit is None:
+            return None
+        entry = hit[0]
+        modules = entry[0]
+        fns = [_resolve_qualname(rec[0], rec[1]) for rec in modules]
+        if any(f is None for f in fns):
+            return None
+        for f, rec in zip(fns, modules, strict=True):
+            existing = self._design.lookup(rec[2])
+            if existing is not None and existing.mod.emit_func_mlir() == rec[3]:
+                continue
+            # A different module under the same symbol still fails in `add()`.
+            self._design.add(_reloaded_compiled_module(f, rec))
+        return entry
+
     def delay_to(self, w: Wire, *, from_cycle: int, to_cycle: int, width: int) -> Wire:
-        """Insert (to_cycle - from_cycle) register stages for automatic cycle balancing."""
+        """Insert (to_cycle - from_cycle) register stages for automatic cycle balancing.
+
+        Stages are shared per source wire and domain: every consumer taps one
+        delay line at its depth, and only missing stages are appended.
+        """
         if to_cycle <= from_cycle:
             return w
         d = to_cycle - from_cycle
+        m = self._m
+        base = (
+            f"v5.delay {self._cd.clk.ref} {self._cd.rst.ref} {w.sig.ref} i{int(width)}"
+        )
         cur: Wire = w
-        for _ in range(d):
+        have = 0
+        for k in range(d, 0, -1):
+            tap = m._cse_lookup(f"{base} {k}")  # noqa: SLF001
+            if tap is not None:
+                cur = Wire(m, tap)
+                have = k
+                break
+        m._record_struct_delay_reuse(have * int(width))  # noqa: SLF001
+        for k in range(have + 1, d + 1):
             self._delay_serial += 1
             nm = f"_v5_bal_{self._delay_serial}"
-            r = self._m.out(
-                self._m.scoped_name(nm), domain=self._cd, width=width, init=0
-            )
+            r = m.out(m.scoped_name(nm), domain=self._cd, width=width, init=0)
+            m._cse_record(f"{base} {k}", r.q.sig)  # noqa: SLF001
             r.set(cur)
             cur = r.q
         return cur
 
+    def _auto_balance(self, sig: "CycleAwareSignal", name: str) -> "CycleAwareSignal":
+        """Move `sig` one cycle later when the active auto-balance plan cuts `name`."""
+        plan = balance_plan()
+        if plan is None or not plan.cut_point(name):
+            return sig
+        w = sig._w
+        q = self.delay_to(
+            w, from_cycle=sig._cycle, to_cycle=sig._cycle + 1, width=w.width
+        )
+        return CycleAwareSignal(
+            self, Wire(self._m, q.sig, signed=w.signed), sig._cycle + 1
+        )
+
+    def _check_state_update(self, *ws: Wire) -> None:
+        """Keep the values feeding a state update out of the auto-balance plan."""
+        plan = balance_plan()
+        if plan is not None:
+            plan.feeds_state(self._fanin_names([w.sig.ref for w in ws]))
+
+    def _fanin_names(self, refs: list[str]) -> set[str]:
+        """`pyc.alias` debug names in the fanin of `refs`.
+
+        Walks back through ops, wires and registers up to ports and state
+        registers. The index is extended with the lines emitted since the last
+        call, and rebuilt when they were rolled back or are being captured.
+        """
+        m = self._m
+        lines = m._lines  # noqa: SLF001
+        n = self._fanin_len
+        if (
+            lines is not self._fanin_buf
+            or n > len(lines)
+            or (n and lines[n - 1] is not self._fanin_last)
+        ):
+            self._fanin.clear()
+            self._fanin_alias.clear()
+            for outer in m._outer_lines:  # noqa: SLF001
+                for line in outer:
+                    _index_fanin_line(line, self._fanin, self._fanin_alias)
+            n = 0
+        for line in lines[n:]:
+            _index_fanin_line(line, self._fanin, self._fanin_alias)
+        self._fanin_buf = lines
+        self._fanin_len = len(lines)
+        self._fanin_last = lines[-1] if lines else None
+
+        names: set[str] = set()
+        seen: set[str] = set()
+        stack = list(refs)
+        while stack:
+            ref = stack.pop()
+            if ref in seen or ref in self._state_refs:
+                continue
+            seen.add(ref)
+            name = self._fanin_alias.get(ref)
+            if name is not None:
+                names.add(name)
+            stack.extend(self._fanin.get(ref, ()))
+        return names
+
+
+def _index_fanin_line(
+    line: str, fanin: dict[str, list[str]], aliases: dict[str, str]
+) -> None:
+    text = line.strip()
+    if text.startswith("pyc.assign "):
+        refs = _SSA_REF.findall(text.split(" : ", 1)[0])
+        if len(refs) == 2:
+            fanin.setdefault(refs[0], []).append(refs[1])
+        return
+    lhs, sep, rhs = text.partition(" = ")
+    if not sep or not lhs.startswith("%"):
+        return
+    operands = _SSA_REF.findall(rhs.split(" {", 1)[0].split(" : ", 1)[0])
+    for ref in _SSA_REF.findall(lhs):
+        fanin.setdefault(ref, []).extend(operands)
+    if rhs.startswith("pyc.alias "):
+        name = _PYC_NAME.search(rhs)
+        if name is not None:
+            aliases[lhs] = name.group(1)
+
 
 # ── Hierarchical compilation helpers ──────────────────────────────────────
 
@@ -331,6 +496,113 @@ def _hierarchical_cache_key(
     return (id(fn), kw_str)
 
 
+def _sub_artifact_key(
+    fn: Callable[..., Any], kwargs: dict[str, Any], domain_name: str
+) -> tuple[Any, ...] | None:
+    """Content key of a hierarchical sub-module for :func:`module_artifact_cache`.
+
+    Source fingerprint + canonical kwargs (``prefix`` excluded), or None when
+    either is unavailable (closures, kwargs that do not canonicalize).
+    """
+    from .design import DesignError, canonical_params_json
+
+    fp = const_fn_fingerprint(fn)
+    if fp is None:
+        return None
+    try:
+        kw_json = canonical_params_json(
+            {k: v for k, v in kwargs.items() if k != "prefix"}, path="kwargs"
+        )
+    except DesignError:
+        return None
+    key: tuple[Any, ...] = ("v5.sub", fp, str(domain_name), kw_json)
+    plan = balance_plan()
+    if plan is not None:
+        # Cuts retime values inside the sub-module too.
+        key += (tuple(plan.key()),)
+    return key
+
+
+def _resolve_qualname(module: str, qualname: str) -> Any | None:
+    if not module or not qualname or "<locals>" in qualname:
+        return None
+    import importlib
+
+    try:
+        obj: Any = importlib.import_module(module)
+    except ImportError:
+        return None
+    for part in qualname.split("."):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    return obj
+
+
+class _EmittedModule:
+    """A reloaded sub-module: its emitted ``func.func`` in place of a builder."""
+
+    def __init__(self, name: str, func_mlir: str, func_attrs: dict[str, str]) -> None:
+        self.name = name
+        self._func_mlir = func_mlir
+        self._func_attrs = func_attrs
+
+    def emit_func_mlir(self) -> str:
+        return self._func_mlir
+
+    def emit_mlir(self) -> str:
+        return "module {\n" + self._func_mlir + "}\n"
+
+
+def _module_record(fn: Any, cm: Any) -> tuple[Any, ...]:
+    """Plain-tuple form of a compiled sub-module (persisted by the artifact cache)."""
+    return (
+        str(getattr(fn, "__module__", "") or ""),
+        str(getattr(fn, "__qualname__", "") or ""),
+        cm.sym_name,
+        cm.mod.emit_func_mlir(),
+        tuple(sorted(cm.mod._func_attrs.items())),
+        cm.arg_names,
+        cm.arg_types,
+        cm.result_names,
+        cm.result_types,
+        cm.struct_metrics_json,
+        cm.struct_collections_json,
+    )
+
+
+def _reloaded_compiled_module(fn: Any, rec: tuple[Any, ...]) -> Any:
+    from .design import CompiledModule
+
+    (
+        _mod,
+        _qual,
+        sym,
+        text,
+        attrs,
+        arg_names,
+        arg_types,
+        res_names,
+        res_types,
+        metrics_json,
+        collections_json,
+    ) = rec
+    return CompiledModule(
+        fn=fn,
+        params_json="{}",
+        sym_name=sym,
+        mod=_EmittedModule(sym, text, dict(attrs)),
+        arg_names=tuple(arg_names),
+        arg_types=tuple(arg_types),
+        result_names=tuple(res_names),
+        result_types=tuple(res_types),
+        value_param_names=(),
+        value_param_types=(),
+        struct_metrics_json=metrics_json,
+        struct_collections_json=collections_json,
+    )
+
+
 def _record_output_structure(
     outs_dict: dict[str, Any] | Any,
     circuit: "CycleAwareCircuit | None" = None,
@@ -428,6 +700,7 @@ def _make_compiled_module(fn: Any, circuit: CycleAwareCircuit, sym_name: str) ->
             "collection_count": 0,
             "collection_instance_count": 0,
             "module_family_collection_count": 0,
+            "delay_flops_saved": 0,
             "repeat_pressure": 0,
             "repeated_body_clusters": [],
         },
@@ -512,6 +785,7 @@ class StateSignal:
         """Connect the D input of the register (close the feedback loop)."""
         w = _to_wire(next_val)
         wh = _to_wire(when) if when is not None else None
+        self._domain._check_state_update(w, *(() if wh is None else (wh,)))
         if wh is not None:
             self._reg.set(w, when=wh)
         else:
@@ -831,8 +1105,12 @@ class CycleAwareSignal:
         return self._w
 
     def named(self, name: str) -> "CycleAwareSignal":
-        nw = self._domain._m.named(self._w, str(name))
-        return CycleAwareSignal(self._domain, nw, self._cycle)
+        m = self._domain._m
+        full = m.scoped_name(str(name))
+        nw = Wire(m, m.alias(self._w.sig, name=full), signed=self._w.signed)
+        return self._domain._auto_balance(
+            CycleAwareSignal(self._domain, nw, self._cycle), full
+        )
 
     def _align(
         self,
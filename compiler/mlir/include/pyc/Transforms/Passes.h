@@ -1,6 +1,7 @@
 #pragma once
 
 #include <memory>
+#include <string>
 
 #include "mlir/Pass/Pass.h"
 
@@ -22,7 +23,8 @@ std::unique_ptr<::mlir::Pass> createPrunePortsPass();
 std::unique_ptr<::mlir::Pass> createEliminateDeadStatePass();
 std::unique_ptr<::mlir::Pass> createEliminateDeadInstancesPass();
 std::unique_ptr<::mlir::Pass> createSLPPackWiresPass();
-std::unique_ptr<::mlir::Pass> createCheckLogicDepthPass(unsigned logicDepth);
+// `reportPath`: when non-empty, write per-path depth reports (JSON) there.
+std::unique_ptr<::mlir::Pass> createCheckLogicDepthPass(unsigned logicDepth, std::string reportPath = "");
 std::unique_ptr<::mlir::Pass> createCollectCompileStatsPass();
 std::unique_ptr<::mlir::Pass> createFlattenInstancesPass();
 
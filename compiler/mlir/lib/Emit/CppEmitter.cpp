@@ -540,6 +540,88 @@ static LogicalResult emitCombAssign(Operation &op, llvm::raw_ostream &os, NameTa
   return op.emitError("unsupported combinational op for C++ emission");
 }
 
+// Comb blocks smaller than this (or with fewer than two ops per input) are
+// cheaper to re-run than to fingerprint.
+static constexpr unsigned kCombBlockCacheMinOps = 8;
+
+static unsigned combBodyOpCount(pyc::CombOp comb) {
+  if (comb.getBody().empty())
+    return 0;
+  unsigned n = 0;
+  for (Operation &op : comb.getBody().front()) {
+    if (isa<pyc::YieldOp>(op))
+      break;
+    ++n;
+  }
+  return n;
+}
+
+static bool useCombBlockCache(pyc::CombOp comb) {
+  unsigned ops = combBodyOpCount(comb);
+  return comb.getNumOperands() > 0 && ops >= kCombBlockCacheMinOps && ops >= 2 * comb.getNumOperands();
+}
+
+// Input fingerprint cache for one fused comb block (-DPYC_DISABLE_COMB_BLOCK_CACHE
+// turns it off). eval_comb_pass() runs blocks in topological order, so a block
+// whose inputs are unchanged since its last run is not downstream of any
+// changed reg/port/primitive output and can be skipped.
+static void emitCombBlockCache(pyc::CombOp comb, llvm::raw_ostream &os, NameTable &nt, unsigned idx) {
+  std::string prefix = "eval_comb_" + std::to_string(idx) + "_cache";
+  os << "  bool " << prefix << "_valid = false;\n";
+  for (auto [i, v] : llvm::enumerate(comb.getInputs())) {
+    if (bitWidth(v.getType()) <= 64)
+      os << "  std::uint64_t " << prefix << "_fp_" << i << " = 0ull;\n";
+    else
+      os << "  " << cppType(v.getType()) << " " << prefix << "_in_" << i << "{};\n";
+  }
+  os << "  inline bool " << prefix << "_changed() {\n";
+  os << "    bool _pyc_changed = !" << prefix << "_valid;\n";
+  for (auto [i, v] : llvm::enumerate(comb.getInputs())) {
+    std::string inValue = nt.get(v);
+    if (bitWidth(v.getType()) <= 64) {
+      std::string fpName = prefix + "_fp_" + std::to_string(i);
+      os << "    std::uint64_t _pyc_fp_" << i << " = static_cast<std::uint64_t>(" << inValue << ".value());\n";
+      os << "    if (" << fpName << " != _pyc_fp_" << i << ") {\n";
+      os << "      " << fpName << " = _pyc_fp_" << i << ";\n";
+      os << "      _pyc_changed = true;\n";
+      os << "    }\n";
+    } else {
+      std::string cacheName = prefix + "_in_" + std::to_string(i);
+      os << "    if (" << cacheName << " != " << inValue << ") {\n";
+      os << "      " << cacheName << " = " << inValue << ";\n";
+      os << "      _pyc_changed = true;\n";
+      os << "    }\n";
+    }
+  }
+  os << "    " << prefix << "_valid = true;\n";
+  os << "    return _pyc_changed;\n";
+  os << "  }\n\n";
+}
+
+// Prologue of eval_comb_<idx>(): per-block run/skip accounting and, for cached
+// blocks, the early return.
+static void emitCombBlockPrologue(pyc::CombOp comb, llvm::raw_ostream &os, unsigned idx) {
+  if (useCombBlockCache(comb)) {
+    os << "    #ifndef PYC_DISABLE_COMB_BLOCK_CACHE\n";
+    os << "    if (!eval_comb_" << idx << "_cache_changed()) {\n";
+    os << "      if (_pyc_sim_stats_enable) {\n";
+    os << "        _pyc_sim_stats.comb_block_skips++;\n";
+    os << "        #ifdef PYC_COMB_BLOCK_STATS\n";
+    os << "        _pyc_comb_block_skips[" << idx << "]++;\n";
+    os << "        #endif\n";
+    os << "      }\n";
+    os << "      return;\n";
+    os << "    }\n";
+    os << "    #endif\n";
+  }
+  os << "    if (_pyc_sim_stats_enable) {\n";
+  os << "      _pyc_sim_stats.comb_block_evals++;\n";
+  os << "      #ifdef PYC_COMB_BLOCK_STATS\n";
+  os << "      _pyc_comb_block_evals[" << idx << "]++;\n";
+  os << "      #endif\n";
+  os << "    }\n";
+}
+
 static LogicalResult emitCombMethod(pyc::CombOp comb,
                                     llvm::raw_ostream &os,
                                     NameTable &nt,
@@ -564,6 +646,9 @@ static LogicalResult emitCombMethod(pyc::CombOp comb,
     combOps.push_back(&op);
   }
 
+  if (useCombBlockCache(comb))
+    emitCombBlockCache(comb, os, nt, idx);
+
   unsigned combChunkNodes = std::max(1u, opts.combChunkNodes);
   if (combOps.size() > combChunkNodes) {
     std::vector<std::string> partMethods;
@@ -581,6 +666,7 @@ static LogicalResult emitCombMethod(pyc::CombOp comb,
     }
 
     os << "  inline void eval_comb_" << idx << "() {\n";
+    emitCombBlockPrologue(comb, os, idx);
     for (const std::string &partName : partMethods)
       os << "    " << partName << "();\n";
 
@@ -597,6 +683,7 @@ static LogicalResult emitCombMethod(pyc::CombOp comb,
   }
 
   os << "  inline void eval_comb_" << idx << "() {\n";
+  emitCombBlockPrologue(comb, os, idx);
   for (Operation *op : combOps) {
     if (failed(emitCombAssign(*op, os, nt)))
       return failure();
@@ -942,6 +1029,13 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
       });
     }
 
+    // Bulk registration: the whole subtree's probe count is a compile-time
+    // constant, so the registry is sized once (nested reserves are no-ops).
+    auto probeAliases = loadProbeAliasesForTop(opts.probePlanPath, f.getSymName());
+    size_t localProbeCount = f.getNumArguments() + f.getNumResults() + namedProbes.size() + byteMems.size() +
+                             syncMems.size() + syncMemDPs.size() + probeAliases.size();
+    os << "    reg.reserve(reg.size() + pyc_probe_count());\n";
+
 		  for (auto [i, arg] : llvm::enumerate(f.getArguments())) {
 		    unsigned w = bitWidth(arg.getType());
 		    if (w == 0)
@@ -1003,7 +1097,6 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
 	    for (const auto &ii : instInfos)
 	      os << "    reg_child(" << ii.member << ", \"" << ii.seg << "\");\n";
 	  }
-      auto probeAliases = loadProbeAliasesForTop(opts.probePlanPath, f.getSymName());
       if (!probeAliases.empty()) {
         for (const auto &alias : probeAliases) {
           os << "    if (const auto *src = reg.findByPath(" << cppStringLiteral(alias.sourcePath) << "))\n";
@@ -1012,6 +1105,13 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
       }
 	  os << "  }\n\n";
 
+    os << "  static constexpr std::size_t pyc_probe_count() {\n";
+    os << "    return " << localProbeCount << "u";
+    for (const auto &ii : instInfos)
+      os << " + " << sanitizeId(ii.callee.getSymName()) << "::pyc_probe_count()";
+    os << ";\n";
+    os << "  }\n\n";
+
 	  for (auto r : regs) {
 	    unsigned w = bitWidth(r.getQ().getType());
 	    if (w == 0)
@@ -1195,11 +1295,19 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
   os << "    std::uint64_t primitive_eval_calls = 0;\n";
   os << "    std::uint64_t primitive_cache_skips = 0;\n";
   os << "    std::uint64_t fallback_iterations = 0;\n";
+  os << "    std::uint64_t comb_block_evals = 0;\n";
+  os << "    std::uint64_t comb_block_skips = 0;\n";
   os << "  };\n";
   os << "  bool _pyc_sim_stats_enable = false;\n";
   os << "  bool _pyc_sim_fast_enable = false;\n";
   os << "  std::string _pyc_sim_stats_path{};\n";
-  os << "  _pyc_sim_stats_t _pyc_sim_stats{};\n\n";
+  os << "  _pyc_sim_stats_t _pyc_sim_stats{};\n";
+  // Per-block counters are a debug aid (-DPYC_COMB_BLOCK_STATS); the totals
+  // above are always available.
+  os << "  #ifdef PYC_COMB_BLOCK_STATS\n";
+  os << "  std::array<std::uint64_t, " << std::max<std::size_t>(1, combs.size()) << "> _pyc_comb_block_evals{};\n";
+  os << "  std::array<std::uint64_t, " << std::max<std::size_t>(1, combs.size()) << "> _pyc_comb_block_skips{};\n";
+  os << "  #endif\n\n";
   os << "  static bool _pyc_parse_bool_env(const char *name, bool dflt = false) {\n";
   os << "    const char *v = std::getenv(name);\n";
   os << "    if (!v || !*v)\n";
@@ -1217,13 +1325,26 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
   os << "    if (path && *path)\n";
   os << "      _pyc_sim_stats_path = path;\n";
   os << "  }\n\n";
-  os << "  void reset_sim_stats() { _pyc_sim_stats = _pyc_sim_stats_t{}; }\n\n";
+  os << "  void reset_sim_stats() {\n";
+  os << "    _pyc_sim_stats = _pyc_sim_stats_t{};\n";
+  os << "    #ifdef PYC_COMB_BLOCK_STATS\n";
+  os << "    _pyc_comb_block_evals.fill(0);\n";
+  os << "    _pyc_comb_block_skips.fill(0);\n";
+  os << "    #endif\n";
+  os << "  }\n\n";
   os << "  void dump_sim_stats(std::ostream &os) const {\n";
   os << "    os << \"instance_eval_calls=\" << _pyc_sim_stats.instance_eval_calls << \"\\n\";\n";
   os << "    os << \"instance_cache_skips=\" << _pyc_sim_stats.instance_cache_skips << \"\\n\";\n";
   os << "    os << \"primitive_eval_calls=\" << _pyc_sim_stats.primitive_eval_calls << \"\\n\";\n";
   os << "    os << \"primitive_cache_skips=\" << _pyc_sim_stats.primitive_cache_skips << \"\\n\";\n";
   os << "    os << \"fallback_iterations=\" << _pyc_sim_stats.fallback_iterations << \"\\n\";\n";
+  os << "    os << \"comb_block_evals=\" << _pyc_sim_stats.comb_block_evals << \"\\n\";\n";
+  os << "    os << \"comb_block_skips=\" << _pyc_sim_stats.comb_block_skips << \"\\n\";\n";
+  os << "    #ifdef PYC_COMB_BLOCK_STATS\n";
+  for (unsigned i = 0; i < combs.size(); ++i)
+    os << "    os << \"comb_block_" << i << "=\" << _pyc_comb_block_evals[" << i << "] << \"/\" << _pyc_comb_block_skips["
+       << i << "] << \"\\n\";\n";
+  os << "    #endif\n";
   os << "  }\n\n";
   os << "  void dump_sim_stats_to_path(const char *path = nullptr) const {\n";
   os << "    const char *outPath = path;\n";
@@ -2428,6 +2549,70 @@ static LogicalResult emitFunc(func::FuncOp f, llvm::raw_ostream &os, const CppEm
 	    os << "    " << nt.get(fifo.getInReady()) << "_inst_eval_cache_valid = false;\n";
 	  os << "  }\n\n";
 
+  // pyc_snapshot(ar): state save/restore hook for Testbench::snapshot()/restore()
+  // (runtime/cpp/pyc_snapshot.hpp). One template serves both directions; wires
+  // are chunked like tick so huge modules stay compilable.
+  {
+    std::vector<std::string> snapWires;
+    snapWires.reserve(inNames.size() + outNames.size() + decls.size());
+    snapWires.insert(snapWires.end(), inNames.begin(), inNames.end());
+    snapWires.insert(snapWires.end(), outNames.begin(), outNames.end());
+    for (const Decl &d : decls)
+      snapWires.push_back(d.name);
+
+    unsigned snapParts = 0;
+    for (unsigned b = 0; b < snapWires.size(); b += kTickChunk) {
+      unsigned e = std::min<unsigned>(static_cast<unsigned>(snapWires.size()), b + kTickChunk);
+      os << "  template <typename Ar>\n";
+      os << "  void pyc_snapshot_wires_part_" << snapParts++ << "(Ar &ar) {\n";
+      for (unsigned i = b; i < e; ++i)
+        os << "    ar.value(" << snapWires[i] << ");\n";
+      os << "  }\n\n";
+    }
+
+    os << "  template <typename Ar>\n";
+    os << "  void pyc_snapshot(Ar &ar) {\n";
+    os << "    ar.section(" << cppStringLiteral(structName) << ");\n";
+    for (unsigned i = 0; i < snapParts; ++i)
+      os << "    pyc_snapshot_wires_part_" << i << "(ar);\n";
+    for (auto r : regs)
+      os << "    if (" << nt.get(r.getQ()) << "_inst) " << nt.get(r.getQ()) << "_inst->pyc_snapshot(ar);\n";
+    for (auto fifo : fifos)
+      os << "    " << nt.get(fifo.getInReady()) << "_inst.pyc_snapshot(ar);\n";
+    for (auto mem : byteMems)
+      os << "    " << byteMemInstName.lookup(mem.getOperation()) << ".pyc_snapshot(ar);\n";
+    for (auto mem : syncMems) {
+      std::string instName = syncMemInstName.lookup(mem.getOperation());
+      os << "    if (" << instName << ") " << instName << "->pyc_snapshot(ar);\n";
+    }
+    for (auto mem : syncMemDPs) {
+      std::string instName = syncMemDPInstName.lookup(mem.getOperation());
+      os << "    if (" << instName << ") " << instName << "->pyc_snapshot(ar);\n";
+    }
+    for (auto fifo : asyncFifos)
+      os << "    " << nt.get(fifo.getInReady()) << "_inst.pyc_snapshot(ar);\n";
+    for (auto s : cdcSyncs)
+      os << "    " << nt.get(s.getOut()) << "_inst.pyc_snapshot(ar);\n";
+    for (const auto &ii : instInfos)
+      os << "    if (" << ii.member << ") " << ii.member << "->pyc_snapshot(ar);\n";
+    os << "    if constexpr (Ar::kLoading) {\n";
+    os << "      // Restored inputs must not hit stale eval caches.\n";
+    for (const auto &ii : instInfos)
+      os << "      " << ii.member << "_eval_cache_valid = false;\n";
+    for (auto fifo : fifos)
+      os << "      " << nt.get(fifo.getInReady()) << "_inst_eval_cache_valid = false;\n";
+    for (auto mem : byteMems)
+      os << "      " << byteMemInstName.lookup(mem.getOperation()) << "_eval_cache_valid = false;\n";
+    for (auto fifo : asyncFifos)
+      os << "      " << nt.get(fifo.getInReady()) << "_inst_eval_cache_valid = false;\n";
+    for (auto [i, comb] : llvm::enumerate(combs)) {
+      if (useCombBlockCache(comb))
+        os << "      eval_comb_" << i << "_cache_valid = false;\n";
+    }
+    os << "    }\n";
+    os << "  }\n\n";
+  }
+
 	  // Decision 0027: provide explicit comb/tick/commit APIs + high-level step().
 	  // Decision 0001: expose transfer() as an alias of commit().
 	  os << "  void comb() { eval(); }\n";
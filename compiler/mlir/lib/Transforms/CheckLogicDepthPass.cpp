@@ -11,9 +11,14 @@
 #include "llvm/ADT/DenseMap.h"
 #include "llvm/ADT/DenseSet.h"
 #include "llvm/ADT/SmallVector.h"
+#include "llvm/Support/FileSystem.h"
+#include "llvm/Support/JSON.h"
+#include "llvm/Support/raw_ostream.h"
 
 #include <algorithm>
 #include <limits>
+#include <string>
+#include <utility>
 
 using namespace mlir;
 
@@ -41,11 +46,42 @@ static int64_t opCost(Operation *op) {
   return 1;
 }
 
+// Source line encoded in a frontend value name (`x__L12`, `x__stem__L12`,
+// `inst__L12__N1`); -1 when the name carries none.
+static int64_t sourceLineOf(StringRef name) {
+  int64_t line = -1;
+  for (size_t pos = name.find("__L"); pos != StringRef::npos; pos = name.find("__L", pos + 1)) {
+    StringRef rest = name.drop_front(pos + 3);
+    size_t n = 0;
+    while (n < rest.size() && rest[n] >= '0' && rest[n] <= '9')
+      ++n;
+    if (n == 0 || (n < rest.size() && !rest.drop_front(n).starts_with("__")))
+      continue;
+    int64_t v = 0;
+    if (!rest.take_front(n).getAsInteger(10, v))
+      line = v;
+  }
+  return line;
+}
+
+static StringRef debugNameOf(Value v) {
+  Operation *def = v ? v.getDefiningOp() : nullptr;
+  if (!def)
+    return {};
+  if (auto n = def->getAttrOfType<StringAttr>("pyc.name"))
+    return n.getValue();
+  return {};
+}
+
+// Violating paths reported per function (deepest first).
+static constexpr size_t kMaxReportPaths = 256;
+
 class CheckLogicDepthPass : public PassWrapper<CheckLogicDepthPass, OperationPass<ModuleOp>> {
 public:
   MLIR_DEFINE_EXPLICIT_INTERNAL_INLINE_TYPE_ID(CheckLogicDepthPass)
 
-  explicit CheckLogicDepthPass(unsigned depth = 32) : maxDepthLimit(depth) {}
+  explicit CheckLogicDepthPass(unsigned depth = 32, std::string reportPath = "")
+      : maxDepthLimit(depth), reportPath(std::move(reportPath)) {}
 
   StringRef getArgument() const override { return "pyc-check-logic-depth"; }
   StringRef getDescription() const override {
@@ -57,6 +93,7 @@ public:
     CombDepGraphCache combCache(module);
 
     bool failedAny = false;
+    llvm::json::Array reportFuncs;
 
     for (func::FuncOp f : module.getOps<func::FuncOp>()) {
       const int64_t limit = static_cast<int64_t>(maxDepthLimit);
@@ -70,6 +107,8 @@ public:
       });
 
       llvm::DenseMap<Value, int64_t> memo;
+      // Deepest input of each value, for critical-path reports.
+      llvm::DenseMap<Value, Value> critPred;
       llvm::DenseSet<Value> visiting;
       bool failedThisFunc = false;
 
@@ -91,9 +130,10 @@ public:
           } else if (auto comb = dyn_cast_or_null<pyc::CombOp>(parentOp)) {
             unsigned idx = static_cast<unsigned>(barg.getArgNumber());
             auto inputs = comb.getInputs();
-            if (idx < inputs.size())
+            if (idx < inputs.size()) {
               d = self(self, inputs[idx]);
-            else
+              critPred.try_emplace(v, inputs[idx]);
+            } else
               d = 0;
           } else {
             d = 0;
@@ -111,13 +151,22 @@ public:
           d = 0;
         } else if (isa<pyc::WireOp>(def)) {
           int64_t inMax = 0;
+          Value pred;
           if (auto itD = wireDrivers.find(v); itD != wireDrivers.end()) {
-            for (Value src : itD->second)
-              inMax = std::max(inMax, self(self, src));
+            for (Value src : itD->second) {
+              int64_t sd = self(self, src);
+              if (!pred || sd > inMax) {
+                inMax = std::max(inMax, sd);
+                pred = src;
+              }
+            }
           }
+          if (pred)
+            critPred.try_emplace(v, pred);
           d = inMax;
         } else if (auto a = dyn_cast<pyc::AliasOp>(def)) {
           d = self(self, a.getIn());
+          critPred.try_emplace(v, a.getIn());
         } else if (auto comb = dyn_cast<pyc::CombOp>(def)) {
           auto r = dyn_cast<OpResult>(v);
           unsigned resIdx = r ? r.getResultNumber() : 0u;
@@ -126,6 +175,7 @@ public:
             d = 0;
           } else {
             d = self(self, yield.getValues()[resIdx]);
+            critPred.try_emplace(v, yield.getValues()[resIdx]);
           }
         } else if (auto inst = dyn_cast<pyc::InstanceOp>(def)) {
           auto r = dyn_cast<OpResult>(v);
@@ -169,7 +219,11 @@ public:
                   int64_t delta = rs.argDepth[i];
                   if (delta < 0)
                     continue;
-                  best = std::max(best, self(self, inputs[i]) + delta);
+                  int64_t cand = self(self, inputs[i]) + delta;
+                  if (cand > best) {
+                    best = cand;
+                    critPred[v] = inputs[i];
+                  }
                 }
                 d = best;
               }
@@ -177,8 +231,16 @@ public:
           }
         } else {
           int64_t inMax = 0;
-          for (Value in : def->getOperands())
-            inMax = std::max(inMax, self(self, in));
+          Value pred;
+          for (Value in : def->getOperands()) {
+            int64_t id = self(self, in);
+            if (!pred || id > inMax) {
+              inMax = std::max(inMax, id);
+              pred = in;
+            }
+          }
+          if (pred)
+            critPred.try_emplace(v, pred);
           d = inMax + opCost(def);
         }
 
@@ -190,6 +252,7 @@ public:
       int64_t maxDepth = 0;
       int64_t wns = std::numeric_limits<int64_t>::max();
       int64_t tns = 0;
+      llvm::SmallVector<std::pair<Operation *, Value>> violations;
 
       auto observeEndpoint = [&](Operation *op, Value v) {
         int64_t d = depthOf(depthOf, v);
@@ -201,6 +264,8 @@ public:
         if (d > limit) {
           op->emitError("logic depth exceeds limit: depth=") << d << " limit=" << limit;
           failedThisFunc = true;
+          if (!reportPath.empty())
+            violations.emplace_back(op, v);
         }
       };
 
@@ -228,22 +293,91 @@ public:
       f->setAttr("pyc.logic_depth.wns", IntegerAttr::get(i64Ty, wns));
       f->setAttr("pyc.logic_depth.tns", IntegerAttr::get(i64Ty, tns));
 
+      if (!reportPath.empty()) {
+        std::stable_sort(violations.begin(), violations.end(), [&](const auto &a, const auto &b) {
+          return memo.lookup(a.second) > memo.lookup(b.second);
+        });
+        if (violations.size() > kMaxReportPaths)
+          violations.resize(kMaxReportPaths);
+
+        llvm::json::Array paths;
+        for (const auto &[op, endV] : violations) {
+          // Walk the deepest inputs back to the path start; nodes are the
+          // named values on the way (frontend aliases, registers, instances).
+          llvm::json::Array nodes;
+          llvm::DenseSet<Value> seen;
+          for (Value cur = endV; cur && seen.insert(cur).second; cur = critPred.lookup(cur)) {
+            StringRef name = debugNameOf(cur);
+            if (name.empty())
+              continue;
+            llvm::json::Object node;
+            node["name"] = name.str();
+            node["depth"] = memo.lookup(cur);
+            if (int64_t line = sourceLineOf(name); line >= 0)
+              node["line"] = line;
+            nodes.push_back(std::move(node));
+          }
+          std::reverse(nodes.begin(), nodes.end());
+
+          const int64_t d = memo.lookup(endV);
+          llvm::json::Object path;
+          path["endpoint_op"] = op->getName().getStringRef().str();
+          if (auto n = op->getAttrOfType<StringAttr>("pyc.name"))
+            path["endpoint"] = n.getValue().str();
+          path["depth"] = d;
+          path["slack"] = limit - d;
+          path["nodes"] = std::move(nodes);
+          paths.push_back(std::move(path));
+        }
+
+        llvm::json::Object fobj;
+        fobj["name"] = f.getSymName().str();
+        fobj["max_depth"] = maxDepth;
+        fobj["wns"] = wns;
+        fobj["tns"] = tns;
+        fobj["paths"] = std::move(paths);
+        reportFuncs.push_back(std::move(fobj));
+      }
+
       if (failedThisFunc)
         failedAny = true;
     }
 
+    // Written before failing so `pycircuit build --auto-balance` can consume it.
+    if (!reportPath.empty() && failed(writeReport(std::move(reportFuncs))))
+      failedAny = true;
+
     if (failedAny)
       signalPassFailure();
   }
 
 private:
+  LogicalResult writeReport(llvm::json::Array funcs) {
+    llvm::json::Object root;
+    root["version"] = 1;
+    root["logic_depth_limit"] = static_cast<int64_t>(maxDepthLimit);
+    root["functions"] = std::move(funcs);
+
+    std::error_code ec;
+    llvm::raw_fd_ostream os(reportPath, ec, llvm::sys::fs::OF_Text);
+    if (ec) {
+      getOperation().emitError("cannot write logic-depth report: ") << reportPath << ": " << ec.message();
+      return failure();
+    }
+    llvm::json::OStream j(os, 2);
+    j.value(llvm::json::Value(std::move(root)));
+    os << "\n";
+    return success();
+  }
+
   unsigned maxDepthLimit = 32;
+  std::string reportPath;
 };
 
 } // namespace
 
-std::unique_ptr<::mlir::Pass> createCheckLogicDepthPass(unsigned logicDepth) {
-  return std::make_unique<CheckLogicDepthPass>(logicDepth);
+std::unique_ptr<::mlir::Pass> createCheckLogicDepthPass(unsigned logicDepth, std::string reportPath) {
+  return std::make_unique<CheckLogicDepthPass>(logicDepth, std::move(reportPath));
 }
 
 static PassRegistration<CheckLogicDepthPass> pass;
@@ -143,6 +143,11 @@ static llvm::cl::opt<unsigned> logicDepthLimit(
     llvm::cl::desc("Maximum combinational logic depth allowed between sequential boundaries"),
     llvm::cl::init(32));
 
+static llvm::cl::opt<std::string> logicDepthReportPath(
+    "logic-depth-report",
+    llvm::cl::desc("Write critical paths over --logic-depth (named nodes, source lines) as JSON to this path"),
+    llvm::cl::init(""));
+
 static llvm::cl::opt<std::string> simMode("sim-mode", llvm::cl::desc("Simulation mode: default|cpp-only"),
                                           llvm::cl::init("default"));
 
@@ -2258,7 +2263,7 @@ int main(int argc, char **argv) {
   pm.addPass(createSymbolDCEPass());
   pm.addNestedPass<func::FuncOp>(pyc::createCheckFlatTypesPass());
   pm.addNestedPass<func::FuncOp>(pyc::createCheckNoDynamicPass());
-  pm.addPass(pyc::createCheckLogicDepthPass(logicDepthLimit));
+  pm.addPass(pyc::createCheckLogicDepthPass(logicDepthLimit, logicDepthReportPath));
   pm.addNestedPass<func::FuncOp>(pyc::createCollectCompileStatsPass());
   const auto tPassStart = Clock::now();
   if (failed(pm.run(*module))) {
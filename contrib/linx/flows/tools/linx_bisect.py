@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Find the first divergent commit window between two checkpoint-hash traces.
+
+Reference (QEMU) and DUT (pyCircuit) each record an architectural-state hash
+every N commits (register file + memory page hashes, see
+runtime/cpp/pyc_arch_checkpoint.hpp). Comparing those locates the first
+window of N commits that diverges, so only that window needs a full commit
+trace:
+
+  linx_bisect.py qemu.ckpt.jsonl pyc.ckpt.jsonl --out-dir bisect/
+
+On divergence, `--out-dir` receives `window.json` (commit range, cycles,
+differing pages) and `trace_config.json` for the DUT cycle window
+(`_default_trace_config_for_cycle`). `run_linx_qemu_vs_pyc.sh` uses these
+when `LINX_BISECT_EVERY` is set.
+
+Both streams must end with a `final` record (total commit count and state
+hashes). A different final commit count or hash is a divergence. When the
+final records are missing, the tail after the last matching checkpoint is
+reported as an unchecked window so the flow diffs it with full traces.
+
+Exit status: 0 when every checkpoint and the final records match, 1 with a
+window to re-run (divergence or unchecked tail), 2 on usage errors.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from linx_trace_diff import (  # noqa: E402
+    _default_trace_config_for_cycle,
+    _open_text,
+    _write_json,
+    find_restart_snapshot,
+)
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    commit: int
+    cycle: int
+    pc: int
+    regs_hash: int
+    mem_hash: int
+    # Pages whose hash changed since the previous checkpoint (base -> hash).
+    pages: dict[int, int]
+    # End-of-run record: `commit` is the total number of retired commits.
+    final: bool = False
+
+
+@dataclass
+class CheckpointStream:
+    path: Path
+    every: int | None = None
+    page_bytes: int | None = None
+    # Accumulated non-zero page hashes up to the last yielded checkpoint.
+    page_state: dict[int, int] = field(default_factory=dict)
+
+    def __iter__(self) -> Iterator[Checkpoint]:
+        zero: int | None = None
+        with _open_text(self.path) as f:
+            for ln, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise SystemExit(
+                        f"error: {self.path}:{ln}: invalid JSON: {e}"
+                    ) from e
+                if not isinstance(obj, dict):
+                    raise SystemExit(
+                        f"error: {self.path}:{ln}: expected JSON object per line"
+                    )
+                kind = str(obj.get("type", "checkpoint")).strip().lower()
+                if kind in {"start", "header", "meta"}:
+                    self.every = _opt_int(obj.get("checkpoint_every"))
+                    self.page_bytes = _opt_int(obj.get("page_bytes"))
+                    if self.page_bytes:
+                        zero = zero_page_hash(self.page_bytes)
+                    continue
+                if kind not in {"checkpoint", "final"}:
+                    continue
+                try:
+                    cp = Checkpoint(
+                        commit=int(obj["commit"]),
+                        cycle=int(obj.get("cycle", 0)),
+                        pc=int(obj.get("pc", 0)),
+                        regs_hash=int(obj["regs_hash"]),
+                        mem_hash=int(obj["mem_hash"]),
+                        pages={
+                            int(k, 0): int(v)
+                            for k, v in (obj.get("pages") or {}).items()
+                        },
+                        final=kind == "final",
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    raise SystemExit(
+                        f"error: {self.path}:{ln}: malformed checkpoint: {e}"
+                    ) from None
+                for base, h in cp.pages.items():
+                    if h == zero:
+                        self.page_state.pop(base, None)
+                    else:
+                        self.page_state[base] = h
+                yield cp
+
+
+def _opt_int(v) -> int | None:
+    try:
+        return None if v is None else int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+_FNV_OFFSET = 1469598103934665603
+_FNV_PRIME = 1099511628211
+_MASK64 = (1 << 64) - 1
+
+
+def zero_page_hash(page_bytes: int) -> int:
+    """FNV-1a of `page_bytes` zero bytes (pages with this hash are omitted)."""
+    return (_FNV_OFFSET * pow(_FNV_PRIME, page_bytes, 1 << 64)) & _MASK64
+
+
+# `Divergence.fields` marker for streams that end without a final record.
+UNCHECKED_TAIL = "<no-final>"
+
+
+@dataclass(frozen=True)
+class Divergence:
+    # Last checkpoint where both sides agree (None: diverged before the first).
+    good_ref: Checkpoint | None
+    good_dut: Checkpoint | None
+    # First disagreeing checkpoint per side (None: that stream ended first).
+    bad_ref: Checkpoint | None
+    bad_dut: Checkpoint | None
+    fields: list[str]
+    pages: list[int]
+
+    @property
+    def unchecked_tail(self) -> bool:
+        """No final records: checkpoints agree, the commits after them are unverified."""
+        return self.fields == [UNCHECKED_TAIL]
+
+    @property
+    def commit_lo(self) -> int:
+        """First commit index of the divergent window."""
+        return 0 if self.good_ref is None else self.good_ref.commit
+
+    @property
+    def commit_hi(self) -> int | None:
+        """Exclusive end of the window (None: runs to the end of the trace)."""
+        bad = [cp for cp in (self.bad_ref, self.bad_dut) if cp is not None]
+        if len(bad) == 1 and bad[0].final:
+            # The other side ended without a final record: its length is unknown.
+            return None
+        return max(cp.commit for cp in bad) if bad else None
+
+
+def first_divergence(
+    ref: CheckpointStream, dut: CheckpointStream
+) -> tuple[Divergence | None, int]:
+    """Compare checkpoints in lockstep; returns (divergence, matching checkpoints).
+
+    Only matching final records count as a match to the end of the run.
+    """
+    good_ref: Checkpoint | None = None
+    good_dut: Checkpoint | None = None
+    n = 0
+    it_ref = iter(ref)
+    it_dut = iter(dut)
+    while True:
+        a = next(it_ref, None)
+        b = next(it_dut, None)
+        if a is None and b is None:
+            return Divergence(good_ref, good_dut, None, None, [UNCHECKED_TAIL], []), n
+        if a is None or b is None or a.final != b.final:
+            return Divergence(good_ref, good_dut, a, b, ["<length>"], []), n
+        if n == 0 and ref.every and dut.every and ref.every != dut.every:
+            raise SystemExit(
+                f"error: checkpoint interval differs: ref={ref.every} dut={dut.every}"
+            )
+        fields = [
+            k for k in ("pc", "regs_hash", "mem_hash") if getattr(a, k) != getattr(b, k)
+        ]
+        if a.final:
+            if a.commit != b.commit:
+                fields.insert(0, "commit")
+        elif a.commit != b.commit:
+            raise SystemExit(
+                f"error: checkpoints not aligned: ref.commit={a.commit} dut.commit={b.commit}"
+            )
+        if fields:
+            pages = []
+            if "mem_hash" in fields:
+                keys = ref.page_state.keys() | dut.page_state.keys()
+                pages = sorted(
+                    k for k in keys if ref.page_state.get(k) != dut.page_state.get(k)
+                )
+            return Divergence(good_ref, good_dut, a, b, fields, pages), n
+        if a.final:
+            return None, n
+        good_ref, good_dut = a, b
+        n += 1
+
+
+def _window_json(d: Divergence) -> dict:
+    def cp(c: Checkpoint | None) -> dict | None:
+        if c is None:
+            return None
+        return {
+            "commit": c.commit,
+            "cycle": c.cycle,
+            "pc": c.pc,
+            "regs_hash": c.regs_hash,
+            "mem_hash": c.mem_hash,
+        }
+
+    return {
+        "commit_lo": d.commit_lo,
+        "commit_hi": d.commit_hi,
+        "fields": d.fields,
+        "pages": [hex(p) for p in d.pages],
+        "good": {"ref": cp(d.good_ref), "dut": cp(d.good_dut)},
+        "bad": {"ref": cp(d.bad_ref), "dut": cp(d.bad_dut)},
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Locate the first divergent commit window from checkpoint hashes."
+    )
+    ap.add_argument("ref_ckpt", help="Reference checkpoint JSONL (typically QEMU)")
+    ap.add_argument("dut_ckpt", help="DUT checkpoint JSONL (typically pyCircuit)")
+    ap.add_argument(
+        "--out-dir",
+        default=None,
+        help="On divergence, write window.json and trace_config.json for a windowed re-run.",
+    )
+    ap.add_argument(
+        "--snapshot-dir",
+        default=None,
+        help="Directory of simulator snapshots (*.pycsnap); report the nearest one before the window.",
+    )
+    args = ap.parse_args()
+
+    ref = CheckpointStream(Path(args.ref_ckpt).resolve())
+    dut = CheckpointStream(Path(args.dut_ckpt).resolve())
+    for s in (ref, dut):
+        if not s.path.is_file():
+            raise SystemExit(f"error: checkpoint trace not found: {s.path}")
+
+    div, n = first_divergence(ref, dut)
+    if div is None:
+        sys.stdout.write(f"ok: checkpoints match ({n} checkpoints and final state)\n")
+        return 0
+
+    hi = "end" if div.commit_hi is None else str(div.commit_hi)
+    if div.unchecked_tail:
+        sys.stdout.write(
+            f"unchecked: no final checkpoint; commits [{div.commit_lo}, end) after {n} matching checkpoints\n"
+        )
+    else:
+        sys.stdout.write(
+            f"divergence: commits [{div.commit_lo}, {hi}) after {n} matching checkpoints\n"
+        )
+        sys.stdout.write(f"  fields: {', '.join(div.fields)}\n")
+    if div.pages:
+        shown = ", ".join(hex(p) for p in div.pages[:16])
+        more = f" (+{len(div.pages) - 16} more)" if len(div.pages) > 16 else ""
+        sys.stdout.write(f"  pages: {shown}{more}\n")
+
+    cyc_lo = 0 if div.good_dut is None else div.good_dut.cycle
+    cyc_hi = cyc_lo if div.bad_dut is None else div.bad_dut.cycle
+    restart = None
+    if args.snapshot_dir:
+        restart = find_restart_snapshot(Path(args.snapshot_dir), cyc_lo)
+        if restart is None:
+            sys.stdout.write(
+                f"restart-snapshot: none at or before cycle {cyc_lo} in {Path(args.snapshot_dir).resolve()}\n"
+            )
+        else:
+            sys.stdout.write(f"restart-snapshot: {restart[0]} (cycle={restart[1]})\n")
+
+    if args.out_dir:
+        out = Path(args.out_dir).resolve()
+        window = _window_json(div)
+        window["restart_snapshot"] = (
+            None
+            if restart is None
+            else {"path": str(restart[0]), "cycle": int(restart[1])}
+        )
+        _write_json(out / "window.json", window)
+        _write_json(
+            out / "trace_config.json",
+            _default_trace_config_for_cycle(
+                cycle=cyc_lo, pre=0, post=max(0, cyc_hi - cyc_lo)
+            ),
+        )
+        sys.stdout.write(f"bisect-window: {out}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
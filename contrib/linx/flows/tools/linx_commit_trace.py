@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Binary Linx commit traces (`.pyccommit`) and JSONL conversion.
+
+Layout (little-endian; mirrors runtime/cpp/pyc_commit_trace.hpp):
+
+  header : magic "PYCCMT01", u32 version, u32 flags, u32 record_size,
+           u32 schema_id_len, schema_id bytes (utf-8)
+  body   : fixed 120-byte records (see `RECORD`), optionally one zstd frame
+           stream when flags & FLAG_ZSTD
+
+Each record carries every `MANDATORY_FIELDS` value; group validity lives in
+the `valid` bitmask (`VALID_*`). Fields of an invalid group are written as 0.
+
+Usage:
+  linx_commit_trace.py to-bin  qemu.jsonl qemu.pyccommit [--zstd]
+  linx_commit_trace.py to-jsonl pyc.pyccommit pyc.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import struct
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+MAGIC = b"PYCCMT01"
+VERSION = 1
+FLAG_ZSTD = 1 << 0
+
+_HEAD = struct.Struct("<8sIIII")
+
+VALID_SRC0 = 1 << 0
+VALID_SRC1 = 1 << 1
+VALID_DST = 1 << 2
+VALID_WB = 1 << 3
+VALID_MEM = 1 << 4
+MEM_IS_STORE = 1 << 5
+VALID_TRAP = 1 << 6
+
+_VALID_BITS = [
+    ("src0_valid", VALID_SRC0),
+    ("src1_valid", VALID_SRC1),
+    ("dst_valid", VALID_DST),
+    ("wb_valid", VALID_WB),
+    ("mem_valid", VALID_MEM),
+    ("mem_is_store", MEM_IS_STORE),
+    ("trap_valid", VALID_TRAP),
+]
+
+_U64_FIELDS = [
+    "cycle",
+    "pc",
+    "insn",
+    "next_pc",
+    "src0_data",
+    "src1_data",
+    "dst_data",
+    "wb_data",
+    "mem_addr",
+    "mem_wdata",
+    "mem_rdata",
+    "trap_cause",
+    "traparg0",
+]
+_U8_FIELDS = ["len", "src0_reg", "src1_reg", "dst_reg", "wb_rd", "mem_size"]
+_PACKED_FIELDS = [k for k, _ in _VALID_BITS] + _U64_FIELDS + _U8_FIELDS
+
+# 13 x u64, u32 valid, 6 x u8, 6 pad bytes.
+RECORD = struct.Struct("<13QI6B6x")
+RECORD_SIZE = RECORD.size
+
+# Records decoded per block when streaming.
+BLOCK_RECORDS = 1 << 16
+
+
+def numpy_dtype():
+    """NumPy structured dtype matching `RECORD` (requires numpy)."""
+    import numpy as np
+
+    fields = (
+        [(k, "<u8") for k in _U64_FIELDS]
+        + [("valid", "<u4")]
+        + [(k, "u1") for k in _U8_FIELDS]
+    )
+    fields.append(("_pad", "V6"))
+    dt = np.dtype(fields)
+    assert dt.itemsize == RECORD_SIZE
+    return dt
+
+
+def _to_int(v, default: int = 0) -> int:
+    try:
+        if isinstance(v, bool):
+            return 1 if v else 0
+        if isinstance(v, int):
+            return int(v)
+        if isinstance(v, str):
+            s = v.strip().lower().replace("_", "")
+            if not s:
+                return default
+            return int(s, 0)
+        return int(v)
+    except Exception:
+        return default
+
+
+def is_binary_trace(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def pack_record(row: dict) -> bytes:
+    """Pack one JSONL commit row; non-integer values become 0."""
+    get = row.get
+    valid = 0
+    for k, bit in _VALID_BITS:
+        if _int_field(get(k)) != 0:
+            valid |= bit
+    u64 = [_int_field(get(k)) & 0xFFFFFFFFFFFFFFFF for k in _U64_FIELDS]
+    u8 = [_int_field(get(k)) & 0xFF for k in _U8_FIELDS]
+    return RECORD.pack(*u64, valid, *u8)
+
+
+def _int_field(v) -> int:
+    # Producers almost always emit plain ints (or omit gated fields); skip
+    # `_to_int` for those.
+    if type(v) is int:
+        return v
+    if v is None:
+        return 0
+    return _to_int(v)
+
+
+def _is_int_value(v) -> bool:
+    if isinstance(v, int):
+        return True
+    if isinstance(v, str):
+        try:
+            int(v.strip().lower().replace("_", ""), 0)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def _check_int_fields(row: dict, *, path: str, ln: int) -> None:
+    for k in _PACKED_FIELDS:
+        v = row.get(k)
+        if v is not None and not _is_int_value(v):
+            raise ValueError(f"{path}:{ln}: field {k!r} is not an integer: {v!r}")
+
+
+def record_to_row(values: tuple) -> dict:
+    """Unpacked `RECORD` tuple -> JSONL-style row with every `MANDATORY_FIELDS` key."""
+    row = dict(zip(_U64_FIELDS, values[:13], strict=True))
+    valid = values[13]
+    for k, bit in _VALID_BITS:
+        row[k] = 1 if valid & bit else 0
+    row.update(zip(_U8_FIELDS, values[14:20], strict=True))
+    return row
+
+
+class CommitTraceReader:
+    """Sequential reader over a `.pyccommit` file (header + record blocks)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._raw = open(self.path, "rb")
+        head = self._raw.read(_HEAD.size)
+        if len(head) != _HEAD.size:
+            self._raw.close()
+            raise ValueError(f"{self.path}: truncated commit-trace header")
+        magic, version, flags, rec_size, schema_len = _HEAD.unpack(head)
+        if magic != MAGIC:
+            self._raw.close()
+            raise ValueError(f"{self.path}: not a binary commit trace")
+        if version != VERSION or rec_size != RECORD_SIZE:
+            self._raw.close()
+            raise ValueError(
+                f"{self.path}: unsupported commit-trace version={version} record_size={rec_size}"
+            )
+        schema = self._raw.read(schema_len)
+        self.commit_schema_id: str | None = (
+            schema.decode("utf-8", errors="replace") or None
+        )
+        self.flags = flags
+        self._body: BinaryIO = self._raw
+        if flags & FLAG_ZSTD:
+            try:
+                import zstandard
+            except ImportError as e:
+                self._raw.close()
+                raise ValueError(
+                    f"{self.path}: zstd-framed commit trace needs the `zstandard` module"
+                ) from e
+            self._body = zstandard.ZstdDecompressor().stream_reader(self._raw)
+
+    def close(self) -> None:
+        if self._body is not self._raw:
+            self._body.close()
+        self._raw.close()
+
+    def __enter__(self) -> CommitTraceReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def blocks(self, records: int = BLOCK_RECORDS) -> Iterator[bytes]:
+        """Yield raw record bytes, `records` records at a time (last block may be short)."""
+        want = records * RECORD_SIZE
+        while True:
+            buf = _read_exact(self._body, want)
+            if not buf:
+                return
+            if len(buf) % RECORD_SIZE:
+                raise ValueError(f"{self.path}: truncated commit record")
+            yield buf
+            if len(buf) < want:
+                return
+
+    def rows(self) -> Iterator[dict]:
+        for buf in self.blocks():
+            for values in RECORD.iter_unpack(buf):
+                yield record_to_row(values)
+
+
+def _read_exact(f: BinaryIO, n: int) -> bytes:
+    chunks = []
+    got = 0
+    while got < n:
+        b = f.read(n - got)
+        if not b:
+            break
+        chunks.append(b)
+        got += len(b)
+    return b"".join(chunks)
+
+
+class CommitTraceWriter:
+    def __init__(
+        self, path: Path, *, commit_schema_id: str | None = None, zstd: bool = False
+    ) -> None:
+        self.path = Path(path)
+        self._raw = open(self.path, "wb")
+        schema = (commit_schema_id or "").encode("utf-8")
+        flags = FLAG_ZSTD if zstd else 0
+        self._raw.write(_HEAD.pack(MAGIC, VERSION, flags, RECORD_SIZE, len(schema)))
+        self._raw.write(schema)
+        self._body: BinaryIO = self._raw
+        if zstd:
+            try:
+                import zstandard
+            except ImportError as e:
+                self._raw.close()
+                raise ValueError("zstd framing needs the `zstandard` module") from e
+            self._body = zstandard.ZstdCompressor().stream_writer(
+                self._raw, closefd=False
+            )
+        self._buf = io.BytesIO()
+
+    def write_row(self, row: dict) -> None:
+        self._buf.write(pack_record(row))
+        if self._buf.tell() >= BLOCK_RECORDS * RECORD_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._body.write(self._buf.getbuffer())
+        self._buf = io.BytesIO()
+
+    def close(self) -> None:
+        self._flush()
+        if self._body is not self._raw:
+            self._body.close()
+        self._raw.close()
+
+    def __enter__(self) -> CommitTraceWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def jsonl_to_binary(src: Path, dst: Path, *, zstd: bool = False) -> int:
+    """Convert a JSONL commit trace (optionally .gz); returns the record count.
+
+    Records are validated like linx_trace_diff's JSONL loader; packed fields
+    that are present but not integers are rejected instead of written as 0.
+    """
+    import gzip
+
+    # linx_trace_diff imports this module at load time.
+    from linx_trace_diff import _validate_commit_record
+
+    opener = gzip.open if str(src).endswith(".gz") else open
+    n = 0
+    writer: CommitTraceWriter | None = None
+    schema_id: str | None = None
+    with opener(src, "rt", encoding="utf-8") as f:
+        for ln, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            if not isinstance(obj, dict):
+                raise ValueError(f"{src}:{ln}: expected JSON object per line")
+            # Only a leading start record carries the schema id (same rule as linx_trace_diff).
+            if writer is None and _is_start_record(obj):
+                schema_id = _extract_schema_id(obj)
+                continue
+            _validate_commit_record(obj, path=str(src), ln=ln)
+            _check_int_fields(obj, path=str(src), ln=ln)
+            if writer is None:
+                writer = CommitTraceWriter(dst, commit_schema_id=schema_id, zstd=zstd)
+            writer.write_row(obj)
+            n += 1
+    if writer is None:
+        writer = CommitTraceWriter(dst, commit_schema_id=schema_id, zstd=zstd)
+    writer.close()
+    return n
+
+
+def binary_to_jsonl(src: Path, dst: Path) -> int:
+    n = 0
+    with CommitTraceReader(src) as r, open(dst, "w", encoding="utf-8") as out:
+        if r.commit_schema_id is not None:
+            out.write(
+                json.dumps({"type": "start", "commit_schema_id": r.commit_schema_id})
+                + "\n"
+            )
+        for row in r.rows():
+            out.write(json.dumps(row) + "\n")
+            n += 1
+    return n
+
+
+def _is_start_record(obj: dict) -> bool:
+    t = obj.get("type", None)
+    if t is None:
+        return False
+    return str(t).strip().lower() in {"start", "header", "meta"}
+
+
+def _extract_schema_id(start: dict) -> str | None:
+    for k in [
+        "commit_schema_id",
+        "schema_id",
+        "trace_schema_id",
+        "schema",
+        "version",
+        "trace_version",
+    ]:
+        v = start.get(k, None)
+        if v is None:
+            continue
+        s = str(v).strip()
+        if s:
+            return s
+    return None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Convert Linx commit traces between JSONL and binary (.pyccommit)."
+    )
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    tb = sub.add_parser("to-bin", help="JSONL (or .jsonl.gz) -> .pyccommit")
+    tb.add_argument("src", type=Path)
+    tb.add_argument("dst", type=Path)
+    tb.add_argument(
+        "--zstd",
+        action="store_true",
+        help="zstd-frame the record stream (needs `zstandard`).",
+    )
+    tj = sub.add_parser("to-jsonl", help=".pyccommit -> JSONL")
+    tj.add_argument("src", type=Path)
+    tj.add_argument("dst", type=Path)
+    ns = ap.parse_args()
+
+    try:
+        if ns.cmd == "to-bin":
+            n = jsonl_to_binary(ns.src, ns.dst, zstd=bool(ns.zstd))
+        else:
+            n = binary_to_jsonl(ns.src, ns.dst)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 2
+    sys.stdout.write(f"ok: {n} commits -> {ns.dst}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,11 +2,37 @@
 import argparse
 import gzip
 import json
-from pathlib import Path
+import struct
 import sys
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional
-
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:  # Optional fast JSON parser; json.loads stays the reference behaviour.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+try:  # Optional: vectorized compare of binary (.pyccommit) traces.
+    import numpy as _np
+except ImportError:  # pragma: no cover - optional dependency
+    _np = None
+
+TOOLS_DIR = Path(__file__).resolve().parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from linx_commit_trace import (  # noqa: E402
+    RECORD,
+    VALID_MEM,
+    VALID_TRAP,
+    VALID_WB,
+    CommitTraceReader,
+    is_binary_trace,
+    numpy_dtype,
+    record_to_row,
+)
 
 DEFAULT_COMMIT_SCHEMA_ID = "LC-COMMIT-BUNDLE-V2"
 
@@ -157,7 +183,12 @@ def _extract_schema_id(start: dict) -> str | None:
     return None
 
 
+_ALL_COMMIT_FIELDS = frozenset(_BASE_REQUIRED_FIELDS + _WB_FIELDS + _MEM_FIELDS + _TRAP_FIELDS)
+
+
 def _validate_commit_record(obj: dict, *, path: str, ln: int) -> None:
+    if _ALL_COMMIT_FIELDS <= obj.keys():
+        return
     missing = [field for field in _BASE_REQUIRED_FIELDS if field not in obj]
     if missing:
         raise SystemExit(f"error: {path}:{ln}: missing required fields: {', '.join(missing)}")
@@ -178,6 +209,18 @@ def _validate_commit_record(obj: dict, *, path: str, ln: int) -> None:
             raise SystemExit(f"error: {path}:{ln}: trap_valid==1 but missing trap fields: {', '.join(missing_trap)}")
 
 
+def _loads_line(line: str) -> object:
+    """`json.loads` semantics (and error text), using orjson when it is installed."""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(line)
+        except _orjson.JSONDecodeError:
+            # orjson rejects some inputs json accepts (e.g. NaN, >64-bit ints);
+            # fall through so results and error messages match json.loads.
+            pass
+    return json.loads(line)
+
+
 def load_commit_trace(
     path: str,
     *,
@@ -197,7 +240,7 @@ def load_commit_trace(
             if not line:
                 continue
             try:
-                obj = json.loads(line)
+                obj = _loads_line(line)
             except json.JSONDecodeError as e:
                 raise SystemExit(f"error: {p}:{ln}: invalid JSON: {e}") from e
             if not isinstance(obj, dict):
@@ -261,6 +304,52 @@ def _default_trace_config_for_cycle(*, cycle: int, pre: int, post: int) -> dict:
     }
 
 
+# Simulator snapshot header (runtime/cpp/pyc_snapshot.hpp):
+#   magic[8], u32 version, u32 flags, u64 time_steps, u64 cycle, ...
+_SNAPSHOT_MAGIC = b"PYCSNAP1"
+_SNAPSHOT_HEAD = struct.Struct("<8sIIQQ")
+
+
+def _read_snapshot_cycle(path: Path) -> int | None:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_SNAPSHOT_HEAD.size)
+    except OSError:
+        return None
+    if len(head) != _SNAPSHOT_HEAD.size:
+        return None
+    magic, _version, _flags, _time_steps, cycle = _SNAPSHOT_HEAD.unpack(head)
+    if magic != _SNAPSHOT_MAGIC:
+        return None
+    return int(cycle)
+
+
+def find_restart_snapshot(snapshot_dir: Path, cycle: int) -> tuple[Path, int] | None:
+    """
+    Pick the latest `*.pycsnap` taken at or before `cycle`.
+
+    Snapshots come from `Testbench::snapshot()`; re-running the DUT from the
+    returned file skips re-simulating everything before the mismatch.
+    """
+    best: tuple[Path, int] | None = None
+    for p in sorted(Path(snapshot_dir).glob("*.pycsnap")):
+        snap_cycle = _read_snapshot_cycle(p)
+        if snap_cycle is None or snap_cycle > int(cycle):
+            continue
+        if best is None or snap_cycle > best[1]:
+            best = (p.resolve(), snap_cycle)
+    return best
+
+
+def _mismatch_cycle(ref: list[TraceRec], dut: list[TraceRec], idx: int) -> int:
+    ra = ref[idx].raw if 0 <= idx < len(ref) else {}
+    rb = dut[idx].raw if 0 <= idx < len(dut) else {}
+    cyc = _to_int(ra.get("cycle", 0))
+    if cyc == 0 and "cycle" in rb:
+        cyc = _to_int(rb.get("cycle", 0))
+    return cyc
+
+
 def _dump_mismatch(
     *,
     dump_dir: Path,
@@ -272,35 +361,38 @@ def _dump_mismatch(
     dut_schema_id: str | None,
     pre: int,
     post: int,
+    snapshots: bool = False,
+    restart: tuple[Path, int] | None = None,
 ) -> None:
+    """`snapshots`: a snapshot directory was searched; adds `restart_snapshot`."""
     dump_dir = Path(dump_dir).resolve()
     dump_dir.mkdir(parents=True, exist_ok=True)
 
     ra = ref[idx].raw if 0 <= idx < len(ref) else {}
     rb = dut[idx].raw if 0 <= idx < len(dut) else {}
-    cyc = _to_int(ra.get("cycle", 0))
-    if cyc == 0 and "cycle" in rb:
-        cyc = _to_int(rb.get("cycle", 0))
+    cyc = _mismatch_cycle(ref, dut, idx)
 
     begin = max(0, int(idx) - int(pre))
     end = min(len(ref), len(dut), int(idx) + int(post) + 1)
     ref_ctx = ref[begin:end]
     dut_ctx = dut[begin:end]
 
-    _write_json(
-        dump_dir / "mismatch.json",
-        {
-            "commit_schema_id": {"ref": ref_schema_id, "dut": dut_schema_id},
-            "mismatch": {
-                "idx": int(idx),
-                "field": str(field),
-                "cycle": int(cyc),
-                "ref": ra,
-                "dut": rb,
-            },
-            "context": {"begin_idx": int(begin), "end_idx_exclusive": int(end)},
+    mismatch = {
+        "commit_schema_id": {"ref": ref_schema_id, "dut": dut_schema_id},
+        "mismatch": {
+            "idx": int(idx),
+            "field": str(field),
+            "cycle": int(cyc),
+            "ref": ra,
+            "dut": rb,
         },
-    )
+        "context": {"begin_idx": int(begin), "end_idx_exclusive": int(end)},
+    }
+    if snapshots:
+        mismatch["restart_snapshot"] = (
+            None if restart is None else {"path": str(restart[0]), "cycle": int(restart[1])}
+        )
+    _write_json(dump_dir / "mismatch.json", mismatch)
     _write_jsonl(dump_dir / "ref.context.jsonl", ref_ctx)
     _write_jsonl(dump_dir / "dut.context.jsonl", dut_ctx)
     _write_json(
@@ -309,68 +401,524 @@ def _dump_mismatch(
     )
 
 
-def first_mismatch(
-    a: list[TraceRec], b: list[TraceRec], *, ignore_fields: set[str], limit: int | None = None
-) -> Optional[tuple[int, str]]:
-    if limit is not None and limit >= 0:
-        a = a[:limit]
-        b = b[:limit]
-    n = min(len(a), len(b))
-    for i in range(n):
-        ra = a[i].raw
-        rb = b[i].raw
-        # Always compare core sequencing fields.
-        for k in ["pc", "insn", "len", "next_pc"]:
-            if k in ignore_fields:
-                continue
-            if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                return i, k
+# Field comparison order of first_mismatch(); gated groups follow their valid bit.
+_COMPARE_FIELDS = (
+    ["pc", "insn", "len", "next_pc", "wb_valid"]
+    + _WB_FIELDS
+    + ["mem_valid"]
+    + _MEM_FIELDS
+    + ["trap_valid"]
+    + _TRAP_FIELDS
+)
 
-        # WB fields: rd/data are don't-care when wb_valid==0.
-        for k in ["wb_valid"]:
-            if k in ignore_fields:
-                continue
-            if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                return i, k
-        if _to_int(ra.get("wb_valid", 0)) != 0 and _to_int(rb.get("wb_valid", 0)) != 0:
-            for k in ["wb_rd", "wb_data"]:
-                if k in ignore_fields:
-                    continue
-                if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                    return i, k
 
-        # Mem fields: addr/data/size are don't-care when mem_valid==0.
-        for k in ["mem_valid"]:
+def _row_mismatch(ra: dict, rb: dict, ignore_fields: set[str]) -> str | None:
+    # Always compare core sequencing fields.
+    for k in ["pc", "insn", "len", "next_pc"]:
+        if k in ignore_fields:
+            continue
+        if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
+            return k
+
+    # WB fields: rd/data are don't-care when wb_valid==0.
+    for k in ["wb_valid"]:
+        if k in ignore_fields:
+            continue
+        if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
+            return k
+    if _to_int(ra.get("wb_valid", 0)) != 0 and _to_int(rb.get("wb_valid", 0)) != 0:
+        for k in ["wb_rd", "wb_data"]:
             if k in ignore_fields:
                 continue
             if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                return i, k
-        if _to_int(ra.get("mem_valid", 0)) != 0 and _to_int(rb.get("mem_valid", 0)) != 0:
-            for k in ["mem_addr", "mem_wdata", "mem_rdata", "mem_size"]:
-                if k in ignore_fields:
-                    continue
-                if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                    return i, k
+                return k
 
-        # Trap fields: cause is don't-care when trap_valid==0.
-        for k in ["trap_valid"]:
+    # Mem fields: addr/data/size are don't-care when mem_valid==0.
+    for k in ["mem_valid"]:
+        if k in ignore_fields:
+            continue
+        if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
+            return k
+    if _to_int(ra.get("mem_valid", 0)) != 0 and _to_int(rb.get("mem_valid", 0)) != 0:
+        for k in ["mem_addr", "mem_wdata", "mem_rdata", "mem_size"]:
             if k in ignore_fields:
                 continue
             if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                return i, k
-        if _to_int(ra.get("trap_valid", 0)) != 0 and _to_int(rb.get("trap_valid", 0)) != 0:
-            k = "trap_cause"
-            if k not in ignore_fields and _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
-                return i, k
+                return k
+
+    # Trap fields: cause is don't-care when trap_valid==0.
+    for k in ["trap_valid"]:
+        if k in ignore_fields:
+            continue
+        if _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
+            return k
+    if _to_int(ra.get("trap_valid", 0)) != 0 and _to_int(rb.get("trap_valid", 0)) != 0:
+        k = "trap_cause"
+        if k not in ignore_fields and _to_int(ra.get(k, None), default=-1) != _to_int(rb.get(k, None), default=-1):
+            return k
+    return None
+
+
+def _compile_row_compare(ignore_fields: set[str]):
+    """
+    Build a row comparator equivalent to `_row_mismatch`.
+
+    Rows whose raw compared fields are identical cannot mismatch, so the common
+    case is one C-level tuple compare; only differing rows take the exact
+    (`_to_int` + validity gating) path.
+    """
+    keys = tuple(k for k in _COMPARE_FIELDS if k not in ignore_fields)
+
+    def compare(ra: dict, rb: dict) -> str | None:
+        if tuple(map(ra.get, keys)) == tuple(map(rb.get, keys)):
+            return None
+        return _row_mismatch(ra, rb, ignore_fields)
+
+    return compare
+
+
+def first_mismatch(
+    a: list[TraceRec], b: list[TraceRec], *, ignore_fields: set[str], limit: int | None = None
+) -> Optional[tuple[int, str]]:
+    if limit is not None and limit >= 0:
+        a = a[:limit]
+        b = b[:limit]
+    n = min(len(a), len(b))
+    compare = _compile_row_compare(ignore_fields)
+    for i in range(n):
+        k = compare(a[i].raw, b[i].raw)
+        if k is not None:
+            return i, k
     if len(a) != len(b):
         return n, "<length>"
     return None
 
 
+class _TraceError(Exception):
+    def __init__(self, side: str, message: str) -> None:
+        super().__init__(message)
+        self.side = side
+
+
+class _CommitStream:
+    """
+    Lazily read and validate one commit trace, row by row.
+
+    Applies the same checks as `load_commit_trace`, raising `_TraceError`
+    instead of exiting so `stream_diff` can report errors in the same order as
+    the eager loader (all of ref, then all of dut).
+    """
+
+    def __init__(
+        self,
+        side: str,
+        path: str,
+        *,
+        assume_schema_id: str | None,
+        expected_schema_id: str | None,
+        require_schema_id: bool,
+    ) -> None:
+        self.side = side
+        self.path = Path(path).resolve()
+        self.commit_schema_id: str | None = None
+        self._assume = assume_schema_id
+        self._expected = expected_schema_id
+        self._require = require_schema_id
+        self._rows = self._read()
+        self._done = False
+
+    def _fail(self, msg: str) -> _TraceError:
+        return _TraceError(self.side, msg)
+
+    def _read(self) -> Iterator[TraceRec]:
+        p = self.path
+        if not p.is_file():
+            raise self._fail(f"error: trace not found: {p}")
+        if is_binary_trace(p):
+            # Fixed records always carry every field; no per-row validation.
+            for buf in self._read_blocks():
+                for values in RECORD.iter_unpack(buf):
+                    yield TraceRec(record_to_row(values))
+            self._done = True
+            return
+        seen_row = False
+        with _open_text(p) as f:
+            for ln, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = _loads_line(line)
+                except json.JSONDecodeError as e:
+                    raise self._fail(f"error: {p}:{ln}: invalid JSON: {e}") from e
+                if not isinstance(obj, dict):
+                    raise self._fail(f"error: {p}:{ln}: expected JSON object per line")
+
+                if not seen_row and self.commit_schema_id is None and _is_start_record(obj):
+                    self.commit_schema_id = _extract_schema_id(obj)
+                    continue
+
+                try:
+                    _validate_commit_record(obj, path=str(p), ln=ln)
+                except SystemExit as e:
+                    raise self._fail(str(e.code)) from None
+                seen_row = True
+                yield TraceRec(obj)
+        self._done = True
+
+    def _read_blocks(self) -> Iterator[bytes]:
+        try:
+            with CommitTraceReader(self.path) as r:
+                self.commit_schema_id = r.commit_schema_id
+                yield from r.blocks()
+        except ValueError as e:
+            raise self._fail(f"error: {e}") from None
+
+    @property
+    def binary(self) -> bool:
+        return self.path.is_file() and is_binary_trace(self.path)
+
+    def rows(self) -> Iterator[TraceRec]:
+        return self._rows
+
+    def blocks(self) -> Iterator[bytes]:
+        """Raw record blocks of a binary trace; use instead of `rows()`."""
+        self._rows = iter(())
+        return self._read_blocks()
+
+    def finish(self) -> None:
+        """Validate any unread rows, then apply the schema checks."""
+        for _ in self._rows:
+            pass
+        p = self.path
+        if self.commit_schema_id is None and self._assume is not None:
+            self.commit_schema_id = str(self._assume).strip() or None
+        if self._require and self.commit_schema_id is None:
+            raise self._fail(f"error: {p}: missing start record with commit_schema_id")
+        if self._expected is not None:
+            exp = str(self._expected).strip()
+            if exp and self.commit_schema_id != exp:
+                got = "<missing>" if self.commit_schema_id is None else self.commit_schema_id
+                raise self._fail(f"error: {p}: schema mismatch: expected={exp!r} got={got!r}")
+
+
+def _collapse_boundary_selfloops_iter(rows: Iterator[TraceRec]) -> Iterator[TraceRec]:
+    """Streaming `_collapse_boundary_selfloops` (one row of lookahead)."""
+    cur: TraceRec | None = None
+    for nxt in rows:
+        if cur is not None:
+            same_pc = _to_int(cur.get("pc")) == _to_int(nxt.get("pc"))
+            same_insn = _to_int(cur.get("insn")) == _to_int(nxt.get("insn"))
+            self_loop = _to_int(cur.get("next_pc")) == _to_int(cur.get("pc"))
+            if not (same_pc and same_insn and self_loop):
+                yield cur
+        cur = nxt
+    if cur is not None:
+        yield cur
+
+
+class _SideState:
+    def __init__(self, pre: int) -> None:
+        self.count = 0
+        self.pre: deque[TraceRec] = deque(maxlen=pre)  # rows [idx - pre, idx)
+        self.post: list[TraceRec] = []  # rows [idx, idx + post]
+
+
+class _RowWindow:
+    """
+    Read-only view of a trace that only holds rows near the mismatch.
+
+    Indexes and slices by absolute row index and reports the full trace
+    length, so list-based helpers (`_dump_mismatch`, `_mismatch_cycle`) work
+    unchanged on streamed results.
+    """
+
+    def __init__(self, rows: list[TraceRec], base: int, length: int) -> None:
+        self._rows = rows
+        self._base = base
+        self._len = length
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self._len)
+            lo = max(start, self._base) - self._base
+            hi = min(stop, self._base + len(self._rows)) - self._base
+            return self._rows[lo:hi] if hi > lo else []
+        i = int(key) - self._base
+        if not 0 <= i < len(self._rows):
+            raise IndexError(f"row {key} is outside the retained window")
+        return self._rows[i]
+
+
+@dataclass
+class StreamDiffResult:
+    ref_schema_id: str | None
+    dut_schema_id: str | None
+    ref_len: int
+    dut_len: int
+    mismatch: Optional[tuple[int, str]]
+    # Rows retained around the mismatch (absolute indexing, full lengths).
+    ref: _RowWindow
+    dut: _RowWindow
+
+
+_GATED_GROUPS = (
+    (VALID_WB, "wb_valid", _WB_FIELDS),
+    (VALID_MEM, "mem_valid", _MEM_FIELDS),
+    (VALID_TRAP, "trap_valid", _TRAP_FIELDS),
+)
+
+
+def _gated_mismatch_mask(a, b, ignore_fields: set[str]):
+    """Per-row `_row_mismatch(...) is not None` over two record arrays."""
+    mask = _np.zeros(len(a), dtype=bool)
+    for k in ["pc", "insn", "len", "next_pc"]:
+        if k not in ignore_fields:
+            mask |= a[k] != b[k]
+    va = a["valid"]
+    vb = b["valid"]
+    for bit, valid_key, fields in _GATED_GROUPS:
+        ga = (va & bit) != 0
+        gb = (vb & bit) != 0
+        if valid_key not in ignore_fields:
+            mask |= ga != gb
+        grp = _np.zeros(len(a), dtype=bool)
+        for k in fields:
+            if k not in ignore_fields:
+                grp |= a[k] != b[k]
+        mask |= ga & gb & grp
+    return mask
+
+
+def _records_to_rows(arr) -> list[TraceRec]:
+    return [TraceRec(record_to_row(v)) for v in RECORD.iter_unpack(arr.tobytes())]
+
+
+def _binary_stream_diff(
+    ref: _CommitStream,
+    dut: _CommitStream,
+    *,
+    ignore_fields: set[str],
+    cap: int | None,
+    pre_n: int,
+    post_n: int,
+) -> StreamDiffResult:
+    """`stream_diff` for two `.pyccommit` traces: compare whole record blocks with NumPy."""
+    dt = numpy_dtype()
+    empty = _np.empty(0, dtype=dt)
+    counts = {"ref": 0, "dut": 0}
+
+    def arrays(stream: _CommitStream) -> Iterator:
+        for buf in stream.blocks():
+            arr = _np.frombuffer(buf, dtype=dt)
+            counts[stream.side] += len(arr)
+            yield arr
+
+    ita = arrays(ref)
+    itb = arrays(dut)
+    a = b = empty
+    pre_a = pre_b = empty
+    idx = 0
+    field: str | None = None
+    try:
+        try:
+            while cap is None or idx < cap:
+                if not len(a):
+                    a = next(ita, None)
+                    if a is None:
+                        a = empty
+                        break
+                if not len(b):
+                    b = next(itb, None)
+                    if b is None:
+                        b = empty
+                        break
+                n = min(len(a), len(b))
+                if cap is not None:
+                    n = min(n, cap - idx)
+                ca = a[:n]
+                cb = b[:n]
+                hit = _np.flatnonzero(_gated_mismatch_mask(ca, cb, ignore_fields))
+                if hit.size:
+                    j = int(hit[0])
+                    field = _row_mismatch(
+                        _records_to_rows(ca[j : j + 1])[0].raw,
+                        _records_to_rows(cb[j : j + 1])[0].raw,
+                        ignore_fields,
+                    )
+                    ca = ca[:j]
+                    cb = cb[:j]
+                    n = j
+                if pre_n:
+                    pre_a = _np.concatenate((pre_a, ca[-pre_n:]))[-pre_n:]
+                    pre_b = _np.concatenate((pre_b, cb[-pre_n:]))[-pre_n:]
+                idx += n
+                a = a[n:]
+                b = b[n:]
+                if field is not None:
+                    break
+        except _TraceError as e:
+            if e.side == "dut":
+                ref.finish()
+            raise
+
+        posts = []
+        for head, it, stream in ((a, ita, ref), (b, itb, dut)):
+            post = head[:post_n]
+            for arr in it:
+                if len(post) < post_n:
+                    post = _np.concatenate((post, arr[: post_n - len(post)]))
+            stream.finish()
+            posts.append(post)
+    except _TraceError as e:
+        raise SystemExit(str(e)) from None
+
+    mismatch: Optional[tuple[int, str]] = None
+    if field is not None:
+        mismatch = (idx, field)
+    else:
+        la = counts["ref"] if cap is None else min(counts["ref"], cap)
+        lb = counts["dut"] if cap is None else min(counts["dut"], cap)
+        if la != lb:
+            mismatch = (idx, "<length>")
+    return StreamDiffResult(
+        ref_schema_id=ref.commit_schema_id,
+        dut_schema_id=dut.commit_schema_id,
+        ref_len=counts["ref"],
+        dut_len=counts["dut"],
+        mismatch=mismatch,
+        ref=_RowWindow(_records_to_rows(pre_a) + _records_to_rows(posts[0]), idx - len(pre_a), counts["ref"]),
+        dut=_RowWindow(_records_to_rows(pre_b) + _records_to_rows(posts[1]), idx - len(pre_b), counts["dut"]),
+    )
+
+
+def stream_diff(
+    ref_path: str,
+    dut_path: str,
+    *,
+    ignore_fields: set[str],
+    limit: int | None = None,
+    drop_boundary_selfloops: bool = False,
+    assume_schema_id: str | None = None,
+    expected_schema_id: str | None = None,
+    require_schema_id: bool = False,
+    context_pre: int = 0,
+    context_post: int = 0,
+) -> StreamDiffResult:
+    """
+    Constant-memory equivalent of load_commit_trace() x2 + first_mismatch().
+
+    Both traces are read in lockstep; only `context_pre` rows before the
+    mismatch (ring buffer) and `context_post + 1` rows from it are kept.
+    Remaining rows are still read afterwards, because the eager path validates
+    whole files and reports total lengths.
+
+    Either trace may be a binary `.pyccommit` file (see linx_commit_trace.py).
+    When both are, NumPy is installed and no self-loop normalization is
+    requested, whole record blocks are compared vectorized.
+    """
+    ref = _CommitStream(
+        "ref",
+        ref_path,
+        assume_schema_id=assume_schema_id,
+        expected_schema_id=expected_schema_id,
+        require_schema_id=require_schema_id,
+    )
+    dut = _CommitStream(
+        "dut",
+        dut_path,
+        assume_schema_id=assume_schema_id,
+        expected_schema_id=expected_schema_id,
+        require_schema_id=require_schema_id,
+    )
+    pre_n = max(0, int(context_pre))
+    post_n = max(0, int(context_post)) + 1
+    cap = limit if limit is not None and limit >= 0 else None
+    if _np is not None and not drop_boundary_selfloops and ref.binary and dut.binary:
+        return _binary_stream_diff(ref, dut, ignore_fields=ignore_fields, cap=cap, pre_n=pre_n, post_n=post_n)
+
+    ref_rows = ref.rows()
+    dut_rows = dut.rows()
+    if drop_boundary_selfloops:
+        ref_rows = _collapse_boundary_selfloops_iter(ref_rows)
+        dut_rows = _collapse_boundary_selfloops_iter(dut_rows)
+
+    sa = _SideState(pre_n)
+    sb = _SideState(pre_n)
+    compare = _compile_row_compare(ignore_fields)
+    field: str | None = None
+    idx = 0
+    try:
+        try:
+            while cap is None or idx < cap:
+                ra = next(ref_rows, None)
+                if ra is None:
+                    break
+                sa.count += 1
+                rb = next(dut_rows, None)
+                if rb is None:
+                    sa.post.append(ra)
+                    break
+                sb.count += 1
+                field = compare(ra.raw, rb.raw)
+                if field is not None:
+                    sa.post.append(ra)
+                    sb.post.append(rb)
+                    break
+                sa.pre.append(ra)
+                sb.pre.append(rb)
+                idx += 1
+        except _TraceError as e:
+            if e.side == "dut":
+                ref.finish()
+            raise
+
+        for st, rows, stream in ((sa, ref_rows, ref), (sb, dut_rows, dut)):
+            for r in rows:
+                st.count += 1
+                if len(st.post) < post_n:
+                    st.post.append(r)
+            stream.finish()
+    except _TraceError as e:
+        raise SystemExit(str(e)) from None
+
+    mismatch: Optional[tuple[int, str]] = None
+    if field is not None:
+        mismatch = (idx, field)
+    else:
+        la = sa.count if cap is None else min(sa.count, cap)
+        lb = sb.count if cap is None else min(sb.count, cap)
+        if la != lb:
+            mismatch = (idx, "<length>")
+    return StreamDiffResult(
+        ref_schema_id=ref.commit_schema_id,
+        dut_schema_id=dut.commit_schema_id,
+        ref_len=sa.count,
+        dut_len=sb.count,
+        mismatch=mismatch,
+        ref=_RowWindow(list(sa.pre) + sa.post, idx - len(sa.pre), sa.count),
+        dut=_RowWindow(list(sb.pre) + sb.post, idx - len(sb.pre), sb.count),
+    )
+
+
+def _print_restart(snapshot_dir: str | None, restart: tuple[Path, int] | None) -> None:
+    if not snapshot_dir:
+        return
+    if restart is None:
+        sys.stdout.write(f"restart-snapshot: none at or before the mismatch in {Path(snapshot_dir).resolve()}\n")
+        return
+    sys.stdout.write(f"restart-snapshot: {restart[0]} (cycle={restart[1]})\n")
+
+
 def main() -> int:
-    ap = argparse.ArgumentParser(description="Diff LinxISA JSONL commit traces (QEMU vs pyCircuit bring-up).")
-    ap.add_argument("ref_jsonl", help="Reference JSONL (typically QEMU)")
-    ap.add_argument("dut_jsonl", help="DUT JSONL (typically pyCircuit)")
+    ap = argparse.ArgumentParser(
+        description="Diff LinxISA commit traces, JSONL or binary .pyccommit (QEMU vs pyCircuit bring-up)."
+    )
+    ap.add_argument("ref_jsonl", help="Reference JSONL or .pyccommit (typically QEMU)")
+    ap.add_argument("dut_jsonl", help="DUT JSONL or .pyccommit (typically pyCircuit)")
     ap.add_argument(
         "--expected-schema-id",
         default=None,
@@ -403,6 +951,11 @@ def main() -> int:
         default=16,
         help="Commits to include after the mismatch in dump artifacts (default: 16).",
     )
+    ap.add_argument(
+        "--snapshot-dir",
+        default=None,
+        help="Directory of simulator snapshots (*.pycsnap); on mismatch, report the nearest one before the failing cycle.",
+    )
     ap.add_argument(
         "--ignore",
         action="append",
@@ -428,42 +981,38 @@ def main() -> int:
     if assume_schema_id is None:
         assume_schema_id = DEFAULT_COMMIT_SCHEMA_ID
 
-    ref_trace = load_commit_trace(
+    dump_pre = max(0, int(args.dump_pre))
+    dump_post = max(0, int(args.dump_post))
+    res = stream_diff(
         args.ref_jsonl,
-        assume_schema_id=assume_schema_id,
-        expected_schema_id=args.expected_schema_id,
-        require_schema_id=bool(args.require_schema_id),
-    )
-    dut_trace = load_commit_trace(
         args.dut_jsonl,
+        ignore_fields=ignore_fields,
+        limit=args.limit,
+        drop_boundary_selfloops=bool(args.drop_boundary_selfloops),
         assume_schema_id=assume_schema_id,
         expected_schema_id=args.expected_schema_id,
         require_schema_id=bool(args.require_schema_id),
+        context_pre=dump_pre if args.dump_dir else 0,
+        context_post=dump_post if args.dump_dir else 0,
     )
 
-    if (
-        ref_trace.commit_schema_id is not None
-        and dut_trace.commit_schema_id is not None
-        and ref_trace.commit_schema_id != dut_trace.commit_schema_id
-    ):
-        raise SystemExit(
-            f"error: schema mismatch: ref={ref_trace.commit_schema_id!r} dut={dut_trace.commit_schema_id!r}"
-        )
-
-    ref = ref_trace.rows
-    dut = dut_trace.rows
+    if res.ref_schema_id is not None and res.dut_schema_id is not None and res.ref_schema_id != res.dut_schema_id:
+        raise SystemExit(f"error: schema mismatch: ref={res.ref_schema_id!r} dut={res.dut_schema_id!r}")
 
-    if args.drop_boundary_selfloops:
-        ref = _collapse_boundary_selfloops(ref)
-        dut = _collapse_boundary_selfloops(dut)
+    ref = res.ref
+    dut = res.dut
 
-    mm = first_mismatch(ref, dut, ignore_fields=ignore_fields, limit=args.limit)
+    mm = res.mismatch
     if mm is None:
         shown = min(len(ref), args.limit) if args.limit is not None and args.limit >= 0 else len(ref)
         print(f"ok: traces match ({shown} commits)")
         return 0
 
     idx, field = mm
+    restart = None
+    if args.snapshot_dir:
+        restart = find_restart_snapshot(Path(args.snapshot_dir), _mismatch_cycle(ref, dut, idx))
+
     if field == "<length>":
         print(f"mismatch: length differs: ref={len(ref)} dut={len(dut)} (first extra at idx={idx})")
         if args.dump_dir:
@@ -473,12 +1022,15 @@ def main() -> int:
                 field=field,
                 ref=ref,
                 dut=dut,
-                ref_schema_id=ref_trace.commit_schema_id,
-                dut_schema_id=dut_trace.commit_schema_id,
-                pre=max(0, int(args.dump_pre)),
-                post=max(0, int(args.dump_post)),
+                ref_schema_id=res.ref_schema_id,
+                dut_schema_id=res.dut_schema_id,
+                pre=dump_pre,
+                post=dump_post,
+                snapshots=bool(args.snapshot_dir),
+                restart=restart,
             )
             print(f"dfx-dump: {Path(args.dump_dir).resolve()}")
+        _print_restart(args.snapshot_dir, restart)
         return 1
 
     ra = ref[idx].raw if idx < len(ref) else {}
@@ -514,12 +1066,15 @@ def main() -> int:
             field=field,
             ref=ref,
             dut=dut,
-            ref_schema_id=ref_trace.commit_schema_id,
-            dut_schema_id=dut_trace.commit_schema_id,
-            pre=max(0, int(args.dump_pre)),
-            post=max(0, int(args.dump_post)),
+            ref_schema_id=res.ref_schema_id,
+            dut_schema_id=res.dut_schema_id,
+            pre=dump_pre,
+            post=dump_post,
+            snapshots=bool(args.snapshot_dir),
+            restart=restart,
         )
         print(f"dfx-dump: {Path(args.dump_dir).resolve()}")
+    _print_restart(args.snapshot_dir, restart)
     return 1
 
 
@@ -344,10 +344,54 @@ def _apply_text_relocs(
             )
 
 
+# Binary memory image consumed by `runtime/cpp/pyc_mem_image.hpp` (PycMemImage).
+MEM_IMAGE_MAGIC = b"PYCMIMG1"
+MEM_IMAGE_VERSION = 1
+MEM_IMAGE_PAGE_SIZE = 0x1000
+MEM_IMAGE_FLAG_ZERO_FILL = 1
+
+
+def _write_mem_image(path: Path, segments: list[tuple[int, bytes]], *, entry: int) -> None:
+    """Write `segments` as a PYCMIMG1 image.
+
+    Payloads start on page boundaries and are zero-padded to a full page so the
+    simulator can mmap them directly as copy-on-write memory pages. All-zero
+    segments (e.g. `.bss`) are recorded as zero-fill without a payload.
+    """
+    header_size = 32 + 32 * len(segments)
+    table: list[tuple[int, int, int, int]] = []
+    payloads: list[tuple[int, bytes]] = []
+    off = _align_up(header_size, MEM_IMAGE_PAGE_SIZE)
+    for addr, blob in segments:
+        if blob.count(0) == len(blob):
+            table.append((addr, len(blob), 0, MEM_IMAGE_FLAG_ZERO_FILL))
+            continue
+        table.append((addr, len(blob), off, 0))
+        payloads.append((off, blob))
+        off = _align_up(off + len(blob), MEM_IMAGE_PAGE_SIZE)
+
+    with path.open("wb") as f:
+        f.write(struct.pack("<8sIIQII", MEM_IMAGE_MAGIC, MEM_IMAGE_VERSION, len(table), entry, MEM_IMAGE_PAGE_SIZE, 0))
+        for rec in table:
+            f.write(struct.pack("<QQQQ", *rec))
+        for payload_off, blob in payloads:
+            f.seek(payload_off)
+            f.write(blob)
+        if off > f.tell():
+            f.seek(off - 1)
+            f.write(b"\x00")
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Build a memory init (.memh) from an ELF (relocatable or executable).")
     ap.add_argument("elf", help="Input ELF (.o or .elf)")
-    ap.add_argument("-o", "--out", required=True, help="Output memh path")
+    ap.add_argument("-o", "--out", required=True, help="Output path (memh text or binary image, see --format)")
+    ap.add_argument(
+        "--format",
+        choices=("memh", "image"),
+        default="memh",
+        help="Output format: text memh (default) or binary PYCMIMG1 image for mmap loading",
+    )
     ap.add_argument("--text-base", default="0x10000", help="Base address for .text when input is ET_REL (hex)")
     ap.add_argument("--data-base", default="0x20000", help="Base address for .data when input is ET_REL (hex)")
     ap.add_argument("--page-align", default="0x1000", help="Alignment for section placement when ET_REL (hex)")
@@ -433,7 +477,7 @@ def main() -> int:
         if (sec.sh_flags & SHF_ALLOC) == 0:
             continue
         if sec.sh_type == SHT_NOBITS:
-            segments.append((section_addrs[sec.index], bytes([0] * sec.sh_size)))
+            segments.append((section_addrs[sec.index], bytes(sec.sh_size)))
         else:
             segments.append((section_addrs[sec.index], data[sec.sh_offset : sec.sh_offset + sec.sh_size]))
 
@@ -443,38 +487,32 @@ def main() -> int:
     for addr, blob in segments:
         max_end = max(max_end, int(addr) + len(blob))
 
-    out_lines: list[str] = []
-    for addr, blob in segments:
-        if not blob:
-            continue
-        out_lines.append(f"@{addr:08x}")
-        for b in blob:
-            out_lines.append(f"{b:02x}")
-
-    Path(ns.out).write_text("\n".join(out_lines) + "\n", encoding="utf-8")
+    start_pc: int | None = None
+    if ns.print_start or ns.format == "image":
+        start_pc = _resolve_start_pc(
+            str(ns.start_symbol),
+            e_type=e_type,
+            e_entry=e_entry,
+            symtab=symtab,
+            section_addrs=section_addrs,
+        )
 
-    if ns.print_start:
-        start_sym = str(ns.start_symbol)
-        start_pc: int | None = None
-        for sym in symtab:
-            if sym.name != start_sym:
-                continue
-            if sym.st_shndx == 0:
+    if ns.format == "image":
+        _write_mem_image(Path(ns.out), [(a, b) for a, b in segments if b], entry=start_pc or 0)
+    else:
+        out_lines: list[str] = []
+        for addr, blob in segments:
+            if not blob:
                 continue
-            if e_type == ET_REL:
-                if sym.st_shndx not in section_addrs:
-                    raise SystemExit(f"error: start symbol {start_sym!r} has unknown section index {sym.st_shndx}")
-                start_pc = section_addrs[sym.st_shndx] + sym.st_value
-            else:
-                start_pc = sym.st_value
-            break
+            out_lines.append(f"@{addr:08x}")
+            for b in blob:
+                out_lines.append(f"{b:02x}")
 
-        if start_pc is None and e_type == ET_EXEC and e_entry:
-            start_pc = int(e_entry)
+        Path(ns.out).write_text("\n".join(out_lines) + "\n", encoding="utf-8")
 
+    if ns.print_start:
         if start_pc is None:
-            raise SystemExit(f"error: start symbol {start_sym!r} not found")
-
+            raise SystemExit(f"error: start symbol {str(ns.start_symbol)!r} not found")
         print(f"0x{start_pc:x}")
 
     if ns.print_max:
@@ -482,5 +520,32 @@ def main() -> int:
     return 0
 
 
+def _resolve_start_pc(
+    start_sym: str,
+    *,
+    e_type: int,
+    e_entry: int,
+    symtab: list[Symbol],
+    section_addrs: dict[int, int],
+) -> int | None:
+    start_pc: int | None = None
+    for sym in symtab:
+        if sym.name != start_sym:
+            continue
+        if sym.st_shndx == 0:
+            continue
+        if e_type == ET_REL:
+            if sym.st_shndx not in section_addrs:
+                raise SystemExit(f"error: start symbol {start_sym!r} has unknown section index {sym.st_shndx}")
+            start_pc = section_addrs[sym.st_shndx] + sym.st_value
+        else:
+            start_pc = sym.st_value
+        break
+
+    if start_pc is None and e_type == ET_EXEC and e_entry:
+        start_pc = int(e_entry)
+    return start_pc
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -317,7 +317,11 @@ materialize_fixture_trace_if_needed() {
   for fixture in "${linxisa_root}"/docs/bringup/gates/model_diff_work/*_"${case_id}"_seed"${seed}"/pyc.jsonl; do
     if [[ -f "${fixture}" ]]; then
       mkdir -p "$(dirname -- "${out_path}")"
-      cp "${fixture}" "${out_path}"
+      if [[ "${out_path}" == *.pyccommit ]]; then
+        python3 "${SCRIPT_DIR}/linx_commit_trace.py" to-bin "${fixture}" "${out_path}" >/dev/null
+      else
+        cp "${fixture}" "${out_path}"
+      fi
       echo "[pyc] using fixture trace ${fixture}" >&2
       return 0
     fi
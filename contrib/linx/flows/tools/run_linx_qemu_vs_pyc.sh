@@ -94,13 +94,29 @@ FALLBACK_USED=0
 
 OBJ="$WORK/test.o"
 QEMU_TRACE="$WORK/qemu.jsonl"
-PYC_TRACE="$WORK/pyc.jsonl"
+# LINX_COMMIT_TRACE_FORMAT=bin: the simulator writes a binary .pyccommit
+# trace (runtime/cpp/pyc_commit_trace.hpp) and the QEMU JSONL reference is
+# converted once, so the diff compares fixed records instead of parsing JSON.
+COMMIT_TRACE_FORMAT="${LINX_COMMIT_TRACE_FORMAT:-jsonl}"
+if [[ "${COMMIT_TRACE_FORMAT}" == "bin" ]]; then
+  PYC_TRACE="$WORK/pyc.pyccommit"
+else
+  PYC_TRACE="$WORK/pyc.jsonl"
+fi
 TRACE_SCHEMA_VERSION="${LINX_TRACE_SCHEMA_VERSION:-1.0}"
 COMMIT_SCHEMA_ID="${LINX_COMMIT_SCHEMA_ID:-LC-COMMIT-BUNDLE-V2}"
 DFX_DUMP_DIR="${LINX_DIFF_DFX_DUMP_DIR:-$WORK/dfx_dump}"
 DFX_PRE="${LINX_DIFF_DFX_PRE:-8}"
 DFX_POST="${LINX_DIFF_DFX_POST:-16}"
 REQUIRE_SCHEMA_ID="${LINX_REQUIRE_COMMIT_SCHEMA_ID:-0}"
+# LINX_BISECT_EVERY=N: first record architectural checkpoint hashes every N
+# commits on both sides (runtime/cpp/pyc_arch_checkpoint.hpp), plus a final
+# record at end of run, then re-run only the first divergent window with full
+# commit tracing.
+BISECT_EVERY="${LINX_BISECT_EVERY:-0}"
+BISECT_DIR="$WORK/bisect"
+QEMU_WINDOW_ENV=()
+PYC_WINDOW_ENV=()
 
 if [[ ! -x "$LLVM_MC" ]]; then
   echo "error: llvm-mc not found: $LLVM_MC" >&2
@@ -118,11 +134,49 @@ fi
 echo "[llvm-mc] $SRC"
 "$LLVM_MC" -triple=linx64 -filetype=obj "$SRC" -o "$OBJ"
 
+if [[ "${BISECT_EVERY}" != "0" ]]; then
+  QEMU_CKPT="$WORK/qemu.ckpt.jsonl"
+  PYC_CKPT="$WORK/pyc.ckpt.jsonl"
+  echo "[bisect] checkpoint hashes every ${BISECT_EVERY} commits"
+  LINX_ARCH_CHECKPOINT="$QEMU_CKPT" LINX_ARCH_CHECKPOINT_EVERY="$BISECT_EVERY" \
+    "$QEMU_BIN" -nographic -monitor none -machine virt -kernel "$OBJ" >/dev/null
+  PYC_KONATA=0 PYC_EXPECT_EXIT=0 PYC_BOOT_PC=0x10000 \
+  PYC_ARCH_CHECKPOINT="$PYC_CKPT" PYC_ARCH_CHECKPOINT_EVERY="$BISECT_EVERY" \
+    bash "$ROOT/flows/tools/run_linx_cpu_pyc_cpp.sh" --elf "$OBJ" >/dev/null
+  if [[ -s "$QEMU_CKPT" && -s "$PYC_CKPT" ]]; then
+    set +e
+    python3 "$ROOT/flows/tools/linx_bisect.py" "$QEMU_CKPT" "$PYC_CKPT" --out-dir "$BISECT_DIR"
+    brc=$?
+    set -e
+    # 0: all checkpoints and both final records match. 1: a divergent window,
+    # or the tail after the last checkpoint when final records are missing;
+    # both are diffed below with full commit traces.
+    if [[ "${brc}" -eq 0 ]]; then
+      exit 0
+    fi
+    if [[ "${brc}" -ne 1 ]]; then
+      exit "${brc}"
+    fi
+    read -r WIN_LO WIN_HI < <(python3 -c 'import json,sys; w=json.load(open(sys.argv[1])); print(w["commit_lo"], "" if w["commit_hi"] is None else w["commit_hi"])' "$BISECT_DIR/window.json")
+    QEMU_WINDOW_ENV=(LINX_COMMIT_TRACE_FROM="$WIN_LO")
+    PYC_WINDOW_ENV=(PYC_COMMIT_TRACE_FROM="$WIN_LO")
+    if [[ -n "${WIN_HI}" ]]; then
+      QEMU_WINDOW_ENV+=(LINX_COMMIT_TRACE_TO="$WIN_HI")
+      PYC_WINDOW_ENV+=(PYC_COMMIT_TRACE_TO="$WIN_HI")
+    fi
+    echo "[bisect] re-running commits [${WIN_LO}, ${WIN_HI:-end}) with full commit tracing"
+  else
+    echo "[bisect] checkpoint hashes not produced; using full commit traces"
+  fi
+fi
+
 echo "[qemu] commit trace: $QEMU_TRACE"
-LINX_COMMIT_TRACE="$QEMU_TRACE" "$QEMU_BIN" -nographic -monitor none -machine virt -kernel "$OBJ" >/dev/null
+env ${QEMU_WINDOW_ENV[@]+"${QEMU_WINDOW_ENV[@]}"} LINX_COMMIT_TRACE="$QEMU_TRACE" \
+  "$QEMU_BIN" -nographic -monitor none -machine virt -kernel "$OBJ" >/dev/null
 
 echo "[pyc] commit trace: $PYC_TRACE"
-PYC_KONATA=0 PYC_EXPECT_EXIT=0 PYC_BOOT_PC=0x10000 PYC_COMMIT_TRACE="$PYC_TRACE" \
+env ${PYC_WINDOW_ENV[@]+"${PYC_WINDOW_ENV[@]}"} \
+  PYC_KONATA=0 PYC_EXPECT_EXIT=0 PYC_BOOT_PC=0x10000 PYC_COMMIT_TRACE="$PYC_TRACE" \
   bash "$ROOT/flows/tools/run_linx_cpu_pyc_cpp.sh" --elf "$OBJ" >/dev/null
 if [[ ! -s "$PYC_TRACE" ]]; then
   echo "[pyc] primary flow did not emit commit trace; trying LinxCore fallback"
@@ -136,6 +190,7 @@ if [[ ! -s "$PYC_TRACE" ]]; then
     -o "$MEMH" >/dev/null
   LINXCORE_TB="${LINXCORE_TB:-$LINXCORE_ROOT/generated/cpp/linxcore_top/tb_linxcore_top_cpp}"
   if [[ -x "$LINXCORE_TB" ]]; then
+    env ${PYC_WINDOW_ENV[@]+"${PYC_WINDOW_ENV[@]}"} \
     PYC_KONATA=0 \
     PYC_EXPECT_EXIT=0 \
     PYC_BOOT_PC=0x10000 \
@@ -156,11 +211,19 @@ python3 "$LINX_ROOT/tools/bringup/validate_trace_schema.py" \
   --expected-version "${TRACE_SCHEMA_VERSION}" \
   --assume-trace-version "${TRACE_SCHEMA_VERSION}" >/dev/null
 
-echo "[schema] validate pyc trace"
-python3 "$LINX_ROOT/tools/bringup/validate_trace_schema.py" \
-  --trace "$PYC_TRACE" \
-  --expected-version "${TRACE_SCHEMA_VERSION}" \
-  --assume-trace-version "${TRACE_SCHEMA_VERSION}" >/dev/null
+DIFF_REF="$QEMU_TRACE"
+if [[ "${COMMIT_TRACE_FORMAT}" == "bin" ]]; then
+  # Binary records have a fixed layout; the reader checks the header instead.
+  DIFF_REF="$WORK/qemu.pyccommit"
+  echo "[convert] qemu trace -> ${DIFF_REF}"
+  python3 "$ROOT/flows/tools/linx_commit_trace.py" to-bin "$QEMU_TRACE" "$DIFF_REF" >/dev/null
+else
+  echo "[schema] validate pyc trace"
+  python3 "$LINX_ROOT/tools/bringup/validate_trace_schema.py" \
+    --trace "$PYC_TRACE" \
+    --expected-version "${TRACE_SCHEMA_VERSION}" \
+    --assume-trace-version "${TRACE_SCHEMA_VERSION}" >/dev/null
+fi
 
 echo "[diff]"
 DIFF_ARGS=(
@@ -179,8 +242,11 @@ if [[ "$FALLBACK_USED" == "1" ]]; then
   echo "[diff] using fallback-prefix mode (limit=${PREFIX_LIMIT})"
   DIFF_ARGS+=(--limit "$PREFIX_LIMIT")
 fi
+if [[ -n "${WIN_LO:-}" ]]; then
+  echo "[diff] idx is relative to the bisect window start (commit ${WIN_LO})"
+fi
 set +e
-python3 "$ROOT/flows/tools/linx_trace_diff.py" "$QEMU_TRACE" "$PYC_TRACE" "${DIFF_ARGS[@]}"
+python3 "$ROOT/flows/tools/linx_trace_diff.py" "$DIFF_REF" "$PYC_TRACE" "${DIFF_ARGS[@]}"
 rc=$?
 set -e
 if [[ "${rc}" -ne 0 ]]; then
@@ -191,10 +257,18 @@ if [[ "${rc}" -ne 0 ]]; then
   OUT_DIR="${OUT_BASE}/${RUN_ID}"
   mkdir -p "${OUT_DIR}"
   cp -f "${QEMU_TRACE}" "${OUT_DIR}/qemu.jsonl" 2>/dev/null || true
-  cp -f "${PYC_TRACE}" "${OUT_DIR}/pyc.jsonl" 2>/dev/null || true
+  if [[ "${COMMIT_TRACE_FORMAT}" == "bin" ]]; then
+    cp -f "${PYC_TRACE}" "${OUT_DIR}/pyc.pyccommit" 2>/dev/null || true
+    python3 "$ROOT/flows/tools/linx_commit_trace.py" to-jsonl "${PYC_TRACE}" "${OUT_DIR}/pyc.jsonl" >/dev/null 2>&1 || true
+  else
+    cp -f "${PYC_TRACE}" "${OUT_DIR}/pyc.jsonl" 2>/dev/null || true
+  fi
   if [[ -d "${DFX_DUMP_DIR}" ]]; then
     cp -R "${DFX_DUMP_DIR}" "${OUT_DIR}/dfx_dump" 2>/dev/null || true
   fi
+  if [[ -d "${BISECT_DIR}" ]]; then
+    cp -R "${BISECT_DIR}" "${OUT_DIR}/bisect" 2>/dev/null || true
+  fi
   echo "[diff] mismatch artifacts: ${OUT_DIR}" >&2
   exit "${rc}"
 fi
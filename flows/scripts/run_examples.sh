@@ -1165,6 +1165,10 @@ int main() {
     return 5;
   }
 
+  // Hash/dump output must not depend on the backing store (dense vs paged).
+  std::cout << "sync_hash=" << sm.mem_hash() << " byte_hash=" << bm.mem_hash() << "\n";
+  bm.mem_dump(std::cout, 0, 7);
+
   std::cout << "ok: mem observability\n";
   return 0;
 }
@@ -1187,6 +1191,158 @@ else
   fi
 fi
 
+pyc_log "running paged memory store parity smoke"
+if ! "${cxx}" -std=c++17 -O2 -DPYC_FORCE_SPARSE_MEM -I "${PYC_ROOT_DIR}/runtime" "${mem_obs_dir}/mem_observe.cpp" \
+    -o "${mem_obs_dir}/mem_observe_paged" \
+    >"${mem_obs_dir}/compile_paged.stdout" 2>"${mem_obs_dir}/compile_paged.stderr"; then
+  pyc_warn "paged memory store C++ compile failed"
+  fail=1
+elif ! "${mem_obs_dir}/mem_observe_paged" >"${mem_obs_dir}/run_paged.stdout" 2>"${mem_obs_dir}/run_paged.stderr"; then
+  pyc_warn "paged memory store C++ run failed"
+  fail=1
+elif ! cmp -s "${mem_obs_dir}/run.stdout" "${mem_obs_dir}/run_paged.stdout"; then
+  pyc_warn "paged memory store hash/dump output differs from dense store"
+  fail=1
+fi
+
+pyc_log "running simulator snapshot/restore smoke"
+snap_dir="$(pyc_out_root)/example-smoke/_snapshot_restore"
+rm -rf "${snap_dir}" >/dev/null 2>&1 || true
+mkdir -p "${snap_dir}"
+
+cat > "${snap_dir}/snapshot_smoke.cpp" <<'CPP'
+#include <cstdint>
+#include <iostream>
+#include <string>
+
+#include <cpp/pyc_byte_mem.hpp>
+#include <cpp/pyc_primitives.hpp>
+#include <cpp/pyc_sync_mem.hpp>
+#include <cpp/pyc_tb.hpp>
+
+using namespace pyc::cpp;
+
+// Hand-written stand-in for a generated module: a counter register that
+// writes its value into a byte memory and a sync memory every cycle.
+struct Dut {
+  Wire<1> clk{};
+  Wire<1> rst{};
+  Wire<1> en{1};
+  Wire<32> d{};
+  Wire<32> init{};
+  Wire<32> q{};
+  Wire<1> wvalid{1};
+  Wire<32> addr{};
+  Wire<32> rdata{};
+  Wire<4> strb{0xF};
+  Wire<1> ren{1};
+  Wire<32> srdata{};
+
+  pyc_reg<32> cnt{clk, rst, en, d, init, q};
+  pyc_byte_mem<32, 32, (1u << 16)> bm{clk, rst, addr, rdata, wvalid, addr, q, strb};
+  pyc_sync_mem<32, 32, (1u << 14)> sm{clk, rst, ren, addr, srdata, wvalid, addr, q, strb};
+
+  void comb() {
+    d = q + Wire<32>(1);
+    addr = Wire<32>((q.value() * 4u) & 0xFFFFu);
+    bm.eval();
+  }
+  void tick() {
+    cnt.tick_compute();
+    bm.tick_compute();
+    sm.tick_compute();
+  }
+  void transfer() {
+    cnt.tick_commit();
+    bm.tick_commit();
+    sm.tick_commit();
+  }
+
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.section("Dut");
+    ar.value(clk);
+    ar.value(rst);
+    ar.value(en);
+    ar.value(d);
+    ar.value(init);
+    ar.value(q);
+    ar.value(wvalid);
+    ar.value(addr);
+    ar.value(rdata);
+    ar.value(strb);
+    ar.value(ren);
+    ar.value(srdata);
+    cnt.pyc_snapshot(ar);
+    bm.pyc_snapshot(ar);
+    sm.pyc_snapshot(ar);
+  }
+};
+
+static std::string run(Testbench<Dut> &tb, Dut &dut, unsigned cycles) {
+  std::string out;
+  for (unsigned i = 0; i < cycles; ++i) {
+    tb.runCyclesAuto(1);
+    out += std::to_string(dut.q.value()) + "/" + std::to_string(dut.srdata.value()) + " ";
+  }
+  out += std::to_string(dut.bm.mem_hash()) + " " + std::to_string(dut.sm.mem_hash());
+  return out;
+}
+
+int main(int argc, char **argv) {
+  const std::string path = (argc > 1) ? argv[1] : "snapshot_smoke.pycsnap";
+  Dut dut;
+  Testbench<Dut> tb(dut);
+  tb.addClock(dut.clk, 1);
+  tb.reset(dut.rst, 2, 1);
+  run(tb, dut, 100);
+
+  std::string err;
+  if (!tb.snapshotAsync(path, std::nullopt, nullptr, &err) || !tb.waitSnapshots()) {
+    std::cerr << "snapshot failed: " << err << "\n";
+    return 2;
+  }
+  const std::uint64_t t0 = tb.timeSteps();
+  const std::string first = run(tb, dut, 50);
+
+  if (!tb.restore(path, nullptr, &err)) {
+    std::cerr << "restore failed: " << err << "\n";
+    return 3;
+  }
+  if (tb.timeSteps() != t0) {
+    std::cerr << "time not restored\n";
+    return 4;
+  }
+  const std::string second = run(tb, dut, 50);
+  if (first != second) {
+    std::cerr << "replay mismatch:\n  " << first << "\n  " << second << "\n";
+    return 5;
+  }
+  std::cout << "ok: snapshot restore\n";
+  return 0;
+}
+CPP
+
+for snap_mode in dense paged; do
+  snap_flag="-DPYC_DISABLE_SPARSE_MEM"
+  if [[ "${snap_mode}" == "paged" ]]; then
+    snap_flag="-DPYC_FORCE_SPARSE_MEM"
+  fi
+  if ! "${cxx}" -std=c++17 -O2 "${snap_flag}" -I "${PYC_ROOT_DIR}/runtime" "${snap_dir}/snapshot_smoke.cpp" \
+      -o "${snap_dir}/snapshot_smoke_${snap_mode}" \
+      >"${snap_dir}/compile_${snap_mode}.stdout" 2>"${snap_dir}/compile_${snap_mode}.stderr"; then
+    pyc_warn "snapshot smoke C++ compile failed (${snap_mode})"
+    fail=1
+  elif ! "${snap_dir}/snapshot_smoke_${snap_mode}" "${snap_dir}/${snap_mode}.pycsnap" \
+      >"${snap_dir}/run_${snap_mode}.stdout" 2>"${snap_dir}/run_${snap_mode}.stderr"; then
+    pyc_warn "snapshot smoke C++ run failed (${snap_mode})"
+    fail=1
+  elif ! grep -q "ok: snapshot restore" "${snap_dir}/run_${snap_mode}.stdout"; then
+    pyc_warn "snapshot smoke missing success marker (${snap_mode})"
+    fail=1
+  fi
+done
+
 pyc_log "running decision status coverage gate"
 decision_status="${PYC_ROOT_DIR}/docs/gates/decision_status_v40.md"
 decision_report="${gate_out_dir}/decision_status_report.json"
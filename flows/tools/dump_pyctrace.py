@@ -3,11 +3,21 @@ from __future__ import annotations
 
 import argparse
 import json
+import mmap
+import os
 import struct
 import sys
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from enum import IntEnum
+from itertools import islice
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Union
+
+if TYPE_CHECKING:
+    import numpy
 
 
 MAGIC_V2 = b"PYC4TRC2"
@@ -167,94 +177,173 @@ def _load_external_manifest(path: Path) -> tuple[dict[int, str], dict[int, int]]
     return pid_to_path, pid_to_width
 
 
-def parse_pyctrace(
-    path: Path,
-    *,
-    external_manifest: Path | None = None,
-) -> tuple[int, int, list[ProbeDecl], list[ValueChangeEv], list[WriteEv], list[ResetEv], list[InvalidateEv]]:
-    data = memoryview(path.read_bytes())
-    off = 0
-
-    magic, off = _bytes(data, off, 8)
-    if magic not in {MAGIC_V2, MAGIC_V3}:
-        raise ParseError(f"bad magic: got={magic!r} exp one of ({MAGIC_V2!r}, {MAGIC_V3!r})")
-
-    schema_version, off = _u32le(data, off)
-    flags, off = _u32le(data, off)
-
-    probes: list[ProbeDecl] = []
-    pid_to_path: dict[int, str] = {}
-    pid_to_width: dict[int, int] = {}
-    if external_manifest is not None:
-        pid_to_path, pid_to_width = _load_external_manifest(external_manifest)
-
-    evs: list[ValueChangeEv] = []
-    writes: list[WriteEv] = []
-    resets: list[ResetEv] = []
-    invalidates: list[InvalidateEv] = []
-    cur_cycle: int | None = None
-    cur_phase: int | None = None
-    while off < len(data):
-        chunk_len, off = _u32le(data, off)
-        chunk_ty, off = _u32le(data, off)
-        payload, off = _take(data, off, chunk_len)
-        poff = 0
-
-        if chunk_ty == int(ChunkType.PROBE_DECLARE):
-            pid, poff = _u64le(payload, poff)
-            kind, poff = _u8(payload, poff)
-            _subkind, poff = _u8(payload, poff)
-            path_len, poff = _u32le(payload, poff)
-            pbytes, poff = _bytes(payload, poff, path_len)
-            cname = _decode_utf8(pbytes)
-            human_len, poff = _u32le(payload, poff)
-            hbytes, poff = _bytes(payload, poff, human_len)
-            human = _decode_utf8(hbytes)
-            ts_len, poff = _u32le(payload, poff)
-            ts, poff = _bytes(payload, poff, ts_len)
-            probes.append(ProbeDecl(probe_id=pid, kind=kind, canonical_path=cname, human_name=human, type_sig=ts))
-            pid_to_path.setdefault(pid, cname)
-            # Width lives in type_sig; we also infer width for Bits from the current minimal encoding.
-            if len(ts) >= 6 and ts[0] == 0:
-                width_bits = int(struct.unpack_from("<I", ts, 1)[0])
-                pid_to_width.setdefault(pid, width_bits)
-            continue
+TraceEvent = Union[ProbeDecl, ValueChangeEv, WriteEv, ResetEv, InvalidateEv]
+
+_CHUNK_HEAD = struct.Struct("<II")
+_VC_HEAD = struct.Struct("<QI")
+# Rows decoded per vectorized batch in `to_columns()` (bounds temporary memory).
+_COLUMN_BATCH_ROWS = 1 << 16
+# Parallel decoding (`iter_pyctrace(jobs=...)`): smallest cycle range handed to
+# a worker, and ranges per worker (for load balance).
+_PARALLEL_MIN_SEGMENT_BYTES = 8 << 20
+_PARALLEL_SEGMENTS_PER_JOB = 4
+
+
+def _width_bits_from_type_sig(ts: bytes) -> int | None:
+    # Width lives in type_sig; Bits use the current minimal encoding.
+    if len(ts) >= 6 and ts[0] == 0:
+        return int(struct.unpack_from("<I", ts, 1)[0])
+    return None
+
+
+class PycTraceReader:
+    """Lazy reader over an `mmap` of a `.pyctrace` file.
+
+    `events()` decodes chunks on demand and yields them in file order, so
+    callers can stop after the cycles they need. `to_columns()` bulk-decodes
+    VALUE_CHANGE chunks into a NumPy structured array (requires NumPy).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < 16:
+            self._file.close()
+            raise ParseError(f"unexpected EOF at offset 0 need 16 bytes (file is {size} bytes)")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._mm)
+        magic = bytes(self._data[0:8])
+        if magic not in {MAGIC_V2, MAGIC_V3}:
+            self.close()
+            raise ParseError(f"bad magic: got={magic!r} exp one of ({MAGIC_V2!r}, {MAGIC_V3!r})")
+        self.schema_version, self.flags = struct.unpack_from("<II", self._data, 8)
+        self._body_off = 16
+
+    def close(self) -> None:
+        data = getattr(self, "_data", None)
+        if data is not None:
+            data.release()
+            self._data = None
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # A caller still holds a view into the mapping; let GC unmap it.
+                pass
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "PycTraceReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _chunks(self, start: int | None = None, stop: int | None = None) -> Iterator[tuple[int, int, int]]:
+        """Yield `(chunk_type, payload_offset, payload_len)` without decoding payloads.
+
+        `start`/`stop` restrict the walk to a byte range whose start is a chunk
+        boundary (see `scan_segments()`).
+        """
+        data = self._data
+        if data is None:
+            raise ValueError("PycTraceReader is closed")
+        end = len(data) if stop is None else stop
+        off = self._body_off if start is None else start
+        head = _CHUNK_HEAD.unpack_from
+        while off < end:
+            if off + 8 > end:
+                raise ParseError(f"unexpected EOF at offset {off} need 8 bytes")
+            chunk_len, chunk_ty = head(data, off)
+            off += 8
+            if off + chunk_len > end:
+                raise ParseError(f"unexpected EOF at offset {off} need {chunk_len} bytes")
+            yield chunk_ty, off, chunk_len
+            off += chunk_len
+
+    def probes(self) -> list[ProbeDecl]:
+        """Decode the PROBE_DECLARE chunks that lead the file.
+
+        Writers emit every declaration right after the file header, so this
+        stops at the first other chunk instead of scanning the whole trace.
+        """
+        out: list[ProbeDecl] = []
+        for chunk_ty, off, n in self._chunks():
+            if chunk_ty != int(ChunkType.PROBE_DECLARE):
+                break
+            out.append(self._decode_probe_decl(self._data[off : off + n]))
+        return out
+
+    def scan_segments(self, target_bytes: int) -> list[tuple[int, int]]:
+        """Split the chunk stream into `(start, stop)` byte ranges of roughly `target_bytes`.
+
+        Every range after the first starts at a CYCLE_BEGIN chunk, so ranges
+        decode independently (`events(start, stop)`) and concatenate back to
+        file order. Only chunk headers are read.
+        """
+        begin_ty = int(ChunkType.CYCLE_BEGIN)
+        target = max(1, int(target_bytes))
+        segments: list[tuple[int, int]] = []
+        seg_start = self._body_off
+        for chunk_ty, off, _n in self._chunks():
+            head_off = off - 8
+            if chunk_ty == begin_ty and head_off - seg_start >= target:
+                segments.append((seg_start, head_off))
+                seg_start = head_off
+        end = len(self._data)
+        if seg_start < end or not segments:
+            segments.append((seg_start, end))
+        return segments
+
+    def events(self, start: int | None = None, stop: int | None = None) -> Iterator[TraceEvent]:
+        """Yield decoded declarations and events in file order (optionally for one byte range)."""
+        schema_version = self.schema_version
+        cur_cycle: int | None = None
+        cur_phase: int | None = None
+        for chunk_ty, off, n in self._chunks(start, stop):
+            payload = self._data[off : off + n]
+            poff = 0
+
+            if chunk_ty == int(ChunkType.PROBE_DECLARE):
+                yield self._decode_probe_decl(payload)
+                continue
 
-        if chunk_ty == int(ChunkType.CYCLE_BEGIN):
-            cyc, poff = _u64le(payload, poff)
-            ph, poff = _u8(payload, poff)
-            cur_cycle = cyc
-            cur_phase = ph
-            continue
+            if chunk_ty == int(ChunkType.CYCLE_BEGIN):
+                cyc, poff = _u64le(payload, poff)
+                ph, poff = _u8(payload, poff)
+                cur_cycle = cyc
+                cur_phase = ph
+                continue
 
-        if chunk_ty == int(ChunkType.CYCLE_END):
-            cyc, poff = _u64le(payload, poff)
-            ph, poff = _u8(payload, poff)
-            if cur_cycle == cyc and cur_phase == ph:
-                cur_cycle = None
-                cur_phase = None
-            continue
+            if chunk_ty == int(ChunkType.CYCLE_END):
+                cyc, poff = _u64le(payload, poff)
+                ph, poff = _u8(payload, poff)
+                if cur_cycle == cyc and cur_phase == ph:
+                    cur_cycle = None
+                    cur_phase = None
+                continue
 
-        if chunk_ty == int(ChunkType.VALUE_CHANGE):
-            pid, poff = _u64le(payload, poff)
-            width_bits, poff = _u32le(payload, poff)
-            byte_count = (width_bits + 7) // 8 if width_bits > 0 else 0
-            vbytes, poff = _bytes(payload, poff, byte_count)
-            known_mask_width_bits = int(width_bits)
-            known_mask_bytes = b"\xff" * byte_count
-            z_mask_width_bits = int(width_bits)
-            z_mask_bytes = b"\x00" * byte_count
-            if schema_version >= 3:
-                known_mask_width_bits, poff = _u32le(payload, poff)
-                known_n = (known_mask_width_bits + 7) // 8 if known_mask_width_bits > 0 else 0
-                known_mask_bytes, poff = _bytes(payload, poff, known_n)
-                z_mask_width_bits, poff = _u32le(payload, poff)
-                z_n = (z_mask_width_bits + 7) // 8 if z_mask_width_bits > 0 else 0
-                z_mask_bytes, poff = _bytes(payload, poff, z_n)
-            if cur_cycle is None or cur_phase is None:
-                raise ParseError("ValueChange seen without active CycleBegin")
-            evs.append(
-                ValueChangeEv(
+            if chunk_ty == int(ChunkType.VALUE_CHANGE):
+                pid, poff = _u64le(payload, poff)
+                width_bits, poff = _u32le(payload, poff)
+                byte_count = (width_bits + 7) // 8 if width_bits > 0 else 0
+                vbytes, poff = _bytes(payload, poff, byte_count)
+                known_mask_width_bits = int(width_bits)
+                known_mask_bytes = b"\xff" * byte_count
+                z_mask_width_bits = int(width_bits)
+                z_mask_bytes = b"\x00" * byte_count
+                if schema_version >= 3:
+                    known_mask_width_bits, poff = _u32le(payload, poff)
+                    known_n = (known_mask_width_bits + 7) // 8 if known_mask_width_bits > 0 else 0
+                    known_mask_bytes, poff = _bytes(payload, poff, known_n)
+                    z_mask_width_bits, poff = _u32le(payload, poff)
+                    z_n = (z_mask_width_bits + 7) // 8 if z_mask_width_bits > 0 else 0
+                    z_mask_bytes, poff = _bytes(payload, poff, z_n)
+                if cur_cycle is None or cur_phase is None:
+                    raise ParseError("ValueChange seen without active CycleBegin")
+                yield ValueChangeEv(
                     cycle=int(cur_cycle),
                     phase=int(cur_phase),
                     probe_id=int(pid),
@@ -265,31 +354,28 @@ def parse_pyctrace(
                     z_mask_width_bits=int(z_mask_width_bits),
                     z_mask_bytes=z_mask_bytes,
                 )
-            )
-            pid_to_width.setdefault(pid, width_bits)
-            continue
+                continue
 
-        if chunk_ty == int(ChunkType.WRITE):
-            pid, poff = _u64le(payload, poff)
-            subkind, poff = _u8(payload, poff)
-            flags, poff = _u8(payload, poff)
-            addr: int | None = None
-            if flags & 0x1:
-                addr, poff = _u64le(payload, poff)
-            data_width_bits, poff = _u32le(payload, poff)
-            data_n = (data_width_bits + 7) // 8 if data_width_bits > 0 else 0
-            data_bytes, poff = _bytes(payload, poff, data_n)
-            mask_width_bits: int | None = None
-            mask_bytes: bytes | None = None
-            if flags & 0x2:
-                mw, poff = _u32le(payload, poff)
-                mask_width_bits = int(mw)
-                mask_n = (mw + 7) // 8 if mw > 0 else 0
-                mask_bytes, poff = _bytes(payload, poff, mask_n)
-            if cur_cycle is None or cur_phase is None:
-                raise ParseError("Write seen without active CycleBegin")
-            writes.append(
-                WriteEv(
+            if chunk_ty == int(ChunkType.WRITE):
+                pid, poff = _u64le(payload, poff)
+                subkind, poff = _u8(payload, poff)
+                wflags, poff = _u8(payload, poff)
+                addr: int | None = None
+                if wflags & 0x1:
+                    addr, poff = _u64le(payload, poff)
+                data_width_bits, poff = _u32le(payload, poff)
+                data_n = (data_width_bits + 7) // 8 if data_width_bits > 0 else 0
+                data_bytes, poff = _bytes(payload, poff, data_n)
+                mask_width_bits: int | None = None
+                mask_bytes: bytes | None = None
+                if wflags & 0x2:
+                    mw, poff = _u32le(payload, poff)
+                    mask_width_bits = int(mw)
+                    mask_n = (mw + 7) // 8 if mw > 0 else 0
+                    mask_bytes, poff = _bytes(payload, poff, mask_n)
+                if cur_cycle is None or cur_phase is None:
+                    raise ParseError("Write seen without active CycleBegin")
+                yield WriteEv(
                     cycle=int(cur_cycle),
                     phase=int(cur_phase),
                     probe_id=int(pid),
@@ -300,54 +386,50 @@ def parse_pyctrace(
                     mask_width_bits=mask_width_bits,
                     mask_bytes=mask_bytes,
                 )
-            )
-            continue
+                continue
 
-        if chunk_ty == int(ChunkType.LOG):
-            # Currently ignored by the dumper output (but validated for structure).
-            _level, poff = _u8(payload, poff)
-            msg_len, poff = _u32le(payload, poff)
-            _msg, poff = _bytes(payload, poff, msg_len)
-            continue
+            if chunk_ty == int(ChunkType.LOG):
+                # Currently ignored by the dumper output (but validated for structure).
+                _level, poff = _u8(payload, poff)
+                msg_len, poff = _u32le(payload, poff)
+                _msg, poff = _bytes(payload, poff, msg_len)
+                continue
 
-        if chunk_ty == int(ChunkType.ASSERT):
-            _fatal, poff = _u8(payload, poff)
-            msg_len, poff = _u32le(payload, poff)
-            _msg, poff = _bytes(payload, poff, msg_len)
-            continue
+            if chunk_ty == int(ChunkType.ASSERT):
+                _fatal, poff = _u8(payload, poff)
+                msg_len, poff = _u32le(payload, poff)
+                _msg, poff = _bytes(payload, poff, msg_len)
+                continue
 
-        if chunk_ty == int(ChunkType.RESET):
-            cyc, poff = _u64le(payload, poff)
-            phase_present, poff = _u8(payload, poff)
-            ph, poff = _u8(payload, poff)
-            edge, poff = _u8(payload, poff)
-            kind, poff = _u8(payload, poff)
-            domain_len, poff = _u32le(payload, poff)
-            domain_b, poff = _bytes(payload, poff, domain_len)
-            resets.append(
-                ResetEv(
+            if chunk_ty == int(ChunkType.RESET):
+                cyc, poff = _u64le(payload, poff)
+                phase_present, poff = _u8(payload, poff)
+                ph, poff = _u8(payload, poff)
+                edge, poff = _u8(payload, poff)
+                kind, poff = _u8(payload, poff)
+                domain_len, poff = _u32le(payload, poff)
+                domain_b, poff = _bytes(payload, poff, domain_len)
+                yield ResetEv(
                     cycle=int(cyc),
                     phase=int(ph) if int(phase_present) else None,
                     edge=int(edge),
                     kind=int(kind),
                     domain=_decode_utf8(domain_b),
                 )
-            )
-            continue
+                continue
 
-        if chunk_ty == int(ChunkType.INVALIDATE):
-            cyc, poff = _u64le(payload, poff)
-            phase_present, poff = _u8(payload, poff)
-            ph, poff = _u8(payload, poff)
-            reason, poff = _u8(payload, poff)
-            domain_len, poff = _u32le(payload, poff)
-            domain_b, poff = _bytes(payload, poff, domain_len)
-            scope_len, poff = _u32le(payload, poff)
-            scope_b, poff = _bytes(payload, poff, scope_len)
-            reason_text_len, poff = _u32le(payload, poff)
-            reason_text_b, poff = _bytes(payload, poff, reason_text_len)
-            invalidates.append(
-                InvalidateEv(
+            if chunk_ty == int(ChunkType.INVALIDATE):
+                cyc, poff = _u64le(payload, poff)
+                phase_present, poff = _u8(payload, poff)
+                ph, poff = _u8(payload, poff)
+                reason, poff = _u8(payload, poff)
+                domain_len, poff = _u32le(payload, poff)
+                domain_b, poff = _bytes(payload, poff, domain_len)
+                scope_len, poff = _u32le(payload, poff)
+                scope_b, poff = _bytes(payload, poff, scope_len)
+                reason_text_len, poff = _u32le(payload, poff)
+                reason_text_b, poff = _bytes(payload, poff, reason_text_len)
+                yield InvalidateEv(
                     cycle=int(cyc),
                     phase=int(ph) if int(phase_present) else None,
                     reason=int(reason),
@@ -355,12 +437,207 @@ def parse_pyctrace(
                     scope=_decode_utf8(scope_b),
                     reason_text=_decode_utf8(reason_text_b),
                 )
-            )
+                continue
+
+            # Unknown chunk types are skipped (Decision 0041).
             continue
 
-        # Unknown chunk types are skipped (Decision 0041).
-        continue
+    def to_columns(self) -> "numpy.ndarray":
+        """Decode all VALUE_CHANGE chunks into a NumPy structured array.
+
+        Fields: `cycle` (u64), `phase` (u8), `probe_id` (u64), `width_bits`
+        (u32) and `value` (little-endian u64 words, zero-padded to the widest
+        probe). Known/Z masks are not exported.
+
+        Only chunk headers and cycle boundaries are walked in Python; payloads
+        are gathered and decoded with vectorized NumPy views, batched by
+        payload length.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError("to_columns() requires numpy (pip install 'pycircuit-hisi[numpy]')") from e
+
+        vc_ty = int(ChunkType.VALUE_CHANGE)
+        begin_ty = int(ChunkType.CYCLE_BEGIN)
+        end_ty = int(ChunkType.CYCLE_END)
+        data = self._data
+        offs = array("Q")
+        lens = array("I")
+        cycles = array("Q")
+        phases = array("B")
+        cur_cycle: int | None = None
+        cur_phase: int | None = None
+        for chunk_ty, off, n in self._chunks():
+            if chunk_ty == vc_ty:
+                if cur_cycle is None or cur_phase is None:
+                    raise ParseError("ValueChange seen without active CycleBegin")
+                if n < _VC_HEAD.size:
+                    raise ParseError(f"unexpected EOF at offset {off} need {_VC_HEAD.size} bytes")
+                offs.append(off)
+                lens.append(n)
+                cycles.append(cur_cycle)
+                phases.append(cur_phase)
+            elif chunk_ty == begin_ty:
+                cur_cycle, cur_phase = struct.unpack_from("<QB", data, off)
+            elif chunk_ty == end_ty:
+                cyc, ph = struct.unpack_from("<QB", data, off)
+                if cur_cycle == cyc and cur_phase == ph:
+                    cur_cycle = None
+                    cur_phase = None
+
+        raw = np.frombuffer(self._mm, dtype=np.uint8)
+        offs_np = np.frombuffer(offs, dtype=np.uint64).astype(np.int64)
+        lens_np = np.frombuffer(lens, dtype=np.uint32)
+        count = int(offs_np.shape[0])
+
+        # Fixed chunk header fields, gathered in row batches so the index
+        # arrays stay bounded for large traces.
+        pid_np = np.zeros(count, dtype=np.uint64)
+        width_np = np.zeros(count, dtype=np.uint32)
+        pid_cols = np.arange(0, 8, dtype=np.int64)
+        width_cols = np.arange(8, 12, dtype=np.int64)
+        for b in range(0, count, _COLUMN_BATCH_ROWS):
+            base = offs_np[b : b + _COLUMN_BATCH_ROWS][:, None]
+            pid_np[b : b + _COLUMN_BATCH_ROWS] = raw[base + pid_cols].copy().view("<u8")[:, 0]
+            width_np[b : b + _COLUMN_BATCH_ROWS] = raw[base + width_cols].copy().view("<u4")[:, 0]
+        nbytes_np = (width_np.astype(np.int64) + 7) // 8
+        if bool(np.any(_VC_HEAD.size + nbytes_np > lens_np)):
+            raise ParseError("ValueChange payload shorter than its width")
+        nwords = max(1, int((int(nbytes_np.max()) + 7) // 8) if count else 1)
+
+        dtype = np.dtype(
+            [
+                ("cycle", "<u8"),
+                ("phase", "u1"),
+                ("probe_id", "<u8"),
+                ("width_bits", "<u4"),
+                ("value", "<u8", (nwords,)),
+            ]
+        )
+        out = np.zeros(count, dtype=dtype)
+        out["cycle"] = np.frombuffer(cycles, dtype=np.uint64)
+        out["phase"] = np.frombuffer(phases, dtype=np.uint8)
+        out["probe_id"] = pid_np
+        out["width_bits"] = width_np
+        if count == 0:
+            return out
+
+        value_bytes = out["value"].view(np.uint8).reshape(count, nwords * 8)
+        for nb in np.unique(nbytes_np):
+            nb = int(nb)
+            if nb == 0:
+                continue
+            rows = np.nonzero(nbytes_np == nb)[0]
+            cols = np.arange(_VC_HEAD.size, _VC_HEAD.size + nb, dtype=np.int64)
+            for b in range(0, int(rows.shape[0]), _COLUMN_BATCH_ROWS):
+                sel = rows[b : b + _COLUMN_BATCH_ROWS]
+                value_bytes[sel, :nb] = raw[offs_np[sel][:, None] + cols]
+        return out
+
+    @staticmethod
+    def _decode_probe_decl(payload: memoryview) -> ProbeDecl:
+        poff = 0
+        pid, poff = _u64le(payload, poff)
+        kind, poff = _u8(payload, poff)
+        _subkind, poff = _u8(payload, poff)
+        path_len, poff = _u32le(payload, poff)
+        pbytes, poff = _bytes(payload, poff, path_len)
+        human_len, poff = _u32le(payload, poff)
+        hbytes, poff = _bytes(payload, poff, human_len)
+        ts_len, poff = _u32le(payload, poff)
+        ts, poff = _bytes(payload, poff, ts_len)
+        return ProbeDecl(
+            probe_id=pid,
+            kind=kind,
+            canonical_path=_decode_utf8(pbytes),
+            human_name=_decode_utf8(hbytes),
+            type_sig=ts,
+        )
+
+
+def _decode_segment(path: str, start: int, stop: int) -> list[TraceEvent]:
+    # Process-pool worker: each worker maps the same file (pages are shared via
+    # the OS page cache) and decodes one independent cycle range.
+    with PycTraceReader(Path(path)) as reader:
+        return list(reader.events(start, stop))
+
+
+def iter_pyctrace(path: Path, *, jobs: int = 1) -> Iterator[TraceEvent]:
+    """Yield declarations and events of a `.pyctrace` file lazily, in file order.
+
+    With `jobs > 1`, traces larger than `_PARALLEL_MIN_SEGMENT_BYTES` are split
+    at CYCLE_BEGIN boundaries and the ranges decode in a process pool; results
+    are yielded in file (cycle) order, with at most `2 * jobs` ranges in
+    flight or buffered at a time. Closing the iterator early cancels
+    ranges that have not started yet.
+    """
+    with PycTraceReader(path) as reader:
+        jobs = max(1, int(jobs))
+        size = len(reader._data)
+        if jobs == 1 or size < 2 * _PARALLEL_MIN_SEGMENT_BYTES:
+            yield from reader.events()
+            return
+        target = max(_PARALLEL_MIN_SEGMENT_BYTES, size // (jobs * _PARALLEL_SEGMENTS_PER_JOB))
+        segments = reader.scan_segments(target)
+
+    if len(segments) == 1:
+        with PycTraceReader(path) as reader:
+            yield from reader.events()
+        return
+
+    workers = min(jobs, len(segments))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # At most 2*workers decoded ranges are in flight or buffered at once.
+        pending: deque[Future[list[TraceEvent]]] = deque()
+        todo = iter(segments)
+        try:
+            for start, stop in islice(todo, 2 * workers):
+                pending.append(pool.submit(_decode_segment, str(path), start, stop))
+            while pending:
+                events = pending.popleft().result()
+                nxt = next(todo, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_decode_segment, str(path), *nxt))
+                yield from events
+                del events
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+def parse_pyctrace(
+    path: Path,
+    *,
+    external_manifest: Path | None = None,
+    jobs: int = 1,
+) -> tuple[int, int, list[ProbeDecl], list[ValueChangeEv], list[WriteEv], list[ResetEv], list[InvalidateEv]]:
+    """Eagerly decode a whole trace (see `PycTraceReader` for the streaming API).
+
+    `jobs > 1` decodes large traces in parallel (see `iter_pyctrace`).
+    """
+    if external_manifest is not None:
+        # Validated for structure; the manifest only affects printing in main().
+        _load_external_manifest(external_manifest)
 
+    probes: list[ProbeDecl] = []
+    evs: list[ValueChangeEv] = []
+    writes: list[WriteEv] = []
+    resets: list[ResetEv] = []
+    invalidates: list[InvalidateEv] = []
+    with PycTraceReader(path) as reader:
+        schema_version, flags = reader.schema_version, reader.flags
+    for ev in iter_pyctrace(path, jobs=jobs):
+        if isinstance(ev, ValueChangeEv):
+            evs.append(ev)
+        elif isinstance(ev, WriteEv):
+            writes.append(ev)
+        elif isinstance(ev, ProbeDecl):
+            probes.append(ev)
+        elif isinstance(ev, ResetEv):
+            resets.append(ev)
+        else:
+            invalidates.append(ev)
     return schema_version, flags, probes, evs, writes, resets, invalidates
 
 
@@ -371,6 +648,12 @@ def main() -> int:
     ap.add_argument("--max-cycles", type=int, default=10)
     ap.add_argument("--max-events", type=int, default=50)
     ap.add_argument("--no-header", action="store_true")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Decode large traces with N worker processes (split at cycle boundaries).",
+    )
     ns = ap.parse_args()
 
     p = Path(ns.path).resolve()
@@ -383,74 +666,88 @@ def main() -> int:
         print(f"error: manifest not found: {manifest}", file=sys.stderr)
         return 2
 
-    try:
-        schema_version, flags, probes, evs, writes, resets, invalidates = parse_pyctrace(p, external_manifest=manifest)
-    except ParseError as e:
-        print(f"error: {p}: {e}", file=sys.stderr)
-        return 2
-
-    if not ns.no_header:
-        print(f"path: {p}")
-        print(f"schema_version: {schema_version}")
-        print(f"flags: 0x{flags:08x}")
-        print(f"probe_decl_count: {len(probes)}")
-        for d in probes[: min(len(probes), 20)]:
-            print(f"  - id=0x{d.probe_id:016x} kind={d.kind} path={d.canonical_path!r}")
-        if len(probes) > 20:
-            print(f"  ... ({len(probes) - 20} more)")
+    max_cycles = max(0, int(ns.max_cycles))
+    max_events = max(0, int(ns.max_events))
 
     pid_to_path: dict[int, str] = {}
     pid_to_width: dict[int, int] = {}
     if manifest is not None:
         pid_to_path, pid_to_width = _load_external_manifest(manifest)
-    for d in probes:
-        pid_to_path.setdefault(d.probe_id, d.canonical_path)
-        if len(d.type_sig) >= 6 and d.type_sig[0] == 0:
-            pid_to_width.setdefault(d.probe_id, int(struct.unpack_from("<I", d.type_sig, 1)[0]))
 
-    max_cycles = max(0, int(ns.max_cycles))
-    max_events = max(0, int(ns.max_events))
+    def _learn_probe(d: ProbeDecl) -> None:
+        pid_to_path.setdefault(d.probe_id, d.canonical_path)
+        w = _width_bits_from_type_sig(d.type_sig)
+        if w is not None:
+            pid_to_width.setdefault(d.probe_id, w)
 
+    # The first `max_cycles` distinct cycles in trace order are shown. Only the
+    # first `max_events` events per cycle are kept (plus counts), and reading
+    # stops at the first event past the last selected cycle.
     seen_cycles: list[int] = []
+    seen_set: set[int] = set()
+    seen_max: int | None = None
     by_cycle_vc: dict[int, list[ValueChangeEv]] = {}
     by_cycle_wr: dict[int, list[WriteEv]] = {}
     by_cycle_reset: dict[int, list[ResetEv]] = {}
     by_cycle_inval: dict[int, list[InvalidateEv]] = {}
+    vc_count: dict[int, int] = {}
+    wr_count: dict[int, int] = {}
 
-    def _touch_cycle(cyc: int) -> bool:
-        if cyc in by_cycle_vc or cyc in by_cycle_wr or cyc in by_cycle_reset or cyc in by_cycle_inval:
-            return True
-        if len(seen_cycles) >= max_cycles:
-            return False
-        seen_cycles.append(cyc)
-        return True
-
-    for ev in evs:
-        if not _touch_cycle(int(ev.cycle)):
-            continue
-        by_cycle_vc.setdefault(int(ev.cycle), []).append(ev)
-
-    for w in writes:
-        if not _touch_cycle(int(w.cycle)):
-            continue
-        by_cycle_wr.setdefault(int(w.cycle), []).append(w)
-
-    for r in resets:
-        if not _touch_cycle(int(r.cycle)):
-            continue
-        by_cycle_reset.setdefault(int(r.cycle), []).append(r)
+    def _keep(bucket: dict, cyc: int, ev: object) -> None:
+        lst = bucket.setdefault(cyc, [])
+        if len(lst) < max_events:
+            lst.append(ev)
 
-    for inv in invalidates:
-        if not _touch_cycle(int(inv.cycle)):
-            continue
-        by_cycle_inval.setdefault(int(inv.cycle), []).append(inv)
+    try:
+        with PycTraceReader(p) as reader:
+            probes = reader.probes()
+            for d in probes:
+                _learn_probe(d)
+
+            if not ns.no_header:
+                print(f"path: {p}")
+                print(f"schema_version: {reader.schema_version}")
+                print(f"flags: 0x{reader.flags:08x}")
+                print(f"probe_decl_count: {len(probes)}")
+                for d in probes[: min(len(probes), 20)]:
+                    print(f"  - id=0x{d.probe_id:016x} kind={d.kind} path={d.canonical_path!r}")
+                if len(probes) > 20:
+                    print(f"  ... ({len(probes) - 20} more)")
+
+        for ev in iter_pyctrace(p, jobs=ns.jobs):
+            if isinstance(ev, ProbeDecl):
+                _learn_probe(ev)
+                continue
+            cyc = int(ev.cycle)
+            if cyc not in seen_set:
+                if len(seen_cycles) >= max_cycles:
+                    if seen_max is None or cyc > seen_max:
+                        break
+                    continue
+                seen_cycles.append(cyc)
+                seen_set.add(cyc)
+                seen_max = cyc if seen_max is None else max(seen_max, cyc)
+            if isinstance(ev, ValueChangeEv):
+                vc_count[cyc] = vc_count.get(cyc, 0) + 1
+                _keep(by_cycle_vc, cyc, ev)
+            elif isinstance(ev, WriteEv):
+                wr_count[cyc] = wr_count.get(cyc, 0) + 1
+                _keep(by_cycle_wr, cyc, ev)
+            elif isinstance(ev, ResetEv):
+                _keep(by_cycle_reset, cyc, ev)
+            else:
+                _keep(by_cycle_inval, cyc, ev)
+    except ParseError as e:
+        print(f"error: {p}: {e}", file=sys.stderr)
+        return 2
 
     for cyc in seen_cycles:
         cev = by_cycle_vc.get(cyc, [])
         cwr = by_cycle_wr.get(cyc, [])
         crs = by_cycle_reset.get(cyc, [])
         cinv = by_cycle_inval.get(cyc, [])
-        print(f"cycle {cyc}: {len(cev)} value-change events, {len(cwr)} write events")
+        n_vc = vc_count.get(cyc, 0)
+        print(f"cycle {cyc}: {n_vc} value-change events, {wr_count.get(cyc, 0)} write events")
 
         for w in cwr[: min(len(cwr), max_events)]:
             phase = Phase(w.phase).name.lower() if w.phase in set(int(x) for x in Phase) else str(w.phase)
@@ -488,8 +785,8 @@ def main() -> int:
                     f"  - ({phase}) {path} = [bytes={len(ev.value_bytes)}] 0x{v_hx} "
                     f"known=0x{k_hx} z=0x{z_hx}"
                 )
-        if len(cev) > max_events:
-            print(f"  ... ({len(cev) - max_events} more)")
+        if n_vc > max_events:
+            print(f"  ... ({n_vc - max_events} more)")
 
         for r in crs[: min(len(crs), max_events)]:
             phase_name = "commit" if r.phase is None else (Phase(r.phase).name.lower() if r.phase in set(int(x) for x in Phase) else str(r.phase))
@@ -0,0 +1,89 @@
+// Per-access overhead of the simulated-memory backing stores.
+//
+// Build + run (from repo root):
+//   c++ -std=c++17 -O2 -I runtime flows/tools/perf/mem_store_bench.cpp -o /tmp/mem_store_bench
+//   /tmp/mem_store_bench [iters]
+//
+// Prints one JSON object per (store, pattern) with ns/access and resident bytes.
+
+#include <chrono>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <memory>
+#include <string>
+
+#include <cpp/pyc_bits.hpp>
+#include <cpp/pyc_mem_store.hpp>
+
+namespace {
+
+using pyc::cpp::pyc_dense_store;
+using pyc::cpp::pyc_paged_store;
+using pyc::cpp::Wire;
+
+constexpr std::size_t kDepthBytes = std::size_t{256} << 20;
+constexpr std::size_t kDepthEntries = std::size_t{1} << 22;
+constexpr std::size_t kWorkingSet = std::size_t{4} << 20;
+
+struct Lcg {
+  std::uint64_t s = 0x9E3779B97F4A7C15ull;
+  std::uint64_t next() {
+    s = s * 6364136223846793005ull + 1442695040888963407ull;
+    return s >> 17;
+  }
+};
+
+template <typename Store, typename T, typename MakeValue>
+void runCase(const char *store, const char *pattern, std::size_t depth, std::size_t iters, bool random,
+             MakeValue makeValue) {
+  using Clock = std::chrono::steady_clock;
+  auto t0 = Clock::now();
+  auto mem = std::make_unique<Store>();
+  auto t1 = Clock::now();
+
+  Lcg rng;
+  std::uint64_t sink = 0;
+  const std::size_t span = (kWorkingSet < depth) ? kWorkingSet : depth;
+  const std::size_t base = depth / 2;
+  for (std::size_t i = 0; i < iters; ++i) {
+    std::size_t a = random ? (base + rng.next() % span) % depth : (base + (i & ~std::size_t{3}) % span) % depth;
+    if ((i & 3u) == 0)
+      mem->write(a, makeValue(i));
+    else
+      sink += static_cast<std::uint64_t>(mem->read(a) == T{} ? 0u : 1u);
+  }
+  auto t2 = Clock::now();
+
+  const double initMs = std::chrono::duration<double, std::milli>(t1 - t0).count();
+  const double nsPerAccess = std::chrono::duration<double, std::nano>(t2 - t1).count() / static_cast<double>(iters);
+  std::cout << "{\"store\":\"" << store << "\",\"pattern\":\"" << pattern << "\",\"init_ms\":" << initMs
+            << ",\"ns_per_access\":" << nsPerAccess << ",\"resident_bytes\":" << mem->resident_bytes()
+            << ",\"sink\":" << sink << "}\n";
+}
+
+} // namespace
+
+int main(int argc, char **argv) {
+  std::size_t iters = 20'000'000;
+  if (argc > 1)
+    iters = static_cast<std::size_t>(std::strtoull(argv[1], nullptr, 10));
+
+  auto byteValue = [](std::size_t i) { return static_cast<std::uint8_t>((i * 131u) | 1u); };
+  auto wordValue = [](std::size_t i) { return Wire<64>(static_cast<std::uint64_t>(i) | 1u); };
+
+  using DenseBytes = pyc_dense_store<std::uint8_t, kDepthBytes>;
+  using PagedBytes = pyc_paged_store<std::uint8_t, kDepthBytes>;
+  using DenseWords = pyc_dense_store<Wire<64>, kDepthEntries>;
+  using PagedWords = pyc_paged_store<Wire<64>, kDepthEntries>;
+
+  runCase<DenseBytes, std::uint8_t>("dense_u8", "sequential", kDepthBytes, iters, false, byteValue);
+  runCase<PagedBytes, std::uint8_t>("paged_u8", "sequential", kDepthBytes, iters, false, byteValue);
+  runCase<DenseBytes, std::uint8_t>("dense_u8", "random", kDepthBytes, iters, true, byteValue);
+  runCase<PagedBytes, std::uint8_t>("paged_u8", "random", kDepthBytes, iters, true, byteValue);
+  runCase<DenseWords, Wire<64>>("dense_w64", "sequential", kDepthEntries, iters, false, wordValue);
+  runCase<PagedWords, Wire<64>>("paged_w64", "sequential", kDepthEntries, iters, false, wordValue);
+  runCase<DenseWords, Wire<64>>("dense_w64", "random", kDepthEntries, iters, true, wordValue);
+  runCase<PagedWords, Wire<64>>("paged_w64", "random", kDepthEntries, iters, true, wordValue);
+  return 0;
+}
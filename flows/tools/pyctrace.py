@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""Indexed queries over pyCircuit binary traces (`.pyctrace`).
+
+`pyctrace.py index TRACE` writes a sidecar index (`TRACE.pycidx`) with, per
+probe, the cycle/phase/file offset of every VALUE_CHANGE event in cycle order,
+plus a cycle-to-offset skip table of CYCLE_BEGIN chunks. `IndexedTrace`
+answers probe queries from the index by decoding only the referenced chunks:
+
+    with IndexedTrace.open(Path("sim.pyctrace")) as trace:
+        trace.value_at("dut.u0:pc", 1200)
+        trace.series("dut.u0:pc", 1000, 1100)
+        trace.find("dut.u0:state", lambda v: v == 3)
+
+Probe paths resolve through `probe_manifest.json` (next to the trace, or
+`--manifest`) and the trace's own PROBE_DECLARE chunks.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from dump_pyctrace import (  # noqa: E402
+    ChunkType,
+    ParseError,
+    PycTraceReader,
+    TraceEvent,
+    _load_external_manifest,
+    _width_bits_from_type_sig,
+)
+
+INDEX_MAGIC = b"PYCTIDX1"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".pycidx"
+
+# A skip-table entry is recorded for the first CYCLE_BEGIN at or past every
+# multiple of this many cycles.
+SKIP_STRIDE_CYCLES = 1024
+
+# magic, version, reserved, trace_size, trace_mtime_ns, nprobes, nskip
+_IDX_HEAD = struct.Struct("<8sIIQQII")
+# probe_id, width_bits, count, data_offset (cycles u64[] | offsets u64[] | phases u8[])
+_IDX_PROBE = struct.Struct("<QIIQ")
+_IDX_SKIP = struct.Struct("<QQ")
+_VC_HEAD = struct.Struct("<QI")
+
+
+class TraceIndexError(ParseError):
+    """Missing, stale or corrupt trace index."""
+
+
+def default_index_path(trace: Path) -> Path:
+    return trace.with_name(trace.name + INDEX_SUFFIX)
+
+
+def _trace_stamp(trace: Path) -> tuple[int, int]:
+    st = trace.stat()
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def build_index(trace: Path, out: Path | None = None) -> Path:
+    """Scan `trace` once and write its sidecar index; returns the index path."""
+    trace = Path(trace)
+    out = default_index_path(trace) if out is None else Path(out)
+
+    vc_ty = int(ChunkType.VALUE_CHANGE)
+    begin_ty = int(ChunkType.CYCLE_BEGIN)
+    end_ty = int(ChunkType.CYCLE_END)
+
+    per_probe: dict[int, tuple[array, array, array]] = {}
+    widths: dict[int, int] = {}
+    skip = array("Q")
+    next_skip = 0
+    with PycTraceReader(trace) as reader:
+        data = reader._data
+        for d in reader.probes():
+            w = _width_bits_from_type_sig(d.type_sig)
+            if w is not None:
+                widths.setdefault(d.probe_id, w)
+        cur_cycle: int | None = None
+        cur_phase: int | None = None
+        for chunk_ty, off, n in reader._chunks():
+            if chunk_ty == vc_ty:
+                if cur_cycle is None or cur_phase is None:
+                    raise ParseError("ValueChange seen without active CycleBegin")
+                if n < _VC_HEAD.size:
+                    raise ParseError(
+                        f"unexpected EOF at offset {off} need {_VC_HEAD.size} bytes"
+                    )
+                pid, width = _VC_HEAD.unpack_from(data, off)
+                rec = per_probe.get(pid)
+                if rec is None:
+                    rec = (array("Q"), array("Q"), array("B"))
+                    per_probe[pid] = rec
+                    widths.setdefault(pid, int(width))
+                rec[0].append(cur_cycle)
+                rec[1].append(off)
+                rec[2].append(cur_phase)
+            elif chunk_ty == begin_ty:
+                cur_cycle, cur_phase = struct.unpack_from("<QB", data, off)
+                if cur_cycle >= next_skip:
+                    skip.append(cur_cycle)
+                    skip.append(off - 8)
+                    next_skip = (
+                        cur_cycle // SKIP_STRIDE_CYCLES + 1
+                    ) * SKIP_STRIDE_CYCLES
+            elif chunk_ty == end_ty:
+                cyc, ph = struct.unpack_from("<QB", data, off)
+                if cur_cycle == cyc and cur_phase == ph:
+                    cur_cycle = None
+                    cur_phase = None
+
+    size, mtime_ns = _trace_stamp(trace)
+    pids = sorted(per_probe)
+    nskip = len(skip) // 2
+    data_off = _IDX_HEAD.size + len(pids) * _IDX_PROBE.size + nskip * _IDX_SKIP.size
+    tmp = out.with_name(out.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(
+            _IDX_HEAD.pack(
+                INDEX_MAGIC, INDEX_VERSION, 0, size, mtime_ns, len(pids), nskip
+            )
+        )
+        for pid in pids:
+            count = len(per_probe[pid][0])
+            f.write(_IDX_PROBE.pack(pid, widths.get(pid, 0), count, data_off))
+            data_off += count * 17
+        if sys.byteorder != "little":
+            skip.byteswap()
+        f.write(skip.tobytes())
+        for pid in pids:
+            cycles, offs, phases = per_probe[pid]
+            if sys.byteorder != "little":
+                cycles.byteswap()
+                offs.byteswap()
+            f.write(cycles.tobytes())
+            f.write(offs.tobytes())
+            f.write(phases.tobytes())
+    os.replace(tmp, out)
+    return out
+
+
+@dataclass(frozen=True)
+class _ProbeIndex:
+    probe_id: int
+    width_bits: int
+    count: int
+    data_offset: int
+
+
+@dataclass(frozen=True)
+class Sample:
+    cycle: int
+    phase: int
+    value: int
+
+
+class IndexedTrace:
+    """Probe queries over a `.pyctrace` file backed by its sidecar index.
+
+    Per-probe arrays are loaded on first use, so opening a trace costs only the
+    probe table and skip table.
+    """
+
+    def __init__(
+        self, trace: Path, index: Path, *, manifest: Path | None = None
+    ) -> None:
+        self.trace = Path(trace)
+        self.index_path = Path(index)
+        with self.index_path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < _IDX_HEAD.size:
+                raise TraceIndexError(f"truncated index: {self.index_path}")
+            raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _rsv, size, mtime_ns, nprobes, nskip = _IDX_HEAD.unpack_from(
+            raw, 0
+        )
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raw.close()
+            raise TraceIndexError(
+                f"not a pyctrace index (or unsupported version): {self.index_path}"
+            )
+        if (size, mtime_ns) != _trace_stamp(self.trace):
+            raw.close()
+            raise TraceIndexError(
+                f"stale index for {self.trace} (re-run `pyctrace.py index`)"
+            )
+        self._raw = raw
+        self._probes: dict[int, _ProbeIndex] = {}
+        off = _IDX_HEAD.size
+        for _ in range(nprobes):
+            pid, width, count, data_off = _IDX_PROBE.unpack_from(raw, off)
+            self._probes[pid] = _ProbeIndex(pid, width, count, data_off)
+            off += _IDX_PROBE.size
+        skip = array("Q")
+        skip.frombytes(raw[off : off + nskip * _IDX_SKIP.size])
+        if sys.byteorder != "little":
+            skip.byteswap()
+        self._skip_cycles = skip[0::2]
+        self._skip_offsets = skip[1::2]
+        self._loaded: dict[int, tuple[array, array, bytes]] = {}
+
+        try:
+            self._reader = PycTraceReader(self.trace)
+        except BaseException:
+            raw.close()
+            raise
+        try:
+            self._path_to_id: dict[str, int] = {}
+            for d in self._reader.probes():
+                self._path_to_id.setdefault(d.canonical_path, d.probe_id)
+            if manifest is None:
+                cand = self.trace.with_name("probe_manifest.json")
+                manifest = cand if cand.is_file() else None
+            if manifest is not None:
+                pid_to_path, _ = _load_external_manifest(Path(manifest))
+                for pid, p in pid_to_path.items():
+                    self._path_to_id.setdefault(p, pid)
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def open(
+        cls,
+        trace: Path,
+        *,
+        index: Path | None = None,
+        manifest: Path | None = None,
+        rebuild: bool = True,
+    ) -> IndexedTrace:
+        """Open `trace`, (re)building a missing or stale index when `rebuild`."""
+        trace = Path(trace)
+        index = default_index_path(trace) if index is None else Path(index)
+        if rebuild:
+            try:
+                return cls(trace, index, manifest=manifest)
+            except (TraceIndexError, FileNotFoundError):
+                build_index(trace, index)
+        return cls(trace, index, manifest=manifest)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._raw.close()
+
+    def __enter__(self) -> IndexedTrace:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- resolution -------------------------------------------------------
+
+    def probe_id(self, path: str | int) -> int:
+        """Resolve a canonical path (or a numeric/hex probe id) to a probe id."""
+        if isinstance(path, int):
+            return path
+        pid = self._path_to_id.get(path)
+        if pid is not None:
+            return pid
+        try:
+            return int(path, 0)
+        except ValueError:
+            raise KeyError(f"unknown probe path: {path!r}") from None
+
+    def width_bits(self, path: str | int) -> int:
+        pi = self._probes.get(self.probe_id(path))
+        return 0 if pi is None else pi.width_bits
+
+    # -- queries ----------------------------------------------------------
+
+    def value_at(self, path: str | int, cycle: int) -> int | None:
+        """Value of `path` after the last change at or before `cycle` (None before the first change)."""
+        cycles, offs, _phases = self._arrays(self.probe_id(path))
+        i = bisect.bisect_right(cycles, cycle)
+        if i == 0:
+            return None
+        return self._value(offs[i - 1])
+
+    def series(self, path: str | int, lo: int, hi: int) -> list[Sample]:
+        """All changes of `path` with `lo <= cycle <= hi`, in trace order."""
+        cycles, offs, phases = self._arrays(self.probe_id(path))
+        i = bisect.bisect_left(cycles, lo)
+        j = bisect.bisect_right(cycles, hi)
+        return [Sample(cycles[k], phases[k], self._value(offs[k])) for k in range(i, j)]
+
+    def find(
+        self,
+        path: str | int,
+        pred: Callable[[int], bool],
+        *,
+        lo: int = 0,
+        hi: int | None = None,
+    ) -> int | None:
+        """First cycle in `[lo, hi]` at which `path` takes a value satisfying `pred`.
+
+        The value holding at `lo` (set by an earlier change) is checked first.
+        """
+        cycles, offs, _phases = self._arrays(self.probe_id(path))
+        # Changes within cycle `lo` itself are scanned below, so only a value
+        # carried in from before `lo` counts as holding at `lo`.
+        i = bisect.bisect_left(cycles, lo)
+        if i > 0 and pred(self._value(offs[i - 1])):
+            return lo
+        end = len(cycles) if hi is None else bisect.bisect_right(cycles, hi)
+        for k in range(i, end):
+            if pred(self._value(offs[k])):
+                return int(cycles[k])
+        return None
+
+    def events_from(self, cycle: int) -> Iterator[TraceEvent]:
+        """Decode events starting near `cycle` using the skip table (events of earlier cycles may appear)."""
+        i = bisect.bisect_right(self._skip_cycles, cycle)
+        start = self._skip_offsets[i - 1] if i > 0 else None
+        return self._reader.events(start)
+
+    # -- internals --------------------------------------------------------
+
+    def _arrays(self, pid: int) -> tuple[array, array, bytes]:
+        got = self._loaded.get(pid)
+        if got is not None:
+            return got
+        pi = self._probes.get(pid)
+        if pi is None:
+            got = (array("Q"), array("Q"), b"")
+        else:
+            n = pi.count
+            base = pi.data_offset
+            cycles = array("Q")
+            cycles.frombytes(self._raw[base : base + 8 * n])
+            offs = array("Q")
+            offs.frombytes(self._raw[base + 8 * n : base + 16 * n])
+            if sys.byteorder != "little":
+                cycles.byteswap()
+                offs.byteswap()
+            got = (cycles, offs, self._raw[base + 16 * n : base + 17 * n])
+        self._loaded[pid] = got
+        return got
+
+    def _value(self, payload_off: int) -> int:
+        data = self._reader._data
+        _pid, width = _VC_HEAD.unpack_from(data, payload_off)
+        n = (width + 7) // 8
+        start = payload_off + _VC_HEAD.size
+        return int.from_bytes(data[start : start + n], "little", signed=False)
+
+
+def _parse_value(text: str) -> int:
+    return int(text, 0)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Index and query pyCircuit binary traces (.pyctrace)."
+    )
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ix = sub.add_parser("index", help="Build the sidecar index (TRACE.pycidx).")
+    ix.add_argument("trace", type=Path)
+    ix.add_argument("-o", "--out", type=Path, default=None)
+
+    q = sub.add_parser(
+        "query", help="Query one probe through the index (built if missing or stale)."
+    )
+    q.add_argument("trace", type=Path)
+    q.add_argument("probe", help="Canonical probe path or probe id.")
+    q.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="probe_manifest.json (default: next to the trace).",
+    )
+    q.add_argument("--index", type=Path, default=None)
+    g = q.add_mutually_exclusive_group(required=True)
+    g.add_argument("--at", type=int, default=None, help="Value at this cycle.")
+    g.add_argument(
+        "--range",
+        nargs=2,
+        type=int,
+        metavar=("LO", "HI"),
+        help="Changes within [LO, HI].",
+    )
+    g.add_argument(
+        "--find-eq",
+        type=_parse_value,
+        default=None,
+        metavar="V",
+        help="First cycle where probe == V.",
+    )
+
+    ns = ap.parse_args()
+    trace = Path(ns.trace).resolve()
+    if not trace.is_file():
+        print(f"error: file not found: {trace}", file=sys.stderr)
+        return 2
+
+    try:
+        if ns.cmd == "index":
+            out = build_index(trace, ns.out)
+            print(out)
+            return 0
+
+        with IndexedTrace.open(trace, index=ns.index, manifest=ns.manifest) as t:
+            if ns.at is not None:
+                v = t.value_at(ns.probe, ns.at)
+                print("<none>" if v is None else f"0x{v:x}")
+            elif ns.range is not None:
+                for s in t.series(ns.probe, ns.range[0], ns.range[1]):
+                    print(f"{s.cycle} {s.phase} 0x{s.value:x}")
+            else:
+                want = ns.find_eq
+                c = t.find(ns.probe, lambda v: v == want)
+                print("<none>" if c is None else c)
+    except KeyError as e:
+        print(f"error: {e.args[0]}", file=sys.stderr)
+        return 2
+    except ParseError as e:
+        print(f"error: {trace}: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,202 @@
+#pragma once
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstdlib>
+#include <fstream>
+#include <limits>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+#include "pyc_mem_store.hpp"
+
+namespace pyc::cpp {
+
+// Architectural-state checkpoint hashes for divergence bisection
+// (contrib/linx/flows/tools/linx_bisect.py).
+//
+// Instead of full commit traces, reference and DUT each record one JSONL line
+// every N commits:
+//
+//   {"type":"start","checkpoint_every":N,"page_bytes":4096,"hash":"fnv1a64"}
+//   {"type":"checkpoint","commit":C,"cycle":K,"pc":P,"regs_hash":R,
+//    "mem_hash":M,"pages":{"<page base>":<page hash>,...}}
+//   ...
+//   {"type":"final","commit":C,...same fields...}
+//
+// The `final` line is written once at end of run (`writeFinal`) with the total
+// number of retired commits, so a divergence after the last periodic
+// checkpoint (or a run of different length) is still detected.
+//
+// - `regs_hash`: FNV-1a over the little-endian bytes of the register values.
+// - page hashes: FNV-1a over the page bytes (same as `mem_hash(lo, hi)` on
+//   byte memories). Only pages whose hash changed since the previous
+//   checkpoint are listed; all-zero pages are implicit.
+// - `mem_hash`: FNV-1a over (base, hash) u64 pairs of all non-zero pages in
+//   ascending base order.
+//
+// The bisect tool compares the two streams, reports the first divergent
+// window of commits, and the flow re-runs only that window with full tracing
+// (`PycCommitWindow`).
+
+inline constexpr std::uint64_t kPycFnvOffset = 1469598103934665603ull;
+inline constexpr std::uint64_t kPycFnvPrime = 1099511628211ull;
+
+inline std::uint64_t pyc_fnv1a_u64(std::uint64_t h, std::uint64_t v) {
+  for (unsigned i = 0; i < 8; ++i) {
+    h ^= (v >> (8u * i)) & 0xFFu;
+    h *= kPycFnvPrime;
+  }
+  return h;
+}
+
+inline std::uint64_t pyc_regs_hash(const std::uint64_t *regs, std::size_t n) {
+  std::uint64_t h = kPycFnvOffset;
+  for (std::size_t i = 0; i < n; ++i)
+    h = pyc_fnv1a_u64(h, regs[i]);
+  return h;
+}
+
+// Hash of a `pageBytes`-long all-zero page (omitted from checkpoints).
+inline std::uint64_t pyc_zero_page_hash(std::size_t pageBytes) { return pyc_fnv1a_zero_run(kPycFnvOffset, pageBytes); }
+
+// Non-zero page hashes of a byte memory (`pyc_byte_mem`-like `mem_hash(lo, hi)`).
+// Untouched pages of paged stores hash in O(log n), so sparse memories stay
+// cheap to checkpoint.
+template <typename Mem>
+std::vector<std::pair<std::uint64_t, std::uint64_t>> pyc_mem_page_hashes(const Mem &mem, std::size_t depthBytes,
+                                                                          std::size_t pageBytes = 4096,
+                                                                          std::uint64_t baseAddr = 0) {
+  std::vector<std::pair<std::uint64_t, std::uint64_t>> out;
+  const std::uint64_t zero = pyc_zero_page_hash(pageBytes);
+  for (std::size_t lo = 0; lo < depthBytes; lo += pageBytes) {
+    std::size_t hi = lo + pageBytes - 1;
+    if (hi >= depthBytes)
+      hi = depthBytes - 1;
+    const std::uint64_t h = mem.mem_hash(lo, hi);
+    if (hi - lo + 1 == pageBytes && h == zero)
+      continue;
+    out.emplace_back(baseAddr + lo, h);
+  }
+  return out;
+}
+
+// Commit-index window `[from, to)` for re-running a divergent range with full
+// tracing. `fromEnv("PYC_COMMIT_TRACE")` reads `<prefix>_FROM` / `<prefix>_TO`.
+struct PycCommitWindow {
+  std::uint64_t from = 0;
+  std::uint64_t to = std::numeric_limits<std::uint64_t>::max();
+
+  bool contains(std::uint64_t commit) const { return commit >= from && commit < to; }
+  bool done(std::uint64_t commit) const { return commit >= to; }
+
+  static PycCommitWindow fromEnv(const std::string &prefix) {
+    PycCommitWindow w;
+    if (const char *s = std::getenv((prefix + "_FROM").c_str()))
+      w.from = std::strtoull(s, nullptr, 0);
+    if (const char *s = std::getenv((prefix + "_TO").c_str()))
+      w.to = std::strtoull(s, nullptr, 0);
+    return w;
+  }
+};
+
+class PycArchCheckpointWriter {
+public:
+  PycArchCheckpointWriter() = default;
+  PycArchCheckpointWriter(const PycArchCheckpointWriter &) = delete;
+  PycArchCheckpointWriter &operator=(const PycArchCheckpointWriter &) = delete;
+
+  ~PycArchCheckpointWriter() { close(); }
+
+  bool open(const std::string &path, std::uint64_t every, std::size_t pageBytes = 4096, std::string *err = nullptr) {
+    close();
+    out_.open(path, std::ios::out | std::ios::trunc);
+    if (!out_.is_open()) {
+      if (err)
+        *err = "failed to open checkpoint trace for writing: " + path;
+      return false;
+    }
+    every_ = every ? every : 1;
+    pageBytes_ = pageBytes;
+    pages_.clear();
+    out_ << "{\"type\":\"start\",\"checkpoint_every\":" << every_ << ",\"page_bytes\":" << pageBytes_
+         << ",\"hash\":\"fnv1a64\"}\n";
+    return out_.good();
+  }
+
+  bool isOpen() const { return out_.is_open(); }
+  std::uint64_t every() const { return every_; }
+  std::size_t pageBytes() const { return pageBytes_; }
+
+  // True when `commit` (commits retired so far) is a checkpoint boundary.
+  bool due(std::uint64_t commit) const { return out_.is_open() && commit != 0 && commit % every_ == 0; }
+
+  // `pages`: current non-zero (base, hash) pairs, e.g. from `pyc_mem_page_hashes()`.
+  void write(std::uint64_t commit, std::uint64_t cycle, std::uint64_t pc, std::uint64_t regsHash,
+             std::vector<std::pair<std::uint64_t, std::uint64_t>> pages) {
+    writeRecord("checkpoint", commit, cycle, pc, regsHash, std::move(pages));
+  }
+
+  // End-of-run record; `commit` is the total number of retired commits. Call
+  // once before `close()`, also when the run ends on a checkpoint boundary.
+  void writeFinal(std::uint64_t commit, std::uint64_t cycle, std::uint64_t pc, std::uint64_t regsHash,
+                  std::vector<std::pair<std::uint64_t, std::uint64_t>> pages) {
+    writeRecord("final", commit, cycle, pc, regsHash, std::move(pages));
+  }
+
+  bool close() {
+    if (!out_.is_open())
+      return false;
+    out_.flush();
+    bool good = out_.good();
+    out_.close();
+    return good;
+  }
+
+private:
+  void writeRecord(const char *type, std::uint64_t commit, std::uint64_t cycle, std::uint64_t pc,
+                   std::uint64_t regsHash, std::vector<std::pair<std::uint64_t, std::uint64_t>> pages) {
+    if (!out_.is_open())
+      return;
+    std::sort(pages.begin(), pages.end());
+    std::uint64_t memHash = kPycFnvOffset;
+    std::unordered_map<std::uint64_t, std::uint64_t> next;
+    next.reserve(pages.size());
+    for (const auto &[base, h] : pages) {
+      memHash = pyc_fnv1a_u64(pyc_fnv1a_u64(memHash, base), h);
+      next.emplace(base, h);
+    }
+
+    out_ << "{\"type\":\"" << type << "\",\"commit\":" << commit << ",\"cycle\":" << cycle << ",\"pc\":" << pc
+         << ",\"regs_hash\":" << regsHash << ",\"mem_hash\":" << memHash << ",\"pages\":{";
+    bool first = true;
+    auto emit = [&](std::uint64_t base, std::uint64_t h) {
+      out_ << (first ? "" : ",") << '"' << base << "\":" << h;
+      first = false;
+    };
+    for (const auto &[base, h] : pages) {
+      auto it = pages_.find(base);
+      if (it == pages_.end() || it->second != h)
+        emit(base, h);
+    }
+    // Pages that became all-zero.
+    const std::uint64_t zero = pyc_zero_page_hash(pageBytes_);
+    for (const auto &[base, h] : pages_) {
+      (void)h;
+      if (!next.count(base))
+        emit(base, zero);
+    }
+    out_ << "}}\n";
+    pages_ = std::move(next);
+  }
+
+  std::ofstream out_{};
+  std::uint64_t every_ = 1;
+  std::size_t pageBytes_ = 4096;
+  std::unordered_map<std::uint64_t, std::uint64_t> pages_{};
+};
+
+} // namespace pyc::cpp
@@ -93,6 +93,42 @@ public:
     eval();
   }
 
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(mem_);
+    ar.value(wptr_bin_);
+    ar.value(wptr_gray_);
+    ar.value(wfull_);
+    ar.value(rptr_gray_w1_);
+    ar.value(rptr_gray_w2_);
+    ar.value(inClkPrev_);
+    ar.value(rptr_bin_);
+    ar.value(rptr_gray_);
+    ar.value(wptr_gray_r1_);
+    ar.value(wptr_gray_r2_);
+    ar.value(out_valid_r_);
+    ar.value(out_data_r_);
+    ar.value(outClkPrev_);
+    ar.value(pendingIn_);
+    ar.value(wptr_bin_next_);
+    ar.value(wptr_gray_next_);
+    ar.value(wfull_next_);
+    ar.value(rptr_gray_w1_next_);
+    ar.value(rptr_gray_w2_next_);
+    ar.value(doWrite_);
+    ar.value(writeAddr_);
+    ar.value(writeData_);
+    ar.value(pendingOut_);
+    ar.value(rptr_bin_next_);
+    ar.value(rptr_gray_next_);
+    ar.value(wptr_gray_r1_next_);
+    ar.value(wptr_gray_r2_next_);
+    ar.value(out_valid_r_next_);
+    ar.value(out_data_r_next_);
+    if constexpr (Ar::kLoading)
+      evalValid_ = false;
+  }
+
 private:
   using ptr_t = std::uint64_t;
 
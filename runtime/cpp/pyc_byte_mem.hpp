@@ -8,6 +8,8 @@
 #include <vector>
 
 #include "pyc_bits.hpp"
+#include "pyc_mem_image.hpp"
+#include "pyc_mem_store.hpp"
 
 namespace pyc::cpp {
 
@@ -17,6 +19,8 @@ namespace pyc::cpp {
 // - `rdata` is assembled little-endian from successive bytes at `raddr`.
 // - Write uses `wstrb` byte enables relative to `waddr`.
 // - Addresses are low-bit indexed into host `size_t`; out-of-range bytes are 0.
+// - Contents live in `pyc_mem_store_t` (dense, or paged for large windows; see
+//   `pyc_mem_store.hpp`).
 template <unsigned AddrWidth, unsigned DataWidth, std::size_t DepthBytes>
 class pyc_byte_mem {
 public:
@@ -32,8 +36,7 @@ public:
                Wire<AddrWidth> &waddr,
                Wire<DataWidth> &wdata,
                Wire<StrbWidth> &wstrb)
-      : clk(clk), rst(rst), raddr(raddr), rdata(rdata), wvalid(wvalid), waddr(waddr), wdata(wdata), wstrb(wstrb),
-        mem_(DepthBytes, 0u) {
+      : clk(clk), rst(rst), raddr(raddr), rdata(rdata), wvalid(wvalid), waddr(waddr), wdata(wdata), wstrb(wstrb) {
     eval();
   }
 
@@ -79,10 +82,16 @@ public:
       hi = DepthBytes - 1;
 
     std::uint64_t h = 1469598103934665603ull;
-    for (std::size_t i = lo; i <= hi; ++i) {
-      h ^= static_cast<std::uint64_t>(mem_[i]);
-      h *= 1099511628211ull;
-    }
+    mem_.visit(lo, hi, [&](std::size_t, const std::uint8_t *bytes, std::size_t n) {
+      if (!bytes) {
+        h = pyc_fnv1a_zero_run(h, n);
+        return;
+      }
+      for (std::size_t i = 0; i < n; ++i) {
+        h ^= static_cast<std::uint64_t>(bytes[i]);
+        h *= 1099511628211ull;
+      }
+    });
     return h;
   }
 
@@ -96,7 +105,7 @@ public:
 
     for (std::size_t i = lo; i <= hi; ++i) {
       os << "{\"addr\":" << i << ",\"byte\":\"0x" << std::hex << std::setw(2) << std::setfill('0')
-         << static_cast<unsigned>(mem_[i]) << std::dec << "\"}\n";
+         << static_cast<unsigned>(mem_.read(i)) << std::dec << "\"}\n";
     }
   }
 
@@ -108,7 +117,7 @@ public:
     Wire<DataWidth> v = Wire<DataWidth>(0);
     for (unsigned i = 0; i < StrbWidth; i++) {
       std::size_t ai = base + static_cast<std::size_t>(i);
-      std::uint8_t b = (ai < DepthBytes) ? mem_[ai] : 0u;
+      std::uint8_t b = (ai < DepthBytes) ? mem_.read(ai) : 0u;
       Wire<DataWidth> byteW = zext<DataWidth, 8>(Wire<8>(b));
       v = v | shl<DataWidth>(byteW, 8u * i);
     }
@@ -162,7 +171,7 @@ public:
         if (ai >= DepthBytes)
           continue;
         Wire<8> byte = extract<8, DataWidth>(latchedData, 8u * i);
-        mem_[ai] = static_cast<std::uint8_t>(byte.value() & 0xFFu);
+        mem_.write(ai, static_cast<std::uint8_t>(byte.value() & 0xFFu));
       }
       dataDirty = true;
 
@@ -175,7 +184,7 @@ public:
           Wire<DataWidth> v = Wire<DataWidth>(0);
           for (unsigned i = 0; i < StrbWidth; i++) {
             std::size_t ai = base + static_cast<std::size_t>(i);
-            std::uint8_t b = (ai < DepthBytes) ? mem_[ai] : 0u;
+            std::uint8_t b = (ai < DepthBytes) ? mem_.read(ai) : 0u;
             Wire<DataWidth> byteW = zext<DataWidth, 8>(Wire<8>(b));
             v = v | shl<DataWidth>(byteW, 8u * i);
           }
@@ -196,17 +205,40 @@ public:
   // Convenience for testbenches.
   void pokeByte(std::size_t addr, std::uint8_t value) {
     if (addr < DepthBytes) {
-      mem_[addr] = value;
+      mem_.write(addr, value);
+      dataDirty = true;
+    }
+  }
+  // Load a `PycMemImage`; image address `baseAddr` maps to byte 0. Paged
+  // stores adopt whole image pages copy-on-write instead of copying them.
+  std::size_t loadImage(const PycMemImage &img, std::uint64_t baseAddr = 0) {
+    const std::size_t n = pyc_load_image_bytes(mem_, DepthBytes, img, baseAddr);
+    dataDirty = true;
+    return n;
+  }
+
+  // State snapshot hook (see pyc_snapshot.hpp). Watch configuration is debug
+  // state and is not captured.
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pendingWrite);
+    ar.value(latchedAddr);
+    ar.value(latchedData);
+    ar.value(latchedStrb);
+    ar.store(mem_);
+    if constexpr (Ar::kLoading) {
+      evalValid = false;
       dataDirty = true;
     }
   }
-  std::uint8_t peekByte(std::size_t addr) const { return (addr < DepthBytes) ? mem_[addr] : 0u; }
+  std::uint8_t peekByte(std::size_t addr) const { return (addr < DepthBytes) ? mem_.read(addr) : 0u; }
 
   std::uint32_t peek32(std::size_t addr) const {
     std::uint32_t v = 0;
     for (unsigned i = 0; i < 4; i++) {
       std::size_t ai = addr + i;
-      std::uint8_t b = (ai < DepthBytes) ? mem_[ai] : 0u;
+      std::uint8_t b = (ai < DepthBytes) ? mem_.read(ai) : 0u;
       v |= (static_cast<std::uint32_t>(b) << (8u * i));
     }
     return v;
@@ -233,7 +265,7 @@ public:
   bool dataDirty = true;
   std::size_t lastEvalRaddr = 0;
 
-  std::vector<std::uint8_t> mem_;
+  pyc_mem_store_t<std::uint8_t, DepthBytes> mem_;
 
 private:
   static constexpr std::size_t toIndex(Wire<AddrWidth> addr) {
@@ -49,6 +49,14 @@ public:
     pending = false;
   }
 
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pending);
+    ar.value(pipe_);
+    ar.value(pipeNext_);
+  }
+
 public:
   Wire<1> &clk;
   Wire<1> &rst;
@@ -0,0 +1,195 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <string>
+#include <string_view>
+#include <type_traits>
+#include <vector>
+
+#if defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+#include <zstd.h>
+#endif
+
+namespace pyc::cpp {
+
+// Binary Linx commit traces (`.pyccommit`): the fixed-layout counterpart of
+// the JSONL commit trace diffed by contrib/linx/flows/tools/linx_trace_diff.py.
+//
+// File layout (little-endian host order, like snapshots):
+//   header : magic "PYCCMT01", u32 version, u32 flags, u32 record_size,
+//            u32 schema_id_len, then schema_id bytes
+//   body   : PycCommitRecord x N, or one zstd stream of them when
+//            flags & kPycCommitTraceZstd (`*.pyccommit.zst`; needs
+//            -DPYC_RUNTIME_ENABLE_ZSTD_TRACE=1 and libzstd)
+//
+// Group fields (src/dst/wb/mem/trap) only matter when their `valid` bit is
+// set; leave them zero otherwise. `linx_commit_trace.py` converts to and from
+// JSONL (e.g. for QEMU reference traces).
+//
+// Testbenches pick the format from the `PYC_COMMIT_TRACE` path:
+//
+//   if (pyc_commit_trace_is_binary(path)) writer.open(path);
+
+inline constexpr char kPycCommitTraceMagic[8] = {'P', 'Y', 'C', 'C', 'M', 'T', '0', '1'};
+inline constexpr std::uint32_t kPycCommitTraceVersion = 1;
+inline constexpr std::uint32_t kPycCommitTraceZstd = 1u << 0;
+
+// `PycCommitRecord::valid` bits.
+inline constexpr std::uint32_t kPycCommitSrc0Valid = 1u << 0;
+inline constexpr std::uint32_t kPycCommitSrc1Valid = 1u << 1;
+inline constexpr std::uint32_t kPycCommitDstValid = 1u << 2;
+inline constexpr std::uint32_t kPycCommitWbValid = 1u << 3;
+inline constexpr std::uint32_t kPycCommitMemValid = 1u << 4;
+inline constexpr std::uint32_t kPycCommitMemIsStore = 1u << 5;
+inline constexpr std::uint32_t kPycCommitTrapValid = 1u << 6;
+
+// One retired instruction; field names match the JSONL `MANDATORY_FIELDS`.
+struct PycCommitRecord {
+  std::uint64_t cycle = 0;
+  std::uint64_t pc = 0;
+  std::uint64_t insn = 0;
+  std::uint64_t next_pc = 0;
+  std::uint64_t src0_data = 0;
+  std::uint64_t src1_data = 0;
+  std::uint64_t dst_data = 0;
+  std::uint64_t wb_data = 0;
+  std::uint64_t mem_addr = 0;
+  std::uint64_t mem_wdata = 0;
+  std::uint64_t mem_rdata = 0;
+  std::uint64_t trap_cause = 0;
+  std::uint64_t traparg0 = 0;
+  std::uint32_t valid = 0;
+  std::uint8_t len = 0;
+  std::uint8_t src0_reg = 0;
+  std::uint8_t src1_reg = 0;
+  std::uint8_t dst_reg = 0;
+  std::uint8_t wb_rd = 0;
+  std::uint8_t mem_size = 0;
+  std::uint8_t reserved[6] = {};
+};
+
+static_assert(sizeof(PycCommitRecord) == 120, "PycCommitRecord layout is part of the .pyccommit format");
+static_assert(std::is_trivially_copyable_v<PycCommitRecord>);
+
+inline bool pyc_commit_trace_is_binary(std::string_view path) {
+  auto endsWith = [&](std::string_view suffix) {
+    return path.size() >= suffix.size() && path.substr(path.size() - suffix.size()) == suffix;
+  };
+  return endsWith(".pyccommit") || endsWith(".pyccommit.zst");
+}
+
+class PycCommitTraceWriter {
+public:
+  // Records buffered before each write (or zstd compression step).
+  static constexpr std::size_t kBufferRecords = 4096;
+
+  PycCommitTraceWriter() = default;
+  PycCommitTraceWriter(const PycCommitTraceWriter &) = delete;
+  PycCommitTraceWriter &operator=(const PycCommitTraceWriter &) = delete;
+
+  ~PycCommitTraceWriter() { close(); }
+
+  bool isOpen() const { return out_.is_open(); }
+  std::uint64_t records() const { return records_; }
+
+  // `*.pyccommit.zst` selects zstd framing.
+  bool open(const std::string &path, std::string_view schemaId = "LC-COMMIT-BUNDLE-V2", std::string *err = nullptr) {
+    close();
+    const bool zstd = path.size() >= 4 && path.compare(path.size() - 4, 4, ".zst") == 0;
+#if !defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+    if (zstd) {
+      if (err)
+        *err = "zstd commit traces need -DPYC_RUNTIME_ENABLE_ZSTD_TRACE=1: " + path;
+      return false;
+    }
+#endif
+    out_.open(path, std::ios::binary | std::ios::out | std::ios::trunc);
+    if (!out_.is_open()) {
+      if (err)
+        *err = "failed to open commit trace for writing: " + path;
+      return false;
+    }
+    out_.write(kPycCommitTraceMagic, sizeof(kPycCommitTraceMagic));
+    writeU32(kPycCommitTraceVersion);
+    writeU32(zstd ? kPycCommitTraceZstd : 0u);
+    writeU32(static_cast<std::uint32_t>(sizeof(PycCommitRecord)));
+    writeU32(static_cast<std::uint32_t>(schemaId.size()));
+    out_.write(schemaId.data(), static_cast<std::streamsize>(schemaId.size()));
+#if defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+    if (zstd) {
+      cctx_ = ZSTD_createCCtx();
+      zbuf_.resize(ZSTD_CStreamOutSize());
+    }
+#endif
+    buf_.reserve(kBufferRecords);
+    records_ = 0;
+    return out_.good();
+  }
+
+  void write(const PycCommitRecord &r) {
+    buf_.push_back(r);
+    ++records_;
+    if (buf_.size() >= kBufferRecords)
+      flushBuffer(/*last=*/false);
+  }
+
+  bool close() {
+    if (!out_.is_open())
+      return false;
+    flushBuffer(/*last=*/true);
+#if defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+    if (cctx_) {
+      ZSTD_freeCCtx(cctx_);
+      cctx_ = nullptr;
+    }
+#endif
+    out_.flush();
+    bool good = out_.good();
+    out_.close();
+    return good;
+  }
+
+private:
+  void writeU32(std::uint32_t v) { out_.write(reinterpret_cast<const char *>(&v), sizeof(v)); }
+
+  void flushBuffer(bool last) {
+    const char *p = reinterpret_cast<const char *>(buf_.data());
+    const std::size_t n = buf_.size() * sizeof(PycCommitRecord);
+#if defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+    if (cctx_) {
+      ZSTD_inBuffer in{p, n, 0};
+      const ZSTD_EndDirective mode = last ? ZSTD_e_end : ZSTD_e_continue;
+      for (;;) {
+        ZSTD_outBuffer zout{zbuf_.data(), zbuf_.size(), 0};
+        const std::size_t remaining = ZSTD_compressStream2(cctx_, &zout, &in, mode);
+        if (ZSTD_isError(remaining)) {
+          out_.setstate(std::ios::badbit);
+          break;
+        }
+        out_.write(zbuf_.data(), static_cast<std::streamsize>(zout.pos));
+        if (last ? remaining == 0 : in.pos == in.size)
+          break;
+      }
+      buf_.clear();
+      return;
+    }
+#endif
+    (void)last;
+    if (n)
+      out_.write(p, static_cast<std::streamsize>(n));
+    buf_.clear();
+  }
+
+  std::ofstream out_{};
+  std::vector<PycCommitRecord> buf_{};
+  std::uint64_t records_ = 0;
+#if defined(PYC_RUNTIME_ENABLE_ZSTD_TRACE)
+  ZSTD_CCtx *cctx_ = nullptr;
+  std::vector<char> zbuf_{};
+#endif
+};
+
+} // namespace pyc::cpp
@@ -0,0 +1,288 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <memory>
+#include <string>
+#include <vector>
+
+#if defined(__unix__) || defined(__APPLE__)
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#define PYC_MEM_IMAGE_MMAP 1
+#endif
+
+namespace pyc::cpp {
+
+// Binary memory image (`PYCMIMG1`), produced by
+// `contrib/linx/flows/tools/linxisa/elf_to_memh.py --format image`.
+//
+// Layout (little-endian):
+// - header (32B): magic "PYCMIMG1", u32 version (=1), u32 segment_count,
+//   u64 entry_pc (0 if unknown), u32 page_size, u32 reserved
+// - segment table: segment_count x { u64 base, u64 size, u64 file_offset, u64 flags }
+// - segment payloads at `file_offset` (multiple of `page_size`), zero-padded
+//   to a `page_size` boundary. `flags & 1` marks a zero-fill segment with no
+//   payload (e.g. `.bss`).
+//
+// Each `loadImage()` maps the file private/writable (`mapPrivate()`), so
+// memories backed by `pyc_paged_store` adopt whole pages straight from their own
+// mapping and the kernel copies a page only when the simulation first writes it.
+class PycMemImage {
+public:
+  static constexpr char kMagic[8] = {'P', 'Y', 'C', 'M', 'I', 'M', 'G', '1'};
+  static constexpr std::uint32_t kVersion = 1;
+  static constexpr std::uint64_t kFlagZeroFill = 1;
+
+  struct Segment {
+    std::uint64_t base = 0;
+    std::uint64_t size = 0;
+    std::uint64_t padded_size = 0;
+    std::uint64_t file_offset = 0;
+    const std::uint8_t *data = nullptr; // read-only view; nullptr for zero-fill segments
+  };
+
+  PycMemImage() = default;
+  PycMemImage(const PycMemImage &) = delete;
+  PycMemImage &operator=(const PycMemImage &) = delete;
+  PycMemImage(PycMemImage &&) = default;
+  PycMemImage &operator=(PycMemImage &&) = default;
+
+  static bool isImage(const std::filesystem::path &path) {
+    std::ifstream in(path, std::ios::binary);
+    char magic[sizeof(kMagic)] = {};
+    if (!in.read(magic, sizeof(magic)))
+      return false;
+    return std::memcmp(magic, kMagic, sizeof(kMagic)) == 0;
+  }
+
+  bool open(const std::filesystem::path &path, std::string *err = nullptr) {
+    close();
+    if (!mapFile(path, err))
+      return false;
+    if (!parse(err)) {
+      close();
+      return false;
+    }
+    return true;
+  }
+
+  void close() {
+    segments_.clear();
+    mapping_.reset();
+    path_.clear();
+    base_ = nullptr;
+    size_ = 0;
+    entry_ = 0;
+  }
+
+  bool isOpen() const { return base_ != nullptr; }
+  std::uint64_t entry() const { return entry_; }
+  const std::vector<Segment> &segments() const { return segments_; }
+
+  // A fresh private (copy-on-write) mapping of the whole file. Writes through
+  // it are never visible to other mappings or to the file. Segment payloads
+  // are at `base + Segment::file_offset`.
+  std::shared_ptr<std::uint8_t> mapPrivate() const {
+    std::shared_ptr<std::uint8_t> out;
+    if (!isOpen())
+      return out;
+#if PYC_MEM_IMAGE_MMAP
+    const int fd = ::open(path_.c_str(), O_RDONLY);
+    if (fd >= 0) {
+      const std::size_t len = size_;
+      void *p = ::mmap(nullptr, len, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+      ::close(fd);
+      if (p != MAP_FAILED) {
+        out.reset(static_cast<std::uint8_t *>(p), [len](std::uint8_t *q) { ::munmap(q, len); });
+        return out;
+      }
+    }
+#endif
+    out.reset(new std::uint8_t[size_], std::default_delete<std::uint8_t[]>());
+    std::memcpy(out.get(), base_, size_);
+    return out;
+  }
+
+private:
+  static std::uint32_t rdU32(const std::uint8_t *p) {
+    std::uint32_t v = 0;
+    for (unsigned i = 0; i < 4; ++i)
+      v |= static_cast<std::uint32_t>(p[i]) << (8u * i);
+    return v;
+  }
+  static std::uint64_t rdU64(const std::uint8_t *p) {
+    std::uint64_t v = 0;
+    for (unsigned i = 0; i < 8; ++i)
+      v |= static_cast<std::uint64_t>(p[i]) << (8u * i);
+    return v;
+  }
+
+  static bool fail(std::string *err, const std::string &msg) {
+    if (err)
+      *err = msg;
+    return false;
+  }
+
+  bool mapFile(const std::filesystem::path &path, std::string *err) {
+#if PYC_MEM_IMAGE_MMAP
+    const int fd = ::open(path.c_str(), O_RDONLY);
+    if (fd < 0)
+      return fail(err, "cannot open memory image: " + path.string());
+    struct stat st {};
+    if (::fstat(fd, &st) != 0 || st.st_size <= 0) {
+      ::close(fd);
+      return fail(err, "cannot stat memory image: " + path.string());
+    }
+    const std::size_t len = static_cast<std::size_t>(st.st_size);
+    void *p = ::mmap(nullptr, len, PROT_READ, MAP_PRIVATE, fd, 0);
+    ::close(fd);
+    if (p == MAP_FAILED)
+      return fail(err, "cannot mmap memory image: " + path.string());
+    mapping_ = std::shared_ptr<void>(p, [len](void *q) { ::munmap(q, len); });
+    base_ = static_cast<const std::uint8_t *>(p);
+    size_ = len;
+    path_ = path;
+    return true;
+#else
+    std::ifstream in(path, std::ios::binary | std::ios::ate);
+    if (!in.is_open())
+      return fail(err, "cannot open memory image: " + path.string());
+    const std::size_t len = static_cast<std::size_t>(in.tellg());
+    std::shared_ptr<std::uint8_t> buf(new std::uint8_t[len], std::default_delete<std::uint8_t[]>());
+    in.seekg(0);
+    if (!in.read(reinterpret_cast<char *>(buf.get()), static_cast<std::streamsize>(len)))
+      return fail(err, "cannot read memory image: " + path.string());
+    base_ = buf.get();
+    size_ = len;
+    path_ = path;
+    mapping_ = std::move(buf);
+    return true;
+#endif
+  }
+
+  bool parse(std::string *err) {
+    constexpr std::size_t kHeaderBytes = 32;
+    constexpr std::size_t kSegmentBytes = 32;
+    if (size_ < kHeaderBytes || std::memcmp(base_, kMagic, sizeof(kMagic)) != 0)
+      return fail(err, "not a PYCMIMG1 memory image");
+    if (rdU32(base_ + 8) != kVersion)
+      return fail(err, "unsupported memory image version");
+    const std::uint32_t count = rdU32(base_ + 12);
+    entry_ = rdU64(base_ + 16);
+    const std::uint64_t pageSize = rdU32(base_ + 24);
+    if (pageSize == 0 || (pageSize & (pageSize - 1)) != 0)
+      return fail(err, "memory image page_size must be a power of two");
+    if (kHeaderBytes + static_cast<std::uint64_t>(count) * kSegmentBytes > size_)
+      return fail(err, "memory image segment table is truncated");
+
+    segments_.reserve(count);
+    for (std::uint32_t i = 0; i < count; ++i) {
+      const std::uint8_t *rec = base_ + kHeaderBytes + static_cast<std::size_t>(i) * kSegmentBytes;
+      Segment seg;
+      seg.base = rdU64(rec + 0);
+      seg.size = rdU64(rec + 8);
+      const std::uint64_t off = rdU64(rec + 16);
+      const std::uint64_t flags = rdU64(rec + 24);
+      seg.padded_size = (seg.size + pageSize - 1) & ~(pageSize - 1);
+      if ((flags & kFlagZeroFill) == 0) {
+        if (off % pageSize != 0 || off > size_ || seg.padded_size > size_ - off)
+          return fail(err, "memory image segment payload is out of bounds");
+        seg.file_offset = off;
+        seg.data = base_ + off;
+      }
+      segments_.push_back(seg);
+    }
+    return true;
+  }
+
+  std::shared_ptr<void> mapping_{};
+  std::filesystem::path path_{};
+  const std::uint8_t *base_ = nullptr;
+  std::size_t size_ = 0;
+  std::uint64_t entry_ = 0;
+  std::vector<Segment> segments_{};
+};
+
+// Load byte-addressed image segments into a byte store covering
+// `[baseAddr, baseAddr + depthBytes)`. Bytes outside the window are dropped.
+// Returns the number of bytes loaded (including zero-fill).
+template <typename Store>
+std::size_t pyc_load_image_bytes(Store &mem, std::size_t depthBytes, const PycMemImage &img, std::uint64_t baseAddr) {
+  std::shared_ptr<std::uint8_t> view = img.mapPrivate();
+  std::size_t loaded = 0;
+  for (const auto &seg : img.segments()) {
+    const std::uint64_t lo = (seg.base > baseAddr) ? seg.base : baseAddr;
+    const std::uint64_t hi = ((seg.base + seg.size) < (baseAddr + depthBytes)) ? (seg.base + seg.size)
+                                                                              : (baseAddr + depthBytes);
+    if (lo >= hi)
+      continue;
+    const std::size_t first = static_cast<std::size_t>(lo - baseAddr);
+    const std::size_t count = static_cast<std::size_t>(hi - lo);
+    const std::size_t skip = static_cast<std::size_t>(lo - seg.base);
+    if (!seg.data)
+      mem.clear(first, count);
+    else
+      mem.map(first, view.get() + seg.file_offset + skip, count, static_cast<std::size_t>(seg.padded_size) - skip,
+              view);
+    loaded += count;
+  }
+  return loaded;
+}
+
+// Load byte-addressed image segments into an entry store of `Wire<DataWidth>`
+// (`StrbWidth` bytes per entry, little-endian lanes). Entry `i` holds image
+// bytes `[baseAddr + i*StrbWidth, baseAddr + (i+1)*StrbWidth)`.
+template <unsigned DataWidth, typename Entry, typename Store>
+std::size_t pyc_load_image_entries(Store &mem, std::size_t depthEntries, const PycMemImage &img,
+                                   std::uint64_t baseAddr) {
+  constexpr std::size_t kLaneBytes = (DataWidth + 7u) / 8u;
+  const std::uint64_t windowEnd = baseAddr + static_cast<std::uint64_t>(depthEntries) * kLaneBytes;
+  std::shared_ptr<std::uint8_t> view = img.mapPrivate();
+  std::size_t loaded = 0;
+  for (const auto &seg : img.segments()) {
+    const std::uint64_t lo = (seg.base > baseAddr) ? seg.base : baseAddr;
+    const std::uint64_t hi = ((seg.base + seg.size) < windowEnd) ? (seg.base + seg.size) : windowEnd;
+    if (lo >= hi)
+      continue;
+    std::uint64_t a = lo;
+
+#if defined(__BYTE_ORDER__) && (__BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__)
+    // Fast path: entries whose host layout is exactly the packed lane bytes.
+    if constexpr (sizeof(Entry) == kLaneBytes) {
+      const std::uint64_t rel = a - baseAddr;
+      const std::size_t skip = static_cast<std::size_t>(a - seg.base);
+      std::uint8_t *src = view.get() + seg.file_offset + skip;
+      if (seg.data && rel % kLaneBytes == 0 && reinterpret_cast<std::uintptr_t>(src) % alignof(Entry) == 0) {
+        const std::size_t n = static_cast<std::size_t>((hi - a) / kLaneBytes);
+        const std::size_t padded = static_cast<std::size_t>((seg.padded_size - skip) / kLaneBytes);
+        mem.map(static_cast<std::size_t>(rel / kLaneBytes), reinterpret_cast<Entry *>(src), n, padded, view);
+        a += static_cast<std::uint64_t>(n) * kLaneBytes;
+      }
+    }
+#endif
+
+    // Generic path: merge bytes lane by lane (partial entries keep other lanes).
+    while (a < hi) {
+      const std::uint64_t rel = a - baseAddr;
+      const std::size_t idx = static_cast<std::size_t>(rel / kLaneBytes);
+      Entry v = mem.read(idx);
+      for (std::size_t lane = static_cast<std::size_t>(rel % kLaneBytes); lane < kLaneBytes && a < hi; ++lane, ++a) {
+        const std::uint64_t b = seg.data ? seg.data[a - seg.base] : 0u;
+        const unsigned w = static_cast<unsigned>(lane / 8u);
+        const unsigned sh = static_cast<unsigned>(lane % 8u) * 8u;
+        v.setWord(w, (v.word(w) & ~(std::uint64_t{0xFF} << sh)) | (b << sh));
+      }
+      mem.write(idx, v);
+    }
+    loaded += static_cast<std::size_t>(hi - lo);
+  }
+  return loaded;
+}
+
+} // namespace pyc::cpp
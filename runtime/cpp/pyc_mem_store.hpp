@@ -0,0 +1,280 @@
+#pragma once
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace pyc::cpp {
+
+// Backing stores for simulated memories (`pyc_byte_mem`, `pyc_sync_mem`,
+// `pyc_sync_mem_dp`).
+//
+// - `pyc_dense_store`: one contiguous zero-filled allocation.
+// - `pyc_paged_store`: fixed-size pages (4 KiB of host memory) behind a
+//   two-level table. Pages are allocated on the first non-zero write; untouched
+//   pages read as zero and cost no host memory or startup memset.
+//
+// Both stores expose the same interface, so memory primitives stay agnostic of
+// the layout (hash/watch/dump results are identical for either store).
+//
+// Compile-time selection (see `pyc_mem_store_t`):
+// - `-DPYC_SPARSE_MEM_MIN_BYTES=<n>`: memories whose dense footprint is at
+//   least `n` host bytes use the paged store (default: 64 MiB).
+// - `-DPYC_DISABLE_SPARSE_MEM`: always use the dense store (A/B checks).
+// - `-DPYC_FORCE_SPARSE_MEM`: always use the paged store.
+
+#ifndef PYC_SPARSE_MEM_MIN_BYTES
+#define PYC_SPARSE_MEM_MIN_BYTES (std::size_t{64} << 20)
+#endif
+
+namespace mem_store_detail {
+
+constexpr std::size_t floorPow2(std::size_t v) {
+  std::size_t p = 1;
+  while ((p << 1) != 0 && (p << 1) <= v)
+    p <<= 1;
+  return p;
+}
+
+constexpr unsigned log2Pow2(std::size_t v) {
+  unsigned n = 0;
+  while (v > 1) {
+    v >>= 1;
+    ++n;
+  }
+  return n;
+}
+
+} // namespace mem_store_detail
+
+// FNV-1a step for a run of `n` zero words: `h ^= 0; h *= prime` repeated `n`
+// times collapses to `h *= prime^n`. Lets `mem_hash()` skip untouched pages.
+inline std::uint64_t pyc_fnv1a_zero_run(std::uint64_t h, std::uint64_t n) {
+  std::uint64_t base = 1099511628211ull;
+  std::uint64_t mul = 1;
+  while (n != 0) {
+    if (n & 1u)
+      mul *= base;
+    base *= base;
+    n >>= 1;
+  }
+  return h * mul;
+}
+
+template <typename T, std::size_t Depth>
+class pyc_dense_store {
+public:
+  using value_type = T;
+  static constexpr bool kSparse = false;
+  static constexpr std::size_t kDepth = Depth;
+
+  pyc_dense_store() : data_(Depth, T{}) {}
+
+  T read(std::size_t i) const { return data_[i]; }
+  void write(std::size_t i, const T &v) { data_[i] = v; }
+
+  // Bulk-load `count` entries from `src` starting at entry `first`. The paged
+  // store may keep referencing `src` (see `pyc_paged_store::map`); the dense
+  // store always copies.
+  void map(std::size_t first, T *src, std::size_t count, std::size_t /*paddedCount*/,
+           const std::shared_ptr<void> & /*keepAlive*/) {
+    std::copy(src, src + count, data_.begin() + static_cast<std::ptrdiff_t>(first));
+  }
+  void clear(std::size_t first, std::size_t count) {
+    std::fill(data_.begin() + static_cast<std::ptrdiff_t>(first),
+              data_.begin() + static_cast<std::ptrdiff_t>(first + count), T{});
+  }
+  // Back to the all-zero state.
+  void reset() { std::fill(data_.begin(), data_.end(), T{}); }
+
+  // Visit `[lo, hi]` (inclusive) as contiguous runs: `fn(first, ptr, count)`.
+  // `ptr == nullptr` means the run is all-zero and has no backing storage.
+  template <typename Fn>
+  void visit(std::size_t lo, std::size_t hi, Fn &&fn) const {
+    if (lo > hi || lo >= Depth)
+      return;
+    fn(lo, data_.data() + lo, hi - lo + 1);
+  }
+
+  std::size_t resident_bytes() const { return data_.size() * sizeof(T); }
+
+private:
+  std::vector<T> data_;
+};
+
+template <typename T, std::size_t Depth>
+class pyc_paged_store {
+public:
+  using value_type = T;
+  static constexpr bool kSparse = true;
+  static constexpr std::size_t kDepth = Depth;
+  static constexpr std::size_t kPageBytes = 4096;
+  static constexpr std::size_t kPageEntries =
+      mem_store_detail::floorPow2((sizeof(T) >= kPageBytes) ? 1 : (kPageBytes / sizeof(T)));
+  static constexpr unsigned kPageShift = mem_store_detail::log2Pow2(kPageEntries);
+  static constexpr std::size_t kLeafPages = 512;
+  static constexpr std::size_t kNumPages = (Depth + kPageEntries - 1) / kPageEntries;
+  static constexpr std::size_t kNumLeaves = (kNumPages + kLeafPages - 1) / kLeafPages;
+
+  pyc_paged_store() : root_(kNumLeaves) {}
+
+  T read(std::size_t i) const {
+    const std::size_t page = i >> kPageShift;
+    if (page == cachedPage_)
+      return cachedData_[i & (kPageEntries - 1)];
+    const T *p = findPage(page);
+    if (!p)
+      return T{};
+    cachedPage_ = page;
+    cachedData_ = const_cast<T *>(p);
+    return p[i & (kPageEntries - 1)];
+  }
+
+  void write(std::size_t i, const T &v) {
+    const std::size_t page = i >> kPageShift;
+    if (page != cachedPage_) {
+      T *p = const_cast<T *>(findPage(page));
+      if (!p) {
+        // Writing zero into an untouched page is a no-op.
+        if (v == T{})
+          return;
+        p = allocPage(page);
+      }
+      cachedPage_ = page;
+      cachedData_ = p;
+    }
+    cachedData_[i & (kPageEntries - 1)] = v;
+  }
+
+  // Bulk-load `count` entries from `src` starting at entry `first`.
+  //
+  // Whole, still-untouched pages are adopted by pointer instead of copied:
+  // `src[0, paddedCount)` must stay valid and writable for the lifetime of the
+  // store (`keepAlive` is retained for that), e.g. a private (copy-on-write)
+  // file mapping from `PycMemImage`. Partial or already-resident pages are
+  // copied.
+  void map(std::size_t first, T *src, std::size_t count, std::size_t paddedCount,
+           const std::shared_ptr<void> &keepAlive) {
+    bool adopted = false;
+    std::size_t done = 0;
+    while (done < count) {
+      const std::size_t i = first + done;
+      const std::size_t page = i >> kPageShift;
+      const std::size_t off = i & (kPageEntries - 1);
+      std::size_t n = kPageEntries - off;
+      if (n > count - done)
+        n = count - done;
+      if (off == 0 && done + kPageEntries <= paddedCount && !findPage(page)) {
+        slotFor(page) = src + done;
+        adopted = true;
+      } else {
+        T *p = const_cast<T *>(findPage(page));
+        if (!p)
+          p = allocPage(page);
+        std::copy(src + done, src + done + n, p + off);
+      }
+      done += n;
+    }
+    if (adopted && keepAlive)
+      keepAlive_.push_back(keepAlive);
+  }
+
+  void clear(std::size_t first, std::size_t count) {
+    if (count == 0)
+      return;
+    visit(first, first + count - 1, [&](std::size_t, const T *p, std::size_t n) {
+      if (p)
+        std::fill(const_cast<T *>(p), const_cast<T *>(p) + n, T{});
+    });
+  }
+
+  // Back to the all-zero state, releasing owned and adopted pages.
+  void reset() {
+    for (Leaf &leaf : root_)
+      leaf.reset();
+    owned_.clear();
+    keepAlive_.clear();
+    residentPages_ = 0;
+    cachedPage_ = ~std::size_t{0};
+    cachedData_ = nullptr;
+  }
+
+  template <typename Fn>
+  void visit(std::size_t lo, std::size_t hi, Fn &&fn) const {
+    if (lo > hi || lo >= Depth)
+      return;
+    if (hi >= Depth)
+      hi = Depth - 1;
+    std::size_t i = lo;
+    while (i <= hi) {
+      const std::size_t page = i >> kPageShift;
+      const std::size_t off = i & (kPageEntries - 1);
+      std::size_t pageEnd = ((page + 1) << kPageShift) - 1;
+      if (pageEnd > hi)
+        pageEnd = hi;
+      const std::size_t count = pageEnd - i + 1;
+      const T *p = findPage(page);
+      fn(i, p ? (p + off) : nullptr, count);
+      i = pageEnd + 1;
+      if (i == 0)
+        break;
+    }
+  }
+
+  // Pages allocated on the host heap (adopted pages are not counted).
+  std::size_t resident_pages() const { return residentPages_; }
+  std::size_t resident_bytes() const { return residentPages_ * kPageEntries * sizeof(T); }
+
+private:
+  // Leaf slots are non-owning: a page is either owned by `owned_` (allocated on
+  // first write) or adopted from an external mapping by `map()`.
+  using Leaf = std::unique_ptr<T *[]>;
+
+  const T *findPage(std::size_t page) const {
+    const Leaf &leaf = root_[page / kLeafPages];
+    if (!leaf)
+      return nullptr;
+    return leaf[page % kLeafPages];
+  }
+
+  T *&slotFor(std::size_t page) {
+    Leaf &leaf = root_[page / kLeafPages];
+    if (!leaf)
+      leaf.reset(new T *[kLeafPages]());
+    return leaf[page % kLeafPages];
+  }
+
+  T *allocPage(std::size_t page) {
+    owned_.emplace_back(new T[kPageEntries]());
+    ++residentPages_;
+    return slotFor(page) = owned_.back().get();
+  }
+
+  std::vector<Leaf> root_;
+  std::vector<std::unique_ptr<T[]>> owned_;
+  std::vector<std::shared_ptr<void>> keepAlive_;
+  std::size_t residentPages_ = 0;
+  mutable std::size_t cachedPage_ = ~std::size_t{0};
+  mutable T *cachedData_ = nullptr;
+};
+
+template <typename T, std::size_t Depth>
+constexpr bool pyc_use_paged_store() {
+#if defined(PYC_DISABLE_SPARSE_MEM)
+  return false;
+#elif defined(PYC_FORCE_SPARSE_MEM)
+  return true;
+#else
+  return Depth >= (std::size_t{PYC_SPARSE_MEM_MIN_BYTES} + sizeof(T) - 1) / sizeof(T);
+#endif
+}
+
+template <typename T, std::size_t Depth>
+using pyc_mem_store_t =
+    std::conditional_t<pyc_use_paged_store<T, Depth>(), pyc_paged_store<T, Depth>, pyc_dense_store<T, Depth>>;
+
+} // namespace pyc::cpp
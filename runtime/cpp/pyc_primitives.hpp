@@ -105,6 +105,15 @@ public:
     }
   }
 
+  // State snapshot hook (see pyc_snapshot.hpp). `q` is a module wire and is
+  // saved by the owning module.
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pending);
+    ar.value(qNext);
+  }
+
 private:
   inline void posedge_compute_inner() {
     bool r = rst.toBool();
@@ -227,6 +236,22 @@ public:
     pending = false;
   }
 
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pending);
+    ar.value(storage_);
+    ar.value(rd_);
+    ar.value(wr_);
+    ar.value(count_);
+    ar.value(storageNext_);
+    ar.value(rdNext_);
+    ar.value(wrNext_);
+    ar.value(countNext_);
+    if constexpr (Ar::kLoading)
+      evalValid_ = false;
+  }
+
 private:
   static constexpr unsigned bump(unsigned p) { return (p + 1 >= Depth) ? 0 : (p + 1); }
 
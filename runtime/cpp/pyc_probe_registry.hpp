@@ -155,9 +155,24 @@ inline std::string shortenInstancePath(std::string_view full_path,
     return segs;
   };
 
+  // Fast path (the common case): short paths are returned as-is without
+  // materializing the segment list.
+  if (full_path.size() <= policy.max_chars) {
+    std::size_t nsegs = 0;
+    bool inSeg = false;
+    for (char c : full_path) {
+      if (c == '.') {
+        inSeg = false;
+      } else if (!inSeg) {
+        inSeg = true;
+        ++nsegs;
+      }
+    }
+    if (nsegs <= policy.max_segments)
+      return std::string(full_path);
+  }
+
   const auto segs = split(full_path);
-  if (segs.size() <= policy.max_segments && full_path.size() <= policy.max_chars)
-    return std::string(full_path);
 
   auto hex64 = [](std::uint64_t v) -> std::string {
     static constexpr char kHex[] = "0123456789abcdef";
@@ -314,6 +329,29 @@ public:
   std::size_t size() const { return entries_.size(); }
   bool empty() const { return entries_.empty(); }
 
+  // Pre-size for bulk registration (generated `pyc_register_probes()` reserves
+  // its static `pyc_probe_count()`), so large designs register without
+  // rehashing or reallocating.
+  void reserve(std::size_t n) {
+    entries_.reserve(n);
+    by_id_.reserve(n);
+  }
+
+  // Order-sensitive fingerprint of the registered probe ids/kinds/widths.
+  // Snapshots record it so a restore into a different build is rejected.
+  std::uint64_t layoutHash() const {
+    std::uint64_t h = 1469598103934665603ull;
+    auto mix = [&](std::uint64_t v) {
+      h ^= v;
+      h *= 1099511628211ull;
+    };
+    for (const auto &e : entries_) {
+      mix(e.probe_id);
+      mix((static_cast<std::uint64_t>(e.kind) << 32) | e.width_bits);
+    }
+    return h;
+  }
+
   template <unsigned W>
   std::uint64_t addWire(std::string path, Wire<W> *wire, ProbeKind kind = ProbeKind::Wire) {
     return addImpl(std::move(path), kind, /*width_bits=*/W, static_cast<void *>(wire));
@@ -388,6 +426,16 @@ public:
     }
   }
 
+  // Lookup with a build-time id (e.g. from probe_manifest.json or a
+  // generated table): O(1) with no hashing when the hint is right; falls back
+  // to findByPath() otherwise (hash-collision suffixes).
+  const Entry *findByPath(std::string_view path, std::uint64_t probe_id_hint) const {
+    auto it = by_id_.find(probe_id_hint);
+    if (it != by_id_.end() && entries_[it->second].path == path)
+      return &entries_[it->second];
+    return findByPath(path);
+  }
+
   const Entry *findById(std::uint64_t probe_id) const {
     auto it = by_id_.find(probe_id);
     if (it == by_id_.end())
@@ -453,19 +501,24 @@ private:
                         std::uint32_t known_mask_width_bits = 0,
                         const void *z_mask_ptr = nullptr,
                         std::uint32_t z_mask_width_bits = 0) {
-    if (const Entry *existing = findByPath(path))
-      return existing->probe_id;
-
+    // Single pass over the same candidate-id sequence findByPath() walks: stop
+    // at the existing entry for `path` or at the first free id.
     const std::uint64_t base = hash64ForPath(path);
     std::uint64_t id = base;
 
     if (auto it = by_id_.find(id); it != by_id_.end()) {
       const auto &other = entries_[it->second];
+      if (other.path == path)
+        return id;
       std::uint32_t suffix = 1;
-      do {
+      for (;; ++suffix) {
         id = hash64ForPathWithSuffix(path, suffix);
-        ++suffix;
-      } while (by_id_.find(id) != by_id_.end());
+        auto jt = by_id_.find(id);
+        if (jt == by_id_.end())
+          break;
+        if (entries_[jt->second].path == path)
+          return id;
+      }
       std::fprintf(stderr,
                    "[pyc] ProbeRegistry hash collision: base=0x%016llx path='%s' collides with '%s'; "
                    "resolved=0x%016llx\n",
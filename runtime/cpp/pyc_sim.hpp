@@ -6,6 +6,7 @@
 #include "pyc_connector.hpp"
 #include "pyc_cdc_sync.hpp"
 #include "pyc_probe_registry.hpp"
+#include "pyc_snapshot.hpp"
 #include "pyc_sync_mem.hpp"
 #include "pyc_byte_mem.hpp"
 #include "pyc_async_fifo.hpp"
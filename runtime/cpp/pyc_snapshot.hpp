@@ -0,0 +1,251 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <string>
+#include <string_view>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace pyc::cpp {
+
+// Simulator state snapshots (`Testbench::snapshot()` / `Testbench::restore()`).
+//
+// File layout (little-endian host order; snapshots are not portable across
+// hosts or builds):
+//   header : magic "PYCSNAP1", u32 version, u32 flags, u64 time_steps,
+//            u64 cycle, u64 probe_layout_hash, u32 nclocks, u32 reserved,
+//            then nclocks x u8 clock level
+//   body   : generated `pyc_snapshot(ar)` walk of the DUT hierarchy
+//
+// Each generated module opens a section (FNV-1a of its struct name), so a
+// snapshot restored into a different design fails fast instead of silently
+// scrambling state. Memory stores are written as runs of non-zero blocks, so a
+// paged (sparse) memory costs only its resident pages.
+//
+// Primitives and generated modules implement one template hook for both
+// directions:
+//
+//   template <typename Ar> void pyc_snapshot(Ar &ar) { ar.value(x); ... }
+//
+// `Ar::kLoading` tells loaders to invalidate derived caches.
+
+inline constexpr char kPycSnapshotMagic[8] = {'P', 'Y', 'C', 'S', 'N', 'A', 'P', '1'};
+inline constexpr std::uint32_t kPycSnapshotVersion = 1;
+
+inline std::uint64_t pyc_snapshot_tag(std::string_view name) {
+  std::uint64_t h = 1469598103934665603ull;
+  for (char c : name) {
+    h ^= static_cast<std::uint8_t>(c);
+    h *= 1099511628211ull;
+  }
+  return h;
+}
+
+struct PycSnapshotHeader {
+  std::uint64_t time_steps = 0;
+  std::uint64_t cycle = 0;
+  std::uint64_t probe_layout_hash = 0;
+  std::vector<std::uint8_t> clock_levels{};
+};
+
+namespace snapshot_detail {
+
+// Memory stores are serialized in blocks of this many entries; all-zero blocks
+// are skipped.
+constexpr std::size_t kStoreBlockEntries = 4096;
+constexpr std::uint64_t kStoreEnd = ~std::uint64_t{0};
+
+template <typename T>
+bool allZero(const T *p, std::size_t n) {
+  for (std::size_t i = 0; i < n; ++i) {
+    if (!(p[i] == T{}))
+      return false;
+  }
+  return true;
+}
+
+} // namespace snapshot_detail
+
+class PycSnapshotWriter {
+public:
+  static constexpr bool kLoading = false;
+
+  bool open(const std::string &path, std::string *err = nullptr) {
+    out_.open(path, std::ios::binary | std::ios::out | std::ios::trunc);
+    if (!out_.is_open()) {
+      if (err)
+        *err = "failed to open snapshot for writing: " + path;
+      return false;
+    }
+    return true;
+  }
+
+  bool ok() const { return out_.good(); }
+
+  bool close() {
+    if (!out_.is_open())
+      return false;
+    out_.flush();
+    bool good = out_.good();
+    out_.close();
+    return good;
+  }
+
+  void bytes(const void *p, std::size_t n) { out_.write(static_cast<const char *>(p), static_cast<std::streamsize>(n)); }
+
+  template <typename T>
+  void value(const T &v) {
+    static_assert(std::is_trivially_copyable_v<T>, "snapshot values must be trivially copyable");
+    bytes(&v, sizeof(T));
+  }
+
+  void section(std::string_view name) { value(pyc_snapshot_tag(name)); }
+
+  template <typename Store>
+  void store(const Store &s) {
+    using T = typename Store::value_type;
+    s.visit(0, Store::kDepth - 1, [&](std::size_t first, const T *p, std::size_t n) {
+      if (!p)
+        return;
+      for (std::size_t off = 0; off < n; off += snapshot_detail::kStoreBlockEntries) {
+        std::size_t cnt = n - off;
+        if (cnt > snapshot_detail::kStoreBlockEntries)
+          cnt = snapshot_detail::kStoreBlockEntries;
+        if (snapshot_detail::allZero(p + off, cnt))
+          continue;
+        value(static_cast<std::uint64_t>(first + off));
+        value(static_cast<std::uint64_t>(cnt));
+        bytes(p + off, cnt * sizeof(T));
+      }
+    });
+    value(snapshot_detail::kStoreEnd);
+  }
+
+  void writeHeader(const PycSnapshotHeader &h) {
+    bytes(kPycSnapshotMagic, sizeof(kPycSnapshotMagic));
+    value(kPycSnapshotVersion);
+    value(std::uint32_t{0});
+    value(h.time_steps);
+    value(h.cycle);
+    value(h.probe_layout_hash);
+    value(static_cast<std::uint32_t>(h.clock_levels.size()));
+    value(std::uint32_t{0});
+    if (!h.clock_levels.empty())
+      bytes(h.clock_levels.data(), h.clock_levels.size());
+  }
+
+private:
+  std::ofstream out_{};
+};
+
+class PycSnapshotReader {
+public:
+  static constexpr bool kLoading = true;
+
+  bool open(const std::string &path, std::string *err = nullptr) {
+    in_.open(path, std::ios::binary | std::ios::in);
+    if (!in_.is_open()) {
+      if (err)
+        *err = "failed to open snapshot: " + path;
+      return false;
+    }
+    return true;
+  }
+
+  // False after a short read or a section mismatch.
+  bool ok() const { return !failed_ && in_.good(); }
+  const std::string &error() const { return error_; }
+
+  void bytes(void *p, std::size_t n) {
+    if (failed_)
+      return;
+    in_.read(static_cast<char *>(p), static_cast<std::streamsize>(n));
+    if (!in_.good())
+      fail("truncated snapshot");
+  }
+
+  template <typename T>
+  void value(T &v) {
+    static_assert(std::is_trivially_copyable_v<T>, "snapshot values must be trivially copyable");
+    bytes(&v, sizeof(T));
+  }
+
+  void section(std::string_view name) {
+    std::uint64_t tag = 0;
+    value(tag);
+    if (!failed_ && tag != pyc_snapshot_tag(name))
+      fail("snapshot section mismatch at module '" + std::string(name) + "' (different design?)");
+  }
+
+  template <typename Store>
+  void store(Store &s) {
+    using T = typename Store::value_type;
+    constexpr std::size_t depth = Store::kDepth;
+    s.reset();
+    std::vector<T> buf;
+    for (;;) {
+      std::uint64_t first = 0;
+      value(first);
+      if (failed_ || first == snapshot_detail::kStoreEnd)
+        return;
+      std::uint64_t cnt = 0;
+      value(cnt);
+      if (failed_ || cnt > snapshot_detail::kStoreBlockEntries || first >= depth || cnt > depth - first) {
+        fail("corrupt memory record in snapshot");
+        return;
+      }
+      buf.resize(static_cast<std::size_t>(cnt));
+      bytes(buf.data(), buf.size() * sizeof(T));
+      if (failed_)
+        return;
+      s.map(static_cast<std::size_t>(first), buf.data(), buf.size(), /*paddedCount=*/0, nullptr);
+    }
+  }
+
+  bool readHeader(PycSnapshotHeader &h) {
+    char magic[sizeof(kPycSnapshotMagic)] = {};
+    bytes(magic, sizeof(magic));
+    if (failed_ || std::memcmp(magic, kPycSnapshotMagic, sizeof(magic)) != 0) {
+      fail("not a pyCircuit snapshot");
+      return false;
+    }
+    std::uint32_t version = 0;
+    std::uint32_t flags = 0;
+    value(version);
+    value(flags);
+    if (!failed_ && version != kPycSnapshotVersion) {
+      fail("unsupported snapshot version " + std::to_string(version));
+      return false;
+    }
+    value(h.time_steps);
+    value(h.cycle);
+    value(h.probe_layout_hash);
+    std::uint32_t nclocks = 0;
+    std::uint32_t reserved = 0;
+    value(nclocks);
+    value(reserved);
+    if (failed_)
+      return false;
+    h.clock_levels.assign(nclocks, 0);
+    if (nclocks)
+      bytes(h.clock_levels.data(), nclocks);
+    return !failed_;
+  }
+
+private:
+  void fail(std::string msg) {
+    if (!failed_)
+      error_ = std::move(msg);
+    failed_ = true;
+  }
+
+  std::ifstream in_{};
+  bool failed_ = false;
+  std::string error_{};
+};
+
+} // namespace pyc::cpp
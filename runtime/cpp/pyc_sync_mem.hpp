@@ -1,6 +1,5 @@
 #pragma once
 
-#include <array>
 #include <cstddef>
 #include <cstdint>
 #include <iomanip>
@@ -9,6 +8,8 @@
 #include <vector>
 
 #include "pyc_bits.hpp"
+#include "pyc_mem_image.hpp"
+#include "pyc_mem_store.hpp"
 
 namespace pyc::cpp {
 
@@ -20,6 +21,8 @@ namespace pyc::cpp {
 // - Read-during-write to the same address returns the pre-write data (old-data).
 // - Addresses are low-bit indexed into host `size_t`; out-of-range indices read as 0
 //   and writes are dropped.
+// - Contents live in `pyc_mem_store_t` (dense, or paged for large memories; see
+//   `pyc_mem_store.hpp`).
 template <unsigned AddrWidth, unsigned DataWidth, std::size_t DepthEntries>
 class pyc_sync_mem {
 public:
@@ -80,12 +83,18 @@ public:
       hi = DepthEntries - 1;
 
     std::uint64_t h = 1469598103934665603ull; // FNV-1a offset basis
-    for (std::size_t i = lo; i <= hi; ++i) {
-      for (unsigned w = 0; w < Wire<DataWidth>::kWords; ++w) {
-        h ^= mem_[i].word(w);
-        h *= 1099511628211ull; // FNV-1a prime
+    mem_.visit(lo, hi, [&](std::size_t, const Wire<DataWidth> *entries, std::size_t n) {
+      if (!entries) {
+        h = pyc_fnv1a_zero_run(h, static_cast<std::uint64_t>(n) * Wire<DataWidth>::kWords);
+        return;
       }
-    }
+      for (std::size_t i = 0; i < n; ++i) {
+        for (unsigned w = 0; w < Wire<DataWidth>::kWords; ++w) {
+          h ^= entries[i].word(w);
+          h *= 1099511628211ull; // FNV-1a prime
+        }
+      }
+    });
     return h;
   }
 
@@ -110,7 +119,7 @@ public:
 
     for (std::size_t i = lo; i <= hi; ++i) {
       os << "{\"addr\":" << i << ",\"data\":\"";
-      dumpHex(mem_[i]);
+      dumpHex(mem_.read(i));
       os << "\"}\n";
     }
   }
@@ -142,7 +151,7 @@ public:
       latchedRaddr = toIndex(raddr);
       Wire<DataWidth> v = Wire<DataWidth>(0);
       if (latchedRaddr < DepthEntries)
-        v = mem_[latchedRaddr];
+        v = mem_.read(latchedRaddr);
       rdataNext = v;
       if (watch_enabled_ && latchedRaddr >= watch_lo_ && latchedRaddr <= watch_hi_) {
         MemWatchEvent ev;
@@ -158,8 +167,8 @@ public:
 
   void tick_commit() {
     if (pendingWrite && (latchedWaddr < DepthEntries)) {
-      Wire<DataWidth> committed = applyStrb(mem_[latchedWaddr], latchedWdata, latchedWstrb);
-      mem_[latchedWaddr] = committed;
+      Wire<DataWidth> committed = applyStrb(mem_.read(latchedWaddr), latchedWdata, latchedWstrb);
+      mem_.write(latchedWaddr, committed);
       if (watch_enabled_ && latchedWaddr >= watch_lo_ && latchedWaddr <= watch_hi_) {
         MemWatchEvent ev;
         ev.kind = MemWatchEvent::Kind::Write;
@@ -179,14 +188,33 @@ public:
   // Convenience for testbenches.
   void pokeEntry(std::size_t addr, Wire<DataWidth> value) {
     if (addr < DepthEntries)
-      mem_[addr] = value;
+      mem_.write(addr, value);
   }
   void pokeEntry(std::size_t addr, std::uint64_t value) { pokeEntry(addr, Wire<DataWidth>(value)); }
+  // Load a `PycMemImage`; entry `i` holds image bytes at
+  // `baseAddr + i * StrbWidth` (little-endian lanes).
+  std::size_t loadImage(const PycMemImage &img, std::uint64_t baseAddr = 0) {
+    return pyc_load_image_entries<DataWidth, Wire<DataWidth>>(mem_, DepthEntries, img, baseAddr);
+  }
   Wire<DataWidth> peekEntryBits(std::size_t addr) const {
-    return (addr < DepthEntries) ? mem_[addr] : Wire<DataWidth>(0);
+    return (addr < DepthEntries) ? mem_.read(addr) : Wire<DataWidth>(0);
   }
   std::uint64_t peekEntry(std::size_t addr) const { return peekEntryBits(addr).value(); }
 
+  // State snapshot hook (see pyc_snapshot.hpp).
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pendingWrite);
+    ar.value(pendingRead);
+    ar.value(latchedWaddr);
+    ar.value(latchedRaddr);
+    ar.value(latchedWdata);
+    ar.value(latchedWstrb);
+    ar.value(rdataNext);
+    ar.store(mem_);
+  }
+
 public:
   Wire<1> &clk;
   Wire<1> &rst;
@@ -257,7 +285,7 @@ private:
     return v;
   }
 
-  std::array<Wire<DataWidth>, DepthEntries> mem_{};
+  pyc_mem_store_t<Wire<DataWidth>, DepthEntries> mem_;
 
   bool watch_enabled_ = false;
   std::size_t watch_lo_ = 0;
@@ -322,12 +350,18 @@ public:
       hi = DepthEntries - 1;
 
     std::uint64_t h = 1469598103934665603ull;
-    for (std::size_t i = lo; i <= hi; ++i) {
-      for (unsigned w = 0; w < Wire<DataWidth>::kWords; ++w) {
-        h ^= mem_[i].word(w);
-        h *= 1099511628211ull;
+    mem_.visit(lo, hi, [&](std::size_t, const Wire<DataWidth> *entries, std::size_t n) {
+      if (!entries) {
+        h = pyc_fnv1a_zero_run(h, static_cast<std::uint64_t>(n) * Wire<DataWidth>::kWords);
+        return;
       }
-    }
+      for (std::size_t i = 0; i < n; ++i) {
+        for (unsigned w = 0; w < Wire<DataWidth>::kWords; ++w) {
+          h ^= entries[i].word(w);
+          h *= 1099511628211ull;
+        }
+      }
+    });
     return h;
   }
 
@@ -352,7 +386,7 @@ public:
 
     for (std::size_t i = lo; i <= hi; ++i) {
       os << "{\"addr\":" << i << ",\"data\":\"";
-      dumpHex(mem_[i]);
+      dumpHex(mem_.read(i));
       os << "\"}\n";
     }
   }
@@ -387,7 +421,7 @@ public:
       latchedRaddr0 = toIndex(raddr0);
       Wire<DataWidth> v = Wire<DataWidth>(0);
       if (latchedRaddr0 < DepthEntries)
-        v = mem_[latchedRaddr0];
+        v = mem_.read(latchedRaddr0);
       rdata0Next = v;
       if (watch_enabled_ && latchedRaddr0 >= watch_lo_ && latchedRaddr0 <= watch_hi_) {
         MemWatchEvent ev;
@@ -405,7 +439,7 @@ public:
       latchedRaddr1 = toIndex(raddr1);
       Wire<DataWidth> v = Wire<DataWidth>(0);
       if (latchedRaddr1 < DepthEntries)
-        v = mem_[latchedRaddr1];
+        v = mem_.read(latchedRaddr1);
       rdata1Next = v;
       if (watch_enabled_ && latchedRaddr1 >= watch_lo_ && latchedRaddr1 <= watch_hi_) {
         MemWatchEvent ev;
@@ -421,8 +455,8 @@ public:
 
   void tick_commit() {
     if (pendingWrite && (latchedWaddr < DepthEntries)) {
-      Wire<DataWidth> committed = applyStrb(mem_[latchedWaddr], latchedWdata, latchedWstrb);
-      mem_[latchedWaddr] = committed;
+      Wire<DataWidth> committed = applyStrb(mem_.read(latchedWaddr), latchedWdata, latchedWstrb);
+      mem_.write(latchedWaddr, committed);
       if (watch_enabled_ && latchedWaddr >= watch_lo_ && latchedWaddr <= watch_hi_) {
         MemWatchEvent ev;
         ev.kind = MemWatchEvent::Kind::Write;
@@ -444,14 +478,35 @@ public:
 
   void pokeEntry(std::size_t addr, Wire<DataWidth> value) {
     if (addr < DepthEntries)
-      mem_[addr] = value;
+      mem_.write(addr, value);
   }
   void pokeEntry(std::size_t addr, std::uint64_t value) { pokeEntry(addr, Wire<DataWidth>(value)); }
+  // Load a `PycMemImage`; entry `i` holds image bytes at
+  // `baseAddr + i * StrbWidth` (little-endian lanes).
+  std::size_t loadImage(const PycMemImage &img, std::uint64_t baseAddr = 0) {
+    return pyc_load_image_entries<DataWidth, Wire<DataWidth>>(mem_, DepthEntries, img, baseAddr);
+  }
   Wire<DataWidth> peekEntryBits(std::size_t addr) const {
-    return (addr < DepthEntries) ? mem_[addr] : Wire<DataWidth>(0);
+    return (addr < DepthEntries) ? mem_.read(addr) : Wire<DataWidth>(0);
   }
   std::uint64_t peekEntry(std::size_t addr) const { return peekEntryBits(addr).value(); }
 
+  template <typename Ar>
+  void pyc_snapshot(Ar &ar) {
+    ar.value(clkPrev);
+    ar.value(pendingWrite);
+    ar.value(pendingRead0);
+    ar.value(pendingRead1);
+    ar.value(latchedWaddr);
+    ar.value(latchedRaddr0);
+    ar.value(latchedRaddr1);
+    ar.value(latchedWdata);
+    ar.value(latchedWstrb);
+    ar.value(rdata0Next);
+    ar.value(rdata1Next);
+    ar.store(mem_);
+  }
+
 public:
   Wire<1> &clk;
   Wire<1> &rst;
@@ -529,7 +584,7 @@ private:
     return v;
   }
 
-  std::array<Wire<DataWidth>, DepthEntries> mem_{};
+  pyc_mem_store_t<Wire<DataWidth>, DepthEntries> mem_;
 
   bool watch_enabled_ = false;
   std::size_t watch_lo_ = 0;
@@ -10,7 +10,15 @@
 #include <utility>
 #include <vector>
 
+#if defined(__unix__) || defined(__APPLE__)
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+#define PYC_TB_HAS_FORK 1
+#endif
+
 #include "pyc_bits.hpp"
+#include "pyc_snapshot.hpp"
 #include "pyc_trace_bin.hpp"
 #include "pyc_vcd.hpp"
 
@@ -73,6 +81,14 @@ struct has_tick_negedge : std::false_type {};
 template <typename T>
 struct has_tick_negedge<T, std::void_t<decltype(std::declval<T &>().tick_negedge())>> : std::true_type {};
 
+// Generated modules provide `pyc_snapshot(ar)` (state save/restore hook).
+template <typename T, typename = void>
+struct has_snapshot : std::false_type {};
+
+template <typename T>
+struct has_snapshot<T, std::void_t<decltype(std::declval<T &>().pyc_snapshot(std::declval<PycSnapshotWriter &>()))>>
+    : std::true_type {};
+
 template <typename T>
 inline void maybe_comb(T &dut) {
   if constexpr (has_comb<T>::value) {
@@ -317,7 +333,139 @@ public:
     runCycles(cyclesDeasserted);
   }
 
+  // Full simulator state snapshots (see pyc_snapshot.hpp).
+  //
+  // Captures every module wire, register, FIFO, CDC/async-FIFO and memory in
+  // the DUT hierarchy plus testbench time and clock levels. `cycle` is stored
+  // in the header for restart tooling (`linx_trace_diff.py --snapshot-dir`);
+  // it defaults to the number of clock-0 cycles elapsed. When `probes` is
+  // given, its layout fingerprint is recorded and checked on restore.
+  //
+  // VCD/log/trace writers are not part of the snapshot.
+  bool snapshot(const std::string &path,
+                std::optional<std::uint64_t> cycle = std::nullopt,
+                const ProbeRegistry *probes = nullptr,
+                std::string *err = nullptr) {
+    if constexpr (!detail::has_snapshot<Dut>::value) {
+      (void)path;
+      (void)cycle;
+      (void)probes;
+      if (err)
+        *err = "DUT has no pyc_snapshot() hook (regenerate with a newer pycc)";
+      return false;
+    } else {
+      PycSnapshotWriter w;
+      if (!w.open(path, err))
+        return false;
+      w.writeHeader(makeSnapshotHeader(cycle, probes));
+      dut_.pyc_snapshot(w);
+      if (!w.close()) {
+        if (err)
+          *err = "failed to write snapshot: " + path;
+        return false;
+      }
+      return true;
+    }
+  }
+
+  // Like snapshot(), but the write happens in a forked child so the caller
+  // resumes immediately; the kernel's copy-on-write keeps the child's view of
+  // memories frozen at the fork point. Reap with waitSnapshots(). Falls back
+  // to a synchronous snapshot() where fork() is unavailable.
+  //
+  // Only use from single-threaded simulations: fork() copies the calling
+  // thread only.
+  bool snapshotAsync(const std::string &path,
+                     std::optional<std::uint64_t> cycle = std::nullopt,
+                     const ProbeRegistry *probes = nullptr,
+                     std::string *err = nullptr) {
+#ifdef PYC_TB_HAS_FORK
+    if constexpr (detail::has_snapshot<Dut>::value) {
+      pid_t pid = ::fork();
+      if (pid == 0) {
+        // _exit() skips stream destructors, so buffered VCD/log output is not
+        // flushed twice.
+        bool ok = snapshot(path, cycle, probes, nullptr);
+        ::_exit(ok ? 0 : 1);
+      }
+      if (pid > 0) {
+        pending_snapshots_.push_back(pid);
+        return true;
+      }
+    }
+#endif
+    return snapshot(path, cycle, probes, err);
+  }
+
+  // Wait for all snapshotAsync() children; false if any of them failed.
+  bool waitSnapshots() {
+    bool ok = true;
+#ifdef PYC_TB_HAS_FORK
+    for (pid_t pid : pending_snapshots_) {
+      int status = 0;
+      if (::waitpid(pid, &status, 0) != pid || !WIFEXITED(status) || WEXITSTATUS(status) != 0)
+        ok = false;
+    }
+#endif
+    pending_snapshots_.clear();
+    return ok;
+  }
+
+  bool restore(const std::string &path, const ProbeRegistry *probes = nullptr, std::string *err = nullptr) {
+    if constexpr (!detail::has_snapshot<Dut>::value) {
+      (void)path;
+      (void)probes;
+      if (err)
+        *err = "DUT has no pyc_snapshot() hook (regenerate with a newer pycc)";
+      return false;
+    } else {
+      PycSnapshotReader r;
+      if (!r.open(path, err))
+        return false;
+      PycSnapshotHeader h;
+      if (!r.readHeader(h)) {
+        if (err)
+          *err = r.error();
+        return false;
+      }
+      if (h.clock_levels.size() != clocks_.size()) {
+        if (err)
+          *err = "snapshot clock count mismatch";
+        return false;
+      }
+      if (probes && h.probe_layout_hash != 0 && h.probe_layout_hash != probes->layoutHash()) {
+        if (err)
+          *err = "snapshot probe layout mismatch (different build?)";
+        return false;
+      }
+      dut_.pyc_snapshot(r);
+      if (!r.ok()) {
+        if (err)
+          *err = r.error().empty() ? std::string("truncated snapshot") : r.error();
+        return false;
+      }
+      for (std::size_t i = 0; i < clocks_.size(); ++i)
+        clocks_[i].set(h.clock_levels[i] != 0);
+      time_ = h.time_steps;
+      return true;
+    }
+  }
+
 private:
+  PycSnapshotHeader makeSnapshotHeader(std::optional<std::uint64_t> cycle, const ProbeRegistry *probes) const {
+    PycSnapshotHeader h;
+    h.time_steps = time_;
+    if (cycle) {
+      h.cycle = *cycle;
+    } else if (!clocks_.empty()) {
+      h.cycle = time_ / (2u * clocks_[0].half_period_steps);
+    }
+    h.probe_layout_hash = probes ? probes->layoutHash() : 0;
+    for (const auto &c : clocks_)
+      h.clock_levels.push_back((c.clk && c.clk->toBool()) ? 1u : 0u);
+    return h;
+  }
+
   void runPosedgeCyclesFast(std::uint64_t cycles) {
     if (cycles == 0)
       return;
@@ -386,6 +534,11 @@ private:
   std::optional<VcdWriter> vcd_{};
   std::optional<std::pair<std::uint64_t, std::uint64_t>> vcd_window_{};
   std::optional<std::ofstream> log_{};
+#ifdef PYC_TB_HAS_FORK
+  std::vector<pid_t> pending_snapshots_{};
+#else
+  std::vector<int> pending_snapshots_{};
+#endif
 };
 
 } // namespace pyc::cpp
@@ -25,13 +25,18 @@ def _system_env() -> dict[str, str]:
     return env
 
 
-def _require_system_prereqs() -> dict[str, str]:
+def _require_pycc() -> dict[str, str]:
     env = _system_env()
     pycc = env.get("PYCC") or shutil.which("pycc")
     toolchain_root = env.get("PYC_TOOLCHAIN_ROOT")
     has_toolchain = bool(toolchain_root) or bool(pycc)
     if not has_toolchain:
         pytest.skip("system test requires PYCC or PYC_TOOLCHAIN_ROOT")
+    return env
+
+
+def _require_system_prereqs() -> dict[str, str]:
+    env = _require_pycc()
     if shutil.which("verilator") is None:
         pytest.skip("system test requires verilator")
     return env
@@ -117,3 +122,70 @@ def test_semantic_regressions_script_passes() -> None:
     )
     summary = json.loads(summary_path.read_text(encoding="utf-8"))
     assert summary["status"] == "pass"
+
+
+_DEEP_PATH_DESIGN = """\
+from pycircuit import CycleAwareCircuit, CycleAwareDomain, cas, wire_of
+
+
+def build(m: CycleAwareCircuit, domain: CycleAwareDomain) -> None:
+    a = cas(domain, m.input("a", width=8), cycle=0)
+    b = cas(domain, m.input("b", width=8), cycle=0)
+    c = cas(domain, m.input("c", width=8), cycle=0)
+    count = domain.state(width=8, reset_value=0, name="count")
+    nxt = count + 1
+    count.set(nxt)
+    s1 = a + b
+    s2 = s1 * c
+    s3 = s2 + count
+    s4 = s3 * b
+    m.output("y", s4.wire)
+    m.output("count", wire_of(count))
+
+
+build.__pycircuit_name__ = "deep_path"
+"""
+
+
+def test_auto_balance_places_cuts_from_pycc_logic_depth_report(tmp_path: Path) -> None:
+    env = _require_pycc()
+    root = _repo_root()
+    design = tmp_path / "deep_path.py"
+    design.write_text(_DEEP_PATH_DESIGN, encoding="utf-8")
+    out_dir = tmp_path / "deep_path_build"
+    cmd = [
+        sys.executable,
+        "-m",
+        "pycircuit.cli",
+        "build",
+        str(design),
+        "--out-dir",
+        str(out_dir),
+        "--target",
+        "cpp",
+        "--jobs",
+        "1",
+        "--logic-depth",
+        "2",
+        "--auto-balance",
+    ]
+
+    # a + b -> * c -> + count -> * b is 4 levels deep: pycc reports it and fails.
+    first = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+    assert first.returncode != 0
+    report = json.loads(
+        (out_dir / "logic_depth_report.json").read_text(encoding="utf-8")
+    )
+    assert report["logic_depth_limit"] == 2
+    paths = [p for f in report["functions"] for p in f["paths"]]
+    assert max(p["depth"] for p in paths) == 4
+    nodes = {n["name"].split("__", 1)[0] for p in paths for n in p["nodes"]}
+    assert {"s1", "s2", "s3", "s4"} <= nodes
+
+    # The next build cuts after `s2` and passes the same depth check.
+    second = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+    assert second.returncode == 0, second.stdout + second.stderr
+    plan = json.loads((out_dir / "auto_balance.json").read_text(encoding="utf-8"))
+    assert [c.split("__", 1)[0] for c in plan["cuts"]] == ["s2"]
+    # `nxt` closes the `count` feedback loop, so it is never a cut candidate.
+    assert [n.split("__", 1)[0] for n in plan["state_fed"]] == ["nxt"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pycircuit
+import pytest
+from pycircuit.auto_balance import (
+    BalancePlan,
+    DepthPath,
+    parse_logic_depth_report,
+    plan_path_cuts,
+    set_balance_plan,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_plan_path_cuts_splits_at_deepest_cuttable_node() -> None:
+    path = DepthPath("f", "out", 9, (("a", 2), ("b", 3), ("c", 6), ("d", 7)))
+    assert plan_path_cuts(path, limit=4, cuttable="abcd") == ["b", "d"]
+    assert plan_path_cuts(path, limit=4, cuttable="d") == ["d"]
+    assert plan_path_cuts(path, limit=4, cuttable="") == []
+
+
+def test_auto_balance_cut_retimes_named_cycle_aware_value() -> None:
+    circuit = pycircuit.CycleAwareCircuit("balanced")
+    domain = circuit.create_domain("clk")
+    a = pycircuit.cas(domain, circuit.input("a", width=8), cycle=0)
+    b = pycircuit.cas(domain, circuit.input("b", width=8), cycle=0)
+
+    report = parse_logic_depth_report(
+        {
+            "version": 1,
+            "logic_depth_limit": 1,
+            "functions": [
+                {
+                    "name": "balanced",
+                    "paths": [{"depth": 2, "nodes": [{"name": "s", "depth": 1}]}],
+                }
+            ],
+        }
+    )
+    plan = BalancePlan(cuttable=["s"])
+    assert plan.extend_from_report(report) == ["s"]
+
+    set_balance_plan(plan)
+    try:
+        s = (a + b).named("s")
+    finally:
+        set_balance_plan(None)
+    y = s + a
+
+    assert plan.applied == {"s"}
+    assert s.cycle == 1 and y.cycle == 1
+    # One register retimes `s`, one aligns `a` to it.
+    assert circuit.emit_mlir().count("pyc.reg") == 2
+
+
+def _counters(plan: BalancePlan) -> str:
+    circuit = pycircuit.CycleAwareCircuit("counters")
+    domain = circuit.create_domain("clk")
+    set_balance_plan(plan)
+    try:
+        cnt = domain.state(width=8, reset_value=0, name="cnt")
+        sib = domain.state(width=8, reset_value=0, name="sib")
+        n = (cnt + 1).named("n")
+        cnt.set(n)
+        sib.set((sib + 1).named("m"))
+        a = pycircuit.cas(domain, circuit.input("a", width=8), cycle=0)
+        out = (a + n).named("out")
+    finally:
+        set_balance_plan(None)
+    circuit.output("cnt", cnt.wire)
+    circuit.output("out", out.wire)
+    return circuit.emit_mlir()
+
+
+def test_cuts_feeding_state_updates_are_refused(tmp_path: Path) -> None:
+    plan = BalancePlan(cuts=["n", "out"])
+    _counters(plan)
+    # `n` was cut before `cnt.set(n)` revealed the feedback loop.
+    assert plan.refused == {"n"}
+    assert plan.applied == {"out"}
+    assert plan.cuts == {"out"}
+    assert plan.state_fed == {"n", "m"}
+    assert plan.cuttable == {"out"}
+
+    # Rebuilding with the same plan feeds `n` straight back into `cnt`; only
+    # `out` is retimed.
+    plan.applied.clear()
+    plan.refused.clear()
+    mlir = _counters(plan)
+    assert not plan.refused and plan.applied == {"out"}
+    assert mlir.count("pyc.reg") == 3
+    cnt_next = re.search(r'(%\w+) = pyc.wire \{pyc.name = "cnt__next"\}', mlir)[1]
+    n = re.search(r'(%\w+) = pyc.alias %\w+ \{pyc.name = "n"\}', mlir)[1]
+    assert f"pyc.assign {cnt_next}, {n} :" in mlir
+
+    # State-fed names persist and are never planned.
+    plan.save(tmp_path / "plan.json")
+    loaded = BalancePlan.load(tmp_path / "plan.json")
+    assert loaded.state_fed == {"n", "m"}
+    assert not loaded.cut_point("n")
+    report = parse_logic_depth_report(
+        {
+            "version": 1,
+            "logic_depth_limit": 1,
+            "functions": [
+                {
+                    "name": "counters",
+                    "paths": [{"depth": 3, "nodes": [{"name": "n", "depth": 1}]}],
+                }
+            ],
+        }
+    )
+    assert loaded.extend_from_report(report) == []
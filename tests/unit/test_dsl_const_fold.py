@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from pycircuit.dsl import Module
+
+pytestmark = pytest.mark.unit
+
+
+def _folded(m: Module, sig) -> int:
+    known = m._known(sig)
+    assert known is not None, f"{sig.ref} was not folded"
+    # Only constants are emitted for fully constant expressions.
+    assert all(" = pyc.constant " in line for line in m._lines)
+    return known[0]
+
+
+def test_arithmetic_wraps_at_the_result_width() -> None:
+    m = Module("wrap")
+    x, one = m.const(0xFF, width=8), m.const(1, width=8)
+    assert _folded(m, m.add(x, one)) == 0
+    assert _folded(m, m.sub(m.const(0, width=8), one)) == 0xFF
+    assert _folded(m, m.mul(x, x)) == 0x01
+    assert _folded(m, m.not_(one)) == 0xFE
+    assert _folded(m, m.const(-1, width=4)) == 0xF
+
+
+def test_shift_amount_at_or_past_width() -> None:
+    m = Module("shift")
+    x = m.const(0x81, width=8)
+    for amount in (8, 9, 200):
+        amt = m.const(amount, width=8)
+        assert _folded(m, m.shl(x, amt)) == 0
+        assert _folded(m, m.lshr(x, amt)) == 0
+        assert _folded(m, m.ashr(x, amt)) == 0xFF
+        assert _folded(m, m.shli(x, amount=amount)) == 0
+        assert _folded(m, m.lshri(x, amount=amount)) == 0
+        assert _folded(m, m.ashri(x, amount=amount)) == 0xFF
+    assert _folded(m, m.ashr(m.const(0x41, width=8), m.const(8, width=8))) == 0
+
+
+def test_signed_compare_extend_and_arithmetic_shift() -> None:
+    m = Module("signed")
+    neg, pos = m.const(-2, width=8), m.const(1, width=8)
+    assert _folded(m, m.slt(neg, pos)) == 1
+    assert _folded(m, m.slt(pos, neg)) == 0
+    assert _folded(m, m.ult(neg, pos)) == 0
+    assert _folded(m, m.sext(neg, width=16)) == 0xFFFE
+    assert _folded(m, m.sext(pos, width=16)) == 0x0001
+    assert _folded(m, m.zext(neg, width=16)) == 0x00FE
+    assert _folded(m, m.ashr(neg, m.const(1, width=8))) == 0xFF
+    assert _folded(m, m.ashri(m.const(0x80, width=8), amount=3)) == 0xF0
+    assert _folded(m, m.lshr(neg, m.const(1, width=8))) == 0x7F
+
+
+def test_concat_is_msb_first() -> None:
+    m = Module("concat")
+    hi, mid, lo = m.const(0x1, width=1), m.const(0x2, width=3), m.const(0xA, width=4)
+    out = m.concat(hi, mid, lo)
+    assert out.ty == "i8"
+    assert _folded(m, out) == 0b1_010_1010
+    assert _folded(m, m.extract(out, lsb=4, width=3)) == 0x2
+
+
+def test_mux_with_constant_select_picks_an_operand() -> None:
+    m = Module("mux")
+    a, b = m.input("a", width=8), m.input("b", width=8)
+    assert m.mux(m.const(1, width=1), a, b) is a
+    assert m.mux(m.const(0, width=1), a, b) is b
+    assert not any("pyc.mux" in line for line in m._lines)
+
+    m.mux(m.input("sel", width=1), a, b)
+    assert sum("pyc.mux" in line for line in m._lines) == 1
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+from pycircuit.dsl import Module
+
+pytestmark = pytest.mark.unit
+
+
+def _inputs() -> tuple[Module, object, object]:
+    m = Module("hash_cons")
+    return m, m.input("a", width=8), m.input("b", width=8)
+
+
+def _adds(lines: list[str]) -> int:
+    return sum(" = pyc.add " in line for line in lines)
+
+
+def test_pure_op_is_reused_where_visible() -> None:
+    m, a, b = _inputs()
+    s = m.add(a, b)
+    assert m.add(a, b) is s
+
+    # The enclosing buffer stays visible while a region body is captured,
+    # and so do enclosing indent levels.
+    with m.capture_lines() as body:
+        m.push_indent()
+        assert m.add(a, b) is s
+        m.pop_indent()
+    assert body == []
+    assert _adds(m._lines) == 1
+
+
+def test_values_from_a_captured_region_are_not_reused_outside_it() -> None:
+    m, a, b = _inputs()
+    with m.capture_lines() as body:
+        m.push_indent()
+        inner = m.add(a, b)
+        assert m.add(a, b) is inner
+        m.pop_indent()
+    assert _adds(body) == 1
+
+    outer = m.add(a, b)
+    assert outer.ref != inner.ref
+    assert _adds(m._lines) == 1
+
+    # A discarded capture at the same indent level does not leak either.
+    with m.capture_lines() as dropped:
+        shadow = m.sub(a, b)
+    assert m.sub(a, b).ref != shadow.ref
+    assert _adds(dropped) == 0
+
+
+def test_pure_op_is_not_reused_after_rollback() -> None:
+    m, a, b = _inputs()
+    mark, next_tmp = len(m._lines), m._next_tmp
+    first = m.add(a, b)
+
+    # Roll back like a failed @const call: drop the lines, reuse the refs.
+    del m._lines[mark:]
+    m._next_tmp = next_tmp
+
+    second = m.add(a, b)
+    assert second.ref == first.ref
+    assert _adds(m._lines) == 1
+    assert m.add(a, b) is second
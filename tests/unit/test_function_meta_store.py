@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import ast
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from pycircuit import jit_cache
+from pycircuit.jit_cache import (
+    FunctionMetaStore,
+    assigned_names_for,
+    clear_metadata_caches,
+    get_function_meta,
+    get_structural_metrics,
+)
+
+pytestmark = pytest.mark.unit
+
+_SOURCE = """\
+def body(m, a):
+    x = a
+    for i in range(4):
+        y = x + i
+        x = y
+    return x
+"""
+
+
+def _load_fn(tmp_path: Path):
+    src = tmp_path / "meta_store_design.py"
+    if not src.exists():
+        src.write_text(_SOURCE, encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("meta_store_design", src)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    try:
+        spec.loader.exec_module(mod)
+    finally:
+        del sys.modules[spec.name]
+    return src, mod.body
+
+
+def _loop(fdef: ast.FunctionDef) -> ast.For:
+    return next(s for s in fdef.body if isinstance(s, ast.For))
+
+
+def _saved_store(tmp_path: Path):
+    clear_metadata_caches()
+    src, fn = _load_fn(tmp_path)
+    meta = get_function_meta(fn)
+    get_structural_metrics(fn)
+    names = assigned_names_for(_loop(meta.fdef).body)
+
+    store = FunctionMetaStore(tmp_path / "cache")
+    store.track(fn, "body", meta)
+    assert store.save() == 1
+    clear_metadata_caches()
+    return src, fn, meta, names
+
+
+def test_round_trip_restores_source_tree_and_metrics(tmp_path: Path) -> None:
+    _src, fn, meta, _names = _saved_store(tmp_path)
+
+    loaded = FunctionMetaStore(tmp_path / "cache").load(fn, "body")
+    assert loaded is not None
+    assert loaded.source == meta.source
+    assert loaded.start_line == meta.start_line
+    assert ast.dump(loaded.fdef) == ast.dump(meta.fdef)
+    assert loaded.source_stem == "meta_store_design"
+    assert fn in jit_cache._STRUCT_METRICS_CACHE
+
+    # Nothing changed since the load, so there is nothing to rewrite.
+    store = FunctionMetaStore(tmp_path / "cache")
+    store.load(fn, "body")
+    assert store.save() == 0
+
+
+def test_entry_is_invalidated_by_mtime_or_size_change(tmp_path: Path) -> None:
+    src, fn, _meta, _names = _saved_store(tmp_path)
+    store = FunctionMetaStore(tmp_path / "cache")
+    assert store.load(fn, "body") is not None
+
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert store.load(fn, "body") is None
+
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert store.load(fn, "body") is not None
+    with open(src, "a", encoding="utf-8") as f:
+        f.write("# edited\n")
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert store.load(fn, "body") is None
+
+
+def test_assigned_names_are_restored_by_node_path(tmp_path: Path) -> None:
+    _src, fn, _meta, names = _saved_store(tmp_path)
+    assert names == frozenset({"x", "y"})
+    assert not jit_cache._ASSIGNED_NAMES_CACHE
+
+    loaded = FunctionMetaStore(tmp_path / "cache").load(fn, "body")
+    assert loaded is not None
+    key = tuple(id(s) for s in _loop(loaded.fdef).body)
+    assert jit_cache._ASSIGNED_NAMES_CACHE[key] == names
+
+
+def test_store_is_disabled_without_a_directory(tmp_path: Path) -> None:
+    clear_metadata_caches()
+    _src, fn = _load_fn(tmp_path)
+    store = FunctionMetaStore()
+    store.track(fn, "body", get_function_meta(fn))
+    assert store.load(fn, "body") is None
+    assert store.save() == 0
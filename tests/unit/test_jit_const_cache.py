@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pycircuit
+import pytest
+from pycircuit import Circuit, const, module
+from pycircuit.jit_cache import const_result_cache
+
+pytestmark = pytest.mark.unit
+
+_CALLS: list[int] = []
+
+
+@const
+def _tag_width(m: Circuit) -> int:
+    return len(str(m.name))
+
+
+@const
+def _lanes(m: Circuit, n: int) -> list[int]:
+    _ = m
+    _CALLS.append(n)
+    return [n, n + 1]
+
+
+@const
+def _span(m: Circuit, n: int) -> tuple[int, int]:
+    _ = m
+    _CALLS.append(n)
+    return (n, 2 * n)
+
+
+@module
+def leaf_a(m: Circuit):
+    xs = _lanes(m, 3)
+    xs.append(7)
+    lo, hi = _span(m, 4)
+    m.output("tag", m.const(_tag_width(m), width=8))
+    m.output("n", m.const(len(xs), width=8))
+    m.output("hi", m.const(hi, width=8))
+
+
+@module
+def leaf_long_name(m: Circuit):
+    xs = _lanes(m, 3)
+    lo, hi = _span(m, 4)
+    m.output("tag", m.const(_tag_width(m), width=8))
+    m.output("n", m.const(len(xs), width=8))
+    m.output("hi", m.const(hi, width=8))
+
+
+def _constants(fn) -> list[str]:
+    mlir = pycircuit.compile(fn, name=fn.__name__).emit_mlir()
+    return [
+        line.split("= ", 1)[1] for line in mlir.splitlines() if "pyc.constant" in line
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    const_result_cache().clear()
+    _CALLS.clear()
+    yield
+    const_result_cache().clear()
+
+
+def test_const_reading_the_builder_is_not_shared_across_modules() -> None:
+    assert "pyc.constant 6 : i8" in _constants(leaf_a)
+    assert "pyc.constant 14 : i8" in _constants(leaf_long_name)
+
+
+def test_builder_free_const_hits_across_modules() -> None:
+    _constants(leaf_a)
+    assert _CALLS == [3, 4]
+    _constants(leaf_long_name)
+    assert _CALLS == [3, 4]
+    # Only the builder-free results are in the process-wide cache.
+    frozen = sorted(f for _value, f in const_result_cache()._entries.values())
+    assert frozen == [False, True]
+
+
+def test_non_frozen_hit_is_a_deep_copy() -> None:
+    assert "pyc.constant 2 : i8" in _constants(leaf_long_name)
+    # `leaf_a` hits and appends to its list; neither the cached value nor
+    # the next hit sees that.
+    assert "pyc.constant 3 : i8" in _constants(leaf_a)
+    assert "pyc.constant 2 : i8" in _constants(leaf_long_name)
+    assert _CALLS == [3, 4]
+    values = [v for v, _frozen in const_result_cache()._entries.values()]
+    assert [3, 4] in values
+
+
+def test_const_cache_file_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / ".const_cache.json"
+    _constants(leaf_a)
+    assert const_result_cache().save(path, stamp="s1") == 2
+
+    const_result_cache().clear()
+    assert const_result_cache().load(path, stamp="s1") == 2
+    _constants(leaf_long_name)
+    assert _CALLS == [3, 4]
+
+    # A different stamp (changed sources) ignores the file.
+    const_result_cache().clear()
+    assert const_result_cache().load(path, stamp="s2") == 0
+    _constants(leaf_long_name)
+    assert _CALLS == [3, 4, 3, 4]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import re
+
+import pycircuit
+import pytest
+from pycircuit import Circuit, module
+
+pytestmark = pytest.mark.unit
+
+
+@module
+def _accumulate(m: Circuit):
+    a = m.input("a", width=8)
+    x = a
+    for _ in range(5):
+        x = x + a
+    m.output("y", x)
+
+
+@module
+def _accumulate_index(m: Circuit):
+    a = m.input("a", width=8)
+    x = a
+    for i in range(5):
+        x = x + i
+    m.output("y", x)
+
+
+@module
+def _overwrite(m: Circuit):
+    a = m.input("a", width=8)
+    y = a
+    for _ in range(5):
+        y = a + 1
+    m.output("y", y)
+
+
+def _emit(fn) -> str:
+    return pycircuit.compile(fn, name=fn.__name__).emit_mlir()
+
+
+def test_uniform_range_loop_emits_scf_for_with_peeled_last_iteration() -> None:
+    mlir = _emit(_accumulate)
+
+    loops = re.findall(
+        r"(%\w+) = scf\.for %\w+ = %\w+ to %\w+ step %\w+ iter_args\((%\w+) = %\w+\) -> i8 \{",
+        mlir,
+    )
+    assert len(loops) == 1
+    result, block_arg = loops[0]
+    # Iterations 0..3 run in the loop; the upper bound is the trip count - 1.
+    assert re.search(r"= arith\.constant 4 : index", mlir)
+    body = mlir.split("scf.for", 1)[1].split("scf.yield", 1)[0]
+    assert body.count("pyc.add") == 1
+    assert f"pyc.add {block_arg}," in body
+    # The last iteration is compiled after the loop from its result.
+    tail = mlir.split("scf.yield", 1)[1]
+    assert f"pyc.add {result}," in tail
+    assert mlir.count("pyc.add") == 2
+
+
+def test_non_uniform_range_loop_falls_back_to_unrolling() -> None:
+    mlir = _emit(_accumulate_index)
+
+    assert "scf.for" not in mlir
+    assert mlir.count("pyc.add") == 5
+    for i in range(5):
+        assert f"pyc.constant {i} : i8" in mlir
+
+
+def test_uniform_loop_without_live_carried_values_emits_no_scf_for() -> None:
+    mlir = _emit(_overwrite)
+
+    assert "scf.for" not in mlir
+    assert "arith.constant" not in mlir
+    assert mlir.count("pyc.add") == 1
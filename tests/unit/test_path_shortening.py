@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from pycircuit import path_shortening
+from pycircuit.path_shortening import shorten_instance_path, xxhash64, xxhash64_many
+
+pytestmark = pytest.mark.unit
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def _samples() -> list[bytes]:
+    rng = random.Random(17)
+    # Every length up to 100 covers each tail branch and the 32-byte stripes.
+    out = [bytes(rng.randrange(256) for _ in range(n)) for n in range(101)]
+    out += [f"dut.core{i}.lsu.q{i % 7}.entry_{i}:valid".encode() for i in range(32)]
+    return out
+
+
+def test_xxhash64_reference_vectors() -> None:
+    assert xxhash64(b"") == 0xEF46DB3751D8E999
+    assert xxhash64(b"abc") == 0x44BC2CF5AD770999
+    assert path_shortening._xxhash64_py(b"") == 0xEF46DB3751D8E999
+
+
+def test_xxhash64_many_matches_single_and_fallback() -> None:
+    samples = _samples()
+    for seed in (0, 1, (1 << 64) - 1):
+        batch = xxhash64_many(samples, seed=seed)
+        assert batch == [xxhash64(b, seed=seed) for b in samples]
+        assert batch == [path_shortening._xxhash64_py(b, seed) for b in samples]
+
+
+def test_xxhash64_and_shortening_match_cpp_runtime(tmp_path: Path) -> None:
+    cxx = shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")
+    if cxx is None:
+        pytest.skip("parity test requires a C++ compiler")
+    samples = _samples()
+    paths = [
+        ".".join(f"blk{j}_{'x' * (i % 9)}" for j in range(i)) for i in range(1, 40)
+    ]
+
+    src = tmp_path / "parity.cpp"
+    src.write_text(
+        "#include <cstdio>\n"
+        "#include <iostream>\n"
+        "#include <string>\n"
+        '#include "pyc_probe_registry.hpp"\n'
+        "int main() {\n"
+        "  std::string kind, hex;\n"
+        "  while (std::cin >> kind >> hex) {\n"
+        "    std::string data;\n"
+        "    for (std::size_t i = 0; i + 1 < hex.size(); i += 2)\n"
+        "      data.push_back(static_cast<char>(std::stoi(hex.substr(i, 2), nullptr, 16)));\n"
+        '    if (kind == "h")\n'
+        '      std::printf("%016llx\\n", static_cast<unsigned long long>(pyc::cpp::xxhash64(data.substr(1))));\n'
+        "    else\n"
+        '      std::printf("%s\\n", pyc::cpp::shortenInstancePath(data.substr(1)).c_str());\n'
+        "  }\n"
+        "}\n",
+        encoding="utf-8",
+    )
+    exe = tmp_path / "parity"
+    subprocess.run(
+        [
+            cxx,
+            "-std=c++17",
+            "-O1",
+            f"-I{_repo_root() / 'runtime' / 'cpp'}",
+            str(src),
+            "-o",
+            str(exe),
+        ],
+        check=True,
+    )
+    # Leading "00" keeps empty inputs tokenizable.
+    lines = [f"h 00{b.hex()}" for b in samples] + [
+        f"s 00{p.encode().hex()}" for p in paths
+    ]
+    res = subprocess.run(
+        [str(exe)],
+        input="\n".join(lines) + "\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    got = res.stdout.splitlines()
+    want = [f"{h:016x}" for h in xxhash64_many(samples)] + [
+        shorten_instance_path(p) for p in paths
+    ]
+    assert got == want
+
+
+def test_instance_path_table_ignores_empty_paths() -> None:
+    table = path_shortening.InstancePathTable()
+    assert table.intern("") == -1
+    assert table.intern(".") == -1
+    assert len(table) == 0
+    leaf = table.intern("dut.u0..lsu")
+    assert [table.path(p) for p in table.ancestors(leaf)] == [
+        "dut.u0.lsu",
+        "dut.u0",
+        "dut",
+    ]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pycircuit
+import pytest
+from pycircuit.jit_cache import module_artifact_cache
+
+pytestmark = pytest.mark.unit
+
+_SUB_CALLS: list[int] = []
+
+
+def _adder(m, domain, inputs=None, width=8, prefix="adder"):
+    _SUB_CALLS.append(width)
+    a = pycircuit.cas(domain, m.input(f"{prefix}_a", width=width), cycle=0)
+    b = pycircuit.cas(domain, m.input(f"{prefix}_b", width=width), cycle=0)
+    s = a + b
+    m.output(f"{prefix}_sum", s.wire)
+    return {"sum": s}
+
+
+def _top(m, domain):
+    x = pycircuit.cas(domain, m.input("x", width=8), cycle=0)
+    y = pycircuit.cas(domain, m.input("y", width=8), cycle=0)
+    outs = domain.call(_adder, inputs={"a": x, "b": y}, width=8, prefix="u0")
+    m.output("s", outs["sum"].wire)
+
+
+def _build() -> str:
+    circuit = pycircuit.compile_cycle_aware(
+        _top, name="top", eager=True, hierarchical=True
+    )
+    return circuit.emit_mlir()
+
+
+def test_artifact_cache_hit_skips_sub_module_function() -> None:
+    module_artifact_cache().clear()
+    _SUB_CALLS.clear()
+
+    first = _build()
+    assert _SUB_CALLS == [8]
+
+    second = _build()
+    assert _SUB_CALLS == [8]
+    assert second == first
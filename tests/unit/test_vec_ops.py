@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+from pycircuit import Circuit
+from pycircuit.hw import Vec, Wire
+
+pytestmark = pytest.mark.unit
+
+
+def _consts(m: Circuit, values: list[int], *, width: int) -> Vec:
+    return Vec(tuple(m.const(v, width=width) for v in values))
+
+
+def _value(m: Circuit, w: Wire) -> int:
+    known = m._known(w.sig)
+    assert known is not None, f"{w.sig.ref} was not folded"
+    return known[0]
+
+
+def _lanes(m: Circuit, v: Vec) -> list[int]:
+    return [_value(m, w) for w in v.wires()]
+
+
+def _count(m: Circuit, op: str) -> int:
+    return sum(f" = {op} " in line for line in m._lines)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8])
+def test_priority_encode_and_popcount_match_reference(n: int) -> None:
+    for bits in itertools.product((0, 1), repeat=n):
+        m = Circuit("bits")
+        v = _consts(m, list(bits), width=1)
+        valid, index = v.priority_encode()
+        assert index.width == max(1, (n - 1).bit_length())
+        assert _value(m, valid) == int(any(bits))
+        if any(bits):
+            assert _value(m, index) == bits.index(1)
+
+        count = v.popcount()
+        assert count.width == n.bit_length()
+        assert _value(m, count) == sum(bits)
+
+
+def test_bit_reductions_require_i1_lanes() -> None:
+    m = Circuit("wide")
+    v = _consts(m, [1, 2], width=4)
+    with pytest.raises(TypeError):
+        v.priority_encode()
+    with pytest.raises(TypeError):
+        v.popcount()
+
+
+def test_read_selects_lane_and_gives_zero_out_of_range() -> None:
+    m = Circuit("read")
+    xs = [5, 6, 7, 8, 9]
+    v = _consts(m, xs, width=4)
+    # Index exactly clog2(len) wide: padding lanes read as 0.
+    for i in range(8):
+        assert _value(m, v.read(m.const(i, width=3))) == (xs[i] if i < len(xs) else 0)
+    # Wider index: the high bits also force 0.
+    for i in range(32):
+        assert _value(m, v.read(m.const(i, width=5))) == (xs[i] if i < len(xs) else 0)
+    # Narrow index is zero-extended.
+    assert _value(m, v.read(m.const(1, width=1))) == 6
+
+
+def test_read_is_a_balanced_mux_tree() -> None:
+    m = Circuit("read_tree")
+    v = Vec(tuple(m.input(f"x{i}", width=4) for i in range(5)))
+    out = v.read(m.input("idx", width=3))
+    assert out.width == 4
+    # Padded to 8 lanes: 4 + 2 + 1 muxes, no range check.
+    assert _count(m, "pyc.mux") == 7
+    assert _count(m, "pyc.ult") == 0
+
+
+def test_where_with_scalar_and_lane_selectors() -> None:
+    m = Circuit("where")
+    a = _consts(m, [1, 2, 3], width=4)
+    b = _consts(m, [7, 8, 9], width=4)
+    assert _lanes(m, a.where(m.const(1, width=1), b)) == [1, 2, 3]
+    assert _lanes(m, a.where(m.const(0, width=1), b)) == [7, 8, 9]
+    assert _lanes(m, a.where(m.const(0, width=1), 4)) == [4, 4, 4]
+    sel = _consts(m, [1, 0, 1], width=1)
+    assert _lanes(m, a.where(sel, b)) == [1, 8, 3]
+
+    with pytest.raises(ValueError):
+        a.where(_consts(m, [1, 0], width=1), b)
+
+    m = Circuit("where_wide")
+    x = Vec(tuple(m.input(f"x{i}", width=4) for i in range(3)))
+    y = Vec(tuple(m.input(f"y{i}", width=4) for i in range(3)))
+    out = x.where(m.input("s", width=1), y)
+    assert [w.width for w in out.wires()] == [4, 4, 4]
+    # One wide mux over the packed lanes.
+    assert _count(m, "pyc.mux") == 1
+
+
+def test_lane_equality_returns_vec_of_i1() -> None:
+    m = Circuit("eq")
+    a = _consts(m, [1, 2, 3], width=4)
+    b = _consts(m, [1, 5, 3], width=4)
+    eq = a == b
+    assert isinstance(eq, Vec)
+    assert [w.width for w in eq.wires()] == [1, 1, 1]
+    assert _lanes(m, eq) == [1, 0, 1]
+    assert _lanes(m, a != b) == [0, 1, 0]
+    assert _lanes(m, a == 2) == [0, 1, 0]
+
+    with pytest.raises(ValueError):
+        a == _consts(m, [1, 2], width=4)  # noqa: B015
@@ -6,6 +6,7 @@ Each design outputs to <design_dir>/build/ (mlir/ + verilog/).
 
 from __future__ import annotations
 
+import hashlib
 import importlib
 import json
 import os
@@ -18,6 +19,9 @@ REPO = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(REPO / "compiler" / "frontend"))
 sys.path.insert(0, str(REPO / "designs" / "XiangShan-pyc"))
 
+# Emitted v5 hierarchical sub-modules, reused across designs and runs.
+MODULE_CACHE = REPO / "build" / ".v5_module_cache.json"
+
 
 def find_pycc() -> Path:
     for p in [
@@ -29,6 +33,17 @@ def find_pycc() -> Path:
     raise SystemExit("pycc not found")
 
 
+def source_stamp() -> str:
+    """Hash of the frontend and design sources the cached modules depend on."""
+    h = hashlib.sha256()
+    for root in (REPO / "compiler" / "frontend" / "pycircuit", REPO / "designs"):
+        for f in sorted(root.rglob("*.py")):
+            h.update(str(f.relative_to(REPO)).encode("utf-8"))
+            h.update(b"\0")
+            h.update(f.read_bytes())
+    return h.hexdigest()
+
+
 def stamp_metadata(circuit, name: str, params_json: str = "{}") -> None:
     circuit.set_func_attr("pyc.kind", "module")
     circuit.set_func_attr("pyc.inline", "false")
@@ -542,6 +557,11 @@ def main() -> int:
 
     pycc = find_pycc()
 
+    from pycircuit.jit_cache import module_artifact_cache
+
+    stamp = source_stamp()
+    module_artifact_cache().load(MODULE_CACHE, stamp=stamp)
+
     succeeded = []
     failed = []
     t0 = time.time()
@@ -558,6 +578,12 @@ def main() -> int:
 
     time.time() - t0
 
+    try:
+        MODULE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        module_artifact_cache().save(MODULE_CACHE, stamp=stamp)
+    except OSError:
+        pass
+
     if failed:
         return 1
     return 0